@@ -20,14 +20,12 @@
 import json
 import time
 
-from django.apps import apps
 from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.urls import reverse
 from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
-from django.db.models import Count
 from django.utils.translation import get_language
 
 from avatar.templatetags.avatar_tags import avatar_url
@@ -44,7 +42,8 @@ from geonode.api.authorization import (
 from guardian.shortcuts import get_objects_for_user
 from tastypie.bundle import Bundle
 
-from geonode.base.models import ResourceBase, ThesaurusKeyword
+from geonode.base.counts import get_facet_counts, get_owner_counts, get_resource_counts
+from geonode.base.models import ThesaurusKeyword
 from geonode.base.models import TopicCategory
 from geonode.base.models import Region
 from geonode.base.models import HierarchicalKeyword
@@ -71,53 +70,13 @@ class CountJSONSerializer(Serializer):
     """Custom serializer to post process the api and add counts"""
 
     def get_resources_counts(self, options):
-        if settings.SKIP_PERMS_FILTER:
-            resources = ResourceBase.objects.all()
-        else:
-            resources = get_objects_for_user(options["user"], "base.view_resourcebase")
-
-        resources = get_visible_resources(
-            resources,
+        return get_facet_counts(
             options["user"],
-            admin_approval_required=settings.ADMIN_MODERATE_UPLOADS,
-            unpublished_not_visible=settings.RESOURCE_PUBLISHING,
-            private_groups_not_visibile=settings.GROUP_PRIVATE_RESOURCES,
+            options["count_type"],
+            title_filter=options.get("title_filter"),
+            type_filter=options.get("type_filter"),
         )
 
-        subtypes = []
-        if resources and resources.exists():
-            if options["title_filter"]:
-                resources = resources.filter(title__icontains=options["title_filter"])
-            if options["type_filter"]:
-                _type_filter = options["type_filter"]
-
-                for label, app in apps.app_configs.items():
-                    if hasattr(app, "type") and app.type == "GEONODE_APP":
-                        if hasattr(app, "default_model"):
-                            _model = apps.get_model(label, app.default_model)
-                            if issubclass(_model, _type_filter):
-                                subtypes.append(resources.filter(polymorphic_ctype__model=_model.__name__.lower()))
-
-                if not isinstance(_type_filter, str):
-                    _type_filter = _type_filter.__name__.lower()
-                resources = resources.filter(polymorphic_ctype__model=_type_filter)
-
-        counts = list()
-        if subtypes:
-            for subtype in subtypes:
-                counts.extend(list(subtype.values(options["count_type"]).annotate(count=Count(options["count_type"]))))
-        else:
-            counts = list(resources.values(options["count_type"]).annotate(count=Count(options["count_type"])))
-
-        _counts = {}
-        for c in counts:
-            if c and c["count"] and options["count_type"]:
-                if not _counts.get(c[options["count_type"]], None):
-                    _counts.update({c[options["count_type"]]: c["count"]})
-                else:
-                    _counts[c[options["count_type"]]] += c["count"]
-        return _counts
-
     def to_json(self, data, options=None):
         options = options or {}
         data = self.to_simple(data, options)
@@ -476,39 +435,6 @@ class ProfileResource(TypeFilteredResource):
 
         return email
 
-    def dehydrate_datasets_count(self, bundle):
-        obj_with_perms = get_objects_for_user(bundle.request.user, "base.view_resourcebase").filter(
-            polymorphic_ctype__model="dataset"
-        )
-        return (
-            bundle.obj.resourcebase_set.filter(id__in=obj_with_perms.values("id"))
-            .filter(metadata_only=False)
-            .distinct()
-            .count()
-        )
-
-    def dehydrate_maps_count(self, bundle):
-        obj_with_perms = get_objects_for_user(bundle.request.user, "base.view_resourcebase").filter(
-            polymorphic_ctype__model="map"
-        )
-        return (
-            bundle.obj.resourcebase_set.filter(id__in=obj_with_perms.values("id"))
-            .filter(metadata_only=False)
-            .distinct()
-            .count()
-        )
-
-    def dehydrate_documents_count(self, bundle):
-        obj_with_perms = get_objects_for_user(bundle.request.user, "base.view_resourcebase").filter(
-            polymorphic_ctype__model="document"
-        )
-        return (
-            bundle.obj.resourcebase_set.filter(id__in=obj_with_perms.values("id"))
-            .filter(metadata_only=False)
-            .distinct()
-            .count()
-        )
-
     def dehydrate_avatar_100(self, bundle):
         return avatar_url(bundle.obj, 240)
 
@@ -545,6 +471,25 @@ class ProfileResource(TypeFilteredResource):
             )
         return bundle
 
+    def add_resource_counts(self, request, bundles):
+        """Sets the counts of the resources visible to the user for the whole page at once"""
+        counts = get_owner_counts(request.user, [bundle.obj.pk for bundle in bundles])
+        for bundle in bundles:
+            owner_counts = counts.get(bundle.obj.pk, {})
+            bundle.data.update(
+                layers_count=owner_counts.get("dataset", 0),
+                maps_count=owner_counts.get("map", 0),
+                documents_count=owner_counts.get("document", 0),
+            )
+
+    def alter_list_data_to_serialize(self, request, data):
+        self.add_resource_counts(request, data[self._meta.collection_name])
+        return data
+
+    def alter_detail_data_to_serialize(self, request, data):
+        self.add_resource_counts(request, [data])
+        return data
+
     def prepend_urls(self):
         return []
 
@@ -707,52 +652,4 @@ def _get_resource_counts(request, resourcebase_filter_kwargs):
     objects that belong to the group that has ``my-group`` as slug
 
     """
-    resources = get_visible_resources(
-        ResourceBase.objects.filter(**resourcebase_filter_kwargs),
-        request.user,
-        request=request,
-        admin_approval_required=settings.ADMIN_MODERATE_UPLOADS,
-        unpublished_not_visible=settings.RESOURCE_PUBLISHING,
-        private_groups_not_visibile=settings.GROUP_PRIVATE_RESOURCES,
-    )
-
-    values = resources.values(
-        "polymorphic_ctype__model",
-        "is_approved",
-        "is_published",
-    )
-    qs = values.annotate(counts=Count("polymorphic_ctype__model"))
-    types = ["dataset", "document", "map", "geoapp", "all"]
-
-    subtypes = []
-    for label, app in apps.app_configs.items():
-        if hasattr(app, "type") and app.type == "GEONODE_APP":
-            if hasattr(app, "default_model"):
-                _model = apps.get_model(label, app.default_model)
-                if issubclass(_model, GeoApp):
-                    types.append(_model.__name__.lower())
-                    subtypes.append(_model.__name__.lower())
-    counts = {}
-    for type_ in types:
-        counts[type_] = {
-            "total": 0,
-            "visible": 0,
-            "published": 0,
-            "approved": 0,
-        }
-    for record in qs:
-        resource_type = record["polymorphic_ctype__model"]
-        if resource_type in subtypes:
-            resource_type = "geoapp"
-        is_visible = all((record["is_approved"], record["is_published"]))
-        counts["all"]["total"] += record["counts"]
-        counts["all"]["visible"] += record["counts"] if is_visible else 0
-        counts["all"]["published"] += record["counts"] if record["is_published"] else 0
-        counts["all"]["approved"] += record["counts"] if record["is_approved"] else 0
-        section = counts.get(resource_type)
-        if section is not None:
-            section["total"] += record["counts"]
-            section["visible"] += record["counts"] if is_visible else 0
-            section["published"] += record["counts"] if record["is_published"] else 0
-            section["approved"] += record["counts"] if record["is_approved"] else 0
-    return counts
+    return get_resource_counts(request.user, **resourcebase_filter_kwargs)
@@ -42,6 +42,7 @@ from geonode.documents.models import Document
 from geonode.base.models import ResourceBase
 from geonode.base.models import HierarchicalKeyword
 from geonode.base.bbox_utils import filter_bbox
+from geonode.base.response_cache import cached_response
 from geonode.groups.models import GroupProfile
 from geonode.utils import check_ogc_backend
 from geonode.security.utils import get_visible_resources
@@ -245,8 +246,14 @@ class CommonModelApi(ModelResource):
 
         Should return a HttpResponse (200 OK).
         """
-        # TODO: Uncached for now. Invalidation that works for everyone may be
-        # impossible.
+        # the lists rendered for the anonymous users are shared between them
+        model = self._meta.queryset.model
+        resource_types = None if model is ResourceBase else [model.__name__.lower()]
+        return cached_response(
+            request, f"tastypie_{self._meta.resource_name}", lambda: self._get_list(request, **kwargs), resource_types
+        )
+
+    def _get_list(self, request, **kwargs):
         base_bundle = self.build_bundle(request=request)
         objects = self.obj_get_list(bundle=base_bundle, **self.remove_api_resource_names(kwargs))
         sorted_objects = self.apply_sorting(objects, options=request.GET)
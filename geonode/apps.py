@@ -34,3 +34,7 @@ class AppConfig(BaseAppConfig):
     def ready(self):
         super().ready()
         run_setup_hooks()
+
+        from geonode.sitemap import connect_sitemap_signals
+
+        connect_sitemap_signals()
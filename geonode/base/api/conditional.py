@@ -0,0 +1,117 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Validators of the conditional GET requests of the resources API.
+
+The ETag of a resource is computed from its last_updated time, the one of a list from the latest
+last_updated time and the number of the resources matching the request, read with a single aggregate
+query. The writers bypassing save() with queryset updates of serialized fields (e.g. the thumbnail, the
+bounding boxes and the links) set last_updated too. Both include the visibility class of the user and a permissions generation, replaced whenever the
+permissions of a resource or the members of a group change, and, for the authenticated users, a generation
+replaced when their favorites change, since they are part of the serialized resources.
+
+The generations are kept in the default cache, so the validators are not computed, and the responses are
+always rendered, when it is not shared by the processes serving the requests (e.g. DummyCache or LocMemCache).
+"""
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, signals
+
+from geonode.base.counts import get_visibility_class
+
+PERMISSIONS_GENERATION_KEY = "api_permissions_generation"
+USER_GENERATION_PREFIX = "api_user_generation"
+
+# cache backends not sharing the generations between the processes
+UNSHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
+
+def is_conditional_get_enabled():
+    return settings.API_CONDITIONAL_GET_ENABLED and settings.CACHES["default"]["BACKEND"] not in UNSHARED_CACHE_BACKENDS
+
+
+def get_generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_permissions_validators():
+    """Discards the validators of all the responses, to be called when any permission changes"""
+    cache.set(PERMISSIONS_GENERATION_KEY, uuid4().hex, None)
+
+
+def invalidate_user_validators(user_id):
+    """Discards the validators of the responses to the user"""
+    cache.set(f"{USER_GENERATION_PREFIX}:{user_id}", uuid4().hex, None)
+
+
+def _make_etag(user, *parts):
+    generations = [get_generation(PERMISSIONS_GENERATION_KEY), get_visibility_class(user)]
+    if user and user.is_authenticated:
+        generations.append(get_generation(f"{USER_GENERATION_PREFIX}:{user.pk}"))
+    digest = hashlib.md5(repr(generations + [str(part) for part in parts]).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def get_resource_validators(instance, user, variant=""):
+    """
+    Returns the ETag and the last modification time of the resource, (None, None) when disabled.
+    The variant identifies the representation, e.g. the query string selecting the fields.
+    """
+    if not is_conditional_get_enabled():
+        return None, None
+    return (
+        _make_etag(user, instance.__class__.__name__, instance.pk, instance.last_updated, variant),
+        instance.last_updated,
+    )
+
+
+def get_list_validators(queryset, user, variant=""):
+    """Returns the ETag and the last modification time of the list of the resources of the queryset"""
+    if not is_conditional_get_enabled():
+        return None, None
+    aggregate = queryset.order_by().aggregate(last_updated=Max("last_updated"), count=Count("pk"))
+    etag = _make_etag(user, queryset.model.__name__, aggregate["last_updated"], aggregate["count"], variant)
+    return etag, aggregate["last_updated"]
+
+
+def favorite_changed(instance, **kwargs):
+    invalidate_user_validators(instance.user_id)
+
+
+def group_member_changed(instance, **kwargs):
+    invalidate_permissions_validators()
+
+
+def connect_conditional_get_signals():
+    from geonode.favorite.models import Favorite
+    from geonode.groups.models import GroupMember
+
+    for name, signal in (("save", signals.post_save), ("delete", signals.post_delete)):
+        signal.connect(favorite_changed, sender=Favorite, dispatch_uid=f"api_validators_favorite_{name}")
+        signal.connect(group_member_changed, sender=GroupMember, dispatch_uid=f"api_validators_member_{name}")
@@ -21,30 +21,60 @@ import logging
 from distutils.util import strtobool
 from itertools import groupby
 
+from rest_framework.exceptions import ParseError
 from rest_framework.filters import SearchFilter, BaseFilterBackend
 
 from django.db.models import Subquery
 
-from geonode.base.models import ThesaurusKeyword
+from geonode.base.models import ResourceBase, ThesaurusKeyword
 from geonode.favorite.models import Favorite
 from geonode.base.bbox_utils import filter_bbox
+from geonode.base.search import get_search_weights, is_search_index_enabled, search_resources
 
 logger = logging.getLogger(__name__)
 
 
 class DynamicSearchFilter(SearchFilter):
+    """
+    Searches the resources with the full text index when all the search_fields are covered by it,
+    matching only the words of those fields and sorting them by relevance unless a sort is requested
+    """
+
     def get_search_fields(self, view, request):
         return request.GET.getlist("search_fields", [])
 
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search = request.query_params.get(self.search_param, "")
+        weights = get_search_weights(search_fields)
+        if (
+            weights is not None
+            and search.strip()
+            and issubclass(queryset.model, ResourceBase)
+            and is_search_index_enabled(queryset.db)
+        ):
+            return search_resources(queryset, search, order=not request.query_params.getlist("sort[]"), weights=weights)
+        return super().filter_queryset(request, queryset, view)
+
 
 class ExtentFilter(BaseFilterBackend):
     """
-    Filter that only allows users to see their own objects.
+    Filters the resources by their extent with one or more bounding boxes in the "extent" param.
+    The "extent_predicate" param selects the resources whose extent "intersects" (default), is "within"
+    or "contains" the boxes; with "extent_sort=overlap" the ones overlapping the boxes the most come first,
+    unless a sort is requested.
     """
 
     def filter_queryset(self, request, queryset, view):
         if request.query_params.get("extent"):
-            return filter_bbox(queryset, request.query_params.get("extent"))
+            predicate = request.query_params.get("extent_predicate", "intersects")
+            order_by_overlap = request.query_params.get(
+                "extent_sort"
+            ) == "overlap" and not request.query_params.getlist("sort[]")
+            try:
+                return filter_bbox(queryset, request.query_params.get("extent"), predicate, order_by_overlap)
+            except (ArithmeticError, ValueError) as e:
+                raise ParseError(str(e))
         return queryset
 
 
@@ -17,9 +17,15 @@
 #
 #########################################################################
 from distutils.util import strtobool
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
 from rest_framework.mixins import ListModelMixin
 from rest_framework.response import Response
 
+from geonode.base.api.conditional import get_list_validators, get_resource_validators
+from geonode.base.response_cache import cached_response
+
 
 class AdvertisedListMixin(ListModelMixin):
     def list(self, request, *args, **kwargs):
@@ -53,3 +59,62 @@ class AdvertisedListMixin(ListModelMixin):
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class ConditionalGetMixin:
+    """
+    Answers the GET requests of the resources with ETag and Last-Modified headers, and with
+    304 Not Modified when the If-None-Match ETag is still valid, before serializing the resources.
+    """
+
+    def _not_modified(self, request, etag):
+        if_none_match = request.headers.get("If-None-Match")
+        return bool(etag and if_none_match and etag in parse_etags(if_none_match))
+
+    def _conditional_response(self, request, etag, last_modified, render):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED) if self._not_modified(request, etag) else render()
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+            patch_vary_headers(response, ("Cookie", "Authorization"))
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # the resource is resolved first, so its permissions are checked before answering
+        instance = self.get_object()
+        etag, last_modified = get_resource_validators(instance, request.user, request.get_full_path())
+        return self._conditional_response(
+            request, etag, last_modified, lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = get_list_validators(
+            self.filter_queryset(self.get_queryset()), request.user, request.get_full_path()
+        )
+        return self._conditional_response(
+            request, etag, last_modified, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Shares the rendered lists of resources between the anonymous users, see geonode.base.response_cache.
+    The response_cache_types are the resource types the lists include, all of them when None.
+    """
+
+    response_cache_types = None
+
+    def _render_response(self, response):
+        response.accepted_renderer = self.request.accepted_renderer
+        response.accepted_media_type = self.request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        return response.render()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.__class__.__name__,
+            lambda: self._render_response(super(AnonymousResponseCacheMixin, self).list(request, *args, **kwargs)),
+            self.response_cache_types,
+        )
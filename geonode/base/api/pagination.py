@@ -16,21 +16,234 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
+import json
+import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 
 DEFAULT_PAGE = getattr(settings, "REST_API_DEFAULT_PAGE", 1)
 DEFAULT_PAGE_SIZE = getattr(settings, "REST_API_DEFAULT_PAGE_SIZE", 10)
 DEFAULT_PAGE_QUERY_PARAM = getattr(settings, "REST_API_DEFAULT_PAGE_QUERY_PARAM", "page_size")
 
 
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps the microseconds of the times, two rows cannot share a position"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_approximate_count(queryset):
+    """Returns the number of rows of the queryset estimated by the PostgreSQL planner, counts them elsewhere"""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 class GeoNodeApiPagination(PageNumberPagination):
+    """
+    Page number pagination, switching to keyset pagination when the "cursor" param is passed, empty for the
+    first page. The keyset pages are read with a condition on the sort keys of the resources instead of an
+    OFFSET and without counting them, so walking all the pages takes the same time for each one; the total
+    is returned only when requested with total=approximate, estimated by the database, or total=exact.
+    The rows having NULL sort keys, e.g. no creation date, are sorted last in both directions.
+    """
+
     page = DEFAULT_PAGE
     page_size = DEFAULT_PAGE_SIZE
     page_size_query_param = DEFAULT_PAGE_QUERY_PARAM
+    cursor_query_param = "cursor"
+    total_query_param = "total"
+    # the sort keys when the ones of the queryset cannot be used for the cursors
+    default_ordering = ("-pk",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_cursor_ordering(queryset)
+        self.total = self.get_total(queryset, request)
+        position, reverse = self.decode_cursor(request)
+
+        nullable = self.get_nullable_fields(queryset, self.ordering)
+        ordering = [self._invert(field) for field in self.ordering] if reverse else self.ordering
+        # the NULLs come last, so first when walking the pages backwards
+        queryset = queryset.order_by(*self.get_order_by(ordering, nullable, nulls_first=reverse))
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(ordering, position, nullable, nulls_first=reverse))
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+        self.results = results
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        return results
+
+    def get_cursor_ordering(self, queryset):
+        """Returns the fields sorting the queryset, with the primary key last to make the sort stable"""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not ordering or any(
+            not isinstance(field, str) or "__" in field or field.lstrip("-") in ("?", "") for field in ordering
+        ):
+            return list(self.default_ordering)
+        keys = [field for field in ordering if field.lstrip("-") not in ("pk", "id")]
+        pk_descending = next(
+            (field.startswith("-") for field in ordering if field.lstrip("-") in ("pk", "id")),
+            bool(keys) and keys[-1].startswith("-"),
+        )
+        return keys + ["-pk" if pk_descending else "pk"]
+
+    @staticmethod
+    def get_nullable_fields(queryset, ordering):
+        """Returns the names of the sort keys that can be NULL"""
+        nullable = set()
+        for field in ordering:
+            name = field.lstrip("-")
+            if name == "pk":
+                continue
+            try:
+                if queryset.model._meta.get_field(name).null:
+                    nullable.add(name)
+            except FieldDoesNotExist:
+                # e.g. an annotation
+                nullable.add(name)
+        return nullable
+
+    @staticmethod
+    def get_order_by(ordering, nullable, nulls_first=False):
+        """Returns the expressions sorting the rows, with the NULL sort keys first or last"""
+        order_by = []
+        for field in ordering:
+            name = field.lstrip("-")
+            if name not in nullable:
+                order_by.append(field)
+                continue
+            expression = F(name).desc if field.startswith("-") else F(name).asc
+            order_by.append(expression(nulls_first=True) if nulls_first else expression(nulls_last=True))
+        return order_by
+
+    def get_total(self, queryset, request):
+        total = request.query_params.get(self.total_query_param)
+        if total == "approximate":
+            return get_approximate_count(queryset)
+        if total == "exact":
+            return queryset.count()
+        return None
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def get_position_filter(self, ordering, position, nullable=(), nulls_first=False):
+        """
+        Returns the condition selecting the rows following the position in the ordering,
+        the NULL values of the nullable fields being sorted first or last.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            if name not in nullable:
+                following = Q(**{f"{name}__{lookup}": value})
+            elif value is None:
+                # only the non NULL values follow the first NULLs, nothing follows the last ones
+                following = Q(**{f"{name}__isnull": False}) if nulls_first else None
+            else:
+                following = Q(**{f"{name}__{lookup}": value})
+                if not nulls_first:
+                    following |= Q(**{f"{name}__isnull": True})
+            if following is not None:
+                condition |= equal & following
+            equal &= Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        """Returns the sort keys of the position of the cursor, None for the first page, and its direction"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse, ordering = cursor["p"], bool(cursor["r"]), cursor["o"]
+        except (BinasciiError, KeyError, TypeError, UnicodeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if ordering != self.ordering or len(position) != len(self.ordering):
+            # the sort changed since the cursor was returned
+            raise NotFound("Invalid cursor")
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        position = [getattr(instance, field.lstrip("-")) for field in self.ordering]
+        cursor = json.dumps({"p": position, "r": reverse, "o": self.ordering}, cls=CursorEncoder)
+        encoded = urlsafe_b64encode(cursor.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_next_link()
+        return self.encode_cursor(self.results[-1], False) if self.has_next and self.results else None
+
+    def get_previous_link(self):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.results:
+            return replace_query_param(self.base_url, self.cursor_query_param, "")
+        return self.encode_cursor(self.results[0], True)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value, empty for the first page of the keyset pagination.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.total_query_param,
+                "required": False,
+                "in": "query",
+                "description": "With the cursor, returns the approximate or the exact number of results.",
+                "schema": {"type": "string", "enum": ["approximate", "exact"]},
+            },
+        ]
 
     def get_paginated_response(self, data):
+        if getattr(self, "cursor_mode", False):
+            _paginated_response = {
+                "links": {"next": self.get_next_link(), "previous": self.get_previous_link()},
+                "total": self.total,
+                DEFAULT_PAGE_QUERY_PARAM: self.page_size,
+            }
+            _paginated_response.update(data)
+            return Response(_paginated_response)
         _paginated_response = {
             "links": {"next": self.get_next_link(), "previous": self.get_previous_link()},
             "total": self.page.paginator.count,
@@ -895,6 +895,15 @@ class OwnerSerializer(BaseResourceCountSerializer):
 
     avatar = AvatarUrlField(240, read_only=True)
 
+    def to_representation(self, instance):
+        owner_counts = self.context.get("owner_counts")
+        if owner_counts is None:
+            return super().to_representation(instance)
+        data = super(BaseResourceCountSerializer, self).to_representation(instance)
+        if not isinstance(data, int):
+            data["count"] = sum(owner_counts.get(instance.pk, {}).values())
+        return data
+
 
 class LinkedResourceSerializer(DynamicModelSerializer):
     def __init__(self, *kargs, serialize_source: bool = False, **kwargs):
@@ -23,6 +23,7 @@ import re
 import sys
 import json
 import logging
+import tempfile
 from builtins import Exception
 from typing import Iterable
 
@@ -861,6 +862,179 @@ class BaseApiTests(APITestCase):
         # Pagination
         self.assertEqual(len(response.data["resources"]), 1)
 
+    def test_cursor_pagination(self):
+        """
+        Ensure we can walk the Resource Base list with the keyset pagination.
+        """
+        url = reverse("base-resources-list")
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        response = self.client.get(f"{url}?page_size=100", format="json")
+        expected = [resource["pk"] for resource in response.data["resources"]]
+
+        walked = []
+        pages = []
+        next_url = f"{url}?cursor=&page_size=7"
+        while next_url:
+            response = self.client.get(next_url, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.data["total"])
+            self.assertNotIn("page", response.data)
+            pages.append([resource["pk"] for resource in response.data["resources"]])
+            walked.extend(pages[-1])
+            next_url = response.data["links"]["next"]
+        # the resources created at the same time can be sorted differently by the page number pagination
+        self.assertEqual(len(walked), len(expected))
+        self.assertEqual(set(walked), set(expected))
+        self.assertIsNone(response.data["links"]["next"])
+
+        # the previous pages are the same
+        response = self.client.get(response.data["links"]["previous"], format="json")
+        self.assertEqual([resource["pk"] for resource in response.data["resources"]], pages[-2])
+
+        response = self.client.get(f"{url}?cursor=&total=exact", format="json")
+        self.assertEqual(response.data["total"], len(expected))
+        self.assertIsNone(response.data["links"]["previous"])
+        self.assertEqual(self.client.get(f"{url}?cursor=invalid", format="json").status_code, 404)
+
+    def test_cursor_pagination_null_sort_keys(self):
+        """
+        Ensure the resources without a creation date are walked, last, with the keyset pagination.
+        """
+        url = reverse("base-resources-list")
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        expected = {resource["pk"] for resource in self.client.get(f"{url}?page_size=100").data["resources"]}
+        undated = sorted(expected)[:5]
+        ResourceBase.objects.filter(pk__in=undated).update(created=None)
+
+        walked = []
+        pages = []
+        next_url = f"{url}?cursor=&page_size=3&sort[]=-created"
+        while next_url:
+            response = self.client.get(next_url, format="json")
+            self.assertEqual(response.status_code, 200)
+            pages.append([resource["pk"] for resource in response.data["resources"]])
+            walked.extend(pages[-1])
+            next_url = response.data["links"]["next"]
+        self.assertEqual(len(walked), len(set(walked)))
+        self.assertEqual(set(walked), expected)
+        self.assertEqual(set(walked[-len(undated) :]), set(undated))
+
+        # the previous pages are the same, across the NULL sort keys
+        for page in reversed(pages[:-1]):
+            response = self.client.get(response.data["links"]["previous"], format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([resource["pk"] for resource in response.data["resources"]], page)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": os.path.join(tempfile.gettempdir(), "geonode-conditional-get"),
+            }
+        }
+    )
+    def test_conditional_get(self):
+        """
+        Ensure the resources are not serialized again while they do not change.
+        """
+        from django.core.cache import cache
+
+        cache.clear()
+        resource = ResourceBase.objects.filter(metadata_only=False).first()
+        detail_url = reverse("base-resources-detail", kwargs={"pk": resource.pk})
+        list_url = reverse("base-resources-list")
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        for url in (detail_url, list_url):
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+            self.assertTrue(response.has_header("Last-Modified"))
+
+            with patch.object(ResourceBaseSerializer, "to_representation") as to_representation:
+                response = self.client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+                to_representation.assert_not_called()
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response["ETag"], etag)
+
+            # the other users have their own validators
+            self.client.logout()
+            self.assertNotEqual(self.client.get(url, format="json").get("ETag"), etag)
+            self.assertTrue(self.client.login(username="admin", password="admin"))
+
+        etag = self.client.get(detail_url, format="json")["ETag"]
+        list_etag = self.client.get(list_url, format="json")["ETag"]
+        resource.title = "conditional get"
+        resource.save()
+        response = self.client.get(detail_url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["resource"]["title"], "conditional get")
+        self.assertEqual(self.client.get(list_url, format="json", HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+        # the permissions are checked before answering
+        self.client.logout()
+        resource.set_permissions({"users": {"admin": ["base.view_resourcebase"]}, "groups": {}})
+        response = self.client.get(detail_url, format="json", HTTP_IF_NONE_MATCH="*")
+        self.assertIn(response.status_code, (403, 404))
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        # the validators are not computed when the cache is not shared by the processes
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}):
+            self.assertTrue(self.client.login(username="admin", password="admin"))
+            self.assertFalse(self.client.get(detail_url, format="json").has_header("ETag"))
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": os.path.join(tempfile.gettempdir(), "geonode-responses"),
+            }
+        }
+    )
+    def test_anonymous_response_cache(self):
+        """
+        Ensure the lists rendered for the anonymous users are shared until the resources change.
+        """
+        from django.core.cache import cache
+        from geonode.base.api.views import ResourceBaseViewSet
+
+        cache.clear()
+        url = f"{reverse('base-resources-list')}?page_size=5&sort[]=title"
+        with patch.object(
+            ResourceBaseViewSet, "filter_queryset", autospec=True, side_effect=ResourceBaseViewSet.filter_queryset
+        ) as filter_queryset:
+            first = self.client.get(url, format="json")
+            rendered = filter_queryset.call_count
+            self.assertGreater(rendered, 0)
+            # the same parameters in another order
+            second = self.client.get(f"{reverse('base-resources-list')}?sort[]=title&page_size=5", format="json")
+            self.assertEqual(filter_queryset.call_count, rendered)
+            self.assertEqual(second.status_code, 200)
+            self.assertEqual(second.json(), first.json())
+            self.assertEqual(self.client.get(url, format="json", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+            # the replayed responses keep varying on the credentials
+            self.assertIn("Authorization", second["Vary"])
+
+            # the browsable API is cached apart from the JSON responses
+            html = self.client.get(url, HTTP_ACCEPT="text/html")
+            self.assertGreater(filter_queryset.call_count, rendered)
+            self.assertTrue(html["Content-Type"].startswith("text/html"))
+            self.assertTrue(self.client.get(url, format="json")["Content-Type"].startswith("application/json"))
+            rendered = filter_queryset.call_count
+
+            # the authenticated users are not served from the cache
+            self.assertTrue(self.client.login(username="admin", password="admin"))
+            self.client.get(url, format="json")
+            self.assertGreater(filter_queryset.call_count, rendered)
+            self.client.logout()
+
+            rendered = filter_queryset.call_count
+            resource = Dataset.objects.first()
+            resource.title = "anonymous response cache"
+            resource.save()
+            self.client.get(url, format="json")
+            self.assertGreater(filter_queryset.call_count, rendered)
+
     def test_filter_resources(self):
         """
         Ensure we can filter across the Resource Base list.
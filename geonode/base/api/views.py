@@ -51,6 +51,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticate
 from geonode.maps.models import Map
 from geonode.layers.models import Dataset
 from geonode.favorite.models import Favorite
+from geonode.base.counts import count_by, get_grouped_counts, get_owner_counts
 from geonode.base.models import Configuration, ExtraMetadata, LinkedResource
 from geonode.thumbs.exceptions import ThumbnailError
 from geonode.thumbs.thumbnails import create_thumbnail
@@ -78,7 +79,7 @@ from geonode.resource.api.tasks import resouce_service_dispatcher
 from geonode.resource.manager import resource_manager
 
 
-from geonode.base.api.mixins import AdvertisedListMixin
+from geonode.base.api.mixins import AdvertisedListMixin, AnonymousResponseCacheMixin, ConditionalGetMixin
 from .permissions import (
     IsOwnerOrAdmin,
     IsManagerEditOrAdmin,
@@ -266,6 +267,20 @@ class OwnerViewSet(WithDynamicViewSetMixin, ListModelMixin, RetrieveModelMixin,
         )
         return queryset.order_by("username")
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        title_filter = self.request.query_params.get("title__icontains")
+        type_filter = self.request.query_params.get("type")
+        if page is not None and not (title_filter or type_filter):
+            # the counts of the whole page are read at once instead of counting per owner in the serializer
+            self.owner_counts = get_owner_counts(self.request.user, [owner.pk for owner in page])
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["owner_counts"] = getattr(self, "owner_counts", None)
+        return context
+
 
 class ApiPresetsInitializer(APIView):
     """
@@ -293,7 +308,9 @@ class ApiPresetsInitializer(APIView):
             request.GET._mutable = False
 
 
-class ResourceBaseViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin):
+class ResourceBaseViewSet(
+    AnonymousResponseCacheMixin, ConditionalGetMixin, ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin
+):
     """
     API endpoint that allows base resources to be viewed or edited.
     """
@@ -489,11 +506,12 @@ class ResourceBaseViewSet(ApiPresetsInitializer, DynamicModelViewSet, Advertised
                             ),
                         }
 
+        counts = count_by(get_grouped_counts(request.user), "resource_type")
         for _type in _types:
             resource_types.append(
                 {
                     "name": _type,
-                    "count": get_resources_with_perms(request.user).filter(resource_type=_type).count(),
+                    "count": counts.get(_type, 0),
                     "allowed_perms": _allowed_perms[_type] if _type in _allowed_perms else [],
                 }
             )
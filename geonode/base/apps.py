@@ -17,6 +17,7 @@
 #
 #########################################################################
 from django.apps import AppConfig
+from django.conf import settings
 from django.utils.translation import gettext_noop as _
 
 from geonode.notifications_helper import NotificationsAppConfigBase
@@ -36,3 +37,19 @@ class BaseAppConfig(NotificationsAppConfigBase, AppConfig):
             _("Owner has requested permissions to modify a resource"),
         ),
     )
+
+    def ready(self):
+        super().ready()
+        from geonode.base.api.conditional import connect_conditional_get_signals
+        from geonode.base.counts import connect_resource_counts_signals
+        from geonode.base.response_cache import connect_response_cache_signals
+        from geonode.base.search import connect_search_index_signals
+
+        connect_resource_counts_signals()
+        connect_search_index_signals()
+        connect_conditional_get_signals()
+        connect_response_cache_signals()
+        settings.CELERY_BEAT_SCHEDULE["reconcile-owner-resource-counts"] = {
+            "task": "geonode.tasks.counts.reconcile_owner_resource_counts",
+            "schedule": settings.RESOURCE_COUNTS_RECONCILE_INTERVAL,
+        }
@@ -24,17 +24,21 @@ import re
 import logging
 
 from decimal import Decimal
+from functools import lru_cache
 from typing import Union, List, Generator
 
-from pyproj import CRS
+from pyproj import CRS, Transformer
 from shapely import affinity
 from shapely.ops import split
 from shapely.geometry import mapping, Polygon, LineString, GeometryCollection
 
-from django.contrib.gis.geos import Polygon as DjangoPolygon
+from django.contrib.gis.db.models.functions import Intersection, Union as GeoUnion
+from django.contrib.gis.geos import MultiPolygon as DjangoMultiPolygon, Polygon as DjangoPolygon
+from django.db.models import FloatField, Func, Value
+from django.db.models.functions import NullIf
 
 from geonode import GeoNodeException
-from geonode.utils import bbox_to_projection
+from geonode.utils import _v, bbox_to_projection
 
 logger = logging.getLogger(__name__)
 
@@ -71,34 +75,64 @@ def polygon_from_bbox(bbox, srid=4326):
     return poly
 
 
-def filter_bbox(queryset, bbox):
-    """
-    Filters a queryset by a provided bounding box.
+BBOX_PREDICATES = ("intersects", "within", "contains")
+
 
-    :param bbox: Comma-separated coordinates as "xmin,ymin,xmax,ymax"
+def get_bbox_pieces(bbox):
     """
-    assert queryset.model.__class__.__name__ == "PolymorphicModelBase"
+    Returns the [xmin, ymin, xmax, ymax] pieces of an EPSG:4326 bbox split at the antimeridian.
+    A bbox crossing it has xmin greater than xmax, or longitudes out of [-180, 180].
+    """
+    xmin, ymin, xmax, ymax = (float(value) for value in bbox)
+    width = xmax - xmin if xmax >= xmin else xmax - xmin + 360
+    if width >= 360:
+        return [[-180.0, ymin, 180.0, ymax]]
+    xmin = (xmin + 180) % 360 - 180
+    if xmin + width <= 180:
+        return [[xmin, ymin, xmin + width, ymax]]
+    return [[xmin, ymin, 180.0, ymax], [-180.0, ymin, xmin + width - 360, ymax]]
+
 
-    bboxes = []
-    _bbox_index = -1
-    for _x, _y in enumerate(bbox.split(",")):
-        if _x % 4 == 0:
-            bboxes.append([])
-            _bbox_index += 1
-        bboxes[_bbox_index].append(_y)
+def get_bbox_search_geometry(bbox):
+    """
+    Returns the EPSG:4326 MultiPolygon covering the bounding boxes, split at the antimeridian.
 
-    search_queryset = None
-    for _bbox in bboxes:
-        _bbox = list(map(Decimal, _bbox))
-        search_polygon = polygon_from_bbox((_bbox[0], _bbox[1], _bbox[2], _bbox[3]))
-        for search_polygon_dl in [
-            DjangoPolygon.from_ewkt(_p.wkt)
-            for _p in split_polygon(json.loads(search_polygon.json), output_format="polygons")
-        ]:
-            _qs = queryset.filter(ll_bbox_polygon__intersects=search_polygon_dl)
-            search_queryset = _qs if search_queryset is None else search_queryset | _qs
+    :param bbox: Comma-separated coordinates as "xmin,ymin,xmax,ymax", repeated for more boxes
+    """
+    values = [Decimal(value) for value in bbox.split(",")]
+    if not values or len(values) % 4:
+        raise ValueError(f"Invalid bounding box: {bbox}")
+    polygons = []
+    for index in range(0, len(values), 4):
+        polygons.extend(polygon_from_bbox(piece) for piece in get_bbox_pieces(values[index : index + 4]))
+    geometry = DjangoMultiPolygon(*polygons)
+    geometry.srid = 4326
+    return geometry
+
+
+def filter_bbox(queryset, bbox, predicate="intersects", order_by_overlap=False):
+    """
+    Filters a queryset by a provided bounding box, with a single spatial condition on ll_bbox_polygon.
 
-    return search_queryset
+    :param bbox: Comma-separated coordinates as "xmin,ymin,xmax,ymax", repeated for more boxes
+    :param predicate: The extent of the resources "intersects", is "within" or "contains" the boxes
+    :param order_by_overlap: Sorts the resources by the ratio between the area shared with the boxes
+        and the area covered by both, the ones matching the boxes best first
+    """
+    assert queryset.model.__class__.__name__ == "PolymorphicModelBase"
+    if predicate not in BBOX_PREDICATES:
+        raise ValueError(f"Invalid spatial predicate: {predicate}")
+
+    search_geometry = get_bbox_search_geometry(bbox)
+    queryset = queryset.filter(**{f"ll_bbox_polygon__{predicate}": search_geometry})
+    if order_by_overlap:
+        shared_area = Func(
+            Intersection("ll_bbox_polygon", search_geometry), function="ST_Area", output_field=FloatField()
+        )
+        total_area = Func(GeoUnion("ll_bbox_polygon", search_geometry), function="ST_Area", output_field=FloatField())
+        overlap = shared_area / NullIf(total_area, Value(0.0))
+        queryset = queryset.order_by(overlap.desc(nulls_last=True), "-pk")
+    return queryset
 
 
 def check_crossing(lon1: float, lon2: float, validate: bool = False, dlon_threshold: float = 180.0):
@@ -319,3 +353,49 @@ def clean_bbox(bbox, target_crs):
 
     bbox = transform_bbox(bbox, target_crs=target_crs)
     return bbox
+
+
+@lru_cache(maxsize=16)
+def _get_geographic_transformer(target_srid):
+    return Transformer.from_crs(CRS.from_epsg(4326), CRS.from_epsg(target_srid), always_xy=True)
+
+
+def clean_bboxes(bboxes: List, target_crs: str) -> List:
+    """
+    Vectorized clean_bbox: the BBOXes in EPSG:4326, e.g. the ll_bbox of the resources, are transformed
+    with a single call projecting the corners of all of them; the others are cleaned one by one.
+    """
+    match = re.match(r"^(EPSG:)?(?P<srid>\d{4,6})$", str(target_crs))
+    target_srid = int(match.group("srid")) if match else 4326
+    cleaned = [None] * len(bboxes)
+    indexes, boxes = [], []
+    for index, bbox in enumerate(bboxes):
+        if str(bbox[-1]).upper() == "EPSG:4326":
+            indexes.append(index)
+            boxes.append([float(coord) for coord in bbox[:4]])
+        else:
+            cleaned[index] = clean_bbox(bbox, target_crs)
+    if not boxes:
+        return cleaned
+
+    if target_crs == "EPSG:3857":
+        # same as crop_to_3857_area_of_use
+        bounds = epsg_3857_area_of_use()[:-1]
+        boxes = [[bound if abs(coord) > abs(bound) else coord for coord, bound in zip(box, bounds)] for box in boxes]
+    if target_srid == 4326:
+        for index, box in zip(indexes, boxes):
+            cleaned[index] = box + [target_crs]
+        return cleaned
+
+    # same as bbox_to_projection: the envelope of the projected corners
+    xs, ys = [], []
+    for x0, x1, y0, y1 in boxes:
+        x0, x1 = _v(x0, x=True, target_srid=target_srid), _v(x1, x=True, target_srid=target_srid)
+        y0, y1 = _v(y0, x=False, target_srid=target_srid), _v(y1, x=False, target_srid=target_srid)
+        xs.extend((x0, x0, x1, x1))
+        ys.extend((y0, y1, y1, y0))
+    xs, ys = _get_geographic_transformer(target_srid).transform(xs, ys)
+    for position, index in enumerate(indexes):
+        corners_x, corners_y = xs[position * 4 : position * 4 + 4], ys[position * 4 : position * 4 + 4]
+        cleaned[index] = [min(corners_x), max(corners_x), min(corners_y), max(corners_y), target_crs]
+    return cleaned
@@ -0,0 +1,320 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Resource counters.
+
+The resources visible to a user are counted per type with a single grouped query. The results are
+cached per visibility class: anonymous users and administrators share the same counts, the other
+users have their own. Any change to a resource invalidates all of them at once, by replacing the
+generation included in the cache keys.
+
+As the queries they replace, the counts of the v2 API and of the groups include the resources the user
+can view or change, while the facets of the legacy API and the home page counters, counted with
+view_only, include only the ones the user can view.
+
+The number of resources of each owner is stored instead in the OwnerResourceCount table, per resource
+type for the two classes of viewers sharing the same visibility: the owner and the administrators see
+all of them, anonymous users only the public ones. The counters are refreshed, with a debounce, when
+a resource is saved or deleted and when its permissions change, and reconciled periodically with the
+resources. The counts for other users depend on their own permissions and are computed with a single
+grouped query.
+"""
+import hashlib
+from functools import lru_cache
+from uuid import uuid4
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, signals
+from guardian.shortcuts import get_objects_for_user
+
+from geonode.base.models import OwnerResourceCount, ResourceBase
+from geonode.security.utils import get_resources_with_perms, get_visible_resources
+
+COUNTS_PENDING_PREFIX = "owner_resource_counts_pending"
+COUNTS_CACHE_PREFIX = "resource_counts"
+COUNTS_GENERATION_KEY = "resource_counts_generation"
+
+RESOURCE_TYPES = ["dataset", "document", "map", "geoapp"]
+
+
+@lru_cache(maxsize=None)
+def get_geonode_app_models():
+    """
+    Returns the default models of the GeoNode apps, e.g. GeoApp.
+    The app registry does not change once loaded, they are only looked up the first time.
+    """
+    return tuple(
+        apps.get_model(label, app.default_model)
+        for label, app in apps.app_configs.items()
+        if getattr(app, "type", None) == "GEONODE_APP" and hasattr(app, "default_model")
+    )
+
+
+def get_subtype_models(model):
+    """Returns the lowercase names of the GeoNode apps models inheriting from the model"""
+    return [_model.__name__.lower() for _model in get_geonode_app_models() if issubclass(_model, model)]
+
+
+def get_visibility_class(user):
+    """Returns the name of the class of users sharing the visibility of the resources with the user"""
+    if not user or not user.is_authenticated:
+        return OwnerResourceCount.VISIBILITY_PUBLIC
+    if user.is_superuser:
+        return OwnerResourceCount.VISIBILITY_ALL
+    return f"user_{user.pk}"
+
+
+def get_counts_generation():
+    generation = cache.get(COUNTS_GENERATION_KEY)
+    if generation is None:
+        cache.add(COUNTS_GENERATION_KEY, uuid4().hex, None)
+        generation = cache.get(COUNTS_GENERATION_KEY)
+    return generation
+
+
+def invalidate_resource_counts():
+    """Discards all the cached counts"""
+    cache.set(COUNTS_GENERATION_KEY, uuid4().hex, None)
+
+
+def get_cached_counts(user, name, params, compute):
+    """Returns the counts cached for the visibility class of the user, calling compute() when missing"""
+    params = sorted((key, getattr(value, "pk", value)) for key, value in params.items())
+    digest = hashlib.md5(repr(params).encode("utf-8")).hexdigest()
+    key = f"{COUNTS_CACHE_PREFIX}:{get_counts_generation()}:{get_visibility_class(user)}:{name}:{digest}"
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute()
+        cache.set(key, counts, settings.RESOURCE_COUNTS_CACHE_TIMEOUT)
+    return counts
+
+
+def get_counted_resources_for_user(user, view_only=False):
+    """Returns the resources the user can view or change, only the ones they can view when view_only"""
+    if not view_only or settings.SKIP_PERMS_FILTER:
+        return get_resources_with_perms(user)
+    return get_visible_resources(
+        get_objects_for_user(user, "base.view_resourcebase"),
+        user,
+        admin_approval_required=settings.ADMIN_MODERATE_UPLOADS,
+        unpublished_not_visible=settings.RESOURCE_PUBLISHING,
+        private_groups_not_visibile=settings.GROUP_PRIVATE_RESOURCES,
+    )
+
+
+def get_grouped_counts(user, view_only=False, **filters):
+    """
+    Returns the number of resources visible to the user matching the filters, grouped by
+    model, resource type, subtype, time dimension, approval and publishing state
+    """
+
+    def compute():
+        resources = get_counted_resources_for_user(user, view_only).filter(**filters)
+        return list(
+            resources.order_by()
+            .values(
+                "polymorphic_ctype__model",
+                "resource_type",
+                "subtype",
+                "dataset__has_time",
+                "is_approved",
+                "is_published",
+            )
+            .annotate(count=Count("id"))
+        )
+
+    return get_cached_counts(user, "grouped", {**filters, "view_only": view_only}, compute)
+
+
+def summarize_counts(rows):
+    """
+    Returns the total, visible, published and approved counts of the grouped rows for each resource type
+    and for all of them; the GeoNode apps models are counted as geoapps
+    """
+    subtypes = [_model.__name__.lower() for _model in get_geonode_app_models()]
+    counts = {
+        type_: {"total": 0, "visible": 0, "published": 0, "approved": 0}
+        for type_ in RESOURCE_TYPES + ["all"] + subtypes
+    }
+    for row in rows:
+        resource_type = row["polymorphic_ctype__model"]
+        if resource_type in subtypes:
+            resource_type = "geoapp"
+        is_visible = row["is_approved"] and row["is_published"]
+        for section in (counts["all"], counts.get(resource_type)):
+            if section is not None:
+                section["total"] += row["count"]
+                section["visible"] += row["count"] if is_visible else 0
+                section["published"] += row["count"] if row["is_published"] else 0
+                section["approved"] += row["count"] if row["is_approved"] else 0
+    return counts
+
+
+def count_by(rows, field):
+    """Returns the total of the grouped rows for each value of the field"""
+    counts = {}
+    for row in rows:
+        counts[row[field]] = counts.get(row[field], 0) + row["count"]
+    return counts
+
+
+def get_resource_counts(user, **filters):
+    """Returns the counts of the resources visible to the user per type, see summarize_counts"""
+    return summarize_counts(get_grouped_counts(user, **filters))
+
+
+def get_facet_counts(user, count_type, title_filter=None, type_filter=None):
+    """
+    Returns the number of resources visible to the user for each value of count_type,
+    e.g. the keywords or the regions, optionally filtered by title and resource model
+    """
+
+    def compute():
+        resources = get_counted_resources_for_user(user, view_only=True)
+        if title_filter:
+            resources = resources.filter(title__icontains=title_filter)
+        if type_filter:
+            models = get_subtype_models(type_filter) or [type_filter.__name__.lower()]
+            resources = resources.filter(polymorphic_ctype__model__in=models)
+        counts = resources.order_by().values(count_type).annotate(count=Count(count_type))
+        return {row[count_type]: row["count"] for row in counts if row[count_type] is not None and row["count"]}
+
+    params = {
+        "count_type": count_type,
+        "title_filter": title_filter,
+        "type_filter": type_filter.__name__.lower() if type_filter else None,
+    }
+    return get_cached_counts(user, "facets", params, compute)
+
+
+def get_counted_resources(visibility):
+    """Returns the resources counted for a visibility class"""
+    if visibility == OwnerResourceCount.VISIBILITY_PUBLIC:
+        return get_resources_with_perms(AnonymousUser())
+    # the same resources get_resources_with_perms returns to an administrator
+    return ResourceBase.objects.filter(metadata_only=False, dirty_state=False)
+
+
+def compute_owner_counts(queryset, owner_ids=None):
+    """Returns the number of resources of the queryset as {owner_id: {resource_type: count}}"""
+    queryset = queryset.filter(owner__isnull=False)
+    if owner_ids is not None:
+        queryset = queryset.filter(owner_id__in=owner_ids)
+    counts = {}
+    rows = queryset.order_by().values("owner_id", "resource_type").annotate(count=Count("id", distinct=True))
+    for row in rows:
+        counts.setdefault(row["owner_id"], {})[row["resource_type"]] = row["count"]
+    return counts
+
+
+def refresh_owner_counts(owner_ids=None):
+    """Computes again the counters of the owners, of all of them when owner_ids is None"""
+    counters = []
+    for visibility, _ in OwnerResourceCount.VISIBILITY_CHOICES:
+        for owner_id, counts in compute_owner_counts(get_counted_resources(visibility), owner_ids).items():
+            counters.extend(
+                OwnerResourceCount(owner_id=owner_id, resource_type=resource_type, visibility=visibility, count=count)
+                for resource_type, count in counts.items()
+            )
+    with transaction.atomic():
+        stale = OwnerResourceCount.objects.all()
+        if owner_ids is not None:
+            stale = stale.filter(owner_id__in=owner_ids)
+        stale.delete()
+        OwnerResourceCount.objects.bulk_create(counters, batch_size=1000)
+
+
+def read_owner_counts(owner_ids, visibility):
+    """
+    Returns the stored counters of the owners as {owner_id: {resource_type: count}}.
+    The owners without counters, e.g. right after the upgrade creating them, are counted on the fly
+    and their counters are refreshed.
+    """
+    counts = {}
+    rows = OwnerResourceCount.objects.filter(owner_id__in=owner_ids, visibility=visibility).values_list(
+        "owner_id", "resource_type", "count"
+    )
+    for owner_id, resource_type, count in rows:
+        counts.setdefault(owner_id, {})[resource_type] = count
+    missing = set(owner_ids) - set(counts)
+    if missing:
+        computed = compute_owner_counts(get_counted_resources(visibility), missing)
+        counts.update(computed)
+        # the owners without resources have no counters to store
+        update_owner_counts(computed)
+    return counts
+
+
+def get_owner_counts(user, owner_ids):
+    """
+    Returns the number of resources of the owners visible to the user, as {owner_id: {resource_type: count}}.
+    The stored counters are used for anonymous users, administrators and the owners themselves.
+    """
+    owner_ids = {owner_id for owner_id in owner_ids if owner_id is not None}
+    if not owner_ids:
+        return {}
+    if not user or not user.is_authenticated:
+        return read_owner_counts(owner_ids, OwnerResourceCount.VISIBILITY_PUBLIC)
+    if user.is_superuser:
+        return read_owner_counts(owner_ids, OwnerResourceCount.VISIBILITY_ALL)
+
+    counts = {}
+    if user.pk in owner_ids:
+        counts.update(read_owner_counts([user.pk], OwnerResourceCount.VISIBILITY_ALL))
+        owner_ids.discard(user.pk)
+    if owner_ids:
+        counts.update(compute_owner_counts(get_resources_with_perms(user), owner_ids))
+    return counts
+
+
+def update_owner_counts(owner_ids):
+    """Schedules the refresh of the counters of the owners, once per debounce period"""
+    from geonode.tasks.tasks import update_owner_resource_counts
+
+    for owner_id in {owner_id for owner_id in owner_ids if owner_id is not None}:
+        if cache.add(f"{COUNTS_PENDING_PREFIX}:{owner_id}", True, settings.RESOURCE_COUNTS_UPDATE_DEBOUNCE):
+            transaction.on_commit(
+                lambda owner_id=owner_id: update_owner_resource_counts.apply_async(
+                    args=([owner_id],), countdown=settings.RESOURCE_COUNTS_UPDATE_DEBOUNCE
+                )
+            )
+
+
+def release_owner_counts_update(owner_ids):
+    cache.delete_many([f"{COUNTS_PENDING_PREFIX}:{owner_id}" for owner_id in owner_ids])
+
+
+def resource_counts_changed(instance, sender, **kwargs):
+    invalidate_resource_counts()
+    update_owner_counts([instance.owner_id])
+
+
+def connect_resource_counts_signals():
+    for model in apps.get_models():
+        if issubclass(model, ResourceBase):
+            signals.post_save.connect(
+                resource_counts_changed, sender=model, dispatch_uid=f"resource_counts_{model.__name__}"
+            )
+            signals.post_delete.connect(
+                resource_counts_changed, sender=model, dispatch_uid=f"resource_counts_delete_{model.__name__}"
+            )
@@ -0,0 +1,34 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+from django.core.management.base import BaseCommand, CommandError
+
+from geonode.base.search import is_search_index_enabled, update_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full text search vectors of the resources"
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource_ids", nargs="*", type=int, help="Resources to update, all when not given")
+
+    def handle(self, *args, **options):
+        if not is_search_index_enabled():
+            raise CommandError("The full text search index requires PostgreSQL and RESOURCE_SEARCH_INDEX_ENABLED")
+        update_search_vectors(options["resource_ids"] or None)
+        self.stdout.write("Search index updated")
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-19 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("base", "0093_alter_thesaurus_slug"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OwnerResourceCount",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("resource_type", models.CharField(max_length=1024)),
+                (
+                    "visibility",
+                    models.CharField(
+                        choices=[
+                            ("all", "Visible to the owner and the administrators"),
+                            ("public", "Visible to anonymous users"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="resource_counts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="ownerresourcecount",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "resource_type", "visibility"), name="unique_owner_resource_count"
+            ),
+        ),
+    ]
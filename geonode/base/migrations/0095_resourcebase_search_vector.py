@@ -0,0 +1,106 @@
+import logging
+
+from django.db import migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+# the search vectors as built by geonode.base.search when the column was added
+LANGUAGE_CONFIGS = {
+    "dan": "danish",
+    "ger": "german",
+    "deu": "german",
+    "eng": "english",
+    "spa": "spanish",
+    "fin": "finnish",
+    "fre": "french",
+    "fra": "french",
+    "hun": "hungarian",
+    "ita": "italian",
+    "dut": "dutch",
+    "nld": "dutch",
+    "nor": "norwegian",
+    "por": "portuguese",
+    "rum": "romanian",
+    "ron": "romanian",
+    "rus": "russian",
+    "swe": "swedish",
+    "tur": "turkish",
+}
+CONFIG = (
+    "(CASE r.language "
+    + " ".join(f"WHEN '{code}' THEN '{config}'" for code, config in LANGUAGE_CONFIGS.items())
+    + " ELSE 'simple' END)::regconfig"
+)
+
+
+def weighted(text, weight):
+    text = f"coalesce({text}, '')"
+    return f"setweight(to_tsvector('simple', {text}) || to_tsvector({CONFIG}, {text}), '{weight}')"
+
+
+KEYWORDS_TEXT = (
+    "(SELECT string_agg(k.name, ' ') FROM base_taggedcontentitem t "
+    "JOIN base_hierarchicalkeyword k ON k.id = t.tag_id WHERE t.content_object_id = r.id)"
+)
+TKEYWORDS_TEXT = (
+    "(SELECT string_agg(concat_ws(' ', tk.alt_label, l.labels), ' ') FROM base_resourcebase_tkeywords t "
+    "JOIN base_thesauruskeyword tk ON tk.id = t.thesauruskeyword_id "
+    "LEFT JOIN LATERAL (SELECT string_agg(label, ' ') AS labels FROM base_thesauruskeywordlabel "
+    "WHERE keyword_id = tk.id) l ON true "
+    "WHERE t.resourcebase_id = r.id)"
+)
+REGIONS_TEXT = (
+    "(SELECT string_agg(g.name, ' ') FROM base_resourcebase_regions t "
+    "JOIN base_region g ON g.id = t.region_id WHERE t.resourcebase_id = r.id)"
+)
+UPDATE_SQL = "UPDATE base_resourcebase r SET search_vector = " + " || ".join(
+    [
+        weighted("r.title", "A"),
+        weighted("r.abstract", "B"),
+        weighted(KEYWORDS_TEXT, "B"),
+        weighted(TKEYWORDS_TEXT, "B"),
+        weighted(REGIONS_TEXT, "C"),
+        weighted("r.csw_anytext", "D"),
+    ]
+)
+
+
+def add_search_vector(apps, schema_editor):
+    "Adds the full text search vector of the resources and its GIN index, on PostgreSQL only"
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("ALTER TABLE base_resourcebase ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS base_resourcebase_search_vector_idx ON base_resourcebase USING GIN (search_vector)"
+    )
+    try:
+        # the trigram index is used by the misspelled titles search, when the extension can be installed
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            schema_editor.execute(
+                "CREATE INDEX IF NOT EXISTS base_resourcebase_title_trgm_idx "
+                "ON base_resourcebase USING GIN (title gin_trgm_ops)"
+            )
+    except Exception as e:
+        logger.warning(f"Could not create the trigram index of the resource titles: {e}")
+
+    # populated whatever RESOURCE_SEARCH_INDEX_ENABLED, so the index is ready when it is turned on
+    schema_editor.execute(UPDATE_SQL)
+
+
+def remove_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS base_resourcebase_title_trgm_idx")
+    schema_editor.execute("ALTER TABLE base_resourcebase DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0094_ownerresourcecount"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
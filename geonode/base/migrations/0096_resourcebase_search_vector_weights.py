@@ -0,0 +1,80 @@
+from django.db import migrations
+
+# the search vectors as built by geonode.base.search when the weights were given to the single fields
+LANGUAGE_CONFIGS = {
+    "dan": "danish",
+    "ger": "german",
+    "deu": "german",
+    "eng": "english",
+    "spa": "spanish",
+    "fin": "finnish",
+    "fre": "french",
+    "fra": "french",
+    "hun": "hungarian",
+    "ita": "italian",
+    "dut": "dutch",
+    "nld": "dutch",
+    "nor": "norwegian",
+    "por": "portuguese",
+    "rum": "romanian",
+    "ron": "romanian",
+    "rus": "russian",
+    "swe": "swedish",
+    "tur": "turkish",
+}
+CONFIG = (
+    "(CASE r.language "
+    + " ".join(f"WHEN '{code}' THEN '{config}'" for code, config in LANGUAGE_CONFIGS.items())
+    + " ELSE 'simple' END)::regconfig"
+)
+
+
+def weighted(text, weight):
+    text = f"coalesce({text}, '')"
+    return f"setweight(to_tsvector('simple', {text}) || to_tsvector({CONFIG}, {text}), '{weight}')"
+
+
+KEYWORDS_TEXT = (
+    "(SELECT string_agg(k.name, ' ') FROM base_taggedcontentitem t "
+    "JOIN base_hierarchicalkeyword k ON k.id = t.tag_id WHERE t.content_object_id = r.id)"
+)
+TKEYWORDS_TEXT = (
+    "(SELECT string_agg(concat_ws(' ', tk.alt_label, l.labels), ' ') FROM base_resourcebase_tkeywords t "
+    "JOIN base_thesauruskeyword tk ON tk.id = t.thesauruskeyword_id "
+    "LEFT JOIN LATERAL (SELECT string_agg(label, ' ') AS labels FROM base_thesauruskeywordlabel "
+    "WHERE keyword_id = tk.id) l ON true "
+    "WHERE t.resourcebase_id = r.id)"
+)
+REGIONS_TEXT = (
+    "(SELECT string_agg(g.name, ' ') FROM base_resourcebase_regions t "
+    "JOIN base_region g ON g.id = t.region_id WHERE t.resourcebase_id = r.id)"
+)
+UPDATE_SQL = "UPDATE base_resourcebase r SET search_vector = " + " || ".join(
+    [
+        weighted("r.title", "A"),
+        weighted("r.abstract", "B"),
+        weighted(KEYWORDS_TEXT, "C"),
+        weighted(TKEYWORDS_TEXT, "C"),
+        weighted(REGIONS_TEXT, "D"),
+        weighted("r.csw_anytext", "D"),
+    ]
+)
+
+
+def update_search_vector(apps, schema_editor):
+    "Rebuilds the search vectors, the abstract and the keywords being stored with different weights"
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(UPDATE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0095_resourcebase_search_vector"),
+    ]
+
+    operations = [
+        # the previous weights only change the ranking, the vectors are left as they are
+        migrations.RunPython(update_search_vector, migrations.RunPython.noop),
+    ]
@@ -1349,7 +1349,11 @@ class ResourceBase(PolymorphicModel, PermissionLevelMixin, ItemBase):
             self.srid = srid
             # This is a trick in order to avoid PostGIS reprojecting the bbox at save time
             # by assuming the default geometries have 'EPSG:4326' as srid.
-            ResourceBase.objects.filter(id=self.id).update(bbox_polygon=self.bbox_polygon, srid=srid)
+            # last_updated is not set by update(), it's the version of the resource in the API validators
+            self.last_updated = now()
+            ResourceBase.objects.filter(id=self.id).update(
+                bbox_polygon=self.bbox_polygon, srid=srid, last_updated=self.last_updated
+            )
         finally:
             self.set_ll_bbox_polygon(bbox, srid=srid)
 
@@ -1376,7 +1380,10 @@ class ResourceBase(PolymorphicModel, PermissionLevelMixin, ItemBase):
                 projected_bbox = bbox_swap(projected_bbox_gn_order[:-1])
 
                 self.ll_bbox_polygon = Polygon.from_bbox(projected_bbox)
-            ResourceBase.objects.filter(id=self.id).update(ll_bbox_polygon=self.ll_bbox_polygon)
+            self.last_updated = now()
+            ResourceBase.objects.filter(id=self.id).update(
+                ll_bbox_polygon=self.ll_bbox_polygon, last_updated=self.last_updated
+            )
         except Exception as e:
             raise GeoNodeException(e)
 
@@ -1597,9 +1604,12 @@ class ResourceBase(PolymorphicModel, PermissionLevelMixin, ItemBase):
                 # Store the new url and path
                 self.thumbnail_url = url
                 self.thumbnail_path = upload_path
+                self.last_updated = now()
                 obj.url = url
                 obj.save()
-                ResourceBase.objects.filter(id=self.id).update(thumbnail_url=url, thumbnail_path=upload_path)
+                ResourceBase.objects.filter(id=self.id).update(
+                    thumbnail_url=url, thumbnail_path=upload_path, last_updated=self.last_updated
+                )
         except Exception as e:
             logger.error(f"Error when generating the thumbnail for resource {self.id}. ({e})")
             try:
@@ -1931,6 +1941,63 @@ class LinkManager(models.Manager):
     def ows(self):
         return self.get_queryset().filter(link_type__in=["OGC:WMS", "OGC:WFS", "OGC:WCS"])
 
+    def sync(self, resource, links, prune_types=()):
+        """
+        Aligns the links of the resource with the desired ones, reading them with a single query
+        and writing the differences in bulk.
+        Each desired link is a dict with the "match" fields identifying the existing link, the "defaults"
+        fields set when creating it and, unless "update" is False, when updating it. The duplicates of the
+        matched links and, with prune_types, the other links of those types are deleted. The hosts of the
+        written links are registered in the proxy registry, as the post_save signal of the links would do.
+        Returns the number of created, updated and deleted links.
+        """
+        existing = list(self.get_queryset().filter(resource=resource).order_by("id"))
+        indexes, matched = {}, {}
+        claimed = set()
+        to_create, to_update, to_delete = {}, {}, set()
+        for link in links:
+            fields = tuple(sorted(link["match"]))
+            if fields not in indexes:
+                indexes[fields] = {}
+                for _link in existing:
+                    indexes[fields].setdefault(tuple(str(getattr(_link, f)) for f in fields), []).append(_link)
+            key = (fields, tuple(str(link["match"][f]) for f in fields))
+            if key in matched:
+                current = matched[key]
+            else:
+                candidates = [_link for _link in indexes[fields].get(key[1], []) if _link.id not in claimed]
+                if not candidates:
+                    matched[key] = to_create[key] = self.model(resource=resource, **link["match"], **link["defaults"])
+                    continue
+                matched[key] = current = candidates[0]
+                claimed.update(_link.id for _link in candidates)
+                to_delete.update(_link.id for _link in candidates[1:])
+            if link.get("update", True):
+                changed = [f for f, value in link["defaults"].items() if getattr(current, f) != value]
+                for f in changed:
+                    setattr(current, f, link["defaults"][f])
+                if changed and current.id:
+                    to_update[current.id] = current
+        if prune_types:
+            to_delete.update(
+                _link.id for _link in existing if _link.link_type in prune_types and _link.id not in claimed
+            )
+        if to_delete:
+            self.get_queryset().filter(id__in=to_delete).delete()
+        if to_update:
+            self.bulk_update(list(to_update.values()), ["extension", "link_type", "name", "mime", "url"])
+        if to_create:
+            self.bulk_create(to_create.values())
+        if to_update or to_create:
+            from geonode.proxy.utils import register_links_hosts
+
+            register_links_hosts(resource, [*to_update.values(), *to_create.values()])
+        if to_delete or to_update or to_create:
+            # the links are part of the serialized resource, whose version is last_updated
+            resource.last_updated = now()
+            ResourceBase.objects.filter(id=resource.id).update(last_updated=resource.last_updated)
+        return len(to_create), len(to_update), len(to_delete)
+
 
 class LinkedResource(models.Model):
     source = models.ForeignKey(
@@ -2102,3 +2169,27 @@ class GroupGeoLimit(models.Model):
 class ExtraMetadata(models.Model):
     resource = models.ForeignKey(ResourceBase, null=False, blank=False, on_delete=models.CASCADE)
     metadata = JSONField(null=True, default=dict, blank=True)
+
+
+class OwnerResourceCount(models.Model):
+    """
+    Number of resources of an owner, per resource type, visible to a class of users.
+    The rows are maintained by geonode.base.counts, they must not be edited directly.
+    """
+
+    VISIBILITY_ALL = "all"
+    VISIBILITY_PUBLIC = "public"
+    VISIBILITY_CHOICES = (
+        (VISIBILITY_ALL, _("Visible to the owner and the administrators")),
+        (VISIBILITY_PUBLIC, _("Visible to anonymous users")),
+    )
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="resource_counts", on_delete=models.CASCADE)
+    resource_type = models.CharField(max_length=1024)
+    visibility = models.CharField(max_length=16, choices=VISIBILITY_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "resource_type", "visibility"], name="unique_owner_resource_count")
+        ]
@@ -0,0 +1,180 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Cache of the rendered catalogue API responses to the anonymous users.
+
+All the anonymous users see the same resources, so the responses to the same request are rendered once
+and shared through the Django cache. The keys include the normalized query parameters, the negotiated
+representation, the language and a generation for each type of resources the response depends on: saving or deleting a resource, or
+changing its permissions, replaces the generation of its type and so discards the responses including it.
+While a response is rendered the other requests for it wait for the result instead of rendering it too.
+"""
+import time
+import hashlib
+import logging
+from uuid import uuid4
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import signals
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.utils.translation import get_language
+
+from geonode.base.models import ResourceBase
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_PREFIX = "api_response"
+RESPONSE_GENERATION_PREFIX = "api_response_generation"
+
+RESOURCE_TYPES = ["dataset", "document", "map", "geoapp"]
+
+# headers stored with the cached responses
+CACHED_HEADERS = ("ETag", "Last-Modified", "Content-Language", "Vary")
+
+
+def get_type_generation(resource_type):
+    key = f"{RESPONSE_GENERATION_PREFIX}:{resource_type}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_cached_responses(resource_type=None):
+    """Discards the cached responses including the resources of the type, of any type when None"""
+    resource_types = RESOURCE_TYPES if resource_type is None or resource_type not in RESOURCE_TYPES else [resource_type]
+    cache.set_many({f"{RESPONSE_GENERATION_PREFIX}:{_type}": uuid4().hex for _type in resource_types}, None)
+
+
+def is_cacheable_request(request):
+    user = getattr(request, "user", None)
+    return (
+        settings.RESPONSE_CACHE_ENABLED
+        and request.method == "GET"
+        and (user is None or not user.is_authenticated)
+        and not request.headers.get("Authorization")
+    )
+
+
+def get_representation(request):
+    """
+    Returns the representation negotiated for the request: the format of the renderer accepted by DRF,
+    the normalized Accept header otherwise (e.g. tastypie also negotiates the format through it)
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    if renderer is not None:
+        return renderer.format
+    return ",".join(sorted("".join(part.split()).lower() for part in request.headers.get("Accept", "").split(",")))
+
+
+def get_response_cache_key(request, name, resource_types=None):
+    """Returns the key of the response to the request, the same for the equivalent requests"""
+    # the order of the values of a parameter can matter, e.g. for the sort
+    params = sorted((key, request.GET.getlist(key)) for key in request.GET.keys())
+    generations = [get_type_generation(_type) for _type in resource_types or RESOURCE_TYPES]
+    digest = hashlib.md5(
+        repr(
+            [
+                request.get_host(),
+                request.is_secure(),
+                request.path,
+                params,
+                get_representation(request),
+                get_language(),
+                generations,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"{RESPONSE_CACHE_PREFIX}:{name}:{digest}"
+
+
+def _store_response(key, response):
+    entry = {
+        "content": response.content,
+        "content_type": response["Content-Type"],
+        "headers": {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+    }
+    cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+    return entry
+
+
+def _build_response(request, entry):
+    etag = entry["headers"].get("ETag")
+    if_none_match = request.headers.get("If-None-Match")
+    if etag and if_none_match and etag in parse_etags(if_none_match):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    for header, value in entry["headers"].items():
+        response[header] = value
+    return response
+
+
+def cached_response(request, name, render, resource_types=None):
+    """
+    Returns the response to the anonymous request from the cache, rendering it with render() when missing.
+    render() returns a rendered HttpResponse, only the 200 OK ones are cached.
+    """
+    if not is_cacheable_request(request):
+        return render()
+    key = get_response_cache_key(request, name, resource_types)
+    entry = cache.get(key)
+    if entry is not None:
+        return _build_response(request, entry)
+
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, True, settings.RESPONSE_CACHE_LOCK_WAIT)
+    if not locked:
+        # another request is rendering the same response
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return _build_response(request, entry)
+    try:
+        response = render()
+        if response.status_code == 200 and not response.streaming:
+            # the representation is negotiated, the shared caches downstream must not mix them either
+            patch_vary_headers(response, ("Accept",))
+            _store_response(key, response)
+        return response
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def resource_changed(instance, **kwargs):
+    invalidate_cached_responses(instance.resource_type)
+
+
+def connect_response_cache_signals():
+    for model in apps.get_models():
+        if issubclass(model, ResourceBase):
+            signals.post_save.connect(
+                resource_changed, sender=model, dispatch_uid=f"api_response_cache_{model.__name__}"
+            )
+            signals.post_delete.connect(
+                resource_changed, sender=model, dispatch_uid=f"api_response_cache_delete_{model.__name__}"
+            )
@@ -0,0 +1,251 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Full text search of the resources on PostgreSQL.
+
+The search_vector column of the resources, added by the migrations on PostgreSQL only and indexed
+with GIN, holds the words of the title, abstract, keywords, thesaurus labels, regions and CSW anytext,
+weighted in this order: the search can be restricted to the fields with the weights of the query terms.
+The words are stored both as they are and stemmed with the text search configuration of the language
+of the resource, so they can be searched from the request language too.
+The vector of a resource is refreshed with a single UPDATE when the resource or its keywords and
+regions change; the update_search_index command rebuilds all of them, e.g. after a thesaurus is loaded.
+"""
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import signals
+from django.db.models.expressions import RawSQL
+from django.utils.translation import get_language
+
+from geonode.base.models import ResourceBase, TaggedContentItem, ThesaurusKeywordLabel
+
+# text search configurations available in PostgreSQL by ISO 639-1 language
+TEXT_SEARCH_CONFIGS = {
+    "da": "danish",
+    "de": "german",
+    "en": "english",
+    "es": "spanish",
+    "fi": "finnish",
+    "fr": "french",
+    "hu": "hungarian",
+    "it": "italian",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sv": "swedish",
+    "tr": "turkish",
+}
+
+# ISO 639-2 codes of the resource languages having a text search configuration
+RESOURCE_LANGUAGES = {
+    "dan": "da",
+    "ger": "de",
+    "deu": "de",
+    "eng": "en",
+    "spa": "es",
+    "fin": "fi",
+    "fre": "fr",
+    "fra": "fr",
+    "hun": "hu",
+    "ita": "it",
+    "dut": "nl",
+    "nld": "nl",
+    "nor": "no",
+    "por": "pt",
+    "rum": "ro",
+    "ron": "ro",
+    "rus": "ru",
+    "swe": "sv",
+    "tur": "tr",
+}
+
+# weights of the search_fields of the SearchFilter in the index
+SEARCH_INDEX_WEIGHTS = {
+    "title": "A",
+    "abstract": "B",
+    "keywords__name": "C",
+    "tkeywords__alt_label": "C",
+    "tkeywords__keyword__label": "C",
+    "regions__name": "D",
+    "csw_anytext": "D",
+}
+
+# search_fields of the SearchFilter covered by the index
+SEARCH_INDEX_FIELDS = set(SEARCH_INDEX_WEIGHTS)
+
+SEARCH_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_search_index_enabled(using=None):
+    using = using or router.db_for_read(ResourceBase)
+    return settings.RESOURCE_SEARCH_INDEX_ENABLED and connections[using].vendor == "postgresql"
+
+
+def get_text_search_config(language=None):
+    """Returns the text search configuration of the ISO 639-1 language, of the active one when None"""
+    language = (language or get_language() or settings.LANGUAGE_CODE).split("-")[0].lower()
+    return TEXT_SEARCH_CONFIGS.get(language, "simple")
+
+
+def get_update_sql():
+    """Returns the SQL refreshing the search vectors of the resources in the %(ids)s list, of all of them when NULL"""
+    resources = ResourceBase._meta.db_table
+    keywords = ResourceBase.keywords.through._meta
+    tkeywords = ResourceBase.tkeywords.through._meta
+    regions = ResourceBase.regions.through._meta
+    config = " ".join(
+        f"WHEN '{code}' THEN '{TEXT_SEARCH_CONFIGS[language]}'" for code, language in RESOURCE_LANGUAGES.items()
+    )
+    config = f"(CASE r.language {config} ELSE 'simple' END)::regconfig"
+
+    def weighted(text, weight):
+        text = f"coalesce({text}, '')"
+        return f"setweight(to_tsvector('simple', {text}) || to_tsvector({config}, {text}), '{weight}')"
+
+    keywords_text = (
+        f"(SELECT string_agg(k.name, ' ') FROM {keywords.db_table} t "
+        f"JOIN {TaggedContentItem.tag_model()._meta.db_table} k ON k.id = t.tag_id WHERE t.content_object_id = r.id)"
+    )
+    tkeywords_text = (
+        f"(SELECT string_agg(concat_ws(' ', tk.alt_label, l.labels), ' ') FROM {tkeywords.db_table} t "
+        f"JOIN {tkeywords.get_field('thesauruskeyword').related_model._meta.db_table} tk "
+        "ON tk.id = t.thesauruskeyword_id "
+        f"LEFT JOIN LATERAL (SELECT string_agg(label, ' ') AS labels FROM {ThesaurusKeywordLabel._meta.db_table} "
+        "WHERE keyword_id = tk.id) l ON true "
+        "WHERE t.resourcebase_id = r.id)"
+    )
+    regions_text = (
+        f"(SELECT string_agg(g.name, ' ') FROM {regions.db_table} t "
+        f"JOIN {regions.get_field('region').related_model._meta.db_table} g ON g.id = t.region_id "
+        "WHERE t.resourcebase_id = r.id)"
+    )
+    vector = " || ".join(
+        [
+            weighted("r.title", "A"),
+            weighted("r.abstract", "B"),
+            weighted(keywords_text, "C"),
+            weighted(tkeywords_text, "C"),
+            weighted(regions_text, "D"),
+            weighted("r.csw_anytext", "D"),
+        ]
+    )
+    return (
+        f"UPDATE {resources} r SET search_vector = {vector} "
+        "WHERE %(ids)s::integer[] IS NULL OR r.id = ANY(%(ids)s::integer[])"
+    )
+
+
+def update_search_vectors(resource_ids=None, using=None):
+    """Refreshes the search vectors of the resources, of all of them when resource_ids is None"""
+    using = using or router.db_for_write(ResourceBase)
+    if not is_search_index_enabled(using):
+        return
+    ids = None if resource_ids is None else sorted({int(_id) for _id in resource_ids})
+    if ids == []:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(get_update_sql(), {"ids": ids})
+
+
+def parse_search_terms(search):
+    """Returns the words of the search text, the last one being a prefix when the user is still typing it"""
+    return [term.lower() for term in SEARCH_TERM_RE.findall(search or "")]
+
+
+def get_search_weights(search_fields):
+    """
+    Returns the weights of the index the search_fields are stored with, an empty string for all of them.
+    Returns None when the fields are not covered by the index: the fields sharing a weight are only searched together.
+    """
+    fields = set(search_fields)
+    if not fields or not fields <= SEARCH_INDEX_FIELDS:
+        return None
+    weights = {SEARCH_INDEX_WEIGHTS[field] for field in fields}
+    if fields != {field for field, weight in SEARCH_INDEX_WEIGHTS.items() if weight in weights}:
+        return None
+    return "" if weights == set(SEARCH_INDEX_WEIGHTS.values()) else "".join(sorted(weights))
+
+
+def get_search_query(terms, weights=""):
+    """
+    Returns the tsquery matching all the terms, the last one as a prefix, as the text of to_tsquery.
+    The terms only match the words stored with the weights, any of them when empty.
+    """
+    return " & ".join([f"{term}:{weights}" if weights else term for term in terms[:-1]] + [f"{terms[-1]}:*{weights}"])
+
+
+def search_resources(queryset, search, order=True, weights=""):
+    """
+    Filters the resources matching all the words of the search text with the index and,
+    with order, sorts them by relevance. With weights, only the words of the fields stored
+    with them are matched, see get_search_weights.
+    """
+    terms = parse_search_terms(search)
+    if not terms:
+        return queryset
+    table = ResourceBase._meta.db_table
+    tsquery = "(to_tsquery('simple', %s) || to_tsquery(%s::regconfig, %s))"
+    query = get_search_query(terms, weights)
+    params = [query, get_text_search_config(), query]
+    condition = f"{table}.search_vector @@ {tsquery}"
+    rank = f"ts_rank_cd({table}.search_vector, {tsquery}, 32)"
+    rank_params = list(params)
+    if settings.RESOURCE_SEARCH_TRIGRAM_ENABLED and (not weights or SEARCH_INDEX_WEIGHTS["title"] in weights):
+        # the titles similar to the search text match also when misspelled
+        text = " ".join(terms)
+        condition = f"({condition} OR {table}.title %% %s)"
+        params.append(text)
+        rank = f"({rank} + similarity({table}.title, %s))"
+        rank_params.append(text)
+    queryset = queryset.extra(where=[condition], params=params)
+    if order:
+        queryset = queryset.order_by(RawSQL(rank, rank_params).desc(), "-pk")
+    return queryset
+
+
+def resource_search_changed(instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    update_search_vectors([instance.pk], using=kwargs.get("using"))
+
+
+def resource_relations_changed(instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        update_search_vectors([instance.pk], using=kwargs.get("using"))
+    elif pk_set:
+        update_search_vectors(pk_set, using=kwargs.get("using"))
+
+
+def connect_search_index_signals():
+    for model in apps.get_models():
+        if issubclass(model, ResourceBase):
+            signals.post_save.connect(
+                resource_search_changed, sender=model, dispatch_uid=f"resource_search_{model.__name__}"
+            )
+    for through in (TaggedContentItem, ResourceBase.tkeywords.through, ResourceBase.regions.through):
+        signals.m2m_changed.connect(
+            resource_relations_changed, sender=through, dispatch_uid=f"resource_search_{through.__name__}"
+        )
@@ -30,6 +30,7 @@ from guardian.shortcuts import get_objects_for_user
 from geonode.maps.models import Map
 from geonode.layers.models import Dataset
 from geonode.base.models import ResourceBase
+from geonode.base.counts import count_by, get_grouped_counts
 from geonode.documents.models import Document
 from geonode.groups.models import GroupProfile
 from geonode.base.bbox_utils import filter_bbox
@@ -62,6 +63,27 @@ def get_item(dictionary, key):
     return dictionary.get(key)
 
 
+def home_facets(user):
+    """Counters of the home page, read from the cached resource counts of the user"""
+    rows = get_grouped_counts(user, view_only=True)
+    datasets = [row for row in rows if row["polymorphic_ctype__model"] == "dataset"]
+    subtypes = count_by(datasets, "subtype")
+    types = count_by(rows, "polymorphic_ctype__model")
+    facets = {
+        "raster": subtypes.get("raster", 0),
+        "vector": subtypes.get("vector", 0),
+        "vector_time": sum(row["count"] for row in datasets if row["subtype"] == "vector" and row["dataset__has_time"]),
+        "remote": subtypes.get("remote", 0),
+        "wms": subtypes.get("wmsStore", 0),
+        "map": types.get("map", 0),
+        "document": types.get("document", 0),
+        "user": get_user_model().objects.exclude(username="AnonymousUser").count(),
+        "group": GroupProfile.objects.exclude(access="private").count(),
+    }
+    facets["dataset"] = facets["raster"] + facets["vector"] + facets["remote"] + facets["wms"]
+    return facets
+
+
 @register.simple_tag(takes_context=True)
 def facets(context):
     request = context["request"]
@@ -79,6 +101,22 @@ def facets(context):
 
     facet_type = context.get("facet_type", "all")
 
+    filters = (
+        title_filter,
+        abstract_filter,
+        purpose_filter,
+        extent_filter,
+        keywords_filter,
+        category_filter,
+        regions_filter,
+        owner_filter,
+        date_gte_filter,
+        date_lte_filter,
+        date_range_filter,
+    )
+    if facet_type == "home" and not any(filters):
+        return home_facets(request.user)
+
     if not settings.SKIP_PERMS_FILTER:
         authorized = []
         try:
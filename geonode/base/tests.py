@@ -33,8 +33,10 @@ from django.conf import settings
 from django.contrib.gis.geos import Polygon, GEOSGeometry
 from django.template import Template, Context
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from geonode.storage.manager import storage_manager
 from django.test import Client, TestCase, override_settings, SimpleTestCase
+from django.http import QueryDict
 from django.shortcuts import reverse
 from django.core.files import File
 from django.core.management import call_command
@@ -52,8 +54,20 @@ from geonode.tests.base import GeoNodeBaseTestSupport
 from geonode.base.templatetags.base_tags import display_change_perms_button
 from geonode.base.templatetags.sanitize_html import sanitize_html
 from geonode.base.utils import OwnerRightsRequestViewUtils
+from geonode.base.counts import (
+    count_by,
+    get_facet_counts,
+    get_grouped_counts,
+    get_owner_counts,
+    get_resource_counts,
+    invalidate_resource_counts,
+    refresh_owner_counts,
+    update_owner_counts,
+)
 from geonode.base.models import (
     HierarchicalKeyword,
+    Link,
+    OwnerResourceCount,
     ResourceBase,
     MenuPlaceholder,
     Menu,
@@ -66,6 +80,13 @@ from geonode.base.models import (
     generate_thesaurus_reference,
 )
 from geonode.base.middleware import ReadOnlyMiddleware, MaintenanceMiddleware
+from geonode.base.search import (
+    get_search_query,
+    get_search_weights,
+    is_search_index_enabled,
+    parse_search_terms,
+    search_resources,
+)
 from geonode.base.templatetags.base_tags import get_visibile_resources, facets
 from geonode.base.templatetags.thesaurus import (
     get_name_translation,
@@ -79,6 +100,7 @@ from geonode.base.templatetags.user_messages import show_notification
 from geonode import geoserver
 from geonode.decorators import on_ogc_backend
 from geonode.resource.manager import resource_manager
+from geonode.security.utils import get_resources_with_perms
 
 test_image = Image.new("RGBA", size=(50, 50), color=(155, 0, 0))
 
@@ -1302,3 +1324,293 @@ class TestResourceBaseViewSetQueryset(TestCase):
         original_pks = [obj.pk for obj in original_list]
         optimized_pks = [obj.pk for obj in optimized_list]
         self.assertEqual(original_pks, optimized_pks)
+
+
+class OwnerResourceCountTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        super().setUp()
+        self.owner = get_user_model().objects.create_user(username="counted_owner", password="counted_owner")
+        self.viewer = get_user_model().objects.create_user(username="counts_viewer", password="counts_viewer")
+        self.admin = get_user_model().objects.filter(is_superuser=True).first()
+        self.datasets = [create_single_dataset(f"counted_dataset_{i}", owner=self.owner) for i in range(3)]
+        ResourceBase.objects.filter(id=self.datasets[0].id).update(dirty_state=True)
+
+    def test_refresh_owner_counts(self):
+        refresh_owner_counts([self.owner.pk])
+        counter = OwnerResourceCount.objects.get(
+            owner=self.owner, resource_type="dataset", visibility=OwnerResourceCount.VISIBILITY_ALL
+        )
+        # the resources in a dirty state are not counted
+        self.assertEqual(counter.count, 2)
+
+        ResourceBase.objects.filter(id=self.datasets[1].id).delete()
+        refresh_owner_counts([self.owner.pk])
+        counter.refresh_from_db()
+        self.assertEqual(counter.count, 1)
+
+    def test_get_owner_counts(self):
+        refresh_owner_counts([self.owner.pk])
+        with patch("geonode.base.counts.compute_owner_counts") as compute:
+            self.assertEqual(get_owner_counts(self.admin, [self.owner.pk]), {self.owner.pk: {"dataset": 2}})
+            self.assertEqual(get_owner_counts(self.owner, [self.owner.pk]), {self.owner.pk: {"dataset": 2}})
+            compute.assert_not_called()
+
+        # the other users count what their permissions allow them to see
+        visible = get_resources_with_perms(self.viewer).filter(owner=self.owner)
+        counts = get_owner_counts(self.viewer, [self.owner.pk])
+        self.assertEqual(counts.get(self.owner.pk, {}).get("dataset", 0), visible.count())
+
+    def test_owner_counts_on_first_miss(self):
+        # e.g. right after the upgrade creating the counters
+        OwnerResourceCount.objects.all().delete()
+        with patch("geonode.base.counts.update_owner_counts") as update:
+            self.assertEqual(get_owner_counts(self.admin, [self.owner.pk]), {self.owner.pk: {"dataset": 2}})
+            self.assertEqual(get_owner_counts(self.admin, [self.viewer.pk]), {})
+        self.assertEqual(list(update.call_args_list[0].args[0]), [self.owner.pk])
+
+    @override_settings(RESOURCE_COUNTS_UPDATE_DEBOUNCE=10)
+    def test_update_owner_counts_is_debounced(self):
+        with (
+            patch("geonode.tasks.tasks.update_owner_resource_counts.apply_async") as apply_async,
+            patch("geonode.base.counts.cache") as cache,
+        ):
+            cache.add.side_effect = [True, False]
+            with self.captureOnCommitCallbacks(execute=True):
+                update_owner_counts([self.owner.pk, None])
+                update_owner_counts([self.owner.pk])
+        apply_async.assert_called_once_with(args=([self.owner.pk],), countdown=10)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ResourceCountsTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        super().setUp()
+        invalidate_resource_counts()
+        self.admin = get_user_model().objects.filter(is_superuser=True).first()
+        self.datasets = [create_single_dataset(f"counted_resource_{i}") for i in range(2)]
+        ResourceBase.objects.filter(id=self.datasets[0].id).update(is_published=False)
+
+    def test_resource_counts_are_cached(self):
+        expected = get_resources_with_perms(self.admin)
+        counts = get_resource_counts(self.admin)
+        self.assertEqual(counts["all"]["total"], expected.count())
+        self.assertEqual(counts["dataset"]["total"], expected.filter(resource_type="dataset").count())
+        self.assertEqual(
+            counts["dataset"]["published"], expected.filter(resource_type="dataset", is_published=True).count()
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(get_resource_counts(self.admin), counts)
+
+        # saving a resource discards the cached counts
+        create_single_dataset("counted_resource_new")
+        self.assertEqual(get_resource_counts(self.admin)["dataset"]["total"], counts["dataset"]["total"] + 1)
+
+    def test_resource_counts_per_visibility_class(self):
+        get_resource_counts(self.admin)
+        # anonymous users do not share the counts of the administrators
+        with patch("geonode.base.counts.get_resources_with_perms", wraps=get_resources_with_perms) as perms:
+            get_resource_counts(AnonymousUser())
+            perms.assert_called_once()
+
+    def test_home_facets(self):
+        request = Mock(GET=QueryDict(), user=self.admin)
+        results = facets({"request": request, "facet_type": "home"})
+        resources = get_resources_with_perms(self.admin)
+        self.assertEqual(
+            results["dataset"],
+            resources.filter(resource_type="dataset", subtype__in=["raster", "vector", "remote", "wmsStore"]).count(),
+        )
+        self.assertEqual(results["map"], resources.filter(resource_type="map").count())
+
+    def test_counted_permissions(self):
+        from guardian.models import GroupObjectPermission, UserObjectPermission
+
+        editor = get_user_model().objects.create(username="counted_resources_editor")
+        resource = self.datasets[1].get_self_resource()
+        # the editor can change the resource, but not view it
+        GroupObjectPermission.objects.filter(object_pk=str(resource.pk)).delete()
+        UserObjectPermission.objects.filter(object_pk=str(resource.pk)).exclude(user=resource.owner).delete()
+        assign_perm("change_resourcebase", editor, resource)
+        expected = get_resources_with_perms(editor).filter(resource_type="dataset").count()
+        self.assertTrue(get_resources_with_perms(editor).filter(pk=resource.pk).exists())
+
+        # the v2 API and the groups count the resources the user can view or change
+        self.assertEqual(count_by(get_grouped_counts(editor), "resource_type").get("dataset", 0), expected)
+        self.assertEqual(get_resource_counts(editor)["dataset"]["total"], expected)
+        # the legacy API facets and the home page count only the ones the user can view
+        self.assertEqual(
+            count_by(get_grouped_counts(editor, view_only=True), "resource_type").get("dataset", 0), expected - 1
+        )
+        self.assertEqual(get_facet_counts(editor, "resource_type").get("dataset", 0), expected - 1)
+
+
+class LinkSyncTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        self.dataset = create_single_dataset("links_sync_dataset")
+        Link.objects.filter(resource=self.dataset).delete()
+
+    def _legend(self, url, mime="image/png"):
+        return {
+            "match": {"name": "Legend", "url": url},
+            "defaults": {"extension": "png", "mime": mime, "link_type": "image"},
+        }
+
+    def test_sync_creates_updates_and_dedupes(self):
+        resource = self.dataset.resourcebase_ptr
+        self.assertEqual(Link.objects.sync(resource, [self._legend("http://legend/1")]), (1, 0, 0))
+        # the duplicates of the matched links are removed
+        Link.objects.create(resource=resource, name="Legend", url="http://legend/1", link_type="image")
+        created, updated, deleted = Link.objects.sync(
+            resource, [self._legend("http://legend/1", mime="image/jpeg"), self._legend("http://legend/1")]
+        )
+        self.assertEqual((created, updated, deleted), (0, 1, 1))
+        link = Link.objects.get(resource=resource)
+        self.assertEqual(link.mime, "image/png")
+
+        # nothing is written when the links did not change
+        with self.assertNumQueries(1):
+            self.assertEqual(Link.objects.sync(resource, [self._legend("http://legend/1")]), (0, 0, 0))
+
+    def test_sync_updates_the_resource_version(self):
+        resource = self.dataset.resourcebase_ptr
+        last_updated = ResourceBase.objects.get(id=resource.id).last_updated
+        Link.objects.sync(resource, [self._legend("http://legend/1")])
+        self.assertGreater(ResourceBase.objects.get(id=resource.id).last_updated, last_updated)
+
+        # the version does not change when the links did not change
+        last_updated = ResourceBase.objects.get(id=resource.id).last_updated
+        Link.objects.sync(resource, [self._legend("http://legend/1")])
+        self.assertEqual(ResourceBase.objects.get(id=resource.id).last_updated, last_updated)
+
+    def test_sync_does_not_update_when_not_requested(self):
+        resource = self.dataset.resourcebase_ptr
+        Link.objects.create(resource=resource, name="OGC WMS: geonode Service", url="http://ows", mime="text/plain")
+        link = {
+            "match": {"name": "OGC WMS: geonode Service", "url": "http://ows"},
+            "defaults": {"extension": "html", "mime": "text/html", "link_type": "OGC:WMS"},
+            "update": False,
+        }
+        self.assertEqual(Link.objects.sync(resource, [link]), (0, 0, 0))
+        self.assertEqual(Link.objects.get(resource=resource).mime, "text/plain")
+
+    def test_sync_registers_the_proxied_hosts(self):
+        from geonode.proxy.utils import ProxyUrlsRegistry
+
+        resource = self.dataset.resourcebase_ptr
+        ResourceBase.objects.filter(id=resource.id).update(sourcetype="REMOTE")
+        resource.refresh_from_db()
+        link = {
+            "match": {"name": "OGC WMS: remote Service", "url": "http://remote.example.org/ows"},
+            "defaults": {"extension": "html", "mime": "text/html", "link_type": "OGC:WMS"},
+        }
+        with patch("geonode.proxy.utils.proxy_urls_registry", ProxyUrlsRegistry().set([])) as registry:
+            Link.objects.sync(resource, [link, self._legend("http://legend.example.org/1")])
+            self.assertEqual(registry.proxy_allowed_hosts, {"remote.example.org"})
+
+    def test_sync_prunes_the_other_links(self):
+        resource = self.dataset.resourcebase_ptr
+        Link.objects.create(resource=resource, name="Legend", url="http://legend/old", link_type="image")
+        Link.objects.create(resource=resource, name="Metadata", url="http://metadata", link_type="metadata")
+        self.assertEqual(
+            Link.objects.sync(resource, [self._legend("http://legend/new")], prune_types=("image",)), (1, 0, 1)
+        )
+        self.assertEqual(
+            sorted(Link.objects.filter(resource=resource).values_list("url", flat=True)),
+            ["http://legend/new", "http://metadata"],
+        )
+
+
+class ResourceSearchTest(GeoNodeBaseTestSupport):
+    def test_search_query(self):
+        terms = parse_search_terms("Land-use  maps of Ita")
+        self.assertEqual(terms, ["land", "use", "maps", "of", "ita"])
+        # the last word is matched as a prefix while typing it
+        self.assertEqual(get_search_query(terms), "land & use & maps & of & ita:*")
+        self.assertEqual(parse_search_terms("' & !"), [])
+        self.assertEqual(get_search_query(["maps", "ita"], "AB"), "maps:AB & ita:*AB")
+
+    def test_search_weights(self):
+        self.assertEqual(get_search_weights(["title"]), "A")
+        self.assertEqual(get_search_weights(["abstract", "title"]), "AB")
+        self.assertEqual(get_search_weights(["title", "keywords__name", "tkeywords__alt_label"]), None)
+        self.assertEqual(
+            get_search_weights(
+                ["title", "keywords__name", "tkeywords__alt_label", "tkeywords__keyword__label", "abstract"]
+            ),
+            "ABC",
+        )
+        self.assertEqual(get_search_weights(["csw_anytext"]), None)
+        self.assertEqual(get_search_weights(["regions__name", "csw_anytext"]), "D")
+        self.assertEqual(get_search_weights(["title", "owner__username"]), None)
+        self.assertEqual(get_search_weights([]), None)
+
+    def test_search_ranking(self):
+        if not is_search_index_enabled():
+            self.skipTest("The full text search index requires PostgreSQL")
+        in_abstract = create_single_dataset("search_in_abstract")
+        in_abstract.abstract = "Rivers of Tuscany"
+        in_abstract.save()
+        in_title = create_single_dataset("search_in_title")
+        in_title.title = "Tuscany rivers"
+        in_title.save()
+        in_keywords = create_single_dataset("search_in_keywords")
+        in_keywords.keywords.add("tuscany")
+
+        results = list(search_resources(ResourceBase.objects.all(), "tusc").values_list("pk", flat=True))
+        self.assertEqual(results[0], in_title.pk)
+        self.assertEqual(set(results), {in_abstract.pk, in_title.pk, in_keywords.pk})
+        # the stemmed words match too
+        self.assertIn(in_title.pk, search_resources(ResourceBase.objects.all(), "river").values_list("pk", flat=True))
+        # only the words of the requested fields match
+        self.assertEqual(
+            set(search_resources(ResourceBase.objects.all(), "tusc", weights="A").values_list("pk", flat=True)),
+            {in_title.pk},
+        )
+
+
+class BBoxFilterTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="bbox_filter_user")
+
+    def _create_dataset(self, name, bbox):
+        return Dataset.objects.create(
+            uuid=str(uuid4()), owner=self.user, name=name, title=name, ll_bbox_polygon=Polygon.from_bbox(bbox)
+        )
+
+    def test_bbox_pieces(self):
+        from .bbox_utils import get_bbox_pieces, get_bbox_search_geometry
+
+        self.assertEqual(get_bbox_pieces([0, 0, 10, 10]), [[0.0, 0.0, 10.0, 10.0]])
+        crossing = [[170.0, 0.0, 180.0, 10.0], [-180.0, 0.0, -170.0, 10.0]]
+        self.assertEqual(get_bbox_pieces([170, 0, -170, 10]), crossing)
+        self.assertEqual(get_bbox_pieces([170, 0, 190, 10]), crossing)
+        self.assertEqual(get_bbox_pieces([-190, 0, -170, 10]), crossing)
+        self.assertEqual(get_bbox_pieces([-200, 0, 200, 10]), [[-180.0, 0.0, 180.0, 10.0]])
+        geometry = get_bbox_search_geometry("170,0,-170,10,0,0,10,10")
+        self.assertEqual(geometry.geom_type, "MultiPolygon")
+        self.assertEqual(len(geometry), 3)
+        with self.assertRaises(ValueError):
+            get_bbox_search_geometry("0,0,10")
+
+    def test_bbox_predicates_and_overlap(self):
+        from .bbox_utils import filter_bbox
+
+        small = self._create_dataset("bbox_small", [2, 2, 4, 4])
+        large = self._create_dataset("bbox_large", [-10, -10, 20, 20])
+        similar = self._create_dataset("bbox_similar", [1, 1, 11, 9])
+        dateline = self._create_dataset("bbox_dateline", [175, 0, 179, 5])
+        queryset = Dataset.objects.filter(owner=self.user)
+
+        self.assertEqual(
+            set(filter_bbox(queryset, "0,0,10,10")),
+            {small, large, similar},
+        )
+        self.assertEqual(set(filter_bbox(queryset, "0,0,10,10", predicate="within")), {small})
+        self.assertEqual(set(filter_bbox(queryset, "0,0,10,10", predicate="contains")), {large})
+        self.assertEqual(set(filter_bbox(queryset, "170,0,-170,10")), {dateline})
+        self.assertEqual(
+            list(filter_bbox(queryset, "0,0,10,10", order_by_overlap=True)),
+            [similar, large, small],
+        )
+        with self.assertRaises(ValueError):
+            filter_bbox(queryset, "0,0,10,10", predicate="touches")
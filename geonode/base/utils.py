@@ -35,9 +35,9 @@ from django.core.exceptions import ValidationError
 
 # Geonode functionality
 from geonode.layers.models import Dataset
-from geonode.base.models import ResourceBase, Link, Configuration
+from geonode.base.models import Link, Configuration
 from geonode.security.utils import AdvancedSecurityWorkflowManager
-from geonode.thumbs.utils import get_thumbs, remove_thumb
+from geonode.storage.gc import collect_garbage
 from geonode.utils import get_legend_url
 
 logger = logging.getLogger("geonode.base.utils")
@@ -85,20 +85,7 @@ def delete_orphaned_thumbs():
     """
     Deletes orphaned thumbnails.
     """
-    deleted = []
-    thumb_uuids = {get_thumb_uuid(filename): filename for filename in get_thumbs()}
-    db_uuids = ResourceBase.objects.filter(uuid__in=thumb_uuids.keys()).values_list("uuid", flat=True)
-    orphaned_uuids = set(thumb_uuids.keys()) - set(db_uuids)
-    orphaned_thumbs = (thumb_uuids[uuid] for uuid in orphaned_uuids if uuid is not None)
-
-    for filename in orphaned_thumbs:
-        try:
-            remove_thumb(filename)
-            deleted.append(filename)
-        except NotImplementedError as e:
-            logger.error(f"Failed to delete orphaned thumbnail '{filename}': {e}")
-
-    return deleted
+    return collect_garbage(areas=["thumbnails"])["thumbnails"]
 
 
 def remove_duplicate_links(resource):
@@ -126,7 +126,8 @@ class Catalogue(CatalogueServiceWeb):
         if self.type == "deegree":
             id_pname = "apiso:Identifier"
         site_url = settings.SITEURL.rstrip("/") if settings.SITEURL.startswith("http") else settings.SITEURL
-        tpl = get_template(template)
+        # the template can be passed already compiled, e.g. when rendering resources in batch
+        tpl = get_template(template) if isinstance(template, str) else template
         ctx = {
             "CATALOG_METADATA_TEMPLATE": settings.CATALOG_METADATA_TEMPLATE,
             "layer": layer,
@@ -0,0 +1,369 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Streaming export of the whole catalogue metadata.
+
+The resources visible to a user are walked with a server-side cursor on their ids; the
+resources themselves are then loaded in chunks, along with their keywords, regions, contacts
+and links, and serialized one by one so that the complete document is never held in memory.
+"""
+import csv
+import json
+import logging
+import re
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.urls import reverse
+from guardian.shortcuts import get_objects_for_user
+
+from geonode.base.models import ResourceBase
+from geonode.people import Roles
+from geonode.security.utils import get_visible_resources
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 200
+
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>\s*")
+EMPTY_METADATA_XML = '<gmd:MD_Metadata xmlns:gmd="http://www.isotc211.org/2005/gmd"/>'
+
+
+def get_exportable_resources(user, resource_type=None):
+    """Returns the queryset of the resources the user is allowed to see in the export"""
+    queryset = get_objects_for_user(user, "base.view_resourcebase", klass=ResourceBase)
+    if resource_type:
+        queryset = queryset.filter(resource_type=resource_type)
+    return get_visible_resources(
+        queryset,
+        user,
+        admin_approval_required=settings.ADMIN_MODERATE_UPLOADS,
+        unpublished_not_visible=settings.RESOURCE_PUBLISHING,
+        private_groups_not_visibile=settings.GROUP_PRIVATE_RESOURCES,
+    )
+
+
+def iterate_resources(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the resources of the queryset in id order.
+    Only the ids are read through the server-side cursor, each chunk of resources is loaded
+    with the relations needed by the exporters in a fixed number of queries.
+    """
+    ids = queryset.order_by("id").values_list("id", flat=True).distinct().iterator(chunk_size=chunk_size)
+    chunk = []
+    for _id in ids:
+        chunk.append(_id)
+        if len(chunk) >= chunk_size:
+            yield from _load_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from _load_chunk(chunk)
+
+
+def _load_chunk(ids):
+    # the export only needs the ResourceBase fields, fetching the concrete instances
+    # would cost one more query per resource type and drop the prefetched relations
+    return (
+        ResourceBase.objects.non_polymorphic()
+        .filter(id__in=ids)
+        .select_related("owner", "category", "license", "restriction_code_type", "spatial_representation_type")
+        .prefetch_related("keywords", "tkeywords", "regions", "link_set", "contactrole_set__contact")
+        .order_by("id")
+    )
+
+
+def get_resource_url(resource):
+    return urljoin(settings.SITEURL, reverse("resolve_uuid", kwargs={"uuid": resource.uuid}))
+
+
+def get_contacts(resource):
+    """Returns the contacts of the prefetched resource grouped by role name"""
+    contacts = {}
+    for contact_role in resource.contactrole_set.all():
+        contacts.setdefault(contact_role.role, []).append(contact_role.contact)
+    return contacts
+
+
+def get_contact_name(contact):
+    return contact.get_full_name() or contact.username
+
+
+def get_keywords(resource):
+    keywords = [keyword.name for keyword in resource.keywords.all()]
+    keywords.extend(tkeyword.alt_label for tkeyword in resource.tkeywords.all())
+    return keywords
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+class MetadataExporter:
+    """
+    Serializes a sequence of resources in a single document, one resource at a time.
+    The header is streamed before the resources are rendered, so the count it is given is the number of the
+    resources to export, an upper bound of the records emitted: the ones failing to render are skipped.
+    The number of the records actually emitted is available to the footer as `returned`.
+    """
+
+    name = None
+    content_type = None
+    extension = None
+
+    def __init__(self):
+        self.returned = 0
+        self.skipped = 0
+
+    def header(self, count):
+        return ""
+
+    def render(self, resource):
+        raise NotImplementedError()
+
+    def footer(self):
+        return ""
+
+    def stream(self, queryset, chunk_size=EXPORT_CHUNK_SIZE):
+        self.returned = 0
+        self.skipped = 0
+        yield self.header(queryset.count())
+        for resource in iterate_resources(queryset, chunk_size=chunk_size):
+            try:
+                content = self.render(resource)
+            except Exception as e:
+                logger.exception(f"Could not export the metadata of resource {resource.id}: {e}")
+                self.skipped += 1
+                continue
+            if content:
+                self.returned += 1
+                yield content
+        if self.skipped:
+            logger.warning(f"Exported {self.returned} {self.name} records, {self.skipped} skipped")
+        yield self.footer()
+
+
+class ISOMetadataExporter(MetadataExporter):
+    """Wraps the stored ISO records into a CSW GetRecords response"""
+
+    name = "iso"
+    content_type = "application/xml"
+    extension = "xml"
+
+    def __init__(self):
+        super().__init__()
+        self._catalogue = None
+        self._template = None
+
+    def header(self, count):
+        # numberOfRecordsReturned is an upper bound, the records failing to render are skipped
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<csw:GetRecordsResponse xmlns:csw="http://www.opengis.net/cat/csw/2.0.2" version="2.0.2">\n'
+            f'<csw:SearchResults numberOfRecordsMatched="{count}" numberOfRecordsReturned="{count}" '
+            'nextRecord="0" elementSet="full" recordSchema="http://www.isotc211.org/2005/gmd">\n'
+        )
+
+    def render(self, resource):
+        md_doc = resource.metadata_xml
+        if not md_doc or md_doc.strip() == EMPTY_METADATA_XML:
+            md_doc = self._generate(resource)
+        return f"{XML_DECLARATION.sub('', md_doc).strip()}\n"
+
+    def _generate(self, resource):
+        # the record has not been generated yet, render it the same way the catalogue does
+        from django.template.loader import get_template
+        from geonode.catalogue import get_catalogue
+
+        if self._catalogue is None:
+            self._catalogue = get_catalogue()
+            self._template = get_template(settings.CATALOG_METADATA_TEMPLATE)
+        return self._catalogue.catalogue.csw_gen_xml(resource.get_real_instance(), self._template)
+
+    def footer(self):
+        # the attributes of SearchResults are already streamed, the number of the records is reported here
+        return f"<!-- {self.returned} records returned -->\n</csw:SearchResults>\n</csw:GetRecordsResponse>\n"
+
+
+class DCATMetadataExporter(MetadataExporter):
+    """Serializes the resources as a DCAT JSON-LD graph of dcat:Dataset"""
+
+    name = "dcat"
+    content_type = "application/ld+json"
+    extension = "jsonld"
+
+    CONTEXT = {
+        "dcat": "http://www.w3.org/ns/dcat#",
+        "dct": "http://purl.org/dc/terms/",
+        "foaf": "http://xmlns.com/foaf/0.1/",
+        "locn": "http://www.w3.org/ns/locn#",
+        "vcard": "http://www.w3.org/2006/vcard/ns#",
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._first = True
+
+    def header(self, count):
+        self._first = True
+        return f'{{"@context": {json.dumps(self.CONTEXT)}, "@graph": [\n'
+
+    def render(self, resource):
+        content = json.dumps(self.to_dict(resource))
+        if self._first:
+            self._first = False
+            return content
+        return f",\n{content}"
+
+    def to_dict(self, resource):
+        dataset = {
+            "@id": get_resource_url(resource),
+            "@type": "dcat:Dataset",
+            "dct:identifier": resource.uuid,
+            "dct:title": resource.title,
+            "dct:description": resource.raw_abstract,
+            "dct:issued": _isoformat(resource.date),
+            "dct:modified": _isoformat(resource.last_updated),
+            "dct:language": resource.language,
+            "dct:type": resource.resource_type,
+            "dcat:keyword": get_keywords(resource),
+            "dcat:landingPage": get_resource_url(resource),
+            "dct:publisher": {"@type": "foaf:Agent", "foaf:name": get_contact_name(resource.owner)},
+        }
+        if resource.category:
+            dataset["dcat:theme"] = resource.category.gn_description
+        if resource.license:
+            dataset["dct:license"] = resource.license.url or resource.license.name
+        if resource.ll_bbox_polygon:
+            dataset["dct:spatial"] = {"@type": "dct:Location", "dcat:bbox": resource.ll_bbox_polygon.wkt}
+        if resource.temporal_extent_start or resource.temporal_extent_end:
+            dataset["dct:temporal"] = {
+                "@type": "dct:PeriodOfTime",
+                "dcat:startDate": _isoformat(resource.temporal_extent_start),
+                "dcat:endDate": _isoformat(resource.temporal_extent_end),
+            }
+        dataset["dcat:contactPoint"] = [
+            {"@type": "vcard:Kind", "vcard:fn": get_contact_name(contact), "vcard:hasEmail": f"mailto:{contact.email}"}
+            for contact in get_contacts(resource).get(Roles.POC.name, [])
+        ]
+        dataset["dcat:distribution"] = [
+            {
+                "@type": "dcat:Distribution",
+                "dct:title": link.name,
+                "dcat:accessURL": link.url,
+                "dcat:mediaType": link.mime,
+                "dct:format": link.extension,
+            }
+            for link in resource.link_set.all()
+            if link.link_type in ("data", "OGC:WMS", "OGC:WFS", "OGC:WCS", "image", "original")
+        ]
+        return dataset
+
+    def footer(self):
+        return "\n]}\n"
+
+
+class _Echo:
+    """File-like object that hands back what is written, to let csv.writer produce single rows"""
+
+    def write(self, value):
+        return value
+
+
+class CSVMetadataExporter(MetadataExporter):
+    """Serializes the resources as a CSV table, one row per resource"""
+
+    name = "csv"
+    content_type = "text/csv"
+    extension = "csv"
+
+    COLUMNS = (
+        "uuid",
+        "title",
+        "resource type",
+        "resource owner",
+        "date",
+        "date type",
+        "abstract",
+        "language",
+        "category",
+        "license",
+        "keywords",
+        "regions",
+        "extent",
+        "SRID",
+        "temporal extent start",
+        "temporal extent end",
+        "point of contact",
+        "metadata author",
+        "url",
+        "thumbnail url",
+    )
+
+    def __init__(self):
+        super().__init__()
+        # same separator used by the single resource export in catalogue.views
+        self.writer = csv.writer(_Echo(), delimiter=";")
+
+    def header(self, count):
+        return self.writer.writerow(self.COLUMNS)
+
+    def render(self, resource):
+        contacts = get_contacts(resource)
+        extent = ""
+        if resource.ll_bbox_polygon:
+            extent = ",".join(str(coord) for coord in resource.ll_bbox_polygon.extent)
+        return self.writer.writerow(
+            (
+                resource.uuid,
+                resource.title,
+                resource.resource_type,
+                resource.owner,
+                _isoformat(resource.date),
+                resource.date_type,
+                resource.raw_abstract,
+                resource.language,
+                resource.category.gn_description if resource.category else "",
+                resource.license.name if resource.license else "",
+                ", ".join(get_keywords(resource)),
+                ", ".join(region.name for region in resource.regions.all()),
+                extent,
+                resource.srid,
+                _isoformat(resource.temporal_extent_start) or "",
+                _isoformat(resource.temporal_extent_end) or "",
+                ", ".join(get_contact_name(c) for c in contacts.get(Roles.POC.name, [])),
+                ", ".join(get_contact_name(c) for c in contacts.get(Roles.METADATA_AUTHOR.name, [])),
+                get_resource_url(resource),
+                resource.thumbnail_url or "",
+            )
+        )
+
+
+EXPORTERS = {exporter.name: exporter for exporter in (ISOMetadataExporter, DCATMetadataExporter, CSVMetadataExporter)}
+
+
+def get_exporter(fmt):
+    """Returns a new exporter for the requested format, raises KeyError for unknown formats"""
+    return EXPORTERS[fmt]()
+
+
+def export_metadata(user, fmt, resource_type=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Returns the exporter and the generator of the export for the resources visible to the user"""
+    exporter = get_exporter(fmt)
+    queryset = get_exportable_resources(user, resource_type=resource_type)
+    return exporter, exporter.stream(queryset, chunk_size=chunk_size)
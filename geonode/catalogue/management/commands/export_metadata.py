@@ -0,0 +1,69 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from guardian.utils import get_anonymous_user
+
+from geonode.catalogue.export import EXPORT_CHUNK_SIZE, EXPORTERS, export_metadata
+
+
+class Command(BaseCommand):
+    help = "Export the metadata of the whole catalogue as ISO XML, DCAT JSON-LD or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-f", "--format", dest="format", choices=sorted(EXPORTERS), default="iso", help="Export format"
+        )
+        parser.add_argument("-o", "--output", dest="output", help="Output file, the standard output when missing")
+        parser.add_argument(
+            "-u",
+            "--user",
+            dest="user",
+            help="Only export the resources visible to this user, the anonymous user when missing",
+        )
+        parser.add_argument("-t", "--resource-type", dest="resource_type", help="Only export this resource type")
+        parser.add_argument(
+            "-c",
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="Number of resources loaded from the database at a time",
+        )
+
+    def handle(self, **options):
+        if options.get("user"):
+            try:
+                user = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist")
+        else:
+            user = get_anonymous_user()
+
+        _, content = export_metadata(
+            user, options["format"], resource_type=options.get("resource_type"), chunk_size=options["chunk_size"]
+        )
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as out:
+                for chunk in content:
+                    out.write(chunk)
+        else:
+            for chunk in content:
+                self.stdout.write(chunk, ending="")
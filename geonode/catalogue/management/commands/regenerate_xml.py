@@ -19,17 +19,26 @@
 #########################################################################
 
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+from django.db import connections
 from django.core.management.base import BaseCommand
 
 from geonode.base.management import command_utils
-from geonode.base.models import ResourceBase
+from geonode.catalogue.models import update_metadata_xml
 from geonode.layers.models import Dataset
 
 
 logger = logging.getLogger(__name__)
 
 
+def regenerate_batch(ids):
+    """Regenerates the metadata of a batch of datasets, returns the number of the successful ones"""
+    layers = list(Dataset.objects.filter(id__in=ids))
+    return update_metadata_xml(layers)
+
+
 class Command(BaseCommand):
     help = "Re-create XML metadata documents"
 
@@ -54,12 +63,29 @@ class Command(BaseCommand):
             action='store_true',
             help="Do not actually perform any change")
 
+        parser.add_argument(
+            '-j',
+            '--jobs',
+            dest="jobs",
+            type=int,
+            default=1,
+            help="Number of parallel processes rendering the metadata")
+
+        parser.add_argument(
+            '-b',
+            '--batch-size',
+            dest="batch_size",
+            type=int,
+            default=100,
+            help="Number of layers rendered by each batch")
+
     def handle(self, **options):
         requested_layers = options.get('layers')
         dry_run = options.get('dry-run')
+        jobs = max(options.get('jobs') or 1, 1)
+        batch_size = max(options.get('batch_size') or 1, 1)
 
-        if options.get("setup_logger"):
-            logger = command_utils.setup_logger()
+        logger = command_utils.setup_logger() if options.get("setup_logger") else logging.getLogger(__name__)
 
         logger.info(f"==== Running command {__name__}")
         logger.info(f"{self.help}")
@@ -67,58 +93,45 @@ class Command(BaseCommand):
 
         logger.debug(f"DRY-RUN is {dry_run}")
         logger.debug(f"LAYERS is {requested_layers}")
-
-        try:
-
-            layers = Dataset.objects.all()
-            tot = len(layers)
-            logger.info(f"Total layers in GeoNode: {tot}")
-            i = 0
-            cnt_ok = 0
-            cnt_bad = 0
-            cnt_skip = 0
-
-            instance: ResourceBase
-            for instance in layers:
-                i += 1
-                logger.info(f"- {i}/{tot} Processing layer {instance.id} [{instance.typename}] '{instance.title}'")
-
-                if requested_layers and instance.typename not in requested_layers:
-                    logger.info("  - Layer filtered out by args")
-                    cnt_skip += 1
-                    continue
-
-                if instance.metadata_uploaded and instance.metadata_uploaded_preserve:
-                    logger.info("  - Layer filtered out since it uses custom XML")
-                    cnt_skip += 1
-                    continue
-
-                try:
-                    good = None
-                    if not dry_run:
-                        try:
-                            try:
-                                # the save() method triggers the metadata regeneration
-                                instance.save()
-                                good = True
-                            except Exception as e:
-                                logger.error(f"Error saving instance '{instance.title}': {e}")
-                                raise e
-
-                        except Exception as e:
-                            logger.exception(f"Error processing '{instance.title}': {e}", e)
-
-                    if dry_run or good:
-                        logger.info(f"  - Done {instance.name}")
-                        cnt_ok += 1
-                    else:
-                        logger.warning(f"Metadata couldn't be regenerated for instance '{instance.title}' ")
-                        cnt_bad += 1
-
-                except Exception as e:
-                    raise e
-        except Exception as e:
-            raise e
+        logger.debug(f"JOBS is {jobs}")
+
+        layers = Dataset.objects.all()
+        tot = layers.count()
+        logger.info(f"Total layers in GeoNode: {tot}")
+
+        if requested_layers:
+            layers = layers.filter(typename__in=requested_layers)
+        to_process = layers.exclude(metadata_uploaded=True, metadata_uploaded_preserve=True)
+        ids = list(to_process.order_by("id").values_list("id", flat=True))
+        cnt_skip = tot - len(ids)
+        logger.info(f"Layers to be processed: {len(ids)}")
+
+        cnt_ok = 0
+        cnt_bad = 0
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        if dry_run:
+            cnt_ok = len(ids)
+        elif jobs == 1:
+            for i, batch in enumerate(batches, start=1):
+                done = regenerate_batch(batch)
+                cnt_ok += done
+                cnt_bad += len(batch) - done
+                logger.info(f"- {i}/{len(batches)} Processed batch of {len(batch)} layers")
+        else:
+            # the forked workers must not share the connections of the parent process
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("fork")) as executor:
+                futures = {executor.submit(regenerate_batch, batch): batch for batch in batches}
+                for i, future in enumerate(as_completed(futures), start=1):
+                    batch = futures[future]
+                    try:
+                        done = future.result()
+                    except Exception as e:
+                        logger.exception(f"Error processing batch of layers {batch}: {e}")
+                        done = 0
+                    cnt_ok += done
+                    cnt_bad += len(batch) - done
+                    logger.info(f"- {i}/{len(batches)} Processed batch of {len(batch)} layers")
 
         logger.info("Work completed" + (" [DRYRUN]" if dry_run else ""))
         logger.info(f"- Metadata regenerated : {cnt_ok}")
@@ -17,10 +17,14 @@
 #
 #########################################################################
 import errno
+import time
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import signals
+from django.template.loader import get_template
 from lxml import etree
 from owslib.etree import etree as dlxml
 from geonode.layers.models import Dataset
@@ -31,6 +35,8 @@ from geonode.base.models import Link, ResourceBase
 
 LOGGER = logging.getLogger(__name__)
 
+METADATA_XML_CACHE_PREFIX = "catalogue:metadata_xml"
+
 
 def catalogue_pre_delete(instance, sender, **kwargs):
     """Removes the layer from the catalogue"""
@@ -40,52 +46,128 @@ def catalogue_pre_delete(instance, sender, **kwargs):
 
 def catalogue_post_save(instance, sender, **kwargs):
     """Get information from catalogue"""
+    if getattr(settings, "CATALOG_METADATA_XML_DEFERRED", False):
+        schedule_metadata_xml_update(instance)
+    else:
+        update_metadata_xml([instance], fail_silently=False)
+
+
+def schedule_metadata_xml_update(instance):
+    """
+    Queues the regeneration of the metadata XML of the instance.
+
+    Several saves of the same resource within the CATALOG_METADATA_XML_DEBOUNCE window
+    collapse into a single render, and the resources queued during the same window
+    are rendered together by one background task.
+    """
+    _id = instance.resourcebase_ptr_id if hasattr(instance, "resourcebase_ptr_id") else instance.id
+    # the resource is marked as pending once committed, so a rolled back save does not hold it
+    transaction.on_commit(lambda: _enqueue_metadata_xml_update(_id))
+
+
+def _pending_timeout():
+    # upper bound after which a resource can be queued again even if its render got lost
+    return getattr(settings, "CATALOG_METADATA_XML_DEBOUNCE", 30) * 10
+
+
+def _enqueue_metadata_xml_update(resource_id):
+    from geonode.catalogue.tasks import flush_metadata_xml_queue, generate_metadata_xml
+
+    if not cache.add(f"{METADATA_XML_CACHE_PREFIX}:pending:{resource_id}", True, _pending_timeout()):
+        LOGGER.debug(f"Metadata XML regeneration for resource {resource_id} already queued")
+        return
+    debounce = getattr(settings, "CATALOG_METADATA_XML_DEBOUNCE", 30)
+    window = int(time.time() // max(debounce, 1))
+    queue_key = f"{METADATA_XML_CACHE_PREFIX}:queue:{window}"
+    try:
+        cache.add(queue_key, 0, _pending_timeout())
+        slot = cache.incr(queue_key)
+        cache.set(f"{queue_key}:{slot}", resource_id, _pending_timeout())
+    except ValueError:
+        # the cache backend does not retain values (e.g. DummyCache): no coalescing possible
+        generate_metadata_xml.apply_async(args=([resource_id],), countdown=debounce)
+        return
+
+    if slot == 1:
+        # the first resource queued in the window schedules the flush of the whole window
+        flush_metadata_xml_queue.apply_async(args=(window,), countdown=debounce)
+
+
+def pop_metadata_xml_queue(window):
+    """
+    Returns the ids of the resources queued during the given window and releases them,
+    so that any further save will queue them again.
+    """
+    queue_key = f"{METADATA_XML_CACHE_PREFIX}:queue:{window}"
+    size = cache.get(queue_key) or 0
+    slot_keys = [f"{queue_key}:{slot}" for slot in range(1, size + 1)]
+    resource_ids = sorted(set(cache.get_many(slot_keys).values()))
+    cache.delete_many(slot_keys + [queue_key])
+    release_metadata_xml_pending(resource_ids)
+    return resource_ids
+
+
+def release_metadata_xml_pending(resource_ids):
+    cache.delete_many([f"{METADATA_XML_CACHE_PREFIX}:pending:{_id}" for _id in resource_ids])
+
+
+def update_metadata_xml(instances, catalogue=None, fail_silently=True):
+    """
+    Updates the catalogue records, the metadata links and the metadata XML of the instances.
+
+    The catalogue backend, the compiled metadata template and the XML parser are shared
+    by the whole batch.
+    Returns the number of resources successfully processed.
+    """
+    catalogue = catalogue or get_catalogue()
+    template = get_template(settings.CATALOG_METADATA_TEMPLATE)
+    parser = etree.XMLParser(remove_blank_text=True)
+    processed = 0
+    for instance in instances:
+        try:
+            if _update_metadata_xml(instance, catalogue, template, parser):
+                processed += 1
+        except Exception as e:
+            if not fail_silently:
+                raise e
+            LOGGER.exception(f"Could not regenerate metadata XML for resource {instance.id}: {e}")
+    return processed
+
+
+def _update_metadata_xml(instance, catalogue, template, parser):
     _id = instance.resourcebase_ptr.id if hasattr(instance, "resourcebase_ptr") else instance.id
     resources = ResourceBase.objects.filter(id=_id)
 
     # Update the Catalog
     try:
-        catalogue = get_catalogue()
         catalogue.create_record(instance)
         record = catalogue.get_record(instance.uuid)
     except OSError as err:
         msg = f'Could not connect to catalogue to save information for layer "{instance.name}"'
         if err.errno == errno.ECONNREFUSED:
             LOGGER.warn(msg, err)
-            return
+            return False
         else:
             raise err
 
     if not record:
         msg = f"Metadata record for {instance.title} does not exist, check the catalogue signals."
         LOGGER.warning(msg)
-        return
+        return False
 
     if not hasattr(record, "links"):
         msg = f"Metadata record for {instance.title} should contain links."
         raise Exception(msg)
 
     # Create the different metadata links with the available formats
-    if resources.exists():
-        for mime, name, metadata_url in record.links["metadata"]:
-            try:
-                Link.objects.get_or_create(
-                    resource=resources.get(),
-                    url=metadata_url,
-                    defaults=dict(name=name, extension="xml", mime=mime, link_type="metadata"),
-                )
-            except Exception:
-                _d = dict(name=name, extension="xml", mime=mime, link_type="metadata")
-                Link.objects.filter(
-                    resource=resources.get(), url=metadata_url, extension="xml", link_type="metadata"
-                ).update(**_d)
+    _update_metadata_links(_id, record.links["metadata"])
 
     if instance.metadata_uploaded and instance.metadata_uploaded_preserve:
         md_doc = etree.tostring(dlxml.fromstring(instance.metadata_xml))
     else:
         # generate an XML document (GeoNode's default is ISO)
-        raw_xml = catalogue.catalogue.csw_gen_xml(instance, settings.CATALOG_METADATA_TEMPLATE)
-        md_obj = dlxml.fromstring(raw_xml, parser=etree.XMLParser(remove_blank_text=True))
+        raw_xml = catalogue.catalogue.csw_gen_xml(instance, template)
+        md_obj = dlxml.fromstring(raw_xml, parser=parser)
         md_doc = etree.tostring(md_obj, pretty_print=True, encoding="unicode")
 
     try:
@@ -95,6 +177,27 @@ def catalogue_post_save(instance, sender, **kwargs):
         csw_anytext = ""
 
     resources.update(metadata_xml=md_doc, csw_wkt_geometry=instance.geographic_bounding_box, csw_anytext=csw_anytext)
+    return True
+
+
+def _update_metadata_links(resource_id, metadata_links):
+    """Creates or updates the metadata links of a resource with one lookup query"""
+    existing = {}
+    for link in Link.objects.filter(resource_id=resource_id, url__in=[_l[2] for _l in metadata_links]):
+        existing.setdefault(link.url, []).append(link)
+
+    missing = []
+    for mime, name, metadata_url in metadata_links:
+        _d = dict(name=name, extension="xml", mime=mime, link_type="metadata")
+        links = existing.get(metadata_url)
+        if not links:
+            missing.append(Link(resource_id=resource_id, url=metadata_url, **_d))
+        elif len(links) > 1:
+            Link.objects.filter(
+                resource_id=resource_id, url=metadata_url, extension="xml", link_type="metadata"
+            ).update(**_d)
+    if missing:
+        Link.objects.bulk_create(missing)
 
 
 if "geonode.catalogue" in settings.INSTALLED_APPS:
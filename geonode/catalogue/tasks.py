@@ -0,0 +1,71 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+"""celery tasks for geonode.catalogue."""
+from django.conf import settings
+from celery.utils.log import get_task_logger
+
+from geonode.celery_app import app
+from geonode.tasks.tasks import FaultTolerantTask
+from geonode.layers.models import Dataset
+from geonode.documents.models import Document
+from geonode.catalogue.models import pop_metadata_xml_queue, release_metadata_xml_pending, update_metadata_xml
+
+logger = get_task_logger(__name__)
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.catalogue.tasks.flush_metadata_xml_queue",
+    queue="update",
+    acks_late=False,
+    ignore_result=True,
+)
+def flush_metadata_xml_queue(self, window):
+    """
+    Regenerates, in batches, the metadata XML of the resources queued during the window.
+    """
+    resource_ids = pop_metadata_xml_queue(window)
+    logger.debug(f"Regenerating metadata XML for {len(resource_ids)} queued resources")
+    batch_size = getattr(settings, "CATALOG_METADATA_XML_BATCH_SIZE", 100)
+    for i in range(0, len(resource_ids), batch_size):
+        generate_metadata_xml.delay(resource_ids[i : i + batch_size])
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.catalogue.tasks.generate_metadata_xml",
+    queue="update",
+    time_limit=1800,
+    acks_late=False,
+    ignore_result=True,
+)
+def generate_metadata_xml(self, resource_ids):
+    """
+    Regenerates the metadata XML of a batch of resources.
+    """
+    # any save happening from now on must queue the resource again
+    release_metadata_xml_pending(resource_ids)
+    # the catalogue only tracks datasets and documents, rendered from their concrete instances
+    resources = list(Dataset.objects.filter(id__in=resource_ids)) + list(Document.objects.filter(id__in=resource_ids))
+    processed = update_metadata_xml(resources)
+    logger.debug(f"Metadata XML regenerated for {processed}/{len(resource_ids)} resources")
+    return processed
@@ -16,10 +16,15 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
+import csv
+import json
 import logging
 import xml.etree.ElementTree as ET
+from unittest.mock import patch
 
 from django.db.models import Q
+from django.core.cache import cache
+from django.test import override_settings
 from django.test import RequestFactory
 from django.http.response import Http404
 from django.core.exceptions import PermissionDenied
@@ -28,7 +33,10 @@ from geonode.catalogue import get_catalogue
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from geonode.tests.base import GeoNodeBaseTestSupport
-from geonode.catalogue.models import catalogue_post_save
+from geonode.base.models import Link, ResourceBase
+from geonode.catalogue.models import METADATA_XML_CACHE_PREFIX, catalogue_post_save, pop_metadata_xml_queue
+from geonode.catalogue.tasks import generate_metadata_xml
+from geonode.catalogue.export import export_metadata, get_exportable_resources
 
 from geonode.catalogue.views import csw_global_dispatch, resolve_uuid
 from geonode.layers.populate_datasets_data import create_dataset_data
@@ -178,3 +186,93 @@ class UUIDResolverTest(GeoNodeBaseTestSupport):
         with self.assertRaises(PermissionDenied) as context:
             resolve_uuid(request, self.dataset.uuid)
         self.assertTrue("Permission Denied" in str(context.exception))
+
+
+@override_settings(
+    CATALOG_METADATA_XML_DEFERRED=True,
+    CATALOG_METADATA_XML_DEBOUNCE=30,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class DeferredMetadataXMLTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        self.dataset = create_single_dataset(name="test_deferred_metadata_xml_dataset")
+        cache.clear()
+
+    def tearDown(self):
+        Dataset.objects.filter(name="test_deferred_metadata_xml_dataset").delete()
+        cache.clear()
+
+    @patch("geonode.catalogue.tasks.flush_metadata_xml_queue.apply_async")
+    def test_saves_within_the_window_are_coalesced(self, flush):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            catalogue_post_save(instance=self.dataset, sender=Dataset)
+        # nothing is marked as pending before the commit
+        self.assertIsNone(cache.get(f"{METADATA_XML_CACHE_PREFIX}:pending:{self.dataset.id}"))
+        for callback in callbacks:
+            callback()
+        with self.captureOnCommitCallbacks(execute=True):
+            catalogue_post_save(instance=self.dataset, sender=Dataset)
+        flush.assert_called_once()
+        window = flush.call_args.kwargs["args"][0]
+        self.assertListEqual(pop_metadata_xml_queue(window), [self.dataset.id])
+        # once popped, the resource can be queued again
+        with self.captureOnCommitCallbacks(execute=True):
+            catalogue_post_save(instance=self.dataset, sender=Dataset)
+        self.assertEqual(flush.call_count, 2)
+
+    def test_generate_metadata_xml(self):
+        Dataset.objects.filter(id=self.dataset.id).update(workspace="deferred_workspace")
+        Link.objects.create(
+            resource=self.dataset, link_type="OGC:WMS", name="WMS", extension="html", url="http://localhost/ows"
+        )
+        ResourceBase.objects.filter(id=self.dataset.id).update(metadata_xml="", csw_anytext="")
+        generate_metadata_xml([self.dataset.id])
+        resource = ResourceBase.objects.get(id=self.dataset.id)
+        self.assertIn(self.dataset.uuid, resource.metadata_xml)
+        self.assertTrue(resource.csw_anytext)
+        # the dataset sections are rendered from the concrete instance
+        self.assertIn("deferred_workspace Service - Provides Layer", resource.metadata_xml)
+
+
+class MetadataExportTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        self.dataset = create_single_dataset(name="test_metadata_export_dataset")
+        self.dataset.set_default_permissions(owner=get_user_model().objects.get(username="admin"))
+        self.anonymous = get_user_model().objects.get(username="AnonymousUser")
+
+    def tearDown(self):
+        Dataset.objects.filter(name="test_metadata_export_dataset").delete()
+
+    def test_csv_export(self):
+        response = self.client.get("/catalogue/export.csv")
+        self.assertEqual(200, response.status_code)
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines(), delimiter=";"))
+        self.assertEqual(rows[0][0], "uuid")
+        self.assertEqual(len(rows) - 1, get_exportable_resources(self.anonymous).count())
+        self.assertIn(self.dataset.uuid, [row[0] for row in rows[1:]])
+
+    def test_dcat_export(self):
+        _, content = export_metadata(self.anonymous, "dcat", resource_type="dataset", chunk_size=2)
+        graph = json.loads("".join(content))["@graph"]
+        self.assertEqual(len(graph), get_exportable_resources(self.anonymous, resource_type="dataset").count())
+        self.assertIn(self.dataset.uuid, [item["dct:identifier"] for item in graph])
+
+    def test_iso_export(self):
+        exporter, content = export_metadata(self.anonymous, "iso", resource_type="dataset")
+        root = ET.fromstring("".join(content))
+        results = root.find("{http://www.opengis.net/cat/csw/2.0.2}SearchResults")
+        self.assertEqual(len(results), exporter.returned)
+        self.assertLessEqual(exporter.returned, int(results.get("numberOfRecordsReturned")))
+
+    def test_export_skips_failed_records(self):
+        exporter, content = export_metadata(self.anonymous, "iso", resource_type="dataset")
+        with patch.object(exporter, "render", side_effect=Exception("render error")):
+            root = ET.fromstring("".join(content))
+        results = root.find("{http://www.opengis.net/cat/csw/2.0.2}SearchResults")
+        self.assertEqual(len(results), 0)
+        self.assertEqual(exporter.returned, 0)
+        self.assertEqual(exporter.skipped, int(results.get("numberOfRecordsMatched")))
+
+    def test_unknown_format(self):
+        response = self.client.get("/catalogue/export.rdf")
+        self.assertEqual(404, response.status_code)
@@ -34,5 +34,6 @@ urlpatterns = [
         views.csw_render_extra_format_html,
         name="csw_render_extra_format_html",
     ),
+    re_path(r"^export\.(?P<fmt>iso|dcat|csv)$", views.metadata_export, name="metadata_export"),
     path(r"uuid/<uuid>", views.resolve_uuid, name="resolve_uuid"),
 ]
@@ -19,13 +19,14 @@
 import os
 import logging
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
 from pycsw import server
 from guardian.shortcuts import get_objects_for_user
 from geonode.catalogue.backends.pycsw_local import CONFIGURATION
+from geonode.catalogue.export import export_metadata
 from geonode.base.models import ResourceBase
 from geonode.layers.models import Dataset
 from geonode.base.auth import get_or_create_token
@@ -332,3 +333,15 @@ def csw_render_extra_format_html(request, layeruuid, resname):
 def resolve_uuid(request, uuid):
     resource = resolve_object(request, ResourceBase, {"uuid": uuid})
     return redirect(resource)
+
+
+def metadata_export(request, fmt):
+    """Streams the metadata of all the resources visible to the user in the requested format"""
+    resource_type = request.GET.get("resource_type")
+    try:
+        exporter, content = export_metadata(request.user, fmt, resource_type=resource_type)
+    except KeyError:
+        raise Http404(f"Unknown export format {fmt}")
+    response = StreamingHttpResponse(content, content_type=exporter.content_type)
+    response["Content-Disposition"] = f'attachment; filename="catalogue.{exporter.extension}"'
+    return response
@@ -28,7 +28,7 @@ from geonode import settings
 
 from geonode.assets.utils import create_asset_and_link
 from geonode.base.api.filters import DynamicSearchFilter, ExtentFilter
-from geonode.base.api.mixins import AdvertisedListMixin
+from geonode.base.api.mixins import AdvertisedListMixin, AnonymousResponseCacheMixin, ConditionalGetMixin
 from geonode.base.api.pagination import GeoNodeApiPagination
 from geonode.base.api.permissions import UserHasPerms
 from geonode.base.api.views import base_linked_resources, ApiPresetsInitializer
@@ -50,7 +50,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class DocumentViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin):
+class DocumentViewSet(
+    AnonymousResponseCacheMixin, ConditionalGetMixin, ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin
+):
     """
     API endpoint that allows documents to be viewed or edited.
     """
@@ -70,6 +72,7 @@ class DocumentViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedList
     queryset = Document.objects.all().order_by("-created")
     serializer_class = DocumentSerializer
     pagination_class = GeoNodeApiPagination
+    response_cache_types = ["document"]
 
     def perform_create(self, serializer):
         """
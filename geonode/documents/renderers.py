@@ -0,0 +1,235 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Rendering of the document previews used for the thumbnails.
+
+The documents are never decoded at full resolution: JPEG images are decoded at a reduced scale,
+the reduced resolution images stored in TIFF files are preferred to the full resolution one,
+very large images are read through GDAL with a decimated read and PDF pages are rasterized at
+the zoom matching the thumbnail size. The other document types are handled by the renderers
+registered with DocumentRenderer.register, e.g. office documents are converted to PDF first.
+"""
+import io
+import math
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import logging
+
+import fitz
+from PIL import Image
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# TIFF NewSubfileType flag of the reduced resolution versions of an image
+TIFF_REDUCED_IMAGE = 0x1
+
+
+def get_thumbnail_size():
+    return settings.THUMBNAIL_SIZE["width"], settings.THUMBNAIL_SIZE["height"]
+
+
+def get_cover_size(size, target):
+    """Returns the smallest size with the aspect ratio of size covering the target size"""
+    width, height = size
+    ratio = max(target[0] / width, target[1] / height)
+    return max(1, math.ceil(width * ratio)), max(1, math.ceil(height * ratio))
+
+
+def _select_tiff_frame(image, target):
+    """Moves to the smallest reduced resolution version of the first page still covering the target"""
+    best_frame, best_area = 0, image.size[0] * image.size[1]
+    aspect = image.size[0] / image.size[1]
+    for frame in range(1, getattr(image, "n_frames", 1)):
+        image.seek(frame)
+        width, height = image.size
+        if not image.tag_v2.get(254, 0) & TIFF_REDUCED_IMAGE:
+            # the next page of the document
+            break
+        if width >= target[0] and height >= target[1] and width * height < best_area:
+            if abs(width / height - aspect) < 0.01 * aspect:
+                best_frame, best_area = frame, width * height
+    image.seek(best_frame)
+
+
+def _read_decimated(filename, target):
+    """Reads the image at the size covering the target with GDAL, which only keeps the output buffer in memory"""
+    from osgeo import gdal
+
+    dataset = gdal.Open(filename)
+    if dataset is None:
+        return None
+    bands = min(dataset.RasterCount, 4)
+    if bands not in (1, 3, 4) or dataset.GetRasterBand(1).DataType != gdal.GDT_Byte:
+        return None
+    width, height = get_cover_size((dataset.RasterXSize, dataset.RasterYSize), target)
+    data = dataset.ReadRaster(
+        0,
+        0,
+        dataset.RasterXSize,
+        dataset.RasterYSize,
+        buf_xsize=width,
+        buf_ysize=height,
+        band_list=list(range(1, bands + 1)),
+        buf_pixel_space=bands,
+        buf_line_space=bands * width,
+        buf_band_space=1,
+        resample_alg=gdal.GRIORA_Average,
+    )
+    image = Image.frombytes({1: "L", 3: "RGB", 4: "RGBA"}[bands], (width, height), data)
+    color_table = dataset.GetRasterBand(1).GetColorTable() if bands == 1 else None
+    if color_table is not None:
+        image = image.convert("P")
+        palette = []
+        for index in range(min(color_table.GetCount(), 256)):
+            palette.extend(color_table.GetColorEntry(index)[:3])
+        image.putpalette(palette)
+    return image
+
+
+def open_image(fp, size=None):
+    """
+    Returns the image covering the thumbnail size, decoding as few pixels as possible.
+    fp can be a filename or a file object; the images too large to be decoded by Pillow
+    are read with GDAL, only available for local files.
+    """
+    size = size or get_thumbnail_size()
+    try:
+        image = Image.open(fp)
+    except Image.DecompressionBombError:
+        image = None
+
+    if image is not None:
+        if image.format == "TIFF":
+            _select_tiff_frame(image, size)
+        cover_size = get_cover_size(image.size, size)
+        if image.format == "JPEG":
+            # let the decoder scale down by 1/2, 1/4 or 1/8
+            image.draft("RGB", cover_size)
+        if image.size[0] * image.size[1] <= settings.DOCUMENT_THUMBNAIL_MAX_DECODE_PIXELS:
+            # reduce() is used for most of the scaling, the remaining one is resampled
+            image.thumbnail(cover_size, reducing_gap=2.0)
+            return image
+        image.close()
+
+    filename = fp if isinstance(fp, str) else getattr(fp, "name", None)
+    decimated = _read_decimated(filename, size) if filename and os.path.exists(filename) else None
+    if decimated is None:
+        raise ValueError("The image is too large to be decoded for the thumbnail")
+    return decimated
+
+
+def to_png(image):
+    with io.BytesIO() as output:
+        image.save(output, format="PNG")
+        return output.getvalue()
+
+
+class DocumentRenderer:
+    FILETYPES = ["pdf"]
+    # See https://pillow.readthedocs.io/en/stable/reference/ImageOps.html#PIL.ImageOps.fit
+    CROP_CENTERING = {"pdf": (0.0, 0.0)}
+
+    def __init__(self) -> None:
+        self.renderers = {filetype: getattr(self, f"render_{filetype}") for filetype in self.FILETYPES}
+        self.centering = dict(self.CROP_CENTERING)
+
+    def register(self, filetypes, render, centering=None):
+        """Registers the function rendering the preview of the filetypes as PNG bytes from a filename"""
+        for filetype in filetypes:
+            self.renderers[filetype.lower()] = render
+            if centering is not None:
+                self.centering[filetype.lower()] = centering
+
+    def supports(self, filename):
+        return self._get_filetype(filename) in self.renderers
+
+    def render(self, filename):
+        content = None
+        if self.supports(filename):
+            content = self.renderers[self._get_filetype(filename)](filename)
+        return content
+
+    def render_image(self, fp):
+        try:
+            with open_image(fp) as image:
+                return to_png(image)
+        except Exception as e:
+            logger.warning(f"Could not generate thumbnail for {getattr(fp, 'name', fp)}: {e}")
+            return None
+
+    def render_pdf(self, filename):
+        try:
+            with fitz.open(filename) as doc:
+                page = doc[0]
+                width, height = get_thumbnail_size()
+                # page sizes are in points, 1/72 of inch: render at the zoom covering the thumbnail
+                zoom = max(width / page.rect.width, height / page.rect.height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                return pix.pil_tobytes(format="PNG")
+        except Exception as e:
+            logger.warning(f"Cound not generate thumbnail for {filename}: {e}")
+            return None
+
+    def preferred_crop_centering(self, filename):
+        return self.centering.get(self._get_filetype(filename))
+
+    def _get_filetype(self, filname):
+        return os.path.splitext(filname)[1][1:].lower()
+
+
+def render_office_document(filename):
+    """Converts the document to PDF with LibreOffice and renders its first page"""
+    soffice = shutil.which(settings.DOCUMENT_THUMBNAIL_SOFFICE)
+    if not soffice:
+        return None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # a profile per conversion, concurrent instances sharing the user profile fail or block on its lock
+        profile = pathlib.Path(tmpdir, "profile").as_uri()
+        outdir = os.path.join(tmpdir, "out")
+        try:
+            subprocess.run(
+                [
+                    soffice,
+                    f"-env:UserInstallation={profile}",
+                    "--headless",
+                    "--convert-to",
+                    "pdf",
+                    "--outdir",
+                    outdir,
+                    filename,
+                ],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=settings.DOCUMENT_THUMBNAIL_CONVERSION_TIMEOUT,
+            )
+        except Exception as e:
+            logger.warning(f"Could not convert {filename} to PDF: {e}")
+            return None
+        pdf = os.path.join(outdir, f"{os.path.splitext(os.path.basename(filename))[0]}.pdf")
+        return doc_renderer.render_pdf(pdf) if os.path.exists(pdf) else None
+
+
+doc_renderer = DocumentRenderer()
+doc_renderer.register(settings.DOCUMENT_THUMBNAIL_OFFICE_TYPES, render_office_document, centering=(0.0, 0.0))
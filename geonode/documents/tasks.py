@@ -16,18 +16,13 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
-import os
-import io
-
-from PIL import Image
-import fitz
-
 from celery.utils.log import get_task_logger
 
 from geonode.celery_app import app
 from geonode.storage.manager import StorageManager
 from geonode.assets.handlers import asset_handler_registry
 from geonode.assets.utils import get_default_asset
+from geonode.documents.renderers import doc_renderer
 
 from ..base.models import ResourceBase
 from .models import Document
@@ -35,44 +30,6 @@ from .models import Document
 logger = get_task_logger(__name__)
 
 
-class DocumentRenderer:
-    FILETYPES = ["pdf"]
-    # See https://pillow.readthedocs.io/en/stable/reference/ImageOps.html#PIL.ImageOps.fit
-    CROP_CENTERING = {"pdf": (0.0, 0.0)}
-
-    def __init__(self) -> None:
-        pass
-
-    def supports(self, filename):
-        return self._get_filetype(filename) in self.FILETYPES
-
-    def render(self, filename):
-        content = None
-        if self.supports(filename):
-            filetype = self._get_filetype(filename)
-            render = getattr(self, f"render_{filetype}")
-            content = render(filename)
-        return content
-
-    def render_pdf(self, filename):
-        try:
-            doc = fitz.open(filename)
-            pix = doc[0].get_pixmap(matrix=fitz.Matrix(2.0, 2.0))
-            return pix.pil_tobytes(format="PNG")
-        except Exception as e:
-            logger.warning(f"Cound not generate thumbnail for {filename}: {e}")
-            return None
-
-    def preferred_crop_centering(self, filename):
-        return self.CROP_CENTERING.get(self._get_filetype(filename))
-
-    def _get_filetype(self, filname):
-        return os.path.splitext(filname)[1][1:]
-
-
-doc_renderer = DocumentRenderer()
-
-
 @app.task(
     bind=True,
     name="geonode.documents.tasks.create_document_thumbnail",
@@ -129,11 +86,8 @@ def create_document_thumbnail(self, object_id):
 
         if image_file:
             try:
-                image = Image.open(image_file)
-                with io.BytesIO() as output:
-                    image.save(output, format="PNG")
-                    thumbnail_content = output.getvalue()
-                    output.close()
+                # decoded straight at the thumbnail size, not at full resolution
+                thumbnail_content = doc_renderer.render_image(image_file)
             except Exception as e:
                 logger.debug(f"Could not generate thumbnail: {e}")
             finally:
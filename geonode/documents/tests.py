@@ -27,13 +27,14 @@ import io
 import json
 import gisdata
 
-from PIL import Image
+from PIL import Image, ImageFile, JpegImagePlugin
 
 from unittest.mock import patch
 from urllib.parse import urlparse
 from pathlib import Path
 
 from django.urls import reverse
+from django.test import SimpleTestCase, override_settings
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -51,6 +52,14 @@ from geonode.tests.base import GeoNodeBaseTestSupport
 from geonode.tests.utils import NotificationsTestsHelper
 from geonode.documents.enumerations import DOCUMENT_TYPE_MAP
 from geonode.documents.models import Document
+from geonode.documents.renderers import (
+    DocumentRenderer,
+    doc_renderer,
+    get_cover_size,
+    open_image,
+    render_office_document,
+    to_png,
+)
 
 from geonode.base.populate_test_data import all_public, create_models, create_single_doc, remove_models
 from geonode.upload.api.exceptions import FileUploadLimitException
@@ -579,3 +588,58 @@ class DocumentViewTestCase(GeoNodeBaseTestSupport):
         # create original link to external
         doc.link_set.create(resource=doc.resourcebase_ptr, link_type="original", url="http://google.com/test")
         self.assertEqual(doc.download_url, "http://google.com/test")
+
+
+@override_settings(THUMBNAIL_SIZE={"width": 400, "height": 200})
+class DocumentRendererTestCase(SimpleTestCase):
+    def setUp(self):
+        self.data_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "tests", "data")
+
+    def _jpeg(self, size):
+        content = io.BytesIO()
+        Image.new("RGB", size, (120, 10, 10)).save(content, format="JPEG")
+        content.seek(0)
+        return content
+
+    def test_get_cover_size(self):
+        self.assertEqual(get_cover_size((4000, 1000), (400, 200)), (800, 200))
+        self.assertEqual(get_cover_size((1000, 4000), (400, 200)), (400, 1600))
+
+    def test_open_image_decodes_at_the_thumbnail_size(self):
+        jpeg_draft = JpegImagePlugin.JpegImageFile.draft
+        with patch.object(JpegImagePlugin.JpegImageFile, "draft", autospec=True, side_effect=jpeg_draft) as draft:
+            with open_image(self._jpeg((4000, 3000))) as image:
+                self.assertEqual(image.size, (400, 300))
+            self.assertEqual(draft.call_args_list[0].args[1:], ("RGB", (400, 300)))
+
+    @override_settings(DOCUMENT_THUMBNAIL_MAX_DECODE_PIXELS=1000)
+    def test_image_too_large_is_not_decoded(self):
+        with patch.object(ImageFile.ImageFile, "load") as load:
+            self.assertIsNone(doc_renderer.render_image(io.BytesIO(to_png(Image.new("RGB", (100, 100))))))
+            load.assert_not_called()
+
+    def test_render_pdf_at_the_thumbnail_size(self):
+        content = doc_renderer.render(os.path.join(self.data_dir, "pdf_doc.pdf"))
+        with Image.open(io.BytesIO(content)) as image:
+            width, height = image.size
+        self.assertTrue(width >= 400 and height >= 200)
+        self.assertTrue(width == 400 or height == 200)
+
+    def test_office_document_profile_per_conversion(self):
+        with patch("geonode.documents.renderers.shutil.which", return_value="/usr/bin/soffice"):
+            with patch("geonode.documents.renderers.subprocess.run") as run:
+                self.assertIsNone(render_office_document("document.docx"))
+                self.assertIsNone(render_office_document("document.docx"))
+        profiles = [call.args[0][1] for call in run.call_args_list]
+        self.assertTrue(all(profile.startswith("-env:UserInstallation=file://") for profile in profiles))
+        self.assertNotEqual(profiles[0], profiles[1])
+        for profile in profiles:
+            self.assertFalse(os.path.exists(profile[len("-env:UserInstallation=file://") :]))
+
+    def test_register_renderer(self):
+        renderer = DocumentRenderer()
+        self.assertFalse(renderer.supports("drawing.dwg"))
+        renderer.register(["dwg"], lambda filename: b"preview", centering=(0.5, 0.0))
+        self.assertTrue(renderer.supports("drawing.DWG"))
+        self.assertEqual(renderer.render("drawing.dwg"), b"preview")
+        self.assertEqual(renderer.preferred_crop_centering("drawing.dwg"), (0.5, 0.0))
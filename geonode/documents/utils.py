@@ -27,7 +27,7 @@ import logging
 from geonode.assets.handlers import asset_handler_registry
 from geonode.assets.utils import get_default_asset
 from geonode.base.enumerations import EventType
-from geonode.storage.manager import storage_manager
+from geonode.storage.gc import collect_garbage
 
 # Django functionality
 from django.http import HttpResponse
@@ -47,19 +47,7 @@ def delete_orphaned_document_files():
     """
     Deletes orphaned files of deleted documents.
     """
-    deleted = []
-    _, files = storage_manager.listdir(os.path.join("documents", "document"))
-
-    for filename in files:
-        if Document.objects.filter(doc_file__contains=filename).count() == 0:
-            logger.debug(f"Deleting orphaned document {filename}")
-            try:
-                storage_manager.delete(os.path.join(os.path.join("documents", "document"), filename))
-                deleted.append(filename)
-            except NotImplementedError as e:
-                logger.error(f"Failed to delete orphaned document '{filename}': {e}")
-
-    return deleted
+    return collect_garbage(areas=["documents"])["documents"]
 
 
 def get_download_response(request, docid, attachment=False):
@@ -28,6 +28,7 @@ from django.conf import settings
 
 from geonode.base.api.views import ResourceBaseViewSet
 from geonode.base.models import ResourceBase
+from geonode.base.response_cache import cached_response
 from geonode.facets.models import FacetProvider, DEFAULT_FACET_PAGE_SIZE, facet_registry
 from geonode.security.utils import get_visible_resources
 
@@ -79,6 +80,7 @@ class BaseFacetingView(APIView):
         Perform some prefiltering on resources, such as
           - auth visibility
           - filtering by other facets already applied
+          - the search text
         :param request:
         :return: a QuerySet on ResourceBase
         """
@@ -86,7 +88,7 @@ class BaseFacetingView(APIView):
         filters = {k: vlist for k, vlist in request.query_params.lists() if k.startswith("filter{")}
         logger.warning(f"FILTERING BY  {filters}")
 
-        if filters:
+        if filters or request.query_params.get("search"):
             viewset = ResourceBaseViewSet(request=request, format_kwarg={}, kwargs=filters)
             viewset.initial(request)
             return get_visible_resources(queryset=viewset.filter_queryset(viewset.get_queryset()), user=request.user)
@@ -128,6 +130,9 @@ class BaseFacetingView(APIView):
 
 class ListFacetsView(BaseFacetingView):
     def get(self, request, *args, **kwargs):
+        return cached_response(request, "facets", lambda: self._get(request))
+
+    def _get(self, request):
         lang, lang_requested = self._resolve_language(request)
         add_links = self._resolve_boolean(request, PARAM_ADD_LINKS, False)
         include_topics = self._resolve_boolean(request, PARAM_INCLUDE_TOPICS, False)
@@ -161,6 +166,9 @@ class ListFacetsView(BaseFacetingView):
 
 class GetFacetView(BaseFacetingView):
     def get(self, request, facet):
+        return cached_response(request, f"facet_{facet}", lambda: self._get(request, facet))
+
+    def _get(self, request, facet):
         logger.debug("get_facet -> %r for user '%r'", facet, request.user.username)
 
         # retrieve provider for the requested facet
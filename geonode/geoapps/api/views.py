@@ -22,7 +22,7 @@ from dynamic_rest.filters import DynamicFilterBackend, DynamicSortingFilter
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from geonode.base.api.filters import DynamicSearchFilter, ExtentFilter
-from geonode.base.api.mixins import AdvertisedListMixin
+from geonode.base.api.mixins import AdvertisedListMixin, AnonymousResponseCacheMixin, ConditionalGetMixin
 from geonode.base.api.pagination import GeoNodeApiPagination
 from geonode.base.api.permissions import UserHasPerms
 from geonode.base.api.views import ApiPresetsInitializer
@@ -36,7 +36,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class GeoAppViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin):
+class GeoAppViewSet(
+    AnonymousResponseCacheMixin, ConditionalGetMixin, ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin
+):
     """
     API endpoint that allows geoapps to be viewed or edited.
     """
@@ -56,6 +58,7 @@ class GeoAppViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMi
     queryset = GeoApp.objects.all().order_by("-created")
     serializer_class = GeoAppSerializer
     pagination_class = GeoNodeApiPagination
+    response_cache_types = ["geoapp"]
 
     def perform_create(self, serializer):
         """
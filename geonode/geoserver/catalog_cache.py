@@ -0,0 +1,191 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+GeoServer catalog sharing the REST responses between the processes through the Django cache.
+
+The responses are keyed by their path relative to the REST endpoint, so the internal and the public
+urls of an object share the same entry. They are used as they are for GEOSERVER_CATALOG_CACHE_FRESHNESS
+seconds, then revalidated with a conditional request when GeoServer sent an ETag or a Last-Modified header.
+The writes made through the catalog only invalidate the objects they change and their collections; the
+invalidations of the whole cache made by the underlying library, e.g. after a reset, mark all the responses
+for revalidation instead of dropping them.
+"""
+import os
+import time
+import hashlib
+import logging
+from contextvars import ContextVar
+from urllib.parse import unquote, urlsplit
+from uuid import uuid4
+from xml.etree.ElementTree import XML
+from xml.parsers.expat import ExpatError
+
+from django.conf import settings
+from django.core.cache import cache
+from geoserver.catalog import Catalog, FailedRequestError
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_PREFIX = "gs_catalog"
+CATALOG_EPOCH_KEY = "gs_catalog_epoch"
+
+# set while a write made through the catalog invalidates its own entries
+_targeted_invalidation = ContextVar("gs_catalog_targeted_invalidation", default=False)
+
+
+def get_rest_path(url):
+    """Returns the path of the url relative to the REST endpoint"""
+    parts = urlsplit(url)
+    path = unquote(parts.path).split("/rest/", 1)[-1].strip("/")
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def get_collection_path(rest_path):
+    """Returns the path of the collection including the object, e.g. workspaces/ws/styles.xml"""
+    parent = os.path.dirname(os.path.splitext(rest_path.split("?", 1)[0])[0])
+    return f"{parent}.xml" if parent else None
+
+
+class CatalogCache:
+    """Replacement of the dictionary the Catalog keeps the REST responses in"""
+
+    def _get_key(self, rest_path):
+        digest = hashlib.md5(rest_path.encode("utf-8")).hexdigest()
+        return f"{CATALOG_CACHE_PREFIX}:{digest}"
+
+    def get_epoch(self):
+        epoch = cache.get(CATALOG_EPOCH_KEY)
+        if epoch is None:
+            cache.add(CATALOG_EPOCH_KEY, uuid4().hex, None)
+            epoch = cache.get(CATALOG_EPOCH_KEY)
+        return epoch
+
+    def get(self, url, default=None):
+        entry = cache.get(self._get_key(get_rest_path(url)))
+        return default if entry is None else entry
+
+    def set(self, url, content, etag=None, last_modified=None):
+        entry = {
+            "content": content,
+            "etag": etag,
+            "last_modified": last_modified,
+            "validated": time.time(),
+            "epoch": self.get_epoch(),
+        }
+        cache.set(self._get_key(get_rest_path(url)), entry, settings.GEOSERVER_CATALOG_CACHE_TIMEOUT)
+
+    def is_fresh(self, entry):
+        return (
+            entry["epoch"] == self.get_epoch()
+            and time.time() - entry["validated"] < settings.GEOSERVER_CATALOG_CACHE_FRESHNESS
+        )
+
+    def invalidate(self, *urls):
+        """Drops the responses of the urls and of the collections including them"""
+        keys = set()
+        for url in urls:
+            if not url:
+                continue
+            rest_path = get_rest_path(url)
+            keys.add(self._get_key(rest_path))
+            keys.add(self._get_key(f"{os.path.splitext(rest_path.split('?', 1)[0])[0]}.xml"))
+            collection_path = get_collection_path(rest_path)
+            if collection_path:
+                keys.add(self._get_key(collection_path))
+        cache.delete_many(list(keys))
+
+    def pop(self, url, default=None):
+        self.invalidate(url)
+        return default
+
+    def clear(self):
+        if not _targeted_invalidation.get():
+            self.revalidate()
+
+    def revalidate(self):
+        """Marks all the responses for revalidation"""
+        cache.set(CATALOG_EPOCH_KEY, uuid4().hex, None)
+
+
+class SharedCacheCatalog(Catalog):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = CatalogCache()
+
+    def get_xml(self, rest_url):
+        entry = self._cache.get(rest_url)
+        if entry is None or not self._cache.is_fresh(entry):
+            headers = {"Accept": "application/xml"}
+            if entry and entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+            resp = self.http_request(rest_url, headers=headers)
+            if resp.status_code == 304 and entry:
+                self._cache.set(rest_url, entry["content"], entry["etag"], entry["last_modified"])
+            elif resp.status_code == 200:
+                content = resp.content
+                if isinstance(content, bytes):
+                    content = content.decode("UTF-8")
+                entry = {"content": content}
+                self._cache.set(rest_url, content, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            else:
+                raise FailedRequestError(resp.content)
+        try:
+            return XML(entry["content"])
+        except (ExpatError, SyntaxError) as e:
+            raise Exception(f"GeoServer gave non-XML response for [GET {rest_url}]: {entry['content']}", e)
+
+    def invalidate(self, *urls):
+        self._cache.invalidate(*urls)
+
+    def revalidate(self):
+        self._cache.revalidate()
+
+    def reset_server(self):
+        """Resets the caches of the store connections and feature types of GeoServer, keeping the responses"""
+        token = _targeted_invalidation.set(True)
+        try:
+            return self.reset()
+        finally:
+            _targeted_invalidation.reset(token)
+
+    def save(self, obj, content_type="application/xml"):
+        token = _targeted_invalidation.set(True)
+        try:
+            return super().save(obj, content_type=content_type)
+        finally:
+            _targeted_invalidation.reset(token)
+            self.invalidate(obj.href)
+
+    def delete(self, config_object, purge=None, recurse=False):
+        token = _targeted_invalidation.set(not recurse)
+        try:
+            return super().delete(config_object, purge=purge, recurse=recurse)
+        finally:
+            _targeted_invalidation.reset(token)
+            # the objects deleted recursively are not known, they are revalidated by clear()
+            self.invalidate(config_object.href)
+
+    def create_style(self, name, data, overwrite=False, workspace=None, style_format="sld10", raw=False):
+        style = super().create_style(
+            name, data, overwrite=overwrite, workspace=workspace, style_format=style_format, raw=raw
+        )
+        self.invalidate(style.href)
+        return style
@@ -66,6 +66,7 @@ from geonode.security.views import _perms_info_json
 from geonode.catalogue.models import catalogue_post_save
 from geonode.layers.models import Dataset, Attribute, Style
 from geonode.layers.enumerations import LAYER_ATTRIBUTE_NUMERIC_DATA_TYPES
+from geonode.layers.profile import get_profile_statistics, update_dataset_profile
 
 from geonode.utils import (
     OGC_Servers_Handler,
@@ -75,7 +76,9 @@ from geonode.utils import (
     set_resource_default_links,
 )
 
+from .catalog_cache import SharedCacheCatalog
 from .geofence import GeoFenceClient, GeoFenceUtils
+from .legends import refresh_legends
 
 logger = logging.getLogger(__name__)
 
@@ -434,6 +437,7 @@ def set_dataset_style(saved_dataset, title, sld, base_file=None):
             except Exception as e:
                 logger.debug(e)
         set_styles(saved_dataset, gs_catalog)
+        refresh_legends(saved_dataset)
 
 
 def cascading_delete(dataset_name=None, catalog=None):
@@ -474,11 +478,6 @@ def cascading_delete(dataset_name=None, catalog=None):
             return None
         else:
             raise e
-    finally:
-        # Let's reset the connections first
-        cat._cache.clear()
-        cat.reset()
-        cat.reload()
 
     if resource is None:
         # If there is no associated resource,
@@ -1081,11 +1080,16 @@ def set_attributes_from_geoserver(layer, overwrite=False):
             attribute_map = []
     # Get attribute statistics & package for call to really_set_attributes()
     attribute_stats = defaultdict(dict)
+    # the statistics of the datasets in the datastore are computed with their profile in a single query
+    profile = update_dataset_profile(layer, attribute_map) if attribute_map else None
+    profile_stats = get_profile_statistics(profile) if profile else {}
     # Add new layer attributes if they don't already exist
     for attribute in attribute_map:
         field, ftype = attribute
         if field is not None:
-            if Attribute.objects.filter(dataset=layer, attribute=field).exists():
+            if field in profile_stats:
+                result = profile_stats[field]
+            elif Attribute.objects.filter(dataset=layer, attribute=field).exists():
                 continue
             elif is_dataset_attribute_aggregable(layer.subtype, field, ftype):
                 logger.debug("Generating layer attribute statistics")
@@ -1097,7 +1101,6 @@ def set_attributes_from_geoserver(layer, overwrite=False):
 
 
 def get_dataset(layer, gs_catalog: Catalog):
-    gs_catalog.reset()
     gs_dataset = None
     try:
         gs_dataset = gs_catalog.get_layer(layer.name)
@@ -1119,7 +1122,6 @@ def clean_styles(layer, gs_catalog: Catalog):
     try:
         # Cleanup Styles without a Workspace
         style = None
-        gs_catalog.reset()
         gs_dataset = get_dataset(layer, gs_catalog)
         if gs_dataset is not None:
             logger.debug(f'clean_styles: Retrieving style "{gs_dataset.default_style.name}" for cleanup')
@@ -1202,6 +1204,7 @@ def set_styles(layer, gs_catalog: Catalog):
         from geonode.base.models import Link
 
         dataset_legends = Link.objects.filter(resource=layer.resourcebase_ptr, name="Legend")
+        legend_urls = []
         for style in set(
             list(layer.styles.all())
             + [
@@ -1211,6 +1214,7 @@ def set_styles(layer, gs_catalog: Catalog):
             if style:
                 style_name = os.path.basename(urlparse(style.sld_url).path).split(".")[0]
                 legend_url = get_legend_url(layer, style_name)
+                legend_urls.append(legend_url)
                 if dataset_legends.filter(resource=layer.resourcebase_ptr, name="Legend", url=legend_url).count() < 2:
                     Link.objects.update_or_create(
                         resource=layer.resourcebase_ptr,
@@ -1223,6 +1227,8 @@ def set_styles(layer, gs_catalog: Catalog):
                             link_type="image",
                         ),
                     )
+        if legend_urls:
+            dataset_legends.exclude(url__in=legend_urls).delete()
         logger.debug(" -- Resource Links[Legend link]...done!")
     except Exception as e:
         logger.debug(f" -- Resource Links[Legend link]...error: {e}")
@@ -1647,6 +1653,11 @@ def _stylefilterparams_geowebcache_dataset(dataset_name):
 
 
 def _invalidate_geowebcache_dataset(dataset_name, url=None):
+    if not url:
+        from geonode.geoserver.tilecache import request_truncate
+
+        request_truncate(dataset_name)
+        return
     # http.add_credentials(username, password)
     headers = {
         "Content-Type": "text/xml",
@@ -1654,8 +1665,6 @@ def _invalidate_geowebcache_dataset(dataset_name, url=None):
     body = f"""
         <truncateLayer><layerName>{dataset_name}</layerName></truncateLayer>
         """.strip()
-    if not url:
-        url = f"{ogc_server_settings.LOCATION}gwc/rest/masstruncate"
     req, content = http_client.post(url, data=body, headers=headers, user=_user)
 
     if req.status_code != 200:
@@ -1753,6 +1762,9 @@ def style_update(request, url, workspace=None):
                 for layer in style.dataset_styles.all():
                     affected_datasets.append(layer)
 
+        for layer in affected_datasets:
+            refresh_legends(layer)
+
         # Invalidate GeoWebCache so it doesn't retain old style in tiles
         try:
             if dataset_name:
@@ -1846,7 +1858,7 @@ _csw = None
 _user, _password = ogc_server_settings.credentials
 
 url = ogc_server_settings.rest
-gs_catalog = Catalog(
+gs_catalog = SharedCacheCatalog(
     url, _user, _password, retries=ogc_server_settings.MAX_RETRIES, backoff_factor=ogc_server_settings.BACKOFF_FACTOR
 )
 gs_uploader = Client(url, _user, _password)
@@ -1891,6 +1903,19 @@ def create_gs_thumbnail(instance, overwrite=False, check_bbox=False):
     return implementation(instance, overwrite, check_bbox)
 
 
+def invalidate_dataset_catalog(instance):
+    """Drops the catalog responses of the layer and of the resource of the dataset"""
+    if not isinstance(gs_catalog, SharedCacheCatalog):
+        return
+    workspace, name = instance.workspace, instance.name
+    gs_catalog.invalidate(
+        f"{gs_catalog.service_url}/layers/{instance.alternate}.xml",
+        f"{gs_catalog.service_url}/workspaces/{workspace}/layers/{name}.xml",
+        f"{gs_catalog.service_url}/workspaces/{workspace}/datastores/{instance.store}/featuretypes/{name}.xml",
+        f"{gs_catalog.service_url}/workspaces/{workspace}/coveragestores/{instance.store}/coverages/{name}.xml",
+    )
+
+
 def sync_instance_with_geoserver(instance_id, *args, **kwargs):
     """
     Synchronizes the Django Instance with GeoServer layers.
@@ -1925,9 +1950,14 @@ def sync_instance_with_geoserver(instance_id, *args, **kwargs):
         #    Currently only gpkg files containing tiles will have this type & will be served via MapProxy.
         _is_remote_instance = hasattr(instance, "subtype") and getattr(instance, "subtype") in ["tileStore", "remote"]
 
-        # Let's reset the connections first
-        gs_catalog._cache.clear()
-        gs_catalog.reset()
+        # the catalog may still hold the objects as they were before the upload
+        invalidate_dataset_catalog(instance)
+        if kwargs.get("overwrite", False):
+            # GeoServer may still hold the readers and the feature type of the previous data
+            if isinstance(gs_catalog, SharedCacheCatalog):
+                gs_catalog.reset_server()
+            else:
+                gs_catalog.reset()
 
         gs_resource = None
         if not _is_remote_instance:
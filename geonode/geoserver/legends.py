@@ -0,0 +1,173 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Cache of the legend graphics of the datasets.
+
+The legends are rendered by the GetLegendGraphic of GeoServer once for each dataset, style, format,
+size and legend options, and kept in the Django cache under the version of the style, a checksum of its
+SLD, and a legends generation of the dataset: invalidate_legends() replaces the generation when the
+styles of the dataset change in GeoServer, refresh_legends() renders again the default legends too.
+
+The legends are only served by GeoNode when the default cache is shared by the processes serving the
+requests, otherwise each request would wait for a GeoServer call the clients can make directly.
+"""
+import hashlib
+import logging
+from urllib.parse import parse_qsl, urlsplit
+from uuid import uuid4
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+LEGEND_CACHE_PREFIX = "legend"
+LEGEND_GENERATION_PREFIX = "legend_generation"
+
+# GetLegendGraphic parameters selecting the rendered legend, the other ones are ignored
+LEGEND_PARAMS = ("format", "width", "height", "legend_options", "sld_version", "rule", "scale", "language")
+LEGEND_FORMATS = ("image/png", "image/jpeg", "image/gif", "application/json")
+
+
+def is_legend_cache_enabled():
+    from geonode.base.api.conditional import UNSHARED_CACHE_BACKENDS
+
+    return settings.LEGEND_CACHE_ENABLED and settings.CACHES["default"]["BACKEND"] not in UNSHARED_CACHE_BACKENDS
+
+
+def get_legends_generation(dataset):
+    key = f"{LEGEND_GENERATION_PREFIX}:{dataset.pk}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid4().hex[:12], None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_legends(dataset):
+    """Discards the legends of the dataset, to be called when its styles change"""
+    cache.set(f"{LEGEND_GENERATION_PREFIX}:{dataset.pk}", uuid4().hex[:12], None)
+
+
+def refresh_legends(dataset):
+    """Discards the legends of the dataset and renders again its default ones in background"""
+    from geonode.geoserver.tasks import geoserver_render_legends
+
+    invalidate_legends(dataset)
+    if is_legend_cache_enabled():
+        transaction.on_commit(lambda: geoserver_render_legends.apply_async(args=(dataset.pk,)))
+
+
+def get_style_version(style):
+    """Returns the checksum of the SLD of the style"""
+    body = style.sld_body or style.sld_url or style.name
+    return hashlib.md5(f"{style.sld_version}:{body}".encode("utf-8")).hexdigest()[:12]
+
+
+def get_dataset_style(dataset, style_name=None):
+    """Returns the style of the dataset with the name, optionally prefixed by its workspace, the default one when None"""
+    if not style_name:
+        return dataset.default_style
+    for style in [dataset.default_style] + list(dataset.styles.all()):
+        if style and style_name in (style.name, f"{style.workspace}:{style.name}"):
+            return style
+    return None
+
+
+def get_legend_params(query):
+    """
+    Returns the normalized parameters of the legend requested with the query, a dict of GetLegendGraphic
+    parameters, None when they are not valid.
+    """
+    params = {key.lower(): value for key, value in query.items() if key.lower() in LEGEND_PARAMS and value}
+    params["format"] = params.get("format", "image/png")
+    if params["format"] not in LEGEND_FORMATS:
+        return None
+    for size in ("width", "height"):
+        try:
+            value = int(params.get(size, 20))
+        except ValueError:
+            return None
+        if not 0 < value <= settings.LEGEND_MAX_SIZE:
+            return None
+        params[size] = str(value)
+    return params
+
+
+def get_legend_key(dataset, style, params):
+    digest = hashlib.md5(repr(sorted(params.items())).encode("utf-8")).hexdigest()
+    return f"{LEGEND_CACHE_PREFIX}:{dataset.pk}:{get_style_version(style)}:{get_legends_generation(dataset)}:{digest}"
+
+
+def render_legend(dataset, style, params):
+    """Returns the legend rendered by GeoServer as a (content, content type) tuple, None when it fails"""
+    ogc_server = settings.OGC_SERVER["default"]
+    try:
+        response = requests.get(
+            f"{ogc_server['LOCATION'].rstrip('/')}/ows",
+            params={
+                "service": "WMS",
+                "request": "GetLegendGraphic",
+                "version": "1.3.0",
+                "layer": dataset.alternate,
+                "style": style.name,
+                **params,
+            },
+            auth=HTTPBasicAuth(ogc_server["USER"], ogc_server["PASSWORD"]),
+            timeout=ogc_server.get("TIMEOUT", 60),
+        )
+    except requests.RequestException as e:
+        logger.warning(f"Could not render the legend of {dataset.alternate}: {e}")
+        return None
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    # GeoServer reports the errors with a 200 OK service exception document
+    if response.status_code != 200 or content_type not in LEGEND_FORMATS:
+        logger.warning(f"Could not render the legend of {dataset.alternate}: {response.status_code} {content_type}")
+        return None
+    return response.content, content_type
+
+
+def get_legend(dataset, style, params):
+    """
+    Returns the legend of the dataset with the style and the parameters, from the cache when available,
+    as a (content, content type) tuple, None when it cannot be rendered, and its cache key.
+    """
+    key = get_legend_key(dataset, style, params)
+    legend = cache.get(key)
+    if legend is None:
+        legend = render_legend(dataset, style, params)
+        if legend is not None:
+            cache.set(key, legend, settings.LEGEND_CACHE_TIMEOUT)
+    return legend, key
+
+
+def render_default_legends(dataset):
+    """Renders the legends of the styles of the dataset linked by its resource links"""
+    from geonode.utils import get_legend_url
+
+    for style in {dataset.default_style, *dataset.styles.all()}:
+        if style:
+            query = dict(parse_qsl(urlsplit(get_legend_url(dataset, style.name)).query))
+            params = get_legend_params(query)
+            if params:
+                get_legend(dataset, style, params)
@@ -17,77 +17,138 @@
 #
 #########################################################################
 
+import json
 import sys
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 
-from geonode.geoserver.helpers import gs_catalog
+from geonode.geoserver.scanner import (
+    STATUS_BROKEN,
+    STATUS_ERROR,
+    STATUS_OK,
+    DatasetScanner,
+    read_report,
+    write_csv_report,
+)
 from geonode.layers.models import Dataset
 
 
-def is_gs_resource_valid(layer):
-    gs_resource = gs_catalog.get_resource(
-        name=layer.name,
-        store=layer.store,
-        workspace=layer.workspace)
-    if gs_resource:
-        return True
-    else:
-        return False
-
-
 class Command(BaseCommand):
-    help = 'Find GeoNode layers with a missing GeoServer resource'
+    help = "Find GeoNode layers with a missing or broken GeoServer layer"
 
     def add_arguments(self, parser):
         parser.add_argument(
-            '--layername',
-            dest='layername',
+            "--layername",
+            dest="layername",
+            default=None,
+            help="Filter by a layername.",
+        )
+        parser.add_argument(
+            "--owner",
+            dest="owner",
             default=None,
-            help='Filter by a layername.',
+            help="Filter by a owner.",
+        )
+        parser.add_argument(
+            "--remove",
+            action="store_true",
+            dest="remove",
+            default=False,
+            help="Remove the layers checked in this run that are missing from the GeoServer catalog.",
+        )
+        parser.add_argument(
+            "--workers", dest="workers", type=int, default=8, help="Number of layers checked concurrently."
+        )
+        parser.add_argument(
+            "--rate", dest="rate", type=float, default=20, help="Maximum number of requests per second to GeoServer."
+        )
+        parser.add_argument(
+            "--timeout", dest="timeout", type=float, default=10, help="Seconds to wait for each GeoServer response."
         )
         parser.add_argument(
-            '--owner',
-            dest='owner',
+            "--report",
+            dest="report",
             default=None,
-            help='Filter by a owner.',
+            help="JSON lines file the result of the check of each layer is appended to.",
         )
         parser.add_argument(
-            '--remove',
-            action='store_true',
-            dest='remove',
+            "--resume",
+            action="store_true",
+            dest="resume",
             default=False,
-            help='Remove a layer if it is broken.',
+            help="Skip the layers already checked in the report, except the ones the check failed for.",
+        )
+        parser.add_argument("--csv", dest="csv", default=None, help="CSV file the whole report is written to.")
+        parser.add_argument(
+            "--batch-size", dest="batch_size", type=int, default=100, help="Number of broken layers removed at once."
         )
 
     def handle(self, **options):
-        if options['layername']:
-            layers = Dataset.objects.filter(name__icontains=options['layername'])
+        if options["layername"]:
+            layers = Dataset.objects.filter(name__icontains=options["layername"])
         else:
             layers = Dataset.objects.all()
-        if options['owner']:
-            layers = layers.filter(owner=get_user_model().objects.filter(username=options['owner']))
+        if options["owner"]:
+            layers = layers.filter(owner=get_user_model().objects.filter(username=options["owner"]))
 
+        rows = []
+        if options["report"] and options["resume"]:
+            rows = [row for row in read_report(options["report"]) if row.get("status") != STATUS_ERROR]
+            layers = layers.exclude(id__in=[row["id"] for row in rows])
         layers_count = layers.count()
-        count = 0
+        print(f"Checking {layers_count} layers, {len(rows)} already checked")
+
+        report = open(options["report"], "a") if options["report"] else None
+        # the rows of the layers checked in this run
+        checked = []
 
-        dataset_errors = []
-        for layer in layers:
-            count += 1
-            try:
+        def report_result(row):
+            checked.append(row)
+            rows.append(row)
+            count = len(checked)
+            if report:
+                report.write(f"{json.dumps(row)}\n")
+                report.flush()
+            if row["status"] != STATUS_OK:
                 print(
-                    f"Checking layer {count}/{layers_count}: {layer.alternate} owned by {layer.owner.username}"
+                    f"Checked layer {count}/{layers_count}: {row['alternate']} is {row['status']} {row['error'] or ''}"
                 )
-                if not is_gs_resource_valid(layer):
-                    print(f"Dataset {layer.alternate} is broken!")
-                    dataset_errors.append(layer)
-                    if options['remove']:
-                        print("Removing this layer...")
-                        layer.delete()
-            except Exception:
-                print("Unexpected error:", sys.exc_info()[0])
 
-        print(f"\n***** Layers with errors: {len(dataset_errors)} in a total of {layers_count} *****")
+        scanner = DatasetScanner(workers=options["workers"], rate=options["rate"], timeout=options["timeout"])
+        datasets = (
+            {"owner": row.pop("owner__username"), **row}
+            for row in layers.order_by("id").values("id", "alternate", "subtype", "owner__username").iterator()
+        )
+        try:
+            scanner.scan(datasets, report_result)
+        except Exception:
+            print("Unexpected error:", sys.exc_info()[1])
+        finally:
+            if report:
+                report.close()
+        if options["csv"]:
+            write_csv_report(rows, options["csv"])
+
+        dataset_errors = [row for row in rows if row["status"] == STATUS_BROKEN]
+        failed = len([row for row in rows if row["status"] == STATUS_ERROR])
+        print(f"\n***** Layers with errors: {len(dataset_errors)} in a total of {len(rows)} *****")
+        if failed:
+            print(f"The check failed for {failed} layers, they are checked again with --resume")
         for dataset_error in dataset_errors:
-            print(f"{dataset_error.alternate} by {dataset_error.owner.username}")
+            print(f"{dataset_error['alternate']} by {dataset_error['owner']}")
+
+        if options["remove"]:
+            # only the layers just found missing from the catalog, the resumed rows can be outdated
+            ids = [row["id"] for row in checked if row["status"] == STATUS_BROKEN and row["catalog"] is False]
+            kept = len([row for row in checked if row["status"] == STATUS_BROKEN]) - len(ids)
+            if kept:
+                print(f"Keeping {kept} broken layers still in the GeoServer catalog")
+            for start in range(0, len(ids), options["batch_size"]):
+                batch = ids[start : start + options["batch_size"]]
+                print(f"Removing the broken layers {start + 1}-{start + len(batch)}/{len(ids)}...")
+                for layer in layers.filter(id__in=batch):
+                    try:
+                        layer.delete()
+                    except Exception:
+                        print(f"Could not remove {layer.alternate}:", sys.exc_info()[1])
@@ -32,7 +32,7 @@ from geonode.layers.models import Dataset
 from geonode.base.models import ResourceBase
 from geonode.utils import get_dataset_workspace
 from geonode.services.enumerations import CASCADED
-from geonode.security.utils import skip_registered_members_common_group
+from geonode.security.utils import defer_security_sync, skip_registered_members_common_group
 from geonode.security.permissions import (
     VIEW_PERMISSIONS,
     OWNER_PERMISSIONS,
@@ -46,6 +46,7 @@ from .tasks import geoserver_set_style, geoserver_delete_map, geoserver_create_s
 from .helpers import (
     gs_catalog,
     set_time_info,
+    invalidate_dataset_catalog,
     ogc_server_settings,
     sync_instance_with_geoserver,
     create_gs_thumbnail,
@@ -73,9 +74,7 @@ class GeoServerResourceManager(ResourceManagerInterface):
             if hasattr(_real_instance, "subtype") and _real_instance.subtype not in ["tileStore", "remote"]:
                 try:
                     logger.debug(f"Searching GeoServer for layer '{_real_instance.alternate}'")
-                    # Let's reset the connections first
-                    gs_catalog._cache.clear()
-                    gs_catalog.reset()
+                    invalidate_dataset_catalog(_real_instance)
                     if gs_catalog.get_layer(_real_instance.alternate):
                         return True
                 except Exception as e:
@@ -130,7 +129,7 @@ class GeoServerResourceManager(ResourceManagerInterface):
     ) -> ResourceBase:
         if instance:
             if isinstance(instance.get_real_instance(), Dataset):
-                _synced_resource = sync_instance_with_geoserver(instance.id)
+                _synced_resource = sync_instance_with_geoserver(instance.id, overwrite=kwargs.get("overwrite", False))
                 instance = _synced_resource or instance
         return instance
 
@@ -173,7 +172,9 @@ class GeoServerResourceManager(ResourceManagerInterface):
                     if settings.OGC_SERVER["default"].get("GEOFENCE_SECURITY_ENABLED", False) or getattr(
                         settings, "GEOFENCE_SECURITY_ENABLED", False
                     ):
-                        if not getattr(settings, "DELAYED_SECURITY_SIGNALS", False):
+                        if defer_security_sync(_resource):
+                            logger.debug(f"GeoFence rules of resource {_resource} deferred")
+                        elif not getattr(settings, "DELAYED_SECURITY_SIGNALS", False):
                             batch = AutoPriorityBatch(
                                 gf_utils.get_first_available_priority(), f"Set permission for resource {_resource}"
                             )
@@ -0,0 +1,189 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Consistency scanner of the datasets published by GeoServer.
+
+Each dataset is checked against the GeoServer catalog, listed once with a single REST request, and with
+a cheap OGC probe: a DescribeFeatureType for the vector datasets, a 1x1 pixel GetMap for the other ones.
+The probes run concurrently on a bounded pool of threads, with a minimum interval between the requests
+sent to the same host and a timeout on each request. The results are appended to a JSON lines report as
+soon as they are known, so an interrupted scan can be resumed skipping the datasets already reported.
+"""
+import csv
+import json
+import time
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_BROKEN = "broken"
+STATUS_ERROR = "error"
+
+REPORT_FIELDS = ("id", "alternate", "owner", "subtype", "status", "catalog", "probe", "error", "elapsed")
+
+
+class HostRateLimiter:
+    """Spaces the requests sent to each host by at least 1 / rate seconds"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class DatasetScanner:
+    """
+    Checks the datasets against GeoServer with workers threads, sending at most rate requests per second
+    to each host and waiting timeout seconds at most for each response.
+    """
+
+    def __init__(self, workers=8, rate=20, timeout=10):
+        ogc_server = settings.OGC_SERVER["default"]
+        self.location = ogc_server["LOCATION"].rstrip("/")
+        self.auth = HTTPBasicAuth(ogc_server["USER"], ogc_server["PASSWORD"])
+        self.workers = workers
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(rate)
+        self._local = threading.local()
+
+    def _get(self, url, **kwargs):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.auth = self.auth
+        self.limiter.wait(url)
+        return session.get(url, timeout=self.timeout, **kwargs)
+
+    def get_catalog_layers(self):
+        """Returns the names, prefixed by their workspace, of all the layers of the GeoServer catalog"""
+        response = self._get(f"{self.location}/rest/layers.json")
+        response.raise_for_status()
+        layers = response.json().get("layers") or {}
+        # GeoServer lists an empty catalog as an empty string
+        return {layer["name"] for layer in (layers.get("layer", []) if isinstance(layers, dict) else [])}
+
+    def probe(self, dataset):
+        """Returns whether GeoServer can describe or render the dataset, raises an exception when it cannot tell"""
+        if dataset["subtype"] == "vector":
+            params = {
+                "service": "WFS",
+                "version": "1.0.0",
+                "request": "DescribeFeatureType",
+                "typeName": dataset["alternate"],
+            }
+        else:
+            params = {
+                "service": "WMS",
+                "version": "1.1.1",
+                "request": "GetMap",
+                "layers": dataset["alternate"],
+                "styles": "",
+                "srs": "EPSG:4326",
+                "bbox": "-180,-90,180,90",
+                "width": 1,
+                "height": 1,
+                "format": "image/png",
+            }
+        response = self._get(f"{self.location}/ows", params=params)
+        if response.status_code == 404:
+            return False
+        # e.g. the authentication or GeoServer failing, which tell nothing about the dataset
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        # the OGC services report the errors with a 200 OK exception document
+        if "ExceptionReport" in response.text[:1024]:
+            return False
+        return "xml" in content_type if dataset["subtype"] == "vector" else content_type.startswith("image/")
+
+    def check(self, dataset, catalog_layers):
+        """Returns the report row of the dataset, a dict with the REPORT_FIELDS"""
+        result = {field: dataset.get(field) for field in ("id", "alternate", "owner", "subtype")}
+        start = time.monotonic()
+        result["catalog"] = dataset["alternate"] in catalog_layers
+        try:
+            result["probe"] = self.probe(dataset)
+            result["status"] = STATUS_OK if result["catalog"] and result["probe"] else STATUS_BROKEN
+            result["error"] = None
+        except Exception as e:
+            result["probe"] = None
+            result["status"] = STATUS_ERROR
+            result["error"] = str(e) or e.__class__.__name__
+        result["elapsed"] = round(time.monotonic() - start, 3)
+        return result
+
+    def scan(self, datasets, callback):
+        """
+        Checks the datasets, dicts with the id, alternate, owner and subtype of the datasets,
+        calling callback with the report row of each one as soon as it is checked.
+        """
+        catalog_layers = self.get_catalog_layers()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # the datasets are submitted as the workers get free, so the pending ones are not held in memory
+            pending = set()
+            for dataset in datasets:
+                pending.add(executor.submit(self.check, dataset, catalog_layers))
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        callback(future.result())
+            for future in pending:
+                callback(future.result())
+
+
+def read_report(path):
+    """Returns the report rows stored in the JSON lines file, an empty list when it does not exist"""
+    rows = []
+    try:
+        with open(path) as report:
+            for line in report:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # the last line of an interrupted scan can be truncated
+                    logger.debug(f"Skipping an invalid line of the report {path}")
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+def write_csv_report(rows, path):
+    with open(path, "w", newline="") as report:
+        writer = csv.DictWriter(report, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
@@ -35,6 +35,7 @@ from django.contrib.auth.models import Group
 from django.contrib.auth import get_user_model
 from geonode.geoserver.geofence import Batch, Rule, AutoPriorityBatch
 from geonode.geoserver.helpers import geofence, gf_utils, gs_catalog
+from geonode.geoserver.tilecache import request_truncate
 from geonode.groups.models import GroupProfile
 from geonode.utils import get_dataset_workspace
 from geonode.security.registry import permissions_registry
@@ -198,30 +199,16 @@ def delete_dataset_cache(dataset_name):
             return False
 
 
-def set_geowebcache_invalidate_cache(dataset_alternate, cat=None):
-    """invalidate GeoWebCache Cache Rules"""
+def set_geowebcache_invalidate_cache(dataset_alternate, cat=None, bbox=None):
+    """invalidate GeoWebCache Cache Rules
+
+    The truncation is scheduled and sent together with the other ones requested for the layer,
+    limited to the bbox, in EPSG:4326, when known.
+    """
     if dataset_alternate is not None and len(dataset_alternate) and "None" not in dataset_alternate:
         try:
             if cat is None or cat.get_layer(dataset_alternate) is not None:
-                url = settings.OGC_SERVER["default"]["LOCATION"]
-                user = settings.OGC_SERVER["default"]["USER"]
-                passwd = settings.OGC_SERVER["default"]["PASSWORD"]
-                """
-                curl -v -u admin:geoserver \
-                -H "Content-type: text/xml" \
-                -d "<truncateLayer><layerName>{dataset_alternate}</layerName></truncateLayer>" \
-                http://localhost:8080/geoserver/gwc/rest/masstruncate
-                """
-                headers = {"Content-type": "text/xml"}
-                payload = f"<truncateLayer><layerName>{dataset_alternate}</layerName></truncateLayer>"
-                r = requests.post(
-                    f"{url.rstrip('/')}/gwc/rest/masstruncate",
-                    headers=headers,
-                    data=payload,
-                    auth=HTTPBasicAuth(user, passwd),
-                )
-                if r.status_code < 200 or r.status_code > 201:
-                    logger.debug(f"Could not Truncate GWC Cache for Dataset '{dataset_alternate}'.")
+                request_truncate(dataset_alternate, bbox=bbox)
         except Exception:
             tb = traceback.format_exc()
             logger.debug(tb)
@@ -327,6 +314,49 @@ def create_geofence_rules(layer, perms, user=None, group=None, batch: Batch = No
     return batch
 
 
+def collect_dataset_geofence_rules(dataset, batch):
+    """Adds to the batch the operations replacing the GeoFence rules of the dataset with its permissions"""
+    gf_utils.collect_delete_layer_rules(get_dataset_workspace(dataset), dataset.name, batch)
+    perm_spec = permissions_registry.get_perms(instance=dataset)
+    # All the other users
+    if "users" in perm_spec:
+        for user, perms in perm_spec["users"].items():
+            user = get_user_model().objects.get(username=user)
+            # Set the GeoFence User Rules
+            geofence_user = str(user)
+            if "AnonymousUser" in geofence_user or str(get_anonymous_user()) in geofence_user:
+                geofence_user = None
+            create_geofence_rules(dataset, perms, user=geofence_user, batch=batch)
+    # All the other groups
+    if "groups" in perm_spec:
+        for group, perms in perm_spec["groups"].items():
+            group = Group.objects.get(name=group)
+            if group and group.name and group.name == "anonymous":
+                group = None
+            # Set the GeoFence Group Rules
+            create_geofence_rules(dataset, perms, group=group, batch=batch)
+
+
+def sync_datasets_geofence_rules(dataset_ids):
+    """
+    Syncs the GeoFence rules of the datasets with their permissions in a single batch.
+    The datasets are left in dirty state when the batch fails, to be synced again by synch_guardian.
+    """
+    from geonode.layers.models import Dataset
+
+    datasets = Dataset.objects.filter(id__in=dataset_ids)
+    batch = AutoPriorityBatch(gf_utils.get_first_available_priority(), f"Sync {len(dataset_ids)} resources")
+    for dataset in datasets:
+        collect_dataset_geofence_rules(dataset, batch)
+    try:
+        logger.info(f"Pushing {batch.length()} changes into GeoFence for {len(dataset_ids)} resources")
+        if geofence.run_batch(batch):
+            invalidate_geofence_cache()
+    except Exception as e:
+        logger.warning(f"Could not sync GeoFence for {len(dataset_ids)} resources: {e}. Retrying async.")
+        datasets.update(dirty_state=True)
+
+
 def sync_resources_with_guardian(resource=None, force=False):
     """
     Sync resources with Guardian and clear their dirty state
@@ -348,26 +378,7 @@ def sync_resources_with_guardian(resource=None, force=False):
         for dataset in datasets:
             try:
                 batch = AutoPriorityBatch(gf_utils.get_first_available_priority(), f"Sync resources {dataset}")
-
-                gf_utils.collect_delete_layer_rules(get_dataset_workspace(dataset), dataset.name, batch)
-                perm_spec = permissions_registry.get_perms(instance=dataset)
-                # All the other users
-                if "users" in perm_spec:
-                    for user, perms in perm_spec["users"].items():
-                        user = get_user_model().objects.get(username=user)
-                        # Set the GeoFence User Rules
-                        geofence_user = str(user)
-                        if "AnonymousUser" in geofence_user or str(get_anonymous_user()) in geofence_user:
-                            geofence_user = None
-                        create_geofence_rules(dataset, perms, user=geofence_user, batch=batch)
-                # All the other groups
-                if "groups" in perm_spec:
-                    for group, perms in perm_spec["groups"].items():
-                        group = Group.objects.get(name=group)
-                        if group and group.name and group.name == "anonymous":
-                            group = None
-                        # Set the GeoFence Group Rules
-                        create_geofence_rules(dataset, perms, group=group, batch=batch)
+                collect_dataset_geofence_rules(dataset, batch)
 
                 logger.info(f"Going to synch permissions in GeoFence for resource {dataset}")
                 rules_committed = geofence.run_batch(batch)
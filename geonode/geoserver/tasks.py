@@ -31,7 +31,16 @@ from geonode.base import enumerations
 from geonode.layers.models import Dataset
 from geonode.base.models import ResourceBase
 
+from .legends import render_default_legends
 from .security import sync_resources_with_guardian
+from .tilecache import (
+    seed_tiles,
+    truncate_tiles,
+    is_seeding_candidate,
+    pop_truncate_requests,
+    count_running_seed_tasks,
+    merge_truncate_requests,
+)
 from .helpers import (
     gs_slurp,
     gs_catalog,
@@ -350,6 +359,74 @@ def geoserver_delete_map(self, object_id):
                 lock.release()
 
 
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.geoserver.tasks.geoserver_truncate_tile_cache",
+    queue="geoserver.events",
+    expires=3600,
+    time_limit=600,
+    acks_late=False,
+    max_retries=5,
+    default_retry_delay=30,
+)
+def geoserver_truncate_tile_cache(self, layer_name, request):
+    """
+    Truncates the tiles of the layer requested since the task has been scheduled, then seeds them
+    again when the layer is popular.
+    """
+    request = merge_truncate_requests(request, pop_truncate_requests(layer_name))
+    try:
+        truncate_tiles(layer_name, request)
+    except Exception as e:
+        # the pending requests have been merged in the one retried
+        raise self.retry(args=(layer_name, request), exc=e)
+    if is_seeding_candidate(layer_name):
+        geoserver_seed_tile_cache.apply_async(args=(layer_name,), countdown=settings.GWC_TRUNCATE_DEBOUNCE)
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.geoserver.tasks.geoserver_seed_tile_cache",
+    queue="geoserver.events",
+    expires=3600,
+    time_limit=600,
+    acks_late=False,
+    max_retries=None,
+)
+def geoserver_seed_tile_cache(self, layer_name):
+    """
+    Seeds the tiles of the layer in its extent, waiting until less than GWC_SEED_MAX_RUNNING
+    seeding tasks are running in GeoWebCache.
+    """
+    if count_running_seed_tasks() >= settings.GWC_SEED_MAX_RUNNING:
+        if self.request.retries >= settings.GWC_SEED_MAX_WAIT // settings.GWC_SEED_RETRY_DELAY:
+            logger.warning(f"Seeding of the tiles of {layer_name} skipped, GeoWebCache is busy")
+            return
+        raise self.retry(countdown=settings.GWC_SEED_RETRY_DELAY)
+    dataset = Dataset.objects.filter(alternate=layer_name).only("ll_bbox_polygon").first()
+    bbox = dataset.ll_bbox_polygon.extent if dataset and dataset.ll_bbox_polygon else None
+    if seed_tiles(layer_name, bbox=bbox):
+        logger.debug(f"Seeding of the tiles of {layer_name} submitted")
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.geoserver.tasks.geoserver_render_legends",
+    queue="geoserver.events",
+    expires=3600,
+    time_limit=600,
+    acks_late=False,
+)
+def geoserver_render_legends(self, dataset_id):
+    """Renders the default legends of the styles of the dataset in the legends cache"""
+    dataset = Dataset.objects.filter(pk=dataset_id).first()
+    if dataset:
+        render_default_legends(dataset)
+
+
 @shared_task(
     bind=True,
     name="geonode.security.tasks.synch_guardian",
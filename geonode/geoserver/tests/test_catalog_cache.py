@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from geonode.geoserver.catalog_cache import SharedCacheCatalog, get_collection_path, get_rest_path
+
+SERVICE_URL = "http://localhost:8080/geoserver/rest"
+LAYER_XML = "<layer><name>geonode:roads</name></layer>"
+
+
+def response(status_code, content=b"", headers=None):
+    return MagicMock(status_code=status_code, content=content, headers=headers or {})
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "gs-catalog"}},
+    GEOSERVER_CATALOG_CACHE_FRESHNESS=60,
+    GEOSERVER_CATALOG_CACHE_TIMEOUT=3600,
+)
+class SharedCacheCatalogTest(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.catalog = SharedCacheCatalog(SERVICE_URL, "admin", "geoserver")
+        # another process sharing the same cache
+        self.other_catalog = SharedCacheCatalog(SERVICE_URL, "admin", "geoserver")
+        self.url = f"{SERVICE_URL}/layers/geonode:roads.xml"
+
+    def test_rest_paths(self):
+        self.assertEqual(get_rest_path(self.url), "layers/geonode:roads.xml")
+        self.assertEqual(
+            get_rest_path("https://public.org/geoserver/rest/layers/geonode%3Aroads.xml"), "layers/geonode:roads.xml"
+        )
+        self.assertEqual(get_collection_path("workspaces/geonode/styles/roads.xml"), "workspaces/geonode/styles.xml")
+        self.assertIsNone(get_collection_path("layers.xml"))
+
+    def test_responses_are_shared(self):
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(200, LAYER_XML.encode())) as http:
+            self.assertEqual(self.catalog.get_xml(self.url).find("name").text, "geonode:roads")
+            self.assertEqual(self.other_catalog.get_xml(self.url).find("name").text, "geonode:roads")
+        http.assert_called_once()
+
+    def test_stale_responses_are_revalidated(self):
+        headers = {"ETag": '"v1"'}
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(200, LAYER_XML.encode(), headers)):
+            self.catalog.get_xml(self.url)
+        self.catalog.revalidate()
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(304)) as http:
+            self.assertEqual(self.other_catalog.get_xml(self.url).find("name").text, "geonode:roads")
+            self.assertEqual(http.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+            # revalidated once for all the processes
+            self.catalog.get_xml(self.url)
+        http.assert_called_once()
+
+    def test_writes_invalidate_the_changed_objects_only(self):
+        styles_url = f"{SERVICE_URL}/styles.xml"
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(200, LAYER_XML.encode())):
+            self.catalog.get_xml(self.url)
+            self.catalog.get_xml(f"{SERVICE_URL}/layers.xml")
+            self.catalog.get_xml(styles_url)
+
+        layer = MagicMock(href=self.url, save_method="PUT")
+        layer.message.return_value = LAYER_XML
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(200)):
+            self.other_catalog.save(layer)
+
+        self.assertIsNone(self.catalog._cache.get(self.url))
+        self.assertIsNone(self.catalog._cache.get(f"{SERVICE_URL}/layers.xml"))
+        entry = self.catalog._cache.get(styles_url)
+        self.assertIsNotNone(entry)
+        self.assertTrue(self.catalog._cache.is_fresh(entry))
+
+    def test_reset_server_keeps_the_responses(self):
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(200, LAYER_XML.encode())):
+            self.catalog.get_xml(self.url)
+        with patch.object(SharedCacheCatalog, "http_request", return_value=response(200)) as http:
+            self.other_catalog.reset_server()
+        self.assertTrue(http.call_args.args[0].endswith("/reset"))
+        self.assertTrue(self.catalog._cache.is_fresh(self.catalog._cache.get(self.url)))
@@ -0,0 +1,95 @@
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from geonode.geoserver.legends import get_legend, get_legend_key, get_legend_params, invalidate_legends
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "legends"}},
+    LEGEND_CACHE_TIMEOUT=60,
+    LEGEND_MAX_SIZE=512,
+)
+class LegendCacheTest(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.dataset = MagicMock(pk=1, alternate="geonode:roads")
+        self.style = MagicMock(sld_body="<sld/>", sld_version="1.0.0")
+        self.style.name = "roads"
+
+    def test_legend_params(self):
+        params = get_legend_params({"WIDTH": "24", "Height": "24", "LAYER": "geonode:rivers", "service": "WMS"})
+        self.assertEqual(params, {"format": "image/png", "width": "24", "height": "24"})
+        self.assertIsNone(get_legend_params({"format": "text/html"}))
+        self.assertIsNone(get_legend_params({"width": "4096"}))
+        self.assertIsNone(get_legend_params({"height": "abc"}))
+
+    def test_key_follows_the_style_version(self):
+        params = get_legend_params({})
+        key = get_legend_key(self.dataset, self.style, params)
+        self.assertEqual(get_legend_key(self.dataset, self.style, params), key)
+        self.assertNotEqual(get_legend_key(self.dataset, self.style, get_legend_params({"width": "40"})), key)
+
+        self.style.sld_body = "<sld version='1.1.0'/>"
+        updated_key = get_legend_key(self.dataset, self.style, params)
+        self.assertNotEqual(updated_key, key)
+        invalidate_legends(self.dataset)
+        self.assertNotEqual(get_legend_key(self.dataset, self.style, params), updated_key)
+
+    @patch("geonode.geoserver.legends.requests")
+    def test_legend_is_rendered_once(self, http):
+        http.get.return_value = MagicMock(status_code=200, content=b"png", headers={"Content-Type": "image/png"})
+        params = get_legend_params({})
+        for _ in range(3):
+            legend, _ = get_legend(self.dataset, self.style, params)
+            self.assertEqual(legend, (b"png", "image/png"))
+        self.assertEqual(http.get.call_count, 1)
+        self.assertEqual(http.get.call_args.kwargs["params"]["style"], "roads")
+
+        invalidate_legends(self.dataset)
+        get_legend(self.dataset, self.style, params)
+        self.assertEqual(http.get.call_count, 2)
+
+    @patch("geonode.geoserver.legends.requests")
+    def test_service_exceptions_are_not_cached(self, http):
+        http.get.return_value = MagicMock(
+            status_code=200, content=b"<ServiceExceptionReport/>", headers={"Content-Type": "application/xml"}
+        )
+        params = get_legend_params({})
+        self.assertIsNone(get_legend(self.dataset, self.style, params)[0])
+        self.assertIsNone(get_legend(self.dataset, self.style, params)[0])
+        self.assertEqual(http.get.call_count, 2)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}, LEGEND_CACHE_ENABLED=True
+    )
+    def test_legend_cache_requires_a_shared_cache(self):
+        from geonode.geoserver.legends import is_legend_cache_enabled
+
+        self.assertFalse(is_legend_cache_enabled())
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": os.path.join(tempfile.gettempdir(), "geonode-legends"),
+            }
+        },
+        LEGEND_CACHE_ENABLED=True,
+        SITEURL="http://localhost:8000/",
+    )
+    def test_legend_url_follows_the_style_version(self):
+        from geonode.geoserver.legends import get_style_version, is_legend_cache_enabled
+        from geonode.utils import get_legend_url
+
+        self.assertTrue(is_legend_cache_enabled())
+        self.dataset.default_style = self.style
+        url = get_legend_url(self.dataset, "roads")
+        self.assertTrue(url.startswith("http://localhost:8000/"))
+        self.assertIn(f"&v={get_style_version(self.style)}", url)
+        self.style.sld_body = "<sld version='1.1.0'/>"
+        self.assertNotEqual(get_legend_url(self.dataset, "roads"), url)
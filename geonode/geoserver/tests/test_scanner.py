@@ -0,0 +1,71 @@
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from geonode.geoserver.scanner import (
+    STATUS_BROKEN,
+    STATUS_ERROR,
+    STATUS_OK,
+    DatasetScanner,
+    HostRateLimiter,
+    read_report,
+)
+
+CATALOG = {"layers": {"layer": [{"name": "geonode:roads"}, {"name": "geonode:dem"}, {"name": "geonode:rivers"}]}}
+
+
+def fake_get(url, params=None, **kwargs):
+    if url.endswith("/rest/layers.json"):
+        return MagicMock(status_code=200, json=lambda: CATALOG)
+    layer = params.get("typeName") or params.get("layers")
+    if layer == "geonode:rivers":
+        return MagicMock(status_code=200, text="<ows:ExceptionReport/>", headers={"Content-Type": "text/xml"})
+    if layer == "geonode:lakes":
+        raise TimeoutError("timed out")
+    content_type = "text/xml; subtype=gml/2.1.2" if params["service"] == "WFS" else "image/png"
+    return MagicMock(status_code=200, text="", headers={"Content-Type": content_type})
+
+
+class DatasetScannerTest(SimpleTestCase):
+    @patch("geonode.geoserver.scanner.requests")
+    def test_scan(self, http):
+        http.Session.return_value.get.side_effect = fake_get
+        datasets = [
+            {"id": 1, "alternate": "geonode:roads", "owner": "admin", "subtype": "vector"},
+            {"id": 2, "alternate": "geonode:dem", "owner": "admin", "subtype": "raster"},
+            {"id": 3, "alternate": "geonode:rivers", "owner": "admin", "subtype": "vector"},
+            {"id": 4, "alternate": "geonode:missing", "owner": "admin", "subtype": "vector"},
+            {"id": 5, "alternate": "geonode:lakes", "owner": "admin", "subtype": "vector"},
+        ]
+        rows = []
+        DatasetScanner(workers=2, rate=None).scan(datasets, rows.append)
+
+        by_id = {row["id"]: row for row in rows}
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(by_id[1]["status"], STATUS_OK)
+        self.assertEqual(by_id[2]["status"], STATUS_OK)
+        self.assertEqual(by_id[3]["status"], STATUS_BROKEN)
+        self.assertFalse(by_id[3]["probe"])
+        self.assertEqual(by_id[4]["status"], STATUS_BROKEN)
+        self.assertFalse(by_id[4]["catalog"])
+        self.assertEqual(by_id[5]["status"], STATUS_ERROR)
+        self.assertEqual(by_id[5]["error"], "timed out")
+
+    @patch("geonode.geoserver.scanner.time")
+    def test_rate_limit(self, clock):
+        clock.monotonic.return_value = 100.0
+        limiter = HostRateLimiter(rate=4)
+        limiter.wait("http://geoserver:8080/geoserver/ows")
+        limiter.wait("http://geoserver:8080/geoserver/rest/layers.json")
+        limiter.wait("http://other:8080/geoserver/ows")
+        clock.sleep.assert_called_once_with(0.25)
+
+    def test_read_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.jsonl")
+            self.assertEqual(read_report(path), [])
+            with open(path, "w") as report:
+                report.write('{"id": 1, "status": "ok"}\n{"id": 2, "sta')
+            self.assertEqual(read_report(path), [{"id": 1, "status": "ok"}])
@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from geonode.geoserver.tilecache import (
+    make_truncate_request,
+    merge_truncate_requests,
+    pop_truncate_requests,
+    request_truncate,
+    truncate_tiles,
+)
+
+LAYER_XML = b"""<GeoServerLayer>
+  <name>geonode:roads</name>
+  <mimeFormats><string>image/png</string><string>image/jpeg</string></mimeFormats>
+  <gridSubsets>
+    <gridSubset><gridSetName>EPSG:4326</gridSetName></gridSubset>
+    <gridSubset><gridSetName>EPSG:900913</gridSetName></gridSubset>
+  </gridSubsets>
+</GeoServerLayer>"""
+
+STYLED_LAYER_XML = b"""<GeoServerLayer>
+  <name>geonode:roads</name>
+  <mimeFormats><string>image/png</string></mimeFormats>
+  <gridSubsets><gridSubset><gridSetName>EPSG:4326</gridSetName></gridSubset></gridSubsets>
+  <parameterFilters>
+    <styleParameterFilter>
+      <key>STYLES</key>
+      <defaultValue>roads</defaultValue>
+      <styles class="sorted-set"><string>roads</string><string>roads_red</string></styles>
+    </styleParameterFilter>
+    %s
+  </parameterFilters>
+</GeoServerLayer>"""
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "gwc"}},
+    GWC_TRUNCATE_DEBOUNCE=10,
+)
+class TileCacheTest(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_merge_truncate_requests(self):
+        first = make_truncate_request([0, 0, 10, 10], 2, 8)
+        second = make_truncate_request([-5, 5, 5, 20], 4, 12)
+        self.assertEqual(
+            merge_truncate_requests(first, second),
+            {"full": False, "bbox": [-5.0, 0.0, 10.0, 20.0], "zoom_start": 2, "zoom_stop": 12},
+        )
+        self.assertIsNone(merge_truncate_requests(first, make_truncate_request([1, 1, 2, 2]))["zoom_stop"])
+        self.assertTrue(merge_truncate_requests(first, make_truncate_request())["full"])
+        self.assertEqual(merge_truncate_requests(None, first), first)
+
+    @patch("geonode.geoserver.tasks.geoserver_truncate_tile_cache.apply_async")
+    def test_requests_are_coalesced(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            request_truncate("geonode:roads", bbox=[0, 0, 10, 10])
+            request_truncate("geonode:roads", bbox=[20, 20, 30, 30])
+            request_truncate("geonode:rivers")
+        self.assertEqual(apply_async.call_count, 2)
+        self.assertEqual(pop_truncate_requests("geonode:roads")["bbox"], [0.0, 0.0, 30.0, 30.0])
+        self.assertIsNone(pop_truncate_requests("geonode:roads"))
+        self.assertTrue(pop_truncate_requests("geonode:rivers")["full"])
+
+    @patch("geonode.geoserver.tilecache.requests")
+    def test_truncate_bbox_on_each_gridset(self, http):
+        http.get.return_value = MagicMock(status_code=200, content=LAYER_XML)
+        truncate_tiles("geonode:roads", make_truncate_request([0, 0, 10, 10], zoom_stop=25))
+
+        seed_requests = [call.kwargs["json"]["seedRequest"] for call in http.post.call_args_list]
+        self.assertEqual(len(seed_requests), 4)
+        self.assertTrue(all(seed_request["type"] == "truncate" for seed_request in seed_requests))
+        by_gridset = {seed_request["gridSetId"]: seed_request for seed_request in seed_requests}
+        self.assertEqual(by_gridset["EPSG:4326"]["bounds"]["coords"]["double"], [0.0, 0.0, 10.0, 10.0])
+        self.assertEqual(by_gridset["EPSG:4326"]["zoomStop"], 21)
+        self.assertEqual(by_gridset["EPSG:900913"]["zoomStop"], 25)
+        self.assertAlmostEqual(by_gridset["EPSG:900913"]["bounds"]["coords"]["double"][2], 1113194.9, places=0)
+
+    @patch("geonode.geoserver.tilecache.requests")
+    def test_full_truncation(self, http):
+        truncate_tiles("geonode:roads", make_truncate_request())
+        http.get.assert_not_called()
+        self.assertTrue(http.post.call_args.args[0].endswith("/gwc/rest/masstruncate"))
+
+    @patch("geonode.geoserver.tilecache.requests")
+    def test_truncate_each_parameter_set(self, http):
+        http.get.return_value = MagicMock(status_code=200, content=STYLED_LAYER_XML % b"")
+        truncate_tiles("geonode:roads", make_truncate_request([0, 0, 10, 10]))
+
+        seed_requests = [call.kwargs["json"]["seedRequest"] for call in http.post.call_args_list]
+        # the tiles of the default style and of the other one
+        self.assertEqual(len(seed_requests), 2)
+        self.assertNotIn("parameters", seed_requests[0])
+        self.assertEqual(seed_requests[1]["parameters"], {"entry": [{"string": ["STYLES", "roads_red"]}]})
+
+    @patch("geonode.geoserver.tilecache.requests")
+    def test_full_truncation_with_unknown_parameters(self, http):
+        regex_filter = b"<regexParameterFilter><key>CQL_FILTER</key><regex>.*</regex></regexParameterFilter>"
+        http.get.return_value = MagicMock(status_code=200, content=STYLED_LAYER_XML % regex_filter)
+        truncate_tiles("geonode:roads", make_truncate_request([0, 0, 10, 10]))
+
+        self.assertEqual(http.post.call_count, 1)
+        self.assertTrue(http.post.call_args.args[0].endswith("/gwc/rest/masstruncate"))
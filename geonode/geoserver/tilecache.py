@@ -0,0 +1,338 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Management of the GeoWebCache tiles of the layers.
+
+The truncations requested for a layer within GWC_TRUNCATE_DEBOUNCE seconds are merged and sent
+together: the whole layer is truncated when one of them does not know the area it affects, otherwise
+only the union of their bounding boxes and zoom levels is truncated on each gridset of the layer,
+for each combination of the values its parameter filters allow. The layers whose parameter filters
+do not list their values, e.g. a regular expression, are always truncated as a whole, since the
+parameters their tiles are cached with are not known.
+After the truncation the tiles of the popular layers are seeded again in background on the
+GWC_SEED_GRIDSETS, with no more than GWC_SEED_MAX_RUNNING seeding tasks running in GeoWebCache.
+"""
+import time
+import logging
+from functools import lru_cache
+from itertools import product
+from urllib.parse import quote
+
+import requests
+from defusedxml import ElementTree
+from requests.auth import HTTPBasicAuth
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+TRUNCATE_PENDING_PREFIX = "gwc_truncate_pending"
+TRUNCATE_LOCK_PREFIX = "gwc_truncate_lock"
+
+# SRID and last zoom level of the gridsets GeoWebCache defines by default
+KNOWN_GRIDSETS = {
+    "EPSG:4326": (4326, 21),
+    "EPSG:900913": (3857, 30),
+    "WebMercatorQuad": (3857, 24),
+}
+
+# maximum number of combinations of the parameters of a layer truncated one by one
+MAX_TRUNCATE_PARAMETER_SETS = 32
+
+# status of the GeoWebCache seeding tasks
+SEED_STATUS = {-1: "aborted", 0: "pending", 1: "running", 2: "done"}
+
+
+def get_gwc_url(path):
+    return f"{settings.OGC_SERVER['default']['LOCATION'].rstrip('/')}/gwc/rest/{path}"
+
+
+def _get_auth():
+    return HTTPBasicAuth(settings.OGC_SERVER["default"]["USER"], settings.OGC_SERVER["default"]["PASSWORD"])
+
+
+@lru_cache(maxsize=8)
+def _get_transformer(target_srid):
+    from pyproj import Transformer
+
+    return Transformer.from_crs("EPSG:4326", f"EPSG:{target_srid}", always_xy=True)
+
+
+def get_gridset_bounds(bbox, srid):
+    """Returns the EPSG:4326 bbox [minx, miny, maxx, maxy] in the CRS of a gridset"""
+    minx, miny, maxx, maxy = bbox
+    if srid == 4326:
+        return [minx, miny, maxx, maxy]
+    if srid == 3857:
+        miny, maxy = max(miny, -85.0511), min(maxy, 85.0511)
+    xs, ys = _get_transformer(srid).transform([minx, minx, maxx, maxx], [miny, maxy, miny, maxy])
+    return [min(xs), min(ys), max(xs), max(ys)]
+
+
+def make_truncate_request(bbox=None, zoom_start=None, zoom_stop=None):
+    """
+    Returns the description of the tiles to truncate: bbox is [minx, miny, maxx, maxy] in EPSG:4326,
+    the whole layer is truncated when it is not known
+    """
+    if not bbox:
+        return {"full": True}
+    return {"full": False, "bbox": [float(value) for value in bbox], "zoom_start": zoom_start, "zoom_stop": zoom_stop}
+
+
+def merge_truncate_requests(first, second):
+    """Returns the request covering the tiles of both the requests"""
+    if first is None or second is None:
+        return first or second
+    if first["full"] or second["full"]:
+        return {"full": True}
+    bbox = [
+        min(first["bbox"][0], second["bbox"][0]),
+        min(first["bbox"][1], second["bbox"][1]),
+        max(first["bbox"][2], second["bbox"][2]),
+        max(first["bbox"][3], second["bbox"][3]),
+    ]
+    # a missing zoom level means all of them
+    zoom_start = zoom_stop = None
+    if first["zoom_start"] is not None and second["zoom_start"] is not None:
+        zoom_start = min(first["zoom_start"], second["zoom_start"])
+    if first["zoom_stop"] is not None and second["zoom_stop"] is not None:
+        zoom_stop = max(first["zoom_stop"], second["zoom_stop"])
+    return make_truncate_request(bbox, zoom_start, zoom_stop)
+
+
+def _acquire_layer_lock(layer_name, attempts=50):
+    for _ in range(attempts):
+        if cache.add(f"{TRUNCATE_LOCK_PREFIX}:{layer_name}", True, 10):
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _release_layer_lock(layer_name):
+    cache.delete(f"{TRUNCATE_LOCK_PREFIX}:{layer_name}")
+
+
+def request_truncate(layer_name, bbox=None, zoom_start=None, zoom_stop=None):
+    """
+    Schedules the truncation of the tiles of the layer in the bbox, in EPSG:4326, and zoom levels.
+    The requests received for the same layer until the truncation runs are sent together.
+    """
+    if not layer_name or "None" in layer_name:
+        return
+    from geonode.geoserver.tasks import geoserver_truncate_tile_cache
+
+    request = make_truncate_request(bbox, zoom_start, zoom_stop)
+    schedule = True
+    if _acquire_layer_lock(layer_name):
+        try:
+            key = f"{TRUNCATE_PENDING_PREFIX}:{layer_name}"
+            pending = cache.get(key)
+            request = merge_truncate_requests(pending, request)
+            cache.set(key, request, settings.GWC_TRUNCATE_DEBOUNCE * 10)
+            # the task scheduled with the first request sends the pending ones too
+            schedule = pending is None
+        finally:
+            _release_layer_lock(layer_name)
+    if schedule:
+        transaction.on_commit(
+            lambda: geoserver_truncate_tile_cache.apply_async(
+                args=(layer_name, request), countdown=settings.GWC_TRUNCATE_DEBOUNCE
+            )
+        )
+
+
+def pop_truncate_requests(layer_name):
+    """Returns the merged requests pending for the layer and removes them"""
+    key = f"{TRUNCATE_PENDING_PREFIX}:{layer_name}"
+    locked = _acquire_layer_lock(layer_name)
+    try:
+        pending = cache.get(key)
+        cache.delete(key)
+    finally:
+        if locked:
+            _release_layer_lock(layer_name)
+    return pending
+
+
+def get_parameter_sets(root):
+    """
+    Returns the combinations of the values allowed by the parameter filters of the tile layer, as dicts
+    of the parameters differing from their default values, None when a filter does not list its values.
+    """
+    choices = []
+    for parameter_filter in root.findall("parameterFilters/*"):
+        key = parameter_filter.findtext("key")
+        default = parameter_filter.findtext("defaultValue") or ""
+        values = [
+            value.text or ""
+            for value in parameter_filter.findall("values/*")
+            + parameter_filter.findall("styles/string")
+            + parameter_filter.findall("availableStyles/string")
+        ]
+        if not key or not values:
+            return None
+        choices.append([(key, value) for value in dict.fromkeys(values) if value != default])
+    sets_count = 1
+    for values in choices:
+        sets_count *= len(values) + 1
+    if sets_count > MAX_TRUNCATE_PARAMETER_SETS:
+        return None
+    # the missing parameters take their default values
+    return [dict(filter(None, values)) for values in product(*[[None] + values for values in choices])]
+
+
+def get_layer_tiling(layer_name):
+    """
+    Returns the gridsets, formats and parameter sets, see get_parameter_sets, of the tile layer,
+    None when the layer is not cached
+    """
+    response = requests.get(get_gwc_url(f"layers/{quote(layer_name)}.xml"), auth=_get_auth(), timeout=30)
+    if response.status_code != 200:
+        return None
+    root = ElementTree.fromstring(response.content)
+    gridsets = [name.text for name in root.findall("gridSubsets/gridSubset/gridSetName")]
+    formats = [mime.text for mime in root.findall("mimeFormats/string")]
+    return gridsets, formats, get_parameter_sets(root)
+
+
+def _post_seed_request(
+    layer_name, gridset, image_format, type_, zoom_start, zoom_stop, bounds=None, threads=1, parameters=None
+):
+    seed_request = {
+        "name": layer_name,
+        "gridSetId": gridset,
+        "format": image_format,
+        "type": type_,
+        "zoomStart": zoom_start,
+        "zoomStop": zoom_stop,
+        "threadCount": threads,
+    }
+    if bounds:
+        seed_request["bounds"] = {"coords": {"double": bounds}}
+    if parameters:
+        seed_request["parameters"] = {"entry": [{"string": [key, value]} for key, value in parameters.items()]}
+    response = requests.post(
+        get_gwc_url(f"seed/{quote(layer_name)}.json"),
+        json={"seedRequest": seed_request},
+        auth=_get_auth(),
+        timeout=30,
+    )
+    response.raise_for_status()
+
+
+def truncate_layer(layer_name):
+    """Removes all the tiles of the layer"""
+    response = requests.post(
+        get_gwc_url("masstruncate"),
+        headers={"Content-type": "text/xml"},
+        data=f"<truncateLayer><layerName>{layer_name}</layerName></truncateLayer>",
+        auth=_get_auth(),
+        timeout=30,
+    )
+    if response.status_code < 200 or response.status_code > 201:
+        logger.debug(f"Could not Truncate GWC Cache for Dataset '{layer_name}'.")
+
+
+def truncate_tiles(layer_name, request):
+    """Removes the tiles of the layer described by the request, see make_truncate_request"""
+    tiling = None if request["full"] else get_layer_tiling(layer_name)
+    # the extent of the custom gridsets is not known, nor the parameters of the tiles of some filters
+    if not tiling or tiling[2] is None or any(gridset not in KNOWN_GRIDSETS for gridset in tiling[0]):
+        truncate_layer(layer_name)
+        return
+    gridsets, formats, parameter_sets = tiling
+    for gridset in gridsets:
+        srid, last_zoom = KNOWN_GRIDSETS[gridset]
+        zoom_start = request["zoom_start"] if request["zoom_start"] is not None else 0
+        zoom_stop = min(request["zoom_stop"], last_zoom) if request["zoom_stop"] is not None else last_zoom
+        bounds = get_gridset_bounds(request["bbox"], srid)
+        for image_format in formats:
+            for parameters in parameter_sets:
+                _post_seed_request(
+                    layer_name, gridset, image_format, "truncate", zoom_start, zoom_stop, bounds, parameters=parameters
+                )
+
+
+def get_dataset_bbox(dataset):
+    """Returns the bbox [minx, miny, maxx, maxy] in EPSG:4326 of the dataset, None when not known"""
+    polygon = getattr(dataset, "ll_bbox_polygon", None)
+    if not polygon or (polygon.srid and polygon.srid != 4326):
+        return None
+    return list(polygon.extent)
+
+
+def is_seeding_candidate(layer_name):
+    """Whether the tiles of the layer are seeded after being truncated"""
+    if not settings.GWC_SEED_ENABLED:
+        return False
+    from geonode.layers.models import Dataset
+
+    return Dataset.objects.filter(
+        alternate=layer_name, popular_count__gte=settings.GWC_SEED_MIN_POPULARITY, subtype__in=["vector", "raster"]
+    ).exists()
+
+
+def get_seed_progress(layer_name=None):
+    """
+    Returns the GeoWebCache seeding tasks of the layer, of all the layers when None, as a list of
+    {"task_id", "tiles_done", "tiles_total", "time_remaining", "status"}
+    """
+    path = f"seed/{quote(layer_name)}.json" if layer_name else "seed.json"
+    response = requests.get(get_gwc_url(path), auth=_get_auth(), timeout=30)
+    response.raise_for_status()
+    return [
+        {
+            "task_id": task[3],
+            "tiles_done": task[0],
+            "tiles_total": task[1],
+            "time_remaining": task[2],
+            "status": SEED_STATUS.get(task[4], task[4]),
+        }
+        for task in response.json().get("long-array-array", [])
+    ]
+
+
+def count_running_seed_tasks():
+    return sum(1 for task in get_seed_progress() if task["status"] in ("pending", "running"))
+
+
+def seed_tiles(layer_name, bbox=None):
+    """Submits the seeding of the layer, limited to the bbox in EPSG:4326 when given, on the GWC_SEED_GRIDSETS"""
+    tiling = get_layer_tiling(layer_name)
+    if not tiling:
+        return False
+    gridsets, formats, _ = tiling
+    image_format = settings.GWC_SEED_FORMAT if settings.GWC_SEED_FORMAT in formats else formats[0]
+    for gridset in settings.GWC_SEED_GRIDSETS:
+        if gridset not in gridsets:
+            continue
+        bounds = get_gridset_bounds(bbox, KNOWN_GRIDSETS[gridset][0]) if bbox and gridset in KNOWN_GRIDSETS else None
+        _post_seed_request(
+            layer_name,
+            gridset,
+            image_format,
+            "seed",
+            settings.GWC_SEED_ZOOM_START,
+            settings.GWC_SEED_ZOOM_STOP,
+            bounds,
+            threads=settings.GWC_SEED_THREADS,
+        )
+    return True
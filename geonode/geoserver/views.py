@@ -57,6 +57,7 @@ from geonode.utils import (
 from geonode.geoserver.signals import geoserver_post_save_local
 from .helpers import (
     get_stores,
+    gs_catalog,
     ogc_server_settings,
     style_update,
     ows_endpoint_in_path,
@@ -302,6 +303,9 @@ def geoserver_proxy(request, proxy_path, downstream_path, workspace=None, layern
         access_token=access_token,
         **kwargs,
     )
+    if re.match(r"^.*(?<!/rest/)/rest/", url.path) and request.method in ("POST", "PUT", "DELETE"):
+        # the catalog objects changed through the REST proxy
+        gs_catalog.invalidate(url.geturl())
     return response
 
 
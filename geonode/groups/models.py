@@ -299,7 +299,7 @@ class GroupMember(models.Model):
         from geonode.security.utils import AdvancedSecurityWorkflowManager
 
         if not AdvancedSecurityWorkflowManager.is_auto_publishing_workflow():
-            AdvancedSecurityWorkflowManager.set_group_member_permissions(self.user, self.group, role)
+            AdvancedSecurityWorkflowManager.schedule_group_member_permissions(self.user, self.group, role)
 
 
 def group_pre_delete(instance, sender, **kwargs):
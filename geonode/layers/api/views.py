@@ -26,7 +26,7 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticate
 from rest_framework.response import Response
 
 from geonode.base.api.filters import DynamicSearchFilter, ExtentFilter
-from geonode.base.api.mixins import AdvertisedListMixin
+from geonode.base.api.mixins import AdvertisedListMixin, AnonymousResponseCacheMixin, ConditionalGetMixin
 from geonode.base.api.pagination import GeoNodeApiPagination
 from geonode.base.api.permissions import UserHasPerms
 from geonode.base.api.views import ApiPresetsInitializer
@@ -39,6 +39,7 @@ from geonode.resource.manager import resource_manager
 from rest_framework.exceptions import NotFound
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
+from django.utils.http import http_date
 
 from geonode.storage.manager import StorageManager
 
@@ -61,7 +62,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class DatasetViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin):
+class DatasetViewSet(
+    AnonymousResponseCacheMixin, ConditionalGetMixin, ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin
+):
     """
     API endpoint that allows layers to be viewed or edited.
     """
@@ -81,6 +84,7 @@ class DatasetViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListM
     queryset = Dataset.objects.all().order_by("-created")
     serializer_class = DatasetSerializer
     pagination_class = GeoNodeApiPagination
+    response_cache_types = ["dataset"]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -195,6 +199,28 @@ class DatasetViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListM
         resources = dataset.maps
         return Response(SimpleMapSerializer(many=True).to_representation(resources))
 
+    @extend_schema(
+        methods=["get"],
+        description="API endpoint allowing to retrieve the profile of the data of the dataset.",
+    )
+    @action(detail=True, methods=["get"])
+    def profile(self, request, pk=None, *args, **kwargs):
+        """
+        Returns the schema of the dataset and the statistics, most common values and histograms of its attributes
+        """
+        from geonode.layers.profile import get_dataset_profile
+
+        dataset_profile = get_dataset_profile(self.get_object())
+        if not dataset_profile:
+            raise NotFound(detail=f"The profile of the dataset {pk} has not been computed")
+        etag = f'"{dataset_profile.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag})
+        return Response(
+            {"version": dataset_profile.version, **dataset_profile.profile},
+            headers={"ETag": etag, "Last-Modified": http_date(dataset_profile.last_updated.timestamp())},
+        )
+
     @action(
         detail=True,
         url_path="timeseries",
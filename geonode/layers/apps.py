@@ -59,5 +59,11 @@ class DatasetAppConfig(NotificationsAppConfigBase, AppConfig):
         ),
     )
 
+    def ready(self):
+        super().ready()
+        from geonode.layers.vectortiles import connect_vector_tiles_signals
+
+        connect_vector_tiles_signals()
+
 
 default_app_config = "geonode.layers.DatasetAppConfig"
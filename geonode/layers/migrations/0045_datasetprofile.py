@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("layers", "0044_alter_dataset_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatasetProfile",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "version",
+                    models.CharField(help_text="version of the data profiled", max_length=32, verbose_name="version"),
+                ),
+                ("profile", models.JSONField(default=dict, verbose_name="profile")),
+                ("last_updated", models.DateTimeField(auto_now=True, verbose_name="last updated")),
+                (
+                    "dataset",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="profile", to="layers.dataset"
+                    ),
+                ),
+            ],
+        ),
+    ]
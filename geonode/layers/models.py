@@ -354,6 +354,14 @@ class Dataset(ResourceBase):
 
         return MapLayer.objects.filter(name=self.alternate)
 
+    def set_ll_bbox_polygon(self, bbox, srid="EPSG:4326"):
+        previous_extent = self.ll_bbox_polygon.extent if self.ll_bbox_polygon else None
+        super().set_ll_bbox_polygon(bbox, srid=srid)
+        if self.id and self.ll_bbox_polygon.extent != previous_extent:
+            from geonode.maps.models import update_maps_bbox
+
+            update_maps_bbox(dataset_ids=[self.id])
+
     @classproperty
     def allowed_permissions(cls):
         return {
@@ -601,3 +609,18 @@ class Attribute(models.Model):
 
     def unique_values_as_list(self):
         return self.unique_values.split(",")
+
+
+class DatasetProfile(models.Model):
+    """
+    Profile of the data of a dataset: its schema and the statistics, distinct values and histograms
+    of its attributes, computed from the datastore when the dataset is imported or synchronized.
+    """
+
+    dataset = models.OneToOneField(Dataset, on_delete=models.CASCADE, related_name="profile")
+    version = models.CharField(_("version"), max_length=32, help_text=_("version of the data profiled"))
+    profile = models.JSONField(_("profile"), default=dict)
+    last_updated = models.DateTimeField(_("last updated"), auto_now=True)
+
+    def __str__(self):
+        return f"{self.dataset} ({self.version})"
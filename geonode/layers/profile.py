@@ -0,0 +1,259 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Profiles of the data of the datasets stored in the datastore database.
+
+The profile of a dataset holds its schema and, for each attribute, the count, minimum, maximum,
+average, standard deviation and sum of the values, computed with a single aggregate query on the table,
+along with its most common values, the bounds of an equi-depth histogram and an estimate of the median
+of the numeric values read from the statistics PostgreSQL collects when analyzing the table, which is
+only analyzed when they are missing, e.g. just after it is created. It is stored as JSON in the DatasetProfile
+of the dataset under a new version each time the dataset is imported or synchronized, so the feature
+catalogue, the attributes statistics and the clients building filters never query GeoServer for them.
+"""
+import logging
+from decimal import Decimal
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connections
+
+from geonode.layers.vectortiles import get_datastore
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_TYPES = {"smallint", "integer", "bigint", "numeric", "real", "double precision"}
+ORDERED_TYPES = {
+    "character varying",
+    "character",
+    "text",
+    "date",
+    "time without time zone",
+    "timestamp without time zone",
+    "timestamp with time zone",
+}
+
+# keys of the statistics of the attributes as returned by the WPS statistics process
+STATISTICS_KEYS = {
+    "count": "Count",
+    "min": "Min",
+    "max": "Max",
+    "average": "Average",
+    "median": "Median",
+    "stddev": "StandardDeviation",
+    "sum": "Sum",
+}
+
+
+def get_table_columns(dataset):
+    """Returns the columns of the table of the dataset as a {name: data type} dict, None when not in the datastore"""
+    datastore = get_datastore()
+    if not datastore or dataset.subtype != "vector":
+        return None
+    with connections[datastore].cursor() as cursor:
+        cursor.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s "
+            "ORDER BY ordinal_position",
+            [dataset.name],
+        )
+        columns = {}
+        for name, data_type in cursor.fetchall():
+            columns.setdefault(name, data_type)
+    return columns or None
+
+
+def get_column_aggregates(column, data_type, quote_name):
+    """Returns the statistics keys of the column with the aggregate expressions computing them"""
+    name = quote_name(column).replace("%", "%%")
+    if data_type in NUMERIC_TYPES:
+        # the median is estimated from the statistics of the table, see get_median
+        return [
+            ("count", f"count({name})"),
+            ("min", f"min({name})"),
+            ("max", f"max({name})"),
+            ("average", f"avg({name})"),
+            ("stddev", f"stddev_samp({name})"),
+            ("sum", f"sum({name})"),
+        ]
+    if data_type in ORDERED_TYPES:
+        return [("count", f"count({name})"), ("min", f"min({name})::text"), ("max", f"max({name})::text")]
+    return [("count", f"count({name})")]
+
+
+def build_profile_query(table, columns, quote_name):
+    """Returns the SQL computing the number of features and the statistics of all the columns in one scan"""
+    aggregates = ["count(*)"]
+    for column, data_type in columns.items():
+        aggregates.extend(expression for _, expression in get_column_aggregates(column, data_type, quote_name))
+    return f"SELECT {', '.join(aggregates)} FROM {quote_name(table).replace('%', '%%')}"
+
+
+def _to_json(value):
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2**53:
+        return int(value)
+    return value
+
+
+def _get_histogram(bounds, bins):
+    """Returns the bounds of an equi-depth histogram of at most bins buckets from the ones PostgreSQL collected"""
+    if not bounds or len(bounds) <= bins + 1:
+        return bounds
+    step = (len(bounds) - 1) / bins
+    return [bounds[round(i * step)] for i in range(bins + 1)]
+
+
+def get_median(null_fraction, values, frequencies, bounds):
+    """
+    Returns the median of the numeric values estimated from the statistics PostgreSQL collected on the column:
+    its most common values and the bounds of the histogram of the other ones, each bucket holding the same
+    number of rows. None when there are no statistics.
+    """
+    values = [float(value) for value in values or []]
+    bounds = [float(bound) for bound in bounds or []]
+    frequencies = list(frequencies or [])
+    histogram_fraction = max(1 - (null_fraction or 0) - sum(frequencies), 0) if len(bounds) > 1 else 0
+    if not values and not histogram_fraction:
+        return None
+    # the most common values and the buckets of the histogram by their lower bound
+    points = [(value, value, frequency) for value, frequency in zip(values, frequencies)]
+    bucket_fraction = histogram_fraction / (len(bounds) - 1) if histogram_fraction else 0
+    points.extend((low, high, bucket_fraction) for low, high in zip(bounds, bounds[1:]))
+    points.sort()
+    half = (sum(frequencies) + histogram_fraction) / 2
+    cumulative = 0
+    for low, high, fraction in points:
+        if fraction and cumulative + fraction >= half:
+            # the values of a bucket are assumed evenly spread
+            return low + (high - low) * (half - cumulative) / fraction
+        cumulative += fraction
+    return points[-1][1]
+
+
+def read_column_statistics(cursor, table, quote_name):
+    """
+    Returns the statistics PostgreSQL collected on the columns of the table by column name, analyzing
+    the table when it has none, e.g. just created: otherwise the autovacuum keeps them up to date.
+    """
+    query = (
+        "SELECT attname, null_frac, n_distinct, most_common_vals::text::text[], most_common_freqs, "
+        "histogram_bounds::text::text[] FROM pg_stats WHERE tablename = %s"
+    )
+    cursor.execute(query, [table])
+    rows = cursor.fetchall()
+    if not rows:
+        try:
+            cursor.execute(f"ANALYZE {quote_name(table)}")
+            cursor.execute(query, [table])
+            rows = cursor.fetchall()
+        except Exception as e:
+            logger.debug(f"Could not analyze the table {table}: {e}")
+    return {row[0]: row[1:] for row in rows}
+
+
+def compute_dataset_profile(dataset, attribute_map):
+    """
+    Returns the profile of the dataset having the attributes of the attribute_map, a list of [name, type],
+    None when the dataset is not in the datastore.
+    """
+    columns = get_table_columns(dataset)
+    if not columns:
+        return None
+    names = [attribute[0] for attribute in attribute_map]
+    profiled = {name: data_type for name, data_type in columns.items() if name in names}
+    connection = connections[get_datastore()]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(build_profile_query(dataset.name, profiled, quote_name))
+        row = list(cursor.fetchone())
+        column_statistics = read_column_statistics(cursor, dataset.name, quote_name)
+
+    feature_count = row.pop(0)
+    # the statistics of the columns follow in the order of the query
+    statistics = {}
+    for name, data_type in profiled.items():
+        statistics[name] = {key: _to_json(row.pop(0)) for key, _ in get_column_aggregates(name, data_type, quote_name)}
+
+    max_values = settings.DATASET_PROFILE_MAX_VALUES
+    attributes = []
+    for name, attribute_type, *_ in attribute_map:
+        attribute = {"name": name, "type": attribute_type}
+        if name in profiled:
+            data_type = profiled[name]
+            attribute.update(statistics[name])
+            attribute["nulls"] = feature_count - attribute["count"]
+            if name in column_statistics:
+                null_fraction, n_distinct, values, frequencies, bounds = column_statistics[name]
+                if data_type in NUMERIC_TYPES:
+                    median = get_median(null_fraction, values, frequencies, bounds)
+                    attribute["median"] = _to_json(median) if median is not None else None
+                # a negative n_distinct is the fraction of the rows having distinct values
+                attribute["distinct"] = round(-n_distinct * feature_count) if n_distinct < 0 else round(n_distinct)
+                values = (values or [])[:max_values]
+                histogram = _get_histogram(bounds or [], settings.DATASET_PROFILE_HISTOGRAM_BINS)
+                if data_type in NUMERIC_TYPES:
+                    values = [_to_json(float(value)) for value in values]
+                    histogram = [_to_json(float(bound)) for bound in histogram]
+                attribute["values"] = values
+                attribute["frequencies"] = (frequencies or [])[:max_values]
+                if data_type in NUMERIC_TYPES or data_type in ORDERED_TYPES:
+                    attribute["histogram"] = histogram
+        attributes.append(attribute)
+    return {"feature_count": feature_count, "attributes": attributes}
+
+
+def get_profile_statistics(profile):
+    """Returns the statistics of the attributes of the profile as the WPS statistics process, by attribute name"""
+    statistics = {}
+    for attribute in profile.get("attributes", []):
+        if "count" not in attribute:
+            continue
+        result = {key: "NA" for key in STATISTICS_KEYS.values()}
+        for key, wps_key in STATISTICS_KEYS.items():
+            if attribute.get(key) is not None:
+                result[wps_key] = attribute[key] if key == "count" else str(attribute[key])[:255]
+        values = [str(value) for value in attribute.get("values", [])]
+        result["unique_values"] = ",".join(values) if values else "NA"
+        statistics[attribute["name"]] = result
+    return statistics
+
+
+def update_dataset_profile(dataset, attribute_map):
+    """Computes and stores a new version of the profile of the dataset, returns it, None when it cannot be computed"""
+    from geonode.layers.models import DatasetProfile
+
+    if not settings.DATASET_PROFILE_ENABLED:
+        return None
+    try:
+        profile = compute_dataset_profile(dataset, attribute_map)
+    except Exception as e:
+        logger.warning(f"Could not profile the dataset {dataset.alternate}: {e}")
+        return None
+    if profile is None:
+        return None
+    DatasetProfile.objects.update_or_create(dataset=dataset, defaults={"version": uuid4().hex, "profile": profile})
+    return profile
+
+
+def get_dataset_profile(dataset):
+    """Returns the stored DatasetProfile of the dataset, None when it has not been computed"""
+    from geonode.layers.models import DatasetProfile
+
+    return DatasetProfile.objects.filter(dataset=dataset).first()
@@ -21,6 +21,7 @@ import itertools
 import os
 import shutil
 import logging
+import tempfile
 
 from uuid import uuid4
 from unittest.mock import MagicMock, patch, PropertyMock
@@ -1330,3 +1331,145 @@ class TestCustomDownloadHandler(GeoNodeBaseTestSupport):
         response = self.client.get(url)
         self.assertTrue(response.status_code == 200)
         self.assertEqual(response.content, b"abcsfd2")
+
+
+class VectorTilesTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        super().setUp()
+        self.dataset = create_single_dataset("vector_tiles_dataset")
+
+    def test_tile_query(self):
+        from geonode.layers.vectortiles import build_tile_query
+
+        query = build_tile_query("roads", "geometry", 4326, ["name", "100%"], lambda name: f'"{name}"')
+        self.assertIn('t."name", t."100%%", ST_AsMVTGeom(ST_Simplify(ST_Transform(t."geometry", 3857)', query)
+        self.assertNotIn("ST_Intersection", query)
+        query = build_tile_query(
+            "roads", "geometry", 3857, [], lambda name: f'"{name}"', geolimit="SRID=4326;POINT(0 0)"
+        )
+        self.assertIn('ST_Simplify(ST_Intersection(t."geometry", ', query)
+        self.assertIn('ST_Intersects(t."geometry", ', query)
+
+    def test_memory_cache(self):
+        from geonode.layers.vectortiles import TileLRUCache
+
+        tiles = TileLRUCache(2)
+        tiles.set("a", b"a")
+        tiles.set("b", b"b")
+        tiles.get("a")
+        tiles.set("c", b"c")
+        self.assertIsNone(tiles.get("b"))
+        self.assertEqual(tiles.get("a"), b"a")
+
+    def test_invalidate_vector_tiles(self):
+        from geonode.layers.vectortiles import get_tiles_version, invalidate_vector_tiles
+
+        version = get_tiles_version(self.dataset)
+        self.assertIsNotNone(version)
+        self.assertEqual(get_tiles_version(Dataset.objects.get(pk=self.dataset.pk)), version)
+        invalidate_vector_tiles(self.dataset)
+        self.assertNotEqual(get_tiles_version(self.dataset), version)
+        # the new version is persisted
+        self.assertEqual(get_tiles_version(Dataset.objects.get(pk=self.dataset.pk)), get_tiles_version(self.dataset))
+
+    def test_delete_vector_tiles(self):
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(VECTOR_TILES_CACHE_DIR=cache_dir):
+            tiles_dir = os.path.join(cache_dir, str(self.dataset.pk), "version", "all", "0", "0")
+            os.makedirs(tiles_dir)
+            self.dataset.delete()
+            self.assertFalse(os.path.exists(os.path.join(cache_dir, str(self.dataset.pk))))
+
+    def test_tile_view(self):
+        url = reverse("dataset_tile", args=[self.dataset.alternate, 3, 4, 2])
+        self.client.login(username="admin", password="admin")
+        with override_settings(VECTOR_TILES_ENABLED=False):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+        with (
+            override_settings(VECTOR_TILES_ENABLED=True),
+            patch("geonode.layers.vectortiles.get_tile", return_value=(b"tile", "key")) as get_tile,
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, b"tile")
+            self.assertEqual(get_tile.call_args.args[2:], (3, 4, 2))
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(response.status_code, 304)
+            # out of the tile matrix
+            url = reverse("dataset_tile", args=[self.dataset.alternate, 3, 8, 2])
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class DatasetProfileTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        super().setUp()
+        self.dataset = create_single_dataset("profiled_dataset")
+
+    def test_profile_query(self):
+        from geonode.layers.profile import build_profile_query
+
+        query = build_profile_query(
+            "roads", {"lanes": "integer", "name": "text", "the_geom": "USER-DEFINED"}, lambda name: f'"{name}"'
+        )
+        self.assertTrue(query.startswith('SELECT count(*), count("lanes"), min("lanes"), max("lanes"), avg("lanes")'))
+        self.assertIn('count("name"), min("name")::text, max("name")::text, count("the_geom") FROM "roads"', query)
+        # the median is not computed by sorting the values
+        self.assertNotIn("percentile_cont", query)
+
+    def test_profile_median(self):
+        from geonode.layers.profile import get_median
+
+        self.assertAlmostEqual(get_median(0.2, [], [], list(range(101))), 50)
+        # the most common value holds more than half of the rows
+        self.assertAlmostEqual(get_median(0, ["5"], [0.6], list(range(11))), 5)
+        self.assertIsNone(get_median(0, None, None, None))
+
+    def test_profile_statistics(self):
+        from geonode.layers.profile import _get_histogram, get_profile_statistics
+
+        self.assertEqual(_get_histogram(list(range(101)), 4), [0, 25, 50, 75, 100])
+        self.assertEqual(_get_histogram([1, 2, 3], 4), [1, 2, 3])
+        profile = {
+            "feature_count": 10,
+            "attributes": [
+                {"name": "the_geom", "type": "gml:MultiPolygonPropertyType"},
+                {"name": "lanes", "type": "xsd:int", "count": 8, "min": 1, "max": 4, "average": 2.5, "values": [2, 1]},
+            ],
+        }
+        statistics = get_profile_statistics(profile)
+        self.assertEqual(list(statistics), ["lanes"])
+        self.assertEqual(statistics["lanes"]["Count"], 8)
+        self.assertEqual(statistics["lanes"]["Max"], "4")
+        self.assertEqual(statistics["lanes"]["Median"], "NA")
+        self.assertEqual(statistics["lanes"]["unique_values"], "2,1")
+
+    def test_profile_api_and_feature_catalogue(self):
+        from geonode.layers.models import DatasetProfile
+
+        url = reverse("datasets-profile", args=[self.dataset.pk])
+        self.client.login(username="admin", password="admin")
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.dataset.attribute_set.all().delete()
+        Attribute.objects.create(dataset=self.dataset, attribute="profiled_name", display_order=2)
+        Attribute.objects.create(dataset=self.dataset, attribute="profiled_code", display_order=1)
+        DatasetProfile.objects.create(
+            dataset=self.dataset,
+            version="v1",
+            profile={
+                "feature_count": 3,
+                "attributes": [
+                    {"name": "profiled_name", "type": "xsd:string", "count": 3},
+                    {"name": "profiled_code", "type": "xsd:int", "count": 3},
+                ],
+            },
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["feature_count"], 3)
+        self.assertEqual(response["ETag"], '"v1"')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"v1"').status_code, 304)
+
+        response = self.client.get(reverse("dataset_feature_catalogue", args=[self.dataset.alternate]))
+        # in the display order of the attributes
+        self.assertLess(response.content.index(b"profiled_code"), response.content.index(b"profiled_name"))
@@ -34,6 +34,10 @@ urlpatterns = [
         r"^(?P<layername>[^/]*)/feature_catalogue$", views.dataset_feature_catalogue, name="dataset_feature_catalogue"
     ),
     re_path(r"^(?P<layername>[^/]*)/dataset_download$", views.dataset_download, name="dataset_download"),
+    re_path(
+        r"^(?P<layername>[^/]+)/tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)\.pbf$", views.dataset_tile, name="dataset_tile"
+    ),
+    re_path(r"^(?P<layername>[^/]+)/legend$", views.dataset_legend, name="dataset_legend"),
     re_path(r"^", include("geonode.layers.api.urls")),
 ]
 
@@ -40,7 +40,7 @@ from django.utils.module_loading import import_string
 from django.core.exceptions import ObjectDoesNotExist
 
 from geonode.security.permissions import PermSpec, PermSpecCompact
-from geonode.storage.manager import storage_manager
+from geonode.storage.gc import collect_garbage
 
 # Geonode functionality
 from geonode.base.models import Region
@@ -219,19 +219,7 @@ def get_valid_name(dataset_name):
 
 def delete_orphaned_datasets():
     """Delete orphaned layer files."""
-    deleted = []
-    _, files = storage_manager.listdir("layers")
-
-    for filename in files:
-        if Dataset.objects.filter(file__icontains=filename).count() == 0:
-            logger.debug(f"Deleting orphaned dataset file {filename}")
-            try:
-                storage_manager.delete(os.path.join("layers", filename))
-                deleted.append(filename)
-            except NotImplementedError as e:
-                logger.error(f"Failed to delete orphaned dataset file '{filename}': {e}")
-
-    return deleted
+    return collect_garbage(areas=["layers"])["layers"]
 
 
 def set_datasets_permissions(
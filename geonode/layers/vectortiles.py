@@ -0,0 +1,269 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Mapbox Vector Tiles of the datasets stored in the datastore database.
+
+The tiles are generated by PostGIS with ST_AsMVT from the tables of the datasets, the geometries
+being simplified with the tolerance of a tile pixel at the requested zoom level and clipped to the
+geographic limits of the user. The generated tiles are kept on disk, and the most recent ones in
+memory too, under the version of the dataset, derived from its last_updated time: invalidate_vector_tiles()
+touches the dataset, and removes its tiles from the disk, when its data changes. The tiles of the deleted
+datasets are removed from the disk too.
+"""
+import os
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import signals
+from django.utils.timezone import now
+
+logger = logging.getLogger(__name__)
+
+# half of the side of the EPSG:3857 world
+WEB_MERCATOR_HALF_SIZE = 20037508.342789244
+
+
+class TileLRUCache:
+    """Bounded in memory cache of the most recently used tiles"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def set(self, key, tile):
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_size:
+                self._tiles.popitem(last=False)
+
+
+memory_cache = TileLRUCache(settings.VECTOR_TILES_MEMORY_CACHE_SIZE)
+
+
+def get_datastore():
+    from geonode.geoserver.helpers import ogc_server_settings
+
+    datastore = ogc_server_settings.DATASTORE
+    return datastore if datastore and datastore in settings.DATABASES else None
+
+
+def get_tiles_version(dataset):
+    """Returns the version of the tiles of the dataset, derived from its last_updated time"""
+    last_updated = dataset.last_updated.isoformat() if dataset.last_updated else ""
+    return hashlib.md5(f"{dataset.pk}:{last_updated}".encode("utf-8")).hexdigest()[:12]
+
+
+def delete_vector_tiles(dataset_id):
+    """Removes the tiles of the dataset from the disk"""
+    shutil.rmtree(os.path.join(settings.VECTOR_TILES_CACHE_DIR, str(dataset_id)), ignore_errors=True)
+
+
+def invalidate_vector_tiles(dataset):
+    """Discards the tiles of the dataset, to be called when its data changes"""
+    from geonode.layers.models import Dataset
+
+    # the version is persisted, so all the processes serving the tiles see the new one
+    dataset.last_updated = now()
+    Dataset.objects.filter(pk=dataset.pk).update(last_updated=dataset.last_updated)
+    delete_vector_tiles(dataset.pk)
+
+
+def get_geolimit(dataset, user):
+    """
+    Returns the EWKT of the area of the dataset visible to the user, None when not limited.
+    As in the GeoFence rules, the limits of the user prevail over the ones of their groups.
+    """
+    from geonode.geoserver.security import get_geolimits
+
+    if user.is_superuser:
+        return None
+    username = user.username if user.is_authenticated else None
+    users_geolimits, _, anonymous_geolimits = get_geolimits(dataset, username, None)
+    limits = users_geolimits if username else anonymous_geolimits
+    if limits is not None and limits.exists():
+        return limits.last().wkt
+    if username:
+        group_limits = []
+        for group in user.groups.all():
+            _, groups_geolimits, _ = get_geolimits(dataset, None, group.name)
+            if groups_geolimits is not None and groups_geolimits.exists():
+                group_limits.append(groups_geolimits.last().wkt)
+        if group_limits:
+            from django.contrib.gis.geos import GEOSGeometry
+
+            union = GEOSGeometry(group_limits[0])
+            for wkt in group_limits[1:]:
+                union = union.union(GEOSGeometry(wkt))
+            return union.ewkt
+    return None
+
+
+def get_geometry_column(dataset):
+    """Returns the geometry column and SRID of the table of the dataset, None when not in the datastore"""
+    datastore = get_datastore()
+    if not datastore or dataset.subtype != "vector":
+        return None
+    with connections[datastore].cursor() as cursor:
+        cursor.execute(
+            "SELECT f_geometry_column, srid FROM geometry_columns WHERE f_table_name = %s LIMIT 1",
+            [dataset.name],
+        )
+        row = cursor.fetchone()
+    # the tables without a declared SRID cannot be reprojected
+    return row if row and row[1] else None
+
+
+def get_tile_tolerance(z):
+    """Returns the side of a tile pixel at the zoom level in EPSG:3857 meters"""
+    return 2 * WEB_MERCATOR_HALF_SIZE / (2**z) / settings.VECTOR_TILES_EXTENT
+
+
+def build_tile_query(table, geometry_column, srid, columns, quote_name, geolimit=None):
+    """Returns the SQL generating the tile, see render_tile for its parameters"""
+    geom = f"t.{quote_name(geometry_column)}".replace("%", "%%")
+    native_envelope = "ST_Transform(ST_Expand(ST_TileEnvelope(%(z)s, %(x)s, %(y)s), %(margin)s), %(srid)s)"
+    conditions = [f"{geom} && {native_envelope}"]
+    source = geom
+    if geolimit:
+        limit = "ST_Transform(ST_GeomFromEWKT(%(geolimit)s), %(srid)s)"
+        conditions.append(f"ST_Intersects({geom}, {limit})")
+        source = f"ST_Intersection({geom}, {limit})"
+    if srid != 3857:
+        source = f"ST_Transform({source}, 3857)"
+    # the literal percent signs are escaped for the named parameters
+    properties = "".join(f"t.{quote_name(column)}, ".replace("%", "%%") for column in columns)
+    return (
+        "SELECT ST_AsMVT(tile, %(layer)s, %(extent)s, 'mvt_geom') FROM ("
+        f"SELECT {properties}ST_AsMVTGeom(ST_Simplify({source}, %(tolerance)s, true), "
+        "ST_TileEnvelope(%(z)s, %(x)s, %(y)s), %(extent)s, %(buffer)s, true) AS mvt_geom "
+        f"FROM {quote_name(table).replace('%', '%%')} t WHERE {' AND '.join(conditions)} LIMIT %(max_features)s"
+        ") AS tile WHERE tile.mvt_geom IS NOT NULL"
+    )
+
+
+def render_tile(dataset, z, x, y, geolimit=None):
+    """Returns the MVT tile of the dataset, None when the dataset is not in the datastore"""
+    geometry = get_geometry_column(dataset)
+    if not geometry:
+        return None
+    geometry_column, srid = geometry
+    columns = [
+        attribute
+        for attribute in dataset.attribute_set.visible().values_list("attribute", flat=True)
+        if attribute != geometry_column
+    ]
+    connection = connections[get_datastore()]
+    tolerance = get_tile_tolerance(z)
+    params = {
+        "layer": dataset.name,
+        "z": z,
+        "x": x,
+        "y": y,
+        "srid": srid,
+        "geolimit": geolimit,
+        "extent": settings.VECTOR_TILES_EXTENT,
+        "buffer": settings.VECTOR_TILES_BUFFER,
+        "margin": tolerance * settings.VECTOR_TILES_BUFFER,
+        "tolerance": tolerance * settings.VECTOR_TILES_SIMPLIFY_PIXELS,
+        "max_features": settings.VECTOR_TILES_MAX_FEATURES,
+    }
+    query = build_tile_query(dataset.name, geometry_column, srid, columns, connection.ops.quote_name, geolimit)
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else b""
+
+
+def _get_tile_path(dataset, version, limit_key, z, x, y):
+    return os.path.join(
+        settings.VECTOR_TILES_CACHE_DIR, str(dataset.pk), version, limit_key, str(z), str(x), f"{y}.pbf"
+    )
+
+
+def _prune_tile_versions(dataset, version):
+    """Removes from the disk the tiles of the versions of the dataset other than the given one"""
+    dataset_dir = os.path.join(settings.VECTOR_TILES_CACHE_DIR, str(dataset.pk))
+    try:
+        versions = os.listdir(dataset_dir)
+    except OSError:
+        return
+    for other in versions:
+        if other != version:
+            shutil.rmtree(os.path.join(dataset_dir, other), ignore_errors=True)
+
+
+def get_tile(dataset, user, z, x, y):
+    """
+    Returns the MVT tile of the dataset visible to the user and its cache key, from the cache when available.
+    The tile is None when the dataset is not in the datastore.
+    """
+    geolimit = get_geolimit(dataset, user)
+    limit_key = hashlib.md5(geolimit.encode("utf-8")).hexdigest() if geolimit else "all"
+    version = get_tiles_version(dataset)
+    key = f"{dataset.pk}:{version}:{limit_key}:{z}:{x}:{y}"
+    tile = memory_cache.get(key)
+    if tile is not None:
+        return tile, key
+
+    path = _get_tile_path(dataset, version, limit_key, z, x, y)
+    try:
+        with open(path, "rb") as tile_file:
+            tile = tile_file.read()
+    except OSError:
+        tile = render_tile(dataset, z, x, y, geolimit)
+        if tile is None:
+            return None, key
+        try:
+            if not os.path.isdir(os.path.join(settings.VECTOR_TILES_CACHE_DIR, str(dataset.pk), version)):
+                # the first tile of a new version of the dataset
+                _prune_tile_versions(dataset, version)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid4().hex}"
+            with open(tmp_path, "wb") as tile_file:
+                tile_file.write(tile)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store the vector tile {path}: {e}")
+    memory_cache.set(key, tile)
+    return tile, key
+
+
+def dataset_deleted(instance, **kwargs):
+    delete_vector_tiles(instance.pk)
+
+
+def connect_vector_tiles_signals():
+    from geonode.layers.models import Dataset
+
+    signals.post_delete.connect(dataset_deleted, sender=Dataset, dispatch_uid="vector_tiles_dataset_delete")
@@ -17,6 +17,7 @@
 #
 #########################################################################
 import json
+import hashlib
 import logging
 
 from django.conf import settings
@@ -27,7 +28,8 @@ from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import PermissionDenied
 from django.template.response import TemplateResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from django.http import HttpResponse, HttpResponseNotModified
 from django.views.decorators.clickjacking import xframe_options_exempt
 
 from geonode.base.auth import get_or_create_token
@@ -99,10 +101,18 @@ def dataset_feature_catalogue(request, layername, template="../../catalogue/temp
         out = {"success": False, "errors": "layer is not a feature type"}
         return HttpResponse(json.dumps(out), content_type="application/json", status=400)
 
+    from geonode.layers.profile import get_dataset_profile
+
+    dataset_profile = get_dataset_profile(layer)
+    # the statistics of the attributes profiled
+    profiled = {
+        attribute["name"]: attribute
+        for attribute in (dataset_profile.profile if dataset_profile else {}).get("attributes", [])
+    }
     attributes = []
 
     for attrset in layer.attribute_set.order_by("display_order"):
-        attr = {"name": attrset.attribute, "type": attrset.attribute_type}
+        attr = {**profiled.get(attrset.attribute, {}), "name": attrset.attribute, "type": attrset.attribute_type}
         attributes.append(attr)
 
     context_dict = {
@@ -148,3 +158,83 @@ def dataset_embed(request, layername):
         "resource": layer,
     }
     return TemplateResponse(request, "datasets/dataset_embed.html", context=context_dict)
+
+
+@require_GET
+def dataset_tile(request, layername, z, x, y):
+    """Serves the Mapbox Vector Tiles of the datasets stored in the datastore"""
+    from geonode.layers.vectortiles import get_tile
+
+    z, x, y = int(z), int(x), int(y)
+    if not settings.VECTOR_TILES_ENABLED or z > settings.VECTOR_TILES_MAX_ZOOM or x >= 2**z or y >= 2**z:
+        raise Http404(_("Not found"))
+    try:
+        layer = _resolve_dataset(request, layername, "base.view_resourcebase", _PERMISSION_MSG_VIEW)
+    except PermissionDenied:
+        return HttpResponse(_("Not allowed"), status=403)
+    except Exception:
+        raise Http404(_("Not found"))
+    if not layer:
+        raise Http404(_("Not found"))
+
+    tile, key = get_tile(layer, request.user, z, x, y)
+    if tile is None:
+        raise Http404(_("Not found"))
+    etag = f'"{hashlib.md5(key.encode("utf-8")).hexdigest()}"'
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponseNotModified()
+    elif not tile:
+        response = HttpResponse(status=204)
+    else:
+        response = HttpResponse(tile, content_type="application/vnd.mapbox-vector-tile")
+    response["ETag"] = etag
+    response["Cache-Control"] = f"private, max-age={settings.VECTOR_TILES_MAX_AGE}"
+    return response
+
+
+@require_GET
+def dataset_legend(request, layername):
+    """Serves the legends of the datasets from the legends cache, see geonode.geoserver.legends"""
+    from geonode.geoserver.legends import (
+        get_dataset_style,
+        get_legend,
+        get_legend_params,
+        get_style_version,
+        is_legend_cache_enabled,
+    )
+
+    if not is_legend_cache_enabled():
+        raise Http404(_("Not found"))
+    try:
+        layer = _resolve_dataset(request, layername, "base.view_resourcebase", _PERMISSION_MSG_VIEW)
+    except PermissionDenied:
+        return HttpResponse(_("Not allowed"), status=403)
+    except Exception:
+        raise Http404(_("Not found"))
+    if not layer:
+        raise Http404(_("Not found"))
+
+    query = {key.lower(): value for key, value in request.GET.items()}
+    style = get_dataset_style(layer, query.get("style"))
+    params = get_legend_params(query)
+    if not style or params is None:
+        raise Http404(_("Not found"))
+    legend, key = get_legend(layer, style, params)
+    if legend is None:
+        return HttpResponse(_("The legend could not be rendered"), status=502)
+    etag = f'"{hashlib.md5(key.encode("utf-8")).hexdigest()}"'
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponseNotModified()
+    else:
+        content, content_type = legend
+        response = HttpResponse(content, content_type=content_type)
+    response["ETag"] = etag
+    # the legends visible to the anonymous users can be shared by the proxies
+    visibility = "private" if request.user.is_authenticated else "public"
+    if request.GET.get("v") == get_style_version(style):
+        # the URL changes with the style, see get_legend_url
+        response["Cache-Control"] = f"{visibility}, max-age={settings.LEGEND_CACHE_MAX_AGE}"
+    else:
+        # e.g. a link not updated yet after a change of the style, revalidated with the ETag
+        response["Cache-Control"] = f"{visibility}, no-cache"
+    return response
@@ -29,7 +29,7 @@ from rest_framework.response import Response
 
 from geonode.base import register_event
 from geonode.base.api.filters import DynamicSearchFilter, ExtentFilter
-from geonode.base.api.mixins import AdvertisedListMixin
+from geonode.base.api.mixins import AdvertisedListMixin, AnonymousResponseCacheMixin, ConditionalGetMixin
 from geonode.base.api.pagination import GeoNodeApiPagination
 from geonode.base.api.permissions import UserHasPerms
 from geonode.base.api.views import ApiPresetsInitializer
@@ -47,7 +47,9 @@ from geonode.utils import resolve_object
 logger = logging.getLogger(__name__)
 
 
-class MapViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin):
+class MapViewSet(
+    AnonymousResponseCacheMixin, ConditionalGetMixin, ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin
+):
     """
     API endpoint that allows maps to be viewed or edited.
     """
@@ -67,6 +69,7 @@ class MapViewSet(ApiPresetsInitializer, DynamicModelViewSet, AdvertisedListMixin
     queryset = Map.objects.all().order_by("-created")
     serializer_class = MapSerializer
     pagination_class = GeoNodeApiPagination
+    response_cache_types = ["map"]
 
     def list(self, request, *args, **kwargs):
         # Avoid overfetching removing mapslayer of the list.
@@ -21,7 +21,9 @@ import logging
 import math
 import itertools
 
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
 from django.template.defaultfilters import slugify
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -34,6 +36,8 @@ from geonode.utils import check_ogc_backend
 
 logger = logging.getLogger("geonode.maps.models")
 
+MAPS_BBOX_PENDING_PREFIX = "maps_bbox_pending"
+
 
 class Map(ResourceBase):
     """
@@ -130,36 +134,39 @@ class Map(ResourceBase):
 
     def compute_bbox(self, target_crs="EPSG:3857"):
         """
-        Compute bbox for maps by looping on all maplayers and getting the max
-        bbox of all the datasets
+        Compute bbox for maps as the union of the bboxes of the visible datasets.
+        The bboxes are loaded with a single query and transformed at once.
         """
         epsg_bbox = bbox_utils.epsg_3857_area_of_use(target_crs="EPSG:3857")
 
+        dataset_bboxes = []
+        layers = self.maplayers.filter(visibility=True, dataset__isnull=False).values_list(
+            "dataset__ll_bbox_polygon", "dataset__bbox_polygon", "dataset__srid"
+        )
+        for ll_bbox_polygon, bbox_polygon, srid in layers:
+            if ll_bbox_polygon:
+                x0, y0, x1, y1 = ll_bbox_polygon.extent
+                dataset_bboxes.append([x0, x1, y0, y1, f"EPSG:{ll_bbox_polygon.srid}"])
+            elif bbox_polygon:
+                # handle exceeding the area of use of the default thumb's CRS
+                x0, y0, x1, y1 = bbox_polygon.extent
+                dataset_bboxes.append(bbox_utils.crop_to_3857_area_of_use([x0, x1, y0, y1, srid]))
+
         bbox = [math.inf, -math.inf, math.inf, -math.inf]
-        for layer in self.maplayers.filter(visibility=True).order_by("order").iterator():
-            dataset = layer.dataset
-            if dataset is not None:
-                if dataset.ll_bbox_polygon:
-                    dataset_bbox = bbox_utils.clean_bbox(dataset.ll_bbox, target_crs)
-                elif dataset.bbox:
-                    # handle exceeding the area of use of the default thumb's CRS
-                    dataset_bbox = bbox_utils.transform_bbox(
-                        bbox_utils.crop_to_3857_area_of_use(dataset.bbox), target_crs
-                    )
-
-                if dataset_bbox:
-                    bbox = [
-                        min(bbox[0], dataset_bbox[0]),
-                        max(bbox[1], dataset_bbox[1]),
-                        min(bbox[2], dataset_bbox[2]),
-                        max(bbox[3], dataset_bbox[3]),
-                    ]
+        for dataset_bbox in bbox_utils.clean_bboxes(dataset_bboxes, target_crs):
+            bbox = [
+                min(bbox[0], dataset_bbox[0]),
+                max(bbox[1], dataset_bbox[1]),
+                min(bbox[2], dataset_bbox[2]),
+                max(bbox[3], dataset_bbox[3]),
+            ]
 
         # if the starting bbox is not mutated it means no bbox has been computed from layers
         if bbox[0] == math.inf:
             bbox = epsg_bbox
 
-        self.set_bbox_polygon([bbox[0], bbox[2], bbox[1], bbox[3]], target_crs)
+        if self.bbox_polygon is None or self.srid != target_crs or self.bbox != list(bbox[:4]) + [target_crs]:
+            self.set_bbox_polygon([bbox[0], bbox[2], bbox[1], bbox[3]], target_crs)
         return bbox
 
     @property
@@ -286,3 +293,21 @@ class MapLayer(models.Model):
 
     def __str__(self):
         return f"{self.ows_url}?datasets={self.name}"
+
+
+def update_maps_bbox(dataset_ids):
+    """Schedules the update of the bbox of the maps including the datasets, once per debounce period"""
+    from geonode.tasks.tasks import update_maps_bbox as update_maps_bbox_task
+
+    map_ids = MapLayer.objects.filter(dataset_id__in=dataset_ids, map__isnull=False).values_list("map_id", flat=True)
+    for map_id in set(map_ids):
+        if cache.add(f"{MAPS_BBOX_PENDING_PREFIX}:{map_id}", True, settings.MAPS_BBOX_UPDATE_DEBOUNCE):
+            transaction.on_commit(
+                lambda map_id=map_id: update_maps_bbox_task.apply_async(
+                    args=([map_id],), countdown=settings.MAPS_BBOX_UPDATE_DEBOUNCE
+                )
+            )
+
+
+def release_maps_bbox_update(map_ids):
+    cache.delete_many([f"{MAPS_BBOX_PENDING_PREFIX}:{map_id}" for map_id in map_ids])
@@ -23,19 +23,29 @@ from unittest.mock import patch
 from rest_framework import status
 
 from django.urls import reverse
+from django.test import override_settings
 from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Polygon
 
 from geonode import geoserver
+from geonode.base import bbox_utils
 from geonode.maps.apps import MapsAppConfig
 from geonode.layers.models import Dataset
 from geonode.compat import ensure_string
 from geonode.decorators import on_ogc_backend
-from geonode.maps.models import Map, MapLayer
+from geonode.maps.models import Map, MapLayer, release_maps_bbox_update
+from geonode.tests.base import GeoNodeBaseTestSupport
 from geonode.tests.utils import NotificationsTestsHelper
 from geonode.maps.tests_populate_maplayers import create_maplayers
 from geonode.resource.manager import resource_manager
 
-from geonode.base.populate_test_data import all_public, create_models, remove_models
+from geonode.base.populate_test_data import (
+    all_public,
+    create_models,
+    create_single_dataset,
+    create_single_map,
+    remove_models,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -330,3 +340,49 @@ community."
             self.assertTrue(self.check_notification_out("map_updated", self.u))
 
             self.clear_notifications_queue()
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class MapBboxTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        super().setUp()
+        self.map = create_single_map("map_bbox")
+        self.datasets = []
+        for name, bbox in (("map_bbox_dataset_a", (-10, -5, 10, 5)), ("map_bbox_dataset_b", (100, 30, 179, 88))):
+            dataset = create_single_dataset(name)
+            Dataset.objects.filter(id=dataset.id).update(ll_bbox_polygon=Polygon.from_bbox(bbox))
+            self.datasets.append(Dataset.objects.get(id=dataset.id))
+        for order, dataset in enumerate(self.datasets):
+            MapLayer.objects.create(map=self.map, dataset=dataset, name=dataset.alternate, order=order)
+        MapLayer.objects.create(map=self.map, name="hidden", visibility=False)
+
+    def test_compute_bbox_is_the_union_of_the_datasets_bboxes(self):
+        for target_crs in ("EPSG:3857", "EPSG:4326", "EPSG:3395"):
+            expected = [bbox_utils.clean_bbox(dataset.ll_bbox, target_crs) for dataset in self.datasets]
+            bbox = self.map.compute_bbox(target_crs)
+            self.assertAlmostEqual(bbox[0], min(_bbox[0] for _bbox in expected), places=4)
+            self.assertAlmostEqual(bbox[1], max(_bbox[1] for _bbox in expected), places=4)
+            self.assertAlmostEqual(bbox[2], min(_bbox[2] for _bbox in expected), places=4)
+            self.assertAlmostEqual(bbox[3], max(_bbox[3] for _bbox in expected), places=4)
+            self.assertEqual(self.map.srid, target_crs)
+
+    def test_compute_bbox_runs_a_single_query_when_unchanged(self):
+        self.map.compute_bbox()
+        with self.assertNumQueries(1):
+            self.map.compute_bbox()
+
+    @patch("geonode.tasks.tasks.update_maps_bbox.apply_async")
+    def test_dataset_bbox_change_updates_the_maps(self, apply_async):
+        dataset = self.datasets[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            dataset.set_ll_bbox_polygon([-20, -5, 10, 5])
+            # the updates are debounced
+            dataset.set_ll_bbox_polygon([-30, -5, 10, 5])
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs["args"], ([self.map.id],))
+
+        apply_async.reset_mock()
+        release_maps_bbox_update([self.map.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            dataset.set_ll_bbox_polygon([-30, -5, 10, 5])
+        apply_async.assert_not_called()
@@ -19,7 +19,8 @@
 import logging
 
 from dal import autocomplete
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from guardian.shortcuts import get_objects_for_user
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.viewsets import ViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -27,8 +28,10 @@ from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import JsonResponse
+from django.utils.http import parse_etags
 from django.utils.translation.trans_real import get_language_from_request
 from django.utils.translation import get_language, gettext as _
+from django.db import transaction
 from django.db.models import Q
 
 from geonode.base.api.permissions import UserHasPerms
@@ -42,6 +45,17 @@ from geonode.people.utils import get_available_users
 
 logger = logging.getLogger(__name__)
 
+# lookups that can be used to select the resources of a bulk metadata update
+BULK_UPDATE_FILTERS = (
+    "resource_type",
+    "owner__username",
+    "group__name",
+    "category__identifier",
+    "keywords__slug",
+    "tkeywords__about",
+    "title__icontains",
+)
+
 
 class MetadataViewSet(ViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly, UserHasPerms]
@@ -65,10 +79,16 @@ class MetadataViewSet(ViewSet):
         """
 
         lang = request.query_params.get("lang", get_language_from_request(request)[:2])
+
+        # the client can skip downloading the schema again if it has not changed
+        etag = metadata_manager.get_schema_etag(lang)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=304, headers={"ETag": etag})
+
         schema = metadata_manager.get_schema(lang)
 
         if schema:
-            return Response(schema)
+            return Response(schema, headers={"ETag": etag})
 
         else:
             response = {"Message": "Schema not found"}
@@ -128,6 +148,53 @@ class MetadataViewSet(ViewSet):
             result = {"message": "The dataset was not found"}
             return Response(result, status=404)
 
+    # Apply the same partial JSON schema instance to a set of resources
+    @action(
+        detail=False,
+        methods=["patch"],
+        url_path=r"instances",
+        url_name="schema_instances",
+        permission_classes=[IsAuthenticated],
+    )
+    def schema_instances(self, request):
+        lang = request.query_params.get("lang", get_language_from_request(request)[:2])
+        json_instance = request.data.get("instance", None)
+        resource_ids = request.data.get("resources", None)
+        filters = request.data.get("filter", {})
+
+        if not isinstance(json_instance, dict) or not json_instance:
+            return Response({"message": "The metadata instance to apply is missing"}, status=400)
+        if not isinstance(filters, dict) or any(_f not in BULK_UPDATE_FILTERS for _f in filters):
+            return Response({"message": f"Allowed filters are: {', '.join(BULK_UPDATE_FILTERS)}"}, status=400)
+        if resource_ids is None and not filters:
+            return Response({"message": "Either a list of resources or a filter is required"}, status=400)
+
+        resources = ResourceBase.objects.filter(**filters).distinct()
+        if resource_ids is not None:
+            resources = resources.filter(pk__in=resource_ids)
+        # only the resources whose metadata can be changed by the user are updated
+        resources = get_objects_for_user(
+            request.user, "base.change_resourcebase_metadata", klass=resources, accept_global_perms=False
+        ).order_by("pk")
+
+        with transaction.atomic():
+            updated, errors = metadata_manager.update_schema_instances(resources, json_instance, request.user, lang)
+
+        msg_t = (
+            ("m_metadata_update_error", "Some errors were found while updating the resource")
+            if errors
+            else ("m_metadata_update_ok", "The resource was updated successfully")
+        )
+        msg = get_localized_label(lang, msg_t[0]) or msg_t[1]
+
+        response = {
+            "message": msg,
+            "updated": updated,
+            "extraErrors": errors,
+        }
+
+        return Response(response, status=422 if errors else 200)
+
 
 def tkeywords_autocomplete(request: WSGIRequest, thesaurusid):
 
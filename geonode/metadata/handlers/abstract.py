@@ -70,6 +70,29 @@ class MetadataHandler(metaclass=ABCMeta):
         """
         pass
 
+    def update_resources(
+        self, resources: list, field_name: str, json_instance: dict, context: dict, errors: dict, **kwargs
+    ):
+        """
+        Called by the bulk update, applies the field `field_name` of json_instance to all the resources.
+        The ResourceBase fields changed on the instances are persisted by the manager with bulk updates,
+        related objects should be written by the handler in save_resources.
+        errors is a dict of error dicts, keyed by resource id.
+        The default implementation calls update_resource on each resource, handlers that can
+        process the whole list more efficiently should override it.
+        """
+        for resource in resources:
+            self.update_resource(resource, field_name, json_instance, context, errors.setdefault(resource.pk, {}))
+
+    def save_resources(
+        self, resources: list, field_name: str, json_instance: dict, context: dict, errors: dict, **kwargs
+    ):
+        """
+        Called by the bulk update after the ResourceBase fields are persisted, with the resources
+        without errors only: writes the related objects of the field `field_name`.
+        """
+        pass
+
     def pre_save(self, resource: ResourceBase, json_instance: dict, context: dict, errors: dict, **kwargs):
         """
         Called just after all the calls to update_resource, and just before ResourceBase.save()
@@ -90,7 +113,8 @@ class MetadataHandler(metaclass=ABCMeta):
 
     def load_deserialization_context(self, resource: ResourceBase, jsonschema: dict, context: dict):
         """
-        Called before calls to update_resource in order to initialize info needed by the handler
+        Called before calls to update_resource in order to initialize info needed by the handler.
+        In bulk updates the context is loaded once for all the resources, and resource is None.
         """
         pass
 
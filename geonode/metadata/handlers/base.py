@@ -233,3 +233,23 @@ class BaseHandler(MetadataHandler):
                 [field_name],
                 self.localize_message(context, "metadata_error_store", {"fieldname": field_name, "exc": e}),
             )
+
+    def update_resources(self, resources, field_name, json_instance, context, errors, **kwargs):
+        field_value = json_instance.get(field_name, None)
+
+        try:
+            if field_name in SUBHANDLERS:
+                # the value is the same for all the resources, deserialize it only once
+                field_value = SUBHANDLERS[field_name].deserialize(field_value)
+        except Exception as e:
+            logger.warning(f"Error setting field {field_name}={field_value}: {e}")
+            for resource in resources:
+                self._set_error(
+                    errors.setdefault(resource.pk, {}),
+                    [field_name],
+                    self.localize_message(context, "metadata_error_store", {"fieldname": field_name, "exc": e}),
+                )
+            return
+
+        for resource in resources:
+            setattr(resource, field_name, field_value)
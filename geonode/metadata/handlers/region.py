@@ -22,7 +22,7 @@ from rest_framework.reverse import reverse
 
 from django.utils.translation import gettext as _
 
-from geonode.base.models import Region
+from geonode.base.models import Region, ResourceBase
 from geonode.metadata.handlers.abstract import MetadataHandler
 
 logger = logging.getLogger(__name__)
@@ -67,3 +67,24 @@ class RegionHandler(MetadataHandler):
 
         regions = Region.objects.filter(id__in=new_ids)
         resource.regions.set(regions)
+
+    def update_resources(self, resources, field_name, json_instance, context, errors, **kwargs):
+        data = json_instance[field_name]
+        new_ids = {item["id"] for item in data}
+        # the regions are written in save_resources, once the resources are validated
+        context.setdefault("bulk_related", {})[field_name] = list(
+            Region.objects.filter(id__in=new_ids).values_list("id", flat=True)
+        )
+
+    def save_resources(self, resources, field_name, json_instance, context, errors, **kwargs):
+        regions = context.get("bulk_related", {}).get(field_name)
+        if regions is None or not resources:
+            return
+
+        # replace the regions of all the resources with two queries
+        through = ResourceBase.regions.through
+        resource_ids = [resource.pk for resource in resources]
+        through.objects.filter(resourcebase_id__in=resource_ids).delete()
+        through.objects.bulk_create(
+            [through(resourcebase_id=res_id, region_id=region_id) for res_id in resource_ids for region_id in regions]
+        )
@@ -24,7 +24,7 @@ from rest_framework.reverse import reverse
 from django.db.models import Q
 from django.utils.translation import gettext as _
 
-from geonode.base.models import Thesaurus, ThesaurusKeyword, ThesaurusKeywordLabel
+from geonode.base.models import ResourceBase, Thesaurus, ThesaurusKeyword, ThesaurusKeywordLabel
 from geonode.metadata.handlers.abstract import MetadataHandler
 
 
@@ -168,3 +168,30 @@ class TKeywordsHandler(MetadataHandler):
 
         kw_requested = ThesaurusKeyword.objects.filter(about__in=kids)
         resource.tkeywords.set(kw_requested)
+
+    def update_resources(self, resources, field_name, json_instance, context, errors, **kwargs):
+        kids = []
+        for thes_id, keywords in json_instance.get(TKEYWORDS, {}).items():
+            for keyword in keywords:
+                kids.append(keyword["id"])
+        # the keywords are written in save_resources, once the resources are validated
+        context.setdefault("bulk_related", {})[field_name] = list(
+            ThesaurusKeyword.objects.filter(about__in=kids).values_list("id", flat=True)
+        )
+
+    def save_resources(self, resources, field_name, json_instance, context, errors, **kwargs):
+        kw_requested = context.get("bulk_related", {}).get(field_name)
+        if kw_requested is None or not resources:
+            return
+
+        # replace the keywords of all the resources with two queries
+        through = ResourceBase.tkeywords.through
+        resource_ids = [resource.pk for resource in resources]
+        through.objects.filter(resourcebase_id__in=resource_ids).delete()
+        through.objects.bulk_create(
+            [
+                through(resourcebase_id=res_id, thesauruskeyword_id=kw_id)
+                for res_id in resource_ids
+                for kw_id in kw_requested
+            ]
+        )
@@ -1,10 +1,13 @@
+import hashlib
 import logging
 from datetime import datetime
 
 from cachetools import FIFOCache
+from django.core.cache import caches
 from django.db import connection
 
 from geonode.base.models import ThesaurusKeywordLabel, Thesaurus
+from geonode.metadata import settings
 
 
 logger = logging.getLogger(__name__)
@@ -70,50 +73,94 @@ class I18nCache:
     DATA_KEY_SCHEMA = "schema"
     DATA_KEY_LABELS = "labels"
 
-    def __init__(self):
+    SHARED_KEY_PREFIX = "metadata:i18n"
+    GENERATION_KEY = f"{SHARED_KEY_PREFIX}:generation"
+
+    def __init__(self, shared_cache_alias=None, code_version=None):
         # the cache has the lang as key, and various info in the dict value:
-        # - date: the date field of the thesaurus when it was last loaded, it's used for the expiration check
+        # - date: the version of the thesauri when the info was last loaded, it's used for the expiration check
         # - labels: the keyword labels from the i18n thesaurus
         # - schema: the localized json schema
         # FIFO bc we want to renew the data once in a while
         self.cache = FIFOCache(16)
+        # the entries are also stored in a cache shared among all the processes,
+        # so that they are computed only once per lang and version
+        self.shared_cache_alias = shared_cache_alias
+        # callable returning the version of the code building the data, so that it is rebuilt when the code changes
+        self.code_version = code_version
+
+    @property
+    def shared_cache(self):
+        return caches[self.shared_cache_alias] if self.shared_cache_alias else None
+
+    def get_version(self):
+        """
+        Returns the version of the cached data.
+        It's made of the date of the i18n thesaurus, which is updated when its keywords or labels change,
+        of a generation counter that is increased when any other thesaurus changes,
+        and of the version of the code building the data.
+        """
+        thesaurus_date = (  # may be none if thesaurus does not exist
+            Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER).values_list("date", flat=True).first()
+        )
+        generation = self.shared_cache.get(self.GENERATION_KEY, 0) if self.shared_cache else 0
+        code_version = self.code_version() if self.code_version else ""
+        return f"{thesaurus_date}:{generation}:{code_version}"
+
+    def _shared_key(self, lang, data_key, version):
+        digest = hashlib.md5(f"{lang}:{data_key}:{version}".encode()).hexdigest()
+        return f"{self.SHARED_KEY_PREFIX}:{digest}"
 
     def get_entry(self, lang, data_key):
         """
-        returns date:str, data
-        date is needed for checking the entry freshness when setting info
+        returns version:str, data
+        version is needed for checking the entry freshness when setting info
         data may be None if not cached or expired
         """
         cached_entry = self.cache.get(lang, None)
 
-        thesaurus_date = (  # may be none if thesaurus does not exist
-            Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER).values_list("date", flat=True).first()
-        )
+        version = self.get_version()
         if cached_entry:
-            if thesaurus_date == cached_entry["date"]:
+            if version == cached_entry["date"]:
                 # only return cached data if thesaurus has not been modified
-                return thesaurus_date, cached_entry.get(data_key, None)
+                data = cached_entry.get(data_key, None)
+                if data is not None:
+                    return version, data
             else:
                 logger.info(f"Schema for {lang}:{data_key} needs to be recreated")
 
-        return thesaurus_date, None
+        data = None
+        if self.shared_cache:
+            # the entry may have already been built by another process
+            data = self.shared_cache.get(self._shared_key(lang, data_key, version))
+            if data is not None:
+                logger.debug(f"Loaded lang:{lang} key:{data_key} version:{version} from shared cache")
+                self._set_local(lang, data_key, data, version)
 
-    def set(self, lang: str, data_key: str, data: dict, request_date: str):
-        cached_entry: dict = self.cache.setdefault(lang, {})
+        return version, data
 
-        latest_date = (
-            Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER).values_list("date", flat=True).first()
-        )
+    def set(self, lang: str, data_key: str, data: dict, request_date: str):
+        latest_date = self.get_version()
 
         if request_date == latest_date:
             # no changes after processing, set the info right away
             logger.debug(f"Caching lang:{lang} key:{data_key} date:{request_date}")
-            cached_entry.update({"date": latest_date, data_key: data})
+            self._set_local(lang, data_key, data, latest_date)
+            if self.shared_cache:
+                self.shared_cache.set(
+                    self._shared_key(lang, data_key, latest_date), data, settings.SCHEMA_CACHE_TIMEOUT
+                )
         else:
             logger.warning(
                 f"Cache will not be updated for lang:{lang} key:{data_key} reqdate:{request_date} latest:{latest_date}"
             )
 
+    def _set_local(self, lang, data_key, data, version):
+        cached_entry: dict = self.cache.setdefault(lang, {})
+        if cached_entry.get("date", None) != version:
+            cached_entry.clear()
+        cached_entry.update({"date": version, data_key: data})
+
     def get_labels(self, lang):
         date, labels = self.get_entry(lang, self.DATA_KEY_LABELS)
         if labels is None:
@@ -135,6 +182,15 @@ class I18nCache:
             except KeyError:
                 return
 
+    @classmethod
+    def increase_generation(cls, shared_cache_alias):
+        """Invalidates the entries of all the processes"""
+        shared_cache = caches[shared_cache_alias]
+        try:
+            shared_cache.incr(cls.GENERATION_KEY)
+        except ValueError:
+            shared_cache.set(cls.GENERATION_KEY, 1, None)
+
 
 def thesaurus_changed(sender, instance, **kwargs):
     if instance.identifier == I18N_THESAURUS_IDENTIFIER:
@@ -142,6 +198,15 @@ def thesaurus_changed(sender, instance, **kwargs):
             return
         logger.debug(f"Thesaurus changed: {instance.identifier}")
         _update_thesaurus_date()
+    else:
+        # thesauri are part of the schema
+        logger.debug(f"Thesaurus changed: {instance.identifier}, invalidating schemas")
+        I18nCache.increase_generation(settings.SCHEMA_CACHE_ALIAS)
+
+
+def thesaurus_deleted(sender, instance, **kwargs):
+    logger.debug(f"Thesaurus deleted: {instance.identifier}, invalidating schemas")
+    I18nCache.increase_generation(settings.SCHEMA_CACHE_ALIAS)
 
 
 def thesaurusk_changed(sender, instance, **kwargs):
@@ -17,15 +17,21 @@
 #
 #########################################################################
 
-import logging
 import copy
+import hashlib
+import logging
+import sys
 
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from geonode.base.models import ResourceBase
 from geonode.metadata.handlers.abstract import MetadataHandler
 from geonode.metadata.exceptions import UnsetFieldException
 from geonode.metadata.i18n import I18nCache
-from geonode.metadata.settings import MODEL_SCHEMA
+from geonode.metadata.settings import MODEL_SCHEMA, SCHEMA_CACHE_ALIAS
 
 logger = logging.getLogger(__name__)
 
@@ -42,11 +48,34 @@ class MetadataManager:
     def __init__(self):
         self.root_schema = MODEL_SCHEMA
         self.handlers = {}
-        self._i18n_cache = I18nCache()
+        # the handlers the code version was computed for, and the version
+        self._code_version = (None, None)
+        self._i18n_cache = I18nCache(shared_cache_alias=SCHEMA_CACHE_ALIAS, code_version=self.get_code_version)
 
     def add_handler(self, handler_id, handler):
         self.handlers[handler_id] = handler()
 
+    def get_code_version(self):
+        """
+        Returns the fingerprint of the code building the schema: the GeoNode version and the registered handlers,
+        along with the source of their modules, so that the cached schemas are rebuilt when the code is changed
+        """
+        handlers = tuple(
+            (handler_id, type(handler).__module__, type(handler).__qualname__)
+            for handler_id, handler in self.handlers.items()
+        )
+        if handlers != self._code_version[0]:
+            digest = hashlib.md5(f"{settings.VERSION}:{handlers}".encode())
+            for module_name in sorted({module_name for _, module_name, _ in handlers}):
+                try:
+                    with open(sys.modules[module_name].__file__, "rb") as source:
+                        digest.update(source.read())
+                except (KeyError, AttributeError, TypeError, OSError):
+                    # the module name is already part of the fingerprint
+                    pass
+            self._code_version = (handlers, digest.hexdigest())
+        return self._code_version[1]
+
     def _init_schema_context(self, lang):
         return {"labels": self._i18n_cache.get_labels(lang)}
 
@@ -82,6 +111,13 @@ class MetadataManager:
             self._i18n_cache.set(lang, I18nCache.DATA_KEY_SCHEMA, schema, thesaurus_date)
         return schema
 
+    def get_schema_etag(self, lang=None):
+        """
+        Returns the ETag of the schema for the given lang, computed without loading the schema
+        """
+        digest = hashlib.md5(f"{lang}:{self._i18n_cache.get_version()}".encode()).hexdigest()
+        return f'"{digest}"'
+
     def build_schema_instance(self, resource, lang=None):
         schema = self.get_schema(lang)
 
@@ -185,6 +221,186 @@ class MetadataManager:
 
         return errors
 
+    def update_schema_instances(self, resources, json_instance: dict, user=None, lang=None, chunk_size=500) -> tuple:
+        """
+        Applies the same partial JSON schema instance to a set of resources.
+
+        Only the properties contained in json_instance are updated.
+        The handler contexts are loaded once for the whole set, the changed ResourceBase fields
+        are written with bulk updates, and resource.save() is not called: the side effects
+        of the save signals (e.g. the metadata XML regeneration) are run in a single deferred pass.
+
+        Returns a tuple (updated, errors): the ids of the updated resources, and the errors
+        as a dict where the key "__errors" holds the errors about the whole request and the
+        other keys are the ids of the resources which could not be updated.
+        """
+        schema = self.get_schema()
+        context = self._init_schema_context(lang)
+        context["user"] = user
+
+        errors = {}
+        fieldnames = []
+        for fieldname in json_instance:
+            subschema = schema["properties"].get(fieldname, None)
+            if subschema is None or subschema.get("readOnly", False) or "geonode:handler" not in subschema:
+                MetadataHandler._set_error(
+                    errors,
+                    [],
+                    MetadataHandler.localize_message(context, "metadata_error_bulk_field", {"fieldname": fieldname}),
+                )
+            else:
+                fieldnames.append(fieldname)
+
+        if errors or not fieldnames:
+            return [], errors
+
+        for handler in self.handlers.values():
+            handler.load_deserialization_context(None, schema, context)
+
+        updated = []
+        chunk = []
+        for resource in resources.iterator(chunk_size=chunk_size) if hasattr(resources, "iterator") else resources:
+            chunk.append(resource)
+            if len(chunk) == chunk_size:
+                updated.extend(
+                    self._update_schema_instances_chunk(chunk, schema, fieldnames, json_instance, context, errors)
+                )
+                chunk = []
+        if chunk:
+            updated.extend(
+                self._update_schema_instances_chunk(chunk, schema, fieldnames, json_instance, context, errors)
+            )
+
+        transaction.on_commit(lambda: resources_bulk_updated(updated))
+        return updated, errors
+
+    def _update_schema_instances_chunk(self, resources, schema, fieldnames, json_instance, context, errors):
+        fields = [f for f in ResourceBase._meta.concrete_fields if not f.primary_key]
+        snapshots = {r.pk: [getattr(r, f.attname) for f in fields] for r in resources}
+
+        for fieldname in fieldnames:
+            handler = self.handlers[schema["properties"][fieldname]["geonode:handler"]]
+            try:
+                handler.update_resources(resources, fieldname, json_instance, context, errors)
+            except Exception as e:
+                logger.error(f"Error in bulk update: handler {handler.__class__.__name__}", exc_info=e)
+                for resource in resources:
+                    MetadataHandler._set_error(
+                        errors.setdefault(resource.pk, {}),
+                        [],
+                        MetadataHandler.localize_message(
+                            context,
+                            "metadata_error_update",
+                            {"fieldname": fieldname, "handler": handler.__class__.__name__, "exc": e},
+                        ),
+                    )
+
+        for resource in resources:
+            for handler in self.handlers.values():
+                try:
+                    handler.pre_save(resource, json_instance, context, errors.setdefault(resource.pk, {}))
+                except Exception as e:
+                    logger.error(f"Error in pre_save: handler {handler.__class__.__name__}", exc_info=e)
+                    MetadataHandler._set_error(
+                        errors[resource.pk],
+                        [],
+                        MetadataHandler.localize_message(
+                            context, "metadata_error_pre_save", {"handler": handler.__class__.__name__, "exc": e}
+                        ),
+                    )
+
+        # only the resources without errors are persisted
+        valid = [r for r in resources if not errors.get(r.pk)]
+        for r in resources:
+            if r.pk in errors and not errors[r.pk]:
+                del errors[r.pk]
+
+        changed = {
+            f.name for r in valid for f, old_value in zip(fields, snapshots[r.pk]) if getattr(r, f.attname) != old_value
+        }
+        now = timezone.now()
+        for resource in valid:
+            resource.last_updated = now
+        try:
+            ResourceBase.objects.bulk_update(valid, sorted(changed | {"last_updated"}))
+        except Exception as e:
+            logger.warning(f"Error while bulk updating schema instances: {e}")
+            for resource in valid:
+                MetadataHandler._set_error(
+                    errors.setdefault(resource.pk, {}),
+                    [],
+                    MetadataHandler.localize_message(context, "metadata_error_save", {"exc": e}),
+                )
+            return []
+
+        for fieldname in fieldnames:
+            handler = self.handlers[schema["properties"][fieldname]["geonode:handler"]]
+            try:
+                handler.save_resources(valid, fieldname, json_instance, context, errors)
+            except Exception as e:
+                logger.error(f"Error in bulk save: handler {handler.__class__.__name__}", exc_info=e)
+                for resource in valid:
+                    MetadataHandler._set_error(
+                        errors.setdefault(resource.pk, {}),
+                        [],
+                        MetadataHandler.localize_message(
+                            context,
+                            "metadata_error_update",
+                            {"fieldname": fieldname, "handler": handler.__class__.__name__, "exc": e},
+                        ),
+                    )
+
+        for resource in valid:
+            for handler in self.handlers.values():
+                try:
+                    handler.post_save(resource, json_instance, context, errors.setdefault(resource.pk, {}))
+                except Exception as e:
+                    logger.error(f"Error in post_save: handler {handler.__class__.__name__}", exc_info=e)
+                    MetadataHandler._set_error(
+                        errors[resource.pk],
+                        [],
+                        MetadataHandler.localize_message(
+                            context, "metadata_error_post_save", {"handler": handler.__class__.__name__, "exc": e}
+                        ),
+                    )
+            if not errors[resource.pk]:
+                del errors[resource.pk]
+
+        return [r.pk for r in valid]
+
+
+def resources_bulk_updated(resource_ids):
+    """
+    Runs the side effects of the resource save signals, skipped by the bulk updates, in a single pass
+    """
+    if not resource_ids:
+        return
+
+    from geonode.base.counts import invalidate_resource_counts, update_owner_counts
+    from geonode.base.response_cache import invalidate_cached_responses
+    from geonode.base.search import update_search_vectors
+    from geonode.sitemap import update_sitemap
+
+    # the regions and the thesaurus keywords are part of the search vectors
+    update_search_vectors(resource_ids)
+
+    resources = list(ResourceBase.objects.filter(id__in=resource_ids).only("id", "resource_type", "owner_id"))
+    for resource in resources:
+        update_sitemap(resource)
+    invalidate_resource_counts()
+    update_owner_counts({resource.owner_id for resource in resources})
+    for resource_type in {resource.resource_type for resource in resources}:
+        invalidate_cached_responses(resource_type)
+
+    if "geonode.catalogue" not in settings.INSTALLED_APPS:
+        return
+
+    from geonode.catalogue.tasks import generate_metadata_xml
+
+    batch_size = getattr(settings, "CATALOG_METADATA_XML_BATCH_SIZE", 100)
+    for i in range(0, len(resource_ids), batch_size):
+        generate_metadata_xml.delay(resource_ids[i : i + batch_size])
+
 
 def _create_test_errors(schema, errors, path, msg_template, create_message=True):
     if create_message:
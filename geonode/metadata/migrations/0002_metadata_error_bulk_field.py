@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from django.db import migrations
+
+I18N_THESAURUS_IDENTIFIER = "labels-i18n"
+
+# the messages of the bulk update, the alt_label being the default label
+LABELS = {
+    "metadata_error_bulk_field": "The field '{fieldname}' cannot be updated in bulk",
+}
+
+
+def add_labels(apps, schema_editor):
+    Thesaurus = apps.get_model("base", "Thesaurus")
+    ThesaurusKeyword = apps.get_model("base", "ThesaurusKeyword")
+
+    thesaurus = Thesaurus.objects.filter(identifier=I18N_THESAURUS_IDENTIFIER).first()
+    if thesaurus is None:
+        # the labels are loaded with the thesaurus
+        return
+    for about, alt_label in LABELS.items():
+        if not ThesaurusKeyword.objects.filter(thesaurus=thesaurus, about=about).exists():
+            ThesaurusKeyword.objects.create(thesaurus=thesaurus, about=about, alt_label=alt_label)
+    # the date is the version of the cached labels
+    thesaurus.date = datetime.now().replace(microsecond=0).isoformat()
+    thesaurus.save(update_fields=["date"])
+
+
+def remove_labels(apps, schema_editor):
+    ThesaurusKeyword = apps.get_model("base", "ThesaurusKeyword")
+    ThesaurusKeyword.objects.filter(thesaurus__identifier=I18N_THESAURUS_IDENTIFIER, about__in=list(LABELS)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0095_resourcebase_search_vector"),
+        ("metadata", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_labels, remove_labels),
+    ]
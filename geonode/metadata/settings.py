@@ -22,3 +22,7 @@ METADATA_HANDLERS = {
     "contact": "geonode.metadata.handlers.contact.ContactHandler",
     "sparse": "geonode.metadata.handlers.sparse.SparseHandler",
 }
+
+# Cache shared by all the processes where the localized JSON schemas and labels are stored
+SCHEMA_CACHE_ALIAS = os.getenv("METADATA_SCHEMA_CACHE", "default")
+SCHEMA_CACHE_TIMEOUT = int(os.getenv("METADATA_SCHEMA_CACHE_TIMEOUT", 86400))
@@ -1,9 +1,9 @@
 import logging
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 
 from geonode.base.models import Thesaurus, ThesaurusKeyword, ThesaurusKeywordLabel
-from geonode.metadata.i18n import thesaurus_changed, thesaurusk_changed, thesauruskl_changed
+from geonode.metadata.i18n import thesaurus_changed, thesaurus_deleted, thesaurusk_changed, thesauruskl_changed
 
 logger = logging.getLogger(__name__)
 
@@ -13,4 +13,5 @@ def connect_signals():
     post_save.connect(thesaurus_changed, sender=Thesaurus, weak=False, dispatch_uid="metadata_reset_t")
     post_save.connect(thesaurusk_changed, sender=ThesaurusKeyword, weak=False, dispatch_uid="metadata_reset_tk")
     post_save.connect(thesauruskl_changed, sender=ThesaurusKeywordLabel, weak=False, dispatch_uid="metadata_reset_tkl")
+    post_delete.connect(thesaurus_deleted, sender=Thesaurus, weak=False, dispatch_uid="metadata_delete_t")
     logger.debug("Signal connections set")
@@ -345,6 +345,25 @@ class HandlersTests(GeoNodeBaseTestSupport):
             f"Error setting field {field_name}={field_value}: Deserialization error"
         )
 
+    @patch("geonode.metadata.handlers.base.SUBHANDLERS", new_callable=dict)
+    def test_update_resources_deserializes_once(self, mock_subhandlers):
+        """
+        Ensure that the bulk update deserializes the value once and assigns it to all the resources
+        """
+        field_name = "category"
+        json_instance = {field_name: "new_category_value"}
+        resources = [MagicMock(pk=1), MagicMock(pk=2)]
+
+        mock_subhandlers[field_name] = MagicMock()
+        mock_subhandlers[field_name].deserialize.return_value = self.category
+
+        self.base_handler.update_resources(resources, field_name, json_instance, self.context, self.errors)
+
+        mock_subhandlers[field_name].deserialize.assert_called_once_with("new_category_value")
+        for resource in resources:
+            self.assertEqual(resource.category, self.category)
+        self.assertEqual(self.errors, {})
+
     # Tests for subhandler classes of the base handler
     @patch("geonode.metadata.handlers.base.reverse")
     def test_category_subhandler_update_subschema(self, mocked_endpoint):
@@ -968,6 +987,36 @@ class HandlersTests(GeoNodeBaseTestSupport):
             sorted([updated_region_1, updated_region_2, region_3], key=lambda region: region.name),
         )
 
+    def test_region_handler_update_resources(self):
+        """
+        Test the bulk update of the region handler: all the validated resources get the same regions
+        """
+        glo = Region.objects.get(code="GLO")
+        self.resource.regions.add(glo)
+        self.extra_resource_2.regions.add(glo)
+        region_1 = Region.objects.get(code="ITA")
+        region_2 = Region.objects.get(code="GRC")
+        payload_data = {
+            "regions": [
+                {"id": str(region_1.id), "label": region_1.name},
+                {"id": str(region_2.id), "label": region_2.name},
+            ]
+        }
+        resources = [self.resource, self.extra_resource_1]
+
+        self.region_handler.update_resources(
+            resources + [self.extra_resource_2], "regions", payload_data, self.context, self.errors
+        )
+        # nothing is written before the resources are validated
+        self.assertSetEqual(set(self.resource.regions.all()), {glo})
+
+        # e.g. the third resource did not pass the validation
+        self.region_handler.save_resources(resources, "regions", payload_data, self.context, self.errors)
+
+        for resource in resources:
+            self.assertSetEqual(set(resource.regions.all()), {region_1, region_2})
+        self.assertSetEqual(set(self.extra_resource_2.regions.all()), {glo})
+
     # Tests for the linkedresource handler
 
     @patch("geonode.metadata.handlers.linkedresource.reverse")
@@ -1540,6 +1589,27 @@ class HandlersTests(GeoNodeBaseTestSupport):
         # Ensure that only the keyword1 and keyword2 are stored in the database
         self.assertEqual(len(updated_keywords), 2)
 
+    def test_tkeywords_handler_update_resources(self):
+        """
+        Ensures that the bulk update replaces the keywords of all the resources
+        """
+        self.extra_resource_1.tkeywords.add(self.keyword2)
+        json_instance = {
+            "tkeywords": {
+                "thes-1": [{"id": "http://example.com/keyword1", "label": "Keyword 1"}],
+            }
+        }
+        resources = [self.resource, self.extra_resource_1]
+
+        self.tkeywords_handler.update_resources(resources, "tkeywords", json_instance, self.context, self.errors)
+        # nothing is written before the resources are validated
+        self.assertListEqual(list(self.extra_resource_1.tkeywords.all()), [self.keyword2])
+
+        self.tkeywords_handler.save_resources(resources, "tkeywords", json_instance, self.context, self.errors)
+
+        for resource in resources:
+            self.assertListEqual(list(resource.tkeywords.all()), [self.keyword1])
+
     # Tests for the sparse handler
 
     def test_sparse_handler_update_schema(self):
@@ -18,6 +18,10 @@
 #########################################################################
 
 import time
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import override_settings
 
 from geonode.tests.base import GeoNodeBaseTestSupport
 
@@ -143,3 +147,41 @@ class MetadataI18NTests(GeoNodeBaseTestSupport):
         self._add_label("field1__ovr", "en", "f1_ovr_en")
         schema = self.mm.build_schema(lang="en")
         self.assertEqual("f1_ovr_en", schema["properties"]["field1"]["title"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_schema_shared_among_managers(self):
+        """
+        Ensure a schema built by a process is reused by the others, and invalidated by thesaurus changes
+        """
+        caches["default"].clear()
+        self.sparse_registry.register("field1", {"type": "number"})
+        other_mm = MetadataManager()
+        other_mm.handlers = self.mm.handlers
+
+        schema = self.mm.get_schema("en")
+        with patch.object(other_mm, "build_schema") as mock_build_schema:
+            self.assertEqual(other_mm.get_schema("en"), schema)
+            mock_build_schema.assert_not_called()
+        self.assertEqual(self.mm.get_schema_etag("en"), other_mm.get_schema_etag("en"))
+
+        # changing a thesaurus invalidates the schema of all the managers
+        etag = other_mm.get_schema_etag("en")
+        Thesaurus.objects.create(title="Another thesaurus", identifier="another-thesaurus")
+        self.assertNotEqual(etag, other_mm.get_schema_etag("en"))
+        with patch.object(other_mm, "build_schema", return_value=schema) as mock_build_schema:
+            other_mm.get_schema("en")
+            mock_build_schema.assert_called_once_with("en")
+
+    def test_schema_version_includes_handlers(self):
+        """
+        Ensure the cached schema is invalidated when the handlers building it change
+        """
+        self.sparse_registry.register("field1", {"type": "number"})
+        etag = self.mm.get_schema_etag("en")
+        self.assertEqual(etag, self.mm.get_schema_etag("en"))
+
+        class OtherSparseHandler(SparseHandler):
+            pass
+
+        self.mm.handlers["other"] = OtherSparseHandler(registry=SparseFieldRegistry())
+        self.assertNotEqual(etag, self.mm.get_schema_etag("en"))
@@ -30,7 +30,7 @@ from django.utils.translation import gettext as _
 
 from rest_framework.test import APITestCase
 from geonode.metadata.settings import MODEL_SCHEMA
-from geonode.metadata.manager import metadata_manager
+from geonode.metadata.manager import metadata_manager, resources_bulk_updated
 from geonode.metadata.i18n import I18nCache
 from geonode.metadata.api.views import (
     ProfileAutocomplete,
@@ -174,6 +174,26 @@ class MetadataApiTests(APITestCase):
         # Verify that get_schema was called with the correct lang
         mock_get_schema.assert_called_once_with("it")
 
+    @patch("geonode.metadata.manager.metadata_manager.get_schema")
+    def test_schema_etag(self, mock_get_schema):
+        """
+        Test that the schema is not sent again when the client already has it
+        """
+        mock_get_schema.return_value = {"fake_schema": "schema"}
+
+        url = reverse("metadata-schema")
+        response = self.client.get(url, {"lang": "it"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(url, {"lang": "it"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        mock_get_schema.assert_called_once_with("it")
+
+        # another language has a different ETag
+        response = self.client.get(url, {"lang": "en"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     @patch("geonode.metadata.manager.metadata_manager.build_schema_instance")
     @patch("geonode.base.api.permissions.UserHasPerms.has_permission", return_value=True)
     def test_get_schema_instance_with_default_lang(self, mock_has_permission, mock_build_schema_instance):
@@ -1027,3 +1047,105 @@ class MetadataApiTests(APITestCase):
             self.resource.save.assert_called_once()
             self.assertIn("__errors", errors)
             self.assertEqual(errors["__errors"], ["Error while saving the resource: Error during the resource save"])
+
+    @patch("geonode.metadata.manager.metadata_manager.get_schema")
+    def test_update_schema_instances_no_errors(self, mock_get_schema):
+        mock_get_schema.return_value = self.fake_schema
+        json_instance = {"field1": "new_value1"}
+        resources = ResourceBase.objects.filter(pk__in=[self.resource.pk, self.other_resource.pk]).order_by("pk")
+
+        with patch.dict(metadata_manager.handlers, self.fake_handlers, clear=True):
+            with self.captureOnCommitCallbacks() as callbacks:
+                updated, errors = metadata_manager.update_schema_instances(resources, json_instance, self.test_user_1)
+
+            # the contexts are loaded once for the whole set of resources
+            for handler in self.fake_handlers.values():
+                handler.load_deserialization_context.assert_called_once_with(None, self.fake_schema, ANY)
+
+            # only the handler of the patched field updates the resources
+            self.handler1.update_resources.assert_called_once_with(
+                [self.resource, self.other_resource], "field1", json_instance, ANY, {}
+            )
+            self.handler2.update_resources.assert_not_called()
+            self.handler3.update_resources.assert_not_called()
+            self.handler1.update_resource.assert_not_called()
+            # the related objects are written for the validated resources only
+            self.handler1.save_resources.assert_called_once_with(
+                [self.resource, self.other_resource], "field1", json_instance, ANY, {}
+            )
+
+        self.assertListEqual(updated, [self.resource.pk, self.other_resource.pk])
+        self.assertEqual(errors, {})
+        # side effects are deferred to a single pass after the commit
+        self.assertEqual(len(callbacks), 1)
+
+    @patch("geonode.catalogue.tasks.generate_metadata_xml.delay")
+    @patch("geonode.base.response_cache.invalidate_cached_responses")
+    @patch("geonode.base.counts.update_owner_counts")
+    @patch("geonode.base.counts.invalidate_resource_counts")
+    @patch("geonode.sitemap.update_sitemap")
+    @patch("geonode.base.search.update_search_vectors")
+    def test_resources_bulk_updated(
+        self,
+        mock_update_search_vectors,
+        mock_update_sitemap,
+        mock_invalidate_resource_counts,
+        mock_update_owner_counts,
+        mock_invalidate_cached_responses,
+        mock_generate_metadata_xml,
+    ):
+        resources_bulk_updated([self.resource.pk, self.other_resource.pk])
+        # the bulk writes of the regions and keywords are reflected in the search vectors
+        mock_update_search_vectors.assert_called_once_with([self.resource.pk, self.other_resource.pk])
+        # the side effects of the save signals of the resources
+        self.assertSetEqual(
+            {call.args[0].pk for call in mock_update_sitemap.call_args_list}, {self.resource.pk, self.other_resource.pk}
+        )
+        mock_invalidate_resource_counts.assert_called_once()
+        mock_update_owner_counts.assert_called_once_with({self.resource.owner_id, self.other_resource.owner_id})
+        mock_invalidate_cached_responses.assert_any_call(self.resource.resource_type)
+
+    @patch("geonode.metadata.manager.metadata_manager.get_schema")
+    @patch("geonode.metadata.manager.MetadataHandler.localize_message")
+    def test_update_schema_instances_unknown_field(self, mock_localize_message, mock_get_schema):
+        mock_get_schema.return_value = self.fake_schema
+        mock_localize_message.side_effect = lambda context, msg_id, data: f"Bad field {data['fieldname']}"
+
+        with patch.dict(metadata_manager.handlers, self.fake_handlers, clear=True):
+            updated, errors = metadata_manager.update_schema_instances(
+                ResourceBase.objects.all(), {"field1": "value", "not_a_field": "value"}, self.test_user_1
+            )
+
+            self.handler1.update_resources.assert_not_called()
+
+        self.assertListEqual(updated, [])
+        self.assertListEqual(errors["__errors"], ["Bad field not_a_field"])
+
+    @patch("geonode.metadata.api.views.metadata_manager.update_schema_instances")
+    def test_patch_schema_instances(self, mock_update_schema_instances):
+        mock_update_schema_instances.return_value = ([self.resource.pk], {})
+        self.client.force_login(self.test_user_1)
+        url = reverse("metadata-schema_instances")
+
+        response = self.client.patch(
+            url,
+            data={"resources": [self.resource.pk], "instance": {"edition": "2nd"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.json()["updated"], [self.resource.pk])
+        args = mock_update_schema_instances.call_args.args
+        self.assertDictEqual(args[1], {"edition": "2nd"})
+
+    def test_patch_schema_instances_bad_filter(self):
+        self.client.force_login(self.test_user_1)
+        url = reverse("metadata-schema_instances")
+
+        response = self.client.patch(
+            url,
+            data={"filter": {"owner__password": "x"}, "instance": {"edition": "2nd"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
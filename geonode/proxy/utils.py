@@ -77,6 +77,16 @@ def link_post_save(instance, sender, **kwargs):
         proxy_urls_registry.register_host(remote_host)
 
 
+def register_links_hosts(resource, links):
+    """Registers the hosts of the links of the resource written in bulk, which do not send the post_save signal"""
+    # the registry loads all the links when initialized
+    if proxy_urls_registry._last_registry_load is None or resource.sourcetype != "REMOTE":
+        return
+    for link in links:
+        if link.url and link.link_type in PROXIED_LINK_TYPES:
+            proxy_urls_registry.register_host(urlsplit(link.url).hostname)
+
+
 def link_post_delete(instance, sender, **kwargs):
     # We reinitialize the registry otherwise we might delete a host requested by another service with the same hostanme
     proxy_urls_registry.initialize()
@@ -34,6 +34,7 @@ from geonode.tasks.tasks import AcquireLock, FaultTolerantTask
 
 from .utils import resolve_type_serializer
 from ..models import ExecutionRequest
+from ..progress import publish_execution_progress
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +101,7 @@ def resouce_service_dispatcher(self, execution_id: str):
                     _request = _exec_request.get()
                     if _request.status == ExecutionRequest.STATUS_READY:
                         _exec_request.update(status=ExecutionRequest.STATUS_RUNNING)
+                        publish_execution_progress(execution_id, {"status": ExecutionRequest.STATUS_RUNNING})
                         _request.refresh_from_db()
                         if hasattr(resource_manager, _request.func_name):
                             try:
@@ -137,6 +139,9 @@ def resouce_service_dispatcher(self, execution_id: str):
                                     output_params=_output_params,
                                 )
                                 _request.refresh_from_db()
+                                publish_execution_progress(
+                                    execution_id, {"status": _request.status, "finished": _request.finished}
+                                )
                             except Exception as e:
                                 logger.exception(e)
                                 _exec_request.update(
@@ -150,6 +155,9 @@ def resouce_service_dispatcher(self, execution_id: str):
                                     },
                                 )
                                 _request.refresh_from_db()
+                                publish_execution_progress(
+                                    execution_id, {"status": _request.status, "finished": _request.finished}
+                                )
                         else:
                             logger.warning(_(f"Could not find the operation name: '{_request.func_name}'"))
                             _request.refresh_from_db()
@@ -16,9 +16,16 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
+import json
+from uuid import uuid4
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
 from django.urls import reverse
 from geonode.resource.models import ExecutionRequest
+from geonode.resource.progress import get_execution_progress, publish_execution_progress
 from geonode.tests.base import GeoNodeBaseTestSupport
 
 
@@ -173,3 +180,104 @@ class ExecutionRequestApi(GeoNodeBaseTestSupport):
 
         # cleanup
         obj.delete()
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+@patch("geonode.resource.progress.rm_settings.EXECUTION_PROGRESS_POLL_INTERVAL", 0)
+@patch("geonode.resource.progress.rm_settings.EXECUTION_PROGRESS_STREAM_DURATION", 0)
+class ExecutionRequestProgressApi(GeoNodeBaseTestSupport):
+    def setUp(self):
+        caches["default"].clear()
+        self.user = get_user_model().objects.create(username="marty_mcfly", is_active=True)
+        self.request = ExecutionRequest.objects.create(user=self.user, func_name="import_new_resource", step="start")
+        self.url = reverse("rs-execution-progress", args=[self.request.exec_id])
+
+    def tearDown(self):
+        self.request.delete()
+        self.user.delete()
+
+    def _read_events(self, response, with_ids=False):
+        content = b"".join(response.streaming_content).decode()
+        events = [json.loads(line[len("data: ") :]) for line in content.splitlines() if line.startswith("data: ")]
+        if with_ids:
+            return events, [line[len("id: ") :] for line in content.splitlines() if line.startswith("id: ")]
+        return events
+
+    def test_changes_are_coalesced_in_the_snapshot(self):
+        publish_execution_progress(self.request.exec_id, {"step": "geonode.upload.import_resource"})
+        publish_execution_progress(
+            self.request.exec_id, {"step": "geonode.upload.publish_resource"}, layer_name="layer_a"
+        )
+        snapshot = get_execution_progress(self.request.exec_id)
+        self.assertEqual(snapshot["version"], 2)
+        self.assertEqual(snapshot["func_name"], "import_new_resource")
+        self.assertEqual(snapshot["step"], "geonode.upload.publish_resource")
+        self.assertDictEqual(snapshot["layers"], {"layer_a": "geonode.upload.publish_resource"})
+
+        # the layers are published separately, the steps of the other layers are kept
+        publish_execution_progress(self.request.exec_id, {"step": "geonode.upload.import_resource"}, layer_name="b")
+        publish_execution_progress(self.request.exec_id, {"step": "geonode.upload.create_geonode_resource"}, "b")
+        snapshot = get_execution_progress(self.request.exec_id)
+        self.assertEqual(snapshot["version"], 4)
+        self.assertDictEqual(
+            snapshot["layers"],
+            {"layer_a": "geonode.upload.publish_resource", "b": "geonode.upload.create_geonode_resource"},
+        )
+
+    def test_progress_stream(self):
+        publish_execution_progress(self.request.exec_id, {"status": ExecutionRequest.STATUS_FINISHED})
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("text/event-stream", response["Content-Type"])
+        events, ids = self._read_events(response, with_ids=True)
+        self.assertEqual(1, len(events))
+        self.assertEqual(ExecutionRequest.STATUS_FINISHED, events[0]["status"])
+
+        # nothing changed since the last event received
+        response = self.client.get(self.url, HTTP_LAST_EVENT_ID=ids[-1])
+        self.assertListEqual([], self._read_events(response))
+
+    def test_executions_progress_stream(self):
+        other = ExecutionRequest.objects.create(user=self.user, func_name="import_new_resource", step="start")
+        finished = ExecutionRequest.objects.create(
+            user=self.user, func_name="import_new_resource", status=ExecutionRequest.STATUS_FINISHED
+        )
+        try:
+            publish_execution_progress(self.request.exec_id, {"status": ExecutionRequest.STATUS_FINISHED})
+            publish_execution_progress(other.exec_id, {"status": ExecutionRequest.STATUS_FINISHED})
+            self.client.force_login(self.user)
+            url = reverse("rs-executions-progress")
+
+            # a single stream carries the selected executions
+            response = self.client.get(f"{url}?ids={self.request.exec_id},{other.exec_id}")
+            self.assertEqual(200, response.status_code)
+            events, ids = self._read_events(response, with_ids=True)
+            self.assertSetEqual({str(self.request.exec_id), str(other.exec_id)}, {e["exec_id"] for e in events})
+
+            # resuming from the last event, nothing changed for any of them
+            response = self.client.get(
+                f"{url}?ids={self.request.exec_id}&ids={other.exec_id}", HTTP_LAST_EVENT_ID=ids[-1]
+            )
+            self.assertListEqual([], self._read_events(response))
+
+            # without ids, the running executions of the user are followed
+            response = self.client.get(url)
+            self.assertSetEqual(
+                {str(self.request.exec_id), str(other.exec_id)}, {e["exec_id"] for e in self._read_events(response)}
+            )
+            ExecutionRequest.objects.filter(user=self.user).update(status=ExecutionRequest.STATUS_FINISHED)
+            self.assertEqual(204, self.client.get(url).status_code)
+            self.assertEqual(404, self.client.get(f"{url}?ids={uuid4()}").status_code)
+        finally:
+            other.delete()
+            finished.delete()
+
+    def test_progress_stream_permissions(self):
+        other = get_user_model().objects.create(username="biff_tannen", is_active=True)
+        try:
+            self.client.force_login(other)
+            response = self.client.get(self.url)
+            self.assertEqual(403, response.status_code)
+        finally:
+            other.delete()
@@ -26,7 +26,17 @@ urlpatterns = [
         "resource-service/execution-status/<str:execution_id>",
         views.resource_service_execution_status,
         name="rs-execution-status",
-    )
+    ),
+    path(
+        "resource-service/execution-progress/<str:execution_id>",
+        views.resource_service_execution_progress,
+        name="rs-execution-progress",
+    ),
+    path(
+        "resource-service/execution-progress",
+        views.resource_service_executions_progress,
+        name="rs-executions-progress",
+    ),
 ]
 
 router.register(r"executionrequest", views.ExecutionRequestViewset, "executionrequest")
@@ -16,8 +16,10 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 #########################################################################
+import json
 import logging
 
+from django.http import StreamingHttpResponse
 from dynamic_rest.filters import DynamicFilterBackend, DynamicSortingFilter
 from dynamic_rest.viewsets import WithDynamicViewSetMixin
 from geonode.base.api.filters import DynamicSearchFilter
@@ -28,13 +30,16 @@ from geonode.resource.api.serializer import ExecutionRequestSerializer
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 from django.core.exceptions import ValidationError
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from .. import settings as rm_settings
 from ..models import ExecutionRequest
+from ..progress import FINAL_STATUSES, load_execution_progress, stream_execution_progress
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +79,86 @@ def resource_service_execution_status(request, execution_id: str):
         return Response(status=status.HTTP_400_BAD_REQUEST, exception=e)
 
 
+class EventStreamRenderer(BaseRenderer):
+    """Lets the clients ask for server-sent events, only the error responses are rendered through it"""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f"event: error\ndata: {json.dumps(data)}\n\n"
+
+
+def _progress_stream_response(request, execution_ids):
+    response = StreamingHttpResponse(
+        stream_execution_progress(execution_ids, last_event_id=request.headers.get("Last-Event-ID")),
+        content_type=EventStreamRenderer.media_type,
+    )
+    response["Cache-Control"] = "no-cache"
+    # disables the proxy buffering, e.g. on nginx
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@api_view(["GET"])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def resource_service_execution_progress(request, execution_id: str):
+    """Streams the progress of an API request as server-sent events
+
+    - GET input: <str: execution id>, optional Last-Event-ID header to resume a stream
+    - output: text/event-stream of "progress" events, one for each set of changes
+
+    The stream is closed after EXECUTION_PROGRESS_STREAM_DURATION seconds, during which it holds the worker
+    serving it, and the clients reconnect; the executions can be polled with the status endpoint as well.
+    To follow several executions use resource_service_executions_progress, which holds a single worker.
+    """
+    try:
+        _progress = load_execution_progress(execution_id)
+    except ValidationError as e:
+        return Response({"detail": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+    if _progress is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    if _progress["user_id"] != request.user.id and not request.user.is_superuser:
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    return _progress_stream_response(request, [execution_id])
+
+
+@api_view(["GET"])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def resource_service_executions_progress(request):
+    """Streams the progress of the API requests of the user as server-sent events, in a single stream
+
+    - GET input: optional "ids" params, repeated or comma separated, with the execution ids to follow,
+      the running executions of the user when missing; optional Last-Event-ID header to resume a stream
+    - output: text/event-stream of "progress" events, one for each set of changes of an execution,
+      identified by the exec_id of the event data
+    """
+    if not request.user.is_authenticated:
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    ids = [_id for value in request.query_params.getlist("ids") for _id in value.split(",") if _id]
+    executions = ExecutionRequest.objects.order_by("-created")
+    if not request.user.is_superuser or not ids:
+        executions = executions.filter(user=request.user)
+    try:
+        if ids:
+            executions = executions.filter(exec_id__in=ids)
+        else:
+            executions = executions.exclude(status__in=FINAL_STATUSES)
+        execution_ids = [
+            str(_id)
+            for _id in executions.values_list("exec_id", flat=True)[
+                : rm_settings.EXECUTION_PROGRESS_STREAM_MAX_EXECUTIONS
+            ]
+        ]
+    except ValidationError as e:
+        return Response({"detail": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+    if not execution_ids:
+        # nothing to follow, the clients stop reconnecting
+        return Response(status=status.HTTP_404_NOT_FOUND if ids else status.HTTP_204_NO_CONTENT)
+    return _progress_stream_response(request, execution_ids)
+
+
 class ExecutionRequestViewset(WithDynamicViewSetMixin, ListModelMixin, RetrieveModelMixin, GenericViewSet):
     """
     API endpoint that allows users to be viewed or edited.
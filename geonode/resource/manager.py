@@ -357,7 +357,10 @@ class ResourceManager(ResourceManagerInterface):
                         vals=vals,
                         extra_metadata=extra_metadata,
                     )
-                    _resource = self._concrete_resource_manager.update(uuid, instance=_resource, notify=notify)
+                    # overwrite is set when the data of the resource has been replaced
+                    _resource = self._concrete_resource_manager.update(
+                        uuid, instance=_resource, notify=notify, overwrite=kwargs.get("overwrite", False)
+                    )
 
                     # The following is only a demo proof of concept for a pluggable WF subsystem
                     from geonode.resource.processing.models import ProcessingWorkflow
@@ -556,6 +559,7 @@ class ResourceManager(ResourceManagerInterface):
                 with transaction.atomic():
                     logger.debug(f"Setting permissions {permissions} on {_resource}")
 
+                    _previous_owner_id = _resource.owner_id
                     # default permissions for owner
                     if owner and owner != _resource.owner:
                         _resource.owner = owner
@@ -810,6 +814,17 @@ class ResourceManager(ResourceManagerInterface):
                         # This might not be a severe error. E.g. for datasets outside of local GeoServer
                         logger.error(Exception("Could not complete concrete manager operation successfully!"))
                 _resource.set_processing_state(enumerations.STATE_PROCESSED)
+                # the anonymous visibility of the resource may have changed
+                from geonode.base.api.conditional import invalidate_permissions_validators
+                from geonode.base.counts import invalidate_resource_counts, update_owner_counts
+                from geonode.base.response_cache import invalidate_cached_responses
+                from geonode.sitemap import update_sitemap
+
+                update_sitemap(_resource)
+                invalidate_resource_counts()
+                invalidate_permissions_validators()
+                invalidate_cached_responses(_resource.resource_type)
+                update_owner_counts([_previous_owner_id, _resource.owner_id])
                 return True
             except Exception as e:
                 logger.exception(e)
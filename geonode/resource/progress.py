@@ -0,0 +1,182 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Cache backed change feed of the ExecutionRequest progress.
+
+Whoever updates an execution request publishes the changed fields here; the progress stream
+reads the latest snapshot from the cache, so that following an execution does not hit the
+database. Each field and the step of each layer are kept under their own keys, so the concurrent
+publishers, e.g. the tasks importing the layers of the same execution, never overwrite each
+other's changes, and the version of the snapshot is increased atomically after each change.
+A stream follows any number of executions, the id of its events holding the versions sent for each of them.
+"""
+import json
+import time
+import logging
+from datetime import datetime
+
+from django.core.cache import caches
+
+from geonode.resource import settings as rm_settings
+from geonode.resource.models import ExecutionRequest
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY_PREFIX = "executionrequest:progress"
+PROGRESS_FIELDS = ("status", "func_name", "step", "log", "finished", "last_updated")
+FINAL_STATUSES = (ExecutionRequest.STATUS_FINISHED, ExecutionRequest.STATUS_FAILED)
+
+
+def _get_cache():
+    return caches[rm_settings.EXECUTION_PROGRESS_CACHE]
+
+
+def _get_key(execution_id, *parts):
+    return ":".join([PROGRESS_KEY_PREFIX, str(execution_id), *parts])
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    # e.g. lazy translations used as step names
+    return str(value)
+
+
+def publish_execution_progress(execution_id, changes, layer_name=None):
+    """
+    Stores the changed fields of the execution request and increases the version of its snapshot.
+    When a layer name is given, the step is recorded as the progress of that layer too
+    """
+    cache = _get_cache()
+    timeout = rm_settings.EXECUTION_PROGRESS_TIMEOUT
+    try:
+        if cache.add(_get_key(execution_id, "version"), 0, timeout):
+            # first change published for the execution, the unchanged fields are taken from the database
+            execution = load_execution_progress(execution_id) or {}
+            for name in PROGRESS_FIELDS:
+                if name in execution and name not in changes:
+                    cache.add(_get_key(execution_id, "field", name), execution[name], timeout)
+        cache.set_many(
+            {
+                _get_key(execution_id, "field", name): _serialize(changes[name])
+                for name in PROGRESS_FIELDS
+                if name in changes
+            },
+            timeout,
+        )
+        if layer_name and "step" in changes:
+            step = _serialize(changes["step"])
+            if cache.add(_get_key(execution_id, "layer", layer_name), step, timeout):
+                # the first step of the layer, which is listed in the snapshot from now on
+                cache.add(_get_key(execution_id, "layers"), 0, timeout)
+                slot = cache.incr(_get_key(execution_id, "layers"))
+                cache.set(_get_key(execution_id, "layers", str(slot)), layer_name, timeout)
+            else:
+                cache.set(_get_key(execution_id, "layer", layer_name), step, timeout)
+        # the version is increased last, so the readers seeing it see the changes too
+        cache.incr(_get_key(execution_id, "version"))
+    except ValueError:
+        # the cache backend does not retain values (e.g. DummyCache), the stream reads the database
+        logger.debug(f"Could not publish the progress of the execution {execution_id} in the cache")
+    except Exception as e:
+        # the progress feed must never break the execution itself
+        logger.warning(f"Could not publish the progress of the execution {execution_id}: {e}")
+
+
+def get_execution_progress(execution_id):
+    """Returns the snapshot of the execution progress, None when it is not available"""
+    cache = _get_cache()
+    keys = {_get_key(execution_id, "field", name): name for name in PROGRESS_FIELDS}
+    values = cache.get_many([_get_key(execution_id, "version"), _get_key(execution_id, "layers"), *keys])
+    version = values.get(_get_key(execution_id, "version"))
+    if not version:
+        # nothing published yet, or the first change is being published
+        return None
+    snapshot = {name: values.get(key) for key, name in keys.items()}
+    layers_count = values.get(_get_key(execution_id, "layers")) or 0
+    slots = [_get_key(execution_id, "layers", str(slot)) for slot in range(1, layers_count + 1)]
+    layer_names = list(cache.get_many(slots).values())
+    steps = cache.get_many([_get_key(execution_id, "layer", name) for name in layer_names])
+    snapshot["layers"] = {
+        name: steps[_get_key(execution_id, "layer", name)]
+        for name in layer_names
+        if _get_key(execution_id, "layer", name) in steps
+    }
+    snapshot["version"] = version
+    return snapshot
+
+
+def load_execution_progress(execution_id):
+    """Reads the progress of the execution from the database, along with its owner"""
+    execution = ExecutionRequest.objects.filter(exec_id=execution_id).values("user_id", *PROGRESS_FIELDS).first()
+    if execution is None:
+        return None
+    snapshot = {name: _serialize(value) for name, value in execution.items()}
+    # without a snapshot in the cache, the last update is the version
+    snapshot.update({"version": f"db:{snapshot['last_updated']}", "layers": {}})
+    return snapshot
+
+
+def format_event_id(versions):
+    """Returns the id of an event, holding the versions of the snapshots sent for each execution"""
+    return ";".join(f"{execution_id}={version}" for execution_id, version in versions.items())
+
+
+def parse_event_id(event_id):
+    """Returns the versions of the snapshots sent for each execution from the id of the last event received"""
+    versions = {}
+    for part in (event_id or "").split(";"):
+        execution_id, _, version = part.partition("=")
+        if execution_id and version:
+            versions[execution_id] = version
+    return versions
+
+
+def format_event(snapshot, versions):
+    return f"id: {format_event_id(versions)}\nevent: progress\ndata: {json.dumps(snapshot)}\n\n"
+
+
+def stream_execution_progress(execution_ids, last_event_id=None):
+    """
+    Yields a server-sent event each time the progress of one of the executions changes, until all of them
+    are completed or the stream duration elapses. The changes happening between two checks are coalesced.
+    A single stream follows all the executions, e.g. of a mass upload, so that it holds a single worker
+    """
+    deadline = time.monotonic() + rm_settings.EXECUTION_PROGRESS_STREAM_DURATION
+    versions = parse_event_id(last_event_id)
+    pending = [str(execution_id) for execution_id in execution_ids]
+    yield f"retry: {int(rm_settings.EXECUTION_PROGRESS_POLL_INTERVAL * 1000)}\n\n"
+    while pending:
+        for execution_id in list(pending):
+            snapshot = get_execution_progress(execution_id) or load_execution_progress(execution_id)
+            if snapshot is None:
+                pending.remove(execution_id)
+                continue
+            snapshot.pop("user_id", None)
+            snapshot["exec_id"] = execution_id
+            if str(snapshot["version"]) != versions.get(execution_id):
+                versions[execution_id] = str(snapshot["version"])
+                yield format_event(snapshot, versions)
+            if snapshot.get("status") in FINAL_STATUSES:
+                pending.remove(execution_id)
+        if not pending or time.monotonic() >= deadline:
+            return
+        time.sleep(rm_settings.EXECUTION_PROGRESS_POLL_INTERVAL)
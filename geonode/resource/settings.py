@@ -21,3 +21,19 @@ import os
 RESOURCE_MANAGER_CONCRETE_CLASS = os.environ.get(
     "RESOURCE_MANAGER_CONCRETE_CLASS", "geonode.geoserver.manager.GeoServerResourceManager"
 )
+
+# Cache holding the progress of the execution requests pushed to the clients
+EXECUTION_PROGRESS_CACHE = os.environ.get("EXECUTION_PROGRESS_CACHE", "default")
+# Seconds the progress of an execution request is kept in the cache
+EXECUTION_PROGRESS_TIMEOUT = int(os.environ.get("EXECUTION_PROGRESS_TIMEOUT", 3600))
+# Seconds between two checks of the progress, the changes in between are sent as a single event
+EXECUTION_PROGRESS_POLL_INTERVAL = float(os.environ.get("EXECUTION_PROGRESS_POLL_INTERVAL", 1))
+# Seconds after which the progress stream is closed, the clients reconnect sending the Last-Event-ID.
+# Each open stream holds a worker for this long with the synchronous workers (e.g. gunicorn sync), so it
+# is kept below their timeout and capped to EXECUTION_PROGRESS_STREAM_MAX_DURATION
+EXECUTION_PROGRESS_STREAM_MAX_DURATION = 60
+EXECUTION_PROGRESS_STREAM_DURATION = min(
+    int(os.environ.get("EXECUTION_PROGRESS_STREAM_DURATION", 25)), EXECUTION_PROGRESS_STREAM_MAX_DURATION
+)
+# Maximum number of executions followed by a single progress stream
+EXECUTION_PROGRESS_STREAM_MAX_EXECUTIONS = int(os.environ.get("EXECUTION_PROGRESS_STREAM_MAX_EXECUTIONS", 100))
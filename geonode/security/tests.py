@@ -2919,3 +2919,96 @@ class TestPermissionsHandlers(GeoNodeBaseTestSupport):
 
         # Still empty, since user had no base perms
         self.assertListEqual(updated_perms_empty["users"][self.group_manager], [])
+
+
+@override_settings(RESOURCE_PUBLISHING=True)
+class TestGroupMemberPermissionsPropagation(GeoNodeBaseTestSupport):
+    def setUp(self):
+        self.author, _ = get_user_model().objects.get_or_create(username="propagation_author")
+        self.member, _ = get_user_model().objects.get_or_create(username="propagation_member")
+        self.group, _ = GroupProfile.objects.get_or_create(slug="propagation_group")
+        GroupMember.objects.get_or_create(group=self.group, user=self.author, role="member")
+        self.resources = [
+            create_single_dataset(name=f"propagation_dataset_{i}", owner=self.author, group=self.group.group)
+            for i in range(3)
+        ]
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_membership_changes_are_enqueued(self):
+        from geonode.resource.models import ExecutionRequest
+
+        with patch("geonode.tasks.tasks.propagate_group_member_permissions.apply_async") as apply_async:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                GroupMember.objects.create(group=self.group, user=self.member, role="manager")
+            apply_async.assert_not_called()
+            for callback in callbacks:
+                callback()
+        execution = ExecutionRequest.objects.get(exec_id=apply_async.call_args.kwargs["args"][0])
+        self.assertEqual(execution.func_name, "set_group_member_permissions")
+        self.assertEqual(execution.input_params, {"user": self.member.pk, "group": self.group.pk, "role": "manager"})
+
+    @override_settings(GROUP_MEMBER_PERMISSIONS_CHUNK_SIZE=2)
+    def test_permissions_are_propagated_in_chunks(self):
+        from geonode.resource.models import ExecutionRequest
+
+        with patch("geonode.security.utils.sync_deferred_security_rules") as sync:
+            member = GroupMember.objects.create(group=self.group, user=self.member, role="member")
+        # one GeoFence sync per chunk
+        self.assertEqual(sync.call_count, 2)
+        execution = ExecutionRequest.objects.filter(user=self.member).latest("created")
+        self.assertEqual(execution.status, ExecutionRequest.STATUS_FINISHED)
+        self.assertEqual(execution.step, "3/3")
+        for resource in self.resources:
+            perms = permissions_registry.get_perms(instance=resource, user=self.member)
+            self.assertIn("view_resourcebase", perms)
+            self.assertNotIn("change_resourcebase", perms)
+
+        member.promote()
+        for resource in self.resources:
+            self.assertIn("change_resourcebase", permissions_registry.get_perms(instance=resource, user=self.member))
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_permissions_of_the_current_role_are_propagated(self):
+        from geonode.resource.models import ExecutionRequest
+        from geonode.security.utils import AdvancedSecurityWorkflowManager
+
+        with patch("geonode.tasks.tasks.propagate_group_member_permissions.apply_async"):
+            GroupMember.objects.create(group=self.group, user=self.member, role="manager")
+        execution = ExecutionRequest.objects.filter(user=self.member).latest("created")
+        # the user is demoted before the propagation runs
+        GroupMember.objects.filter(group=self.group, user=self.member).update(role="member")
+
+        with patch("geonode.security.utils.sync_deferred_security_rules"):
+            self.assertTrue(AdvancedSecurityWorkflowManager.run_group_member_permissions(execution.exec_id))
+        for resource in self.resources:
+            perms = permissions_registry.get_perms(instance=resource, user=self.member)
+            self.assertIn("view_resourcebase", perms)
+            self.assertNotIn("change_resourcebase", perms)
+
+    @override_settings(
+        CELERY_TASK_ALWAYS_EAGER=False,
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    )
+    def test_propagations_are_serialized(self):
+        from django.core.cache import cache
+
+        from geonode.resource.models import ExecutionRequest
+        from geonode.security.utils import GROUP_MEMBER_PERMISSIONS_LOCK_PREFIX, AdvancedSecurityWorkflowManager
+
+        with patch("geonode.tasks.tasks.propagate_group_member_permissions.apply_async"):
+            GroupMember.objects.create(group=self.group, user=self.member, role="member")
+        execution = ExecutionRequest.objects.filter(user=self.member).latest("created")
+        lock_key = f"{GROUP_MEMBER_PERMISSIONS_LOCK_PREFIX}:{self.member.pk}:{self.group.pk}"
+
+        # another propagation for the same user and group is running
+        cache.set(lock_key, "running")
+        self.assertFalse(AdvancedSecurityWorkflowManager.run_group_member_permissions(execution.exec_id))
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, ExecutionRequest.STATUS_READY)
+
+        cache.delete(lock_key)
+        with patch("geonode.security.utils.sync_deferred_security_rules"):
+            self.assertTrue(AdvancedSecurityWorkflowManager.run_group_member_permissions(execution.exec_id))
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, ExecutionRequest.STATUS_FINISHED)
+        self.assertIsNone(cache.get(lock_key))
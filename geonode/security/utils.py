@@ -20,10 +20,15 @@ import copy
 import json
 import logging
 import collections
+from contextlib import contextmanager
+from contextvars import ContextVar
 from itertools import chain
 
+from django.db import transaction
 from django.db.models import Q
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import Group, Permission
@@ -31,7 +36,7 @@ from guardian.utils import get_user_obj_perms_model
 from guardian.shortcuts import get_objects_for_user, get_objects_for_group
 
 from geonode.groups.conf import settings as groups_settings
-from geonode.groups.models import GroupProfile
+from geonode.groups.models import GroupMember, GroupProfile
 from geonode.security.permissions import (
     PermSpecCompact,
     EDIT_PERMISSIONS,
@@ -50,6 +55,11 @@ from geonode.security.permissions import (
 
 logger = logging.getLogger(__name__)
 
+GROUP_MEMBER_PERMISSIONS_LOCK_PREFIX = "group_member_permissions_lock"
+
+# ids of the resources whose security rules are synced by the caller, see deferred_security_sync
+_deferred_security_sync = ContextVar("deferred_security_sync", default=None)
+
 
 def get_visible_resources(
     queryset,
@@ -681,7 +691,26 @@ class AdvancedSecurityWorkflowManager:
         return _resource
 
     @staticmethod
-    def set_group_member_permissions(user, group, role):
+    def get_group_member_resources(user, group):
+        """Returns the ids of the resources whose permissions depend on the membership of the user in the group"""
+        perms = ["base.view_resourcebase", "base.change_resourcebase"]
+        # the resources assigned to the group, i.e. in their metadata, and the ones of the owners in the group
+        resource_ids = set(
+            get_objects_for_user(user, perms, any_perm=True).filter(group=group.group).values_list("id", flat=True)
+        )
+        resource_ids.update(
+            get_objects_for_group(group.group, perms, any_perm=True)
+            .filter(owner__groupmember__group=group)
+            .values_list("id", flat=True)
+        )
+        if not resource_ids:
+            resource_ids.update(
+                get_objects_for_user(user, perms, any_perm=True).filter(owner=user).values_list("id", flat=True)
+            )
+        return sorted(resource_ids)
+
+    @staticmethod
+    def set_group_member_permissions(user, group, role, execution_id=None):
         if not AdvancedSecurityWorkflowManager.is_auto_publishing_workflow():
             """
             Internally the set_permissions function will automatically handle the permissions
@@ -689,58 +718,172 @@ class AdvancedSecurityWorkflowManager:
             Background at: https://github.com/GeoNode/geonode/pull/8145
             If the user is demoted, we assign by default at least the view and the download permission
             to the resource
+            The resources are processed in chunks of GROUP_MEMBER_PERMISSIONS_CHUNK_SIZE, whose security
+            rules are synced with the backend at once; the progress is recorded in the execution request.
             """
+            from geonode.base.models import ResourceBase
             from geonode.security.registry import permissions_registry
 
-            # Fetching all the resources belonging to Group "group"; i.e. assgined to "group" metadata
-            queryset = get_objects_for_user(
-                user, ["base.view_resourcebase", "base.change_resourcebase"], any_perm=True
-            ).filter(group=group.group)
-            # Fetching and chaining all the resources belonging to Owner Group "group"
-            queryset = chain(
-                queryset,
-                (
-                    get_objects_for_group(
-                        group.group, ["base.view_resourcebase", "base.change_resourcebase"], any_perm=True
-                    ).filter(owner__groupmember__group=group)
-                ),
-            )
-            _resources = list(set(queryset))
-            if len(_resources) == 0:
-                queryset = get_objects_for_user(
-                    user, ["base.view_resourcebase", "base.change_resourcebase"], any_perm=True
-                ).filter(owner=user)
-                _resources = queryset.iterator()
-            for _r in _resources:
-                perm_spec = permissions_registry.get_perms(instance=_r)
-                if "users" not in perm_spec:
-                    perm_spec["users"] = {}
-                if "groups" not in perm_spec:
-                    perm_spec["groups"] = {}
-
-                AdminViewPermissionsSet = AdvancedSecurityWorkflowManager.compute_admin_and_view_permissions_set(
-                    _r.uuid, instance=_r
+            resource_ids = AdvancedSecurityWorkflowManager.get_group_member_resources(user, group)
+            # the permissions only depend on the type and subtype of the resources
+            permissions_sets = {}
+            chunk_size = settings.GROUP_MEMBER_PERMISSIONS_CHUNK_SIZE
+            for start in range(0, len(resource_ids), chunk_size):
+                resources = ResourceBase.objects.filter(id__in=resource_ids[start : start + chunk_size]).select_related(
+                    "owner", "polymorphic_ctype"
                 )
+                with deferred_security_sync() as deferred:
+                    for _r in resources:
+                        perm_spec = permissions_registry.get_perms(instance=_r)
+                        if "users" not in perm_spec:
+                            perm_spec["users"] = {}
+                        if "groups" not in perm_spec:
+                            perm_spec["groups"] = {}
+
+                        _key = (_r.polymorphic_ctype_id, _r.resource_type, _r.subtype)
+                        if _key not in permissions_sets:
+                            permissions_sets[_key] = (
+                                AdvancedSecurityWorkflowManager.compute_admin_and_view_permissions_set(
+                                    _r.uuid, instance=_r
+                                )
+                            )
+                        AdminViewPermissionsSet = permissions_sets[_key]
+
+                        prev_perms = AdminViewPermissionsSet.view_perms.copy()
+                        if not role:
+                            prev_perms = []
+                            if user == _r.owner:
+                                _group = group if hasattr(group, "group") else GroupProfile.objects.get(group=group)
+                                _users = list(_group.get_managers()) + list(_group.get_members())
+                                for _m in _users:
+                                    if perm_spec["users"].get(_m, None):
+                                        perm_spec["users"].pop(_m)
+
+                                if perm_spec["groups"].get(_group.group, None):
+                                    perm_spec["groups"].pop(_group.group)
+                        elif role == "manager":
+                            prev_perms += AdminViewPermissionsSet.admin_perms.copy()
+                            prev_perms = list(set(prev_perms))
+                        perm_spec["users"][user] = list(set(prev_perms))
+
+                        # Let's the ResourceManager finally decide which are the correct security settings to apply
+                        _r.set_permissions(perm_spec)
+                sync_deferred_security_rules(deferred)
+                if execution_id:
+                    processed = min(start + chunk_size, len(resource_ids))
+                    record_execution_progress(execution_id, f"{processed}/{len(resource_ids)}")
 
-                prev_perms = AdminViewPermissionsSet.view_perms.copy()
-                if not role:
-                    prev_perms = []
-                    if user == _r.owner:
-                        _group = group if hasattr(group, "group") else GroupProfile.objects.get(group=group)
-                        _users = list(_group.get_managers()) + list(_group.get_members())
-                        for _m in _users:
-                            if perm_spec["users"].get(_m, None):
-                                perm_spec["users"].pop(_m)
-
-                        if perm_spec["groups"].get(_group.group, None):
-                            perm_spec["groups"].pop(_group.group)
-                elif role == "manager":
-                    prev_perms += AdminViewPermissionsSet.admin_perms.copy()
-                    prev_perms = list(set(prev_perms))
-                perm_spec["users"][user] = list(set(prev_perms))
+    @staticmethod
+    def schedule_group_member_permissions(user, group, role):
+        """
+        Enqueues the propagation of the permissions of the user after a change of their membership in the group.
+        Returns the execution request reporting its progress.
+        """
+        from geonode.resource.models import ExecutionRequest
+        from geonode.tasks.tasks import propagate_group_member_permissions
+
+        execution = ExecutionRequest.objects.create(
+            user=user,
+            func_name="set_group_member_permissions",
+            action="permissions",
+            name=f"Permissions of {user} in {group}",
+            input_params={"user": user.pk, "group": group.pk, "role": role},
+        )
+
+        def dispatch():
+            propagate_group_member_permissions.apply_async(args=(str(execution.exec_id),))
+
+        if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+            # the task runs inline, within the current transaction
+            dispatch()
+        else:
+            transaction.on_commit(dispatch)
+        return execution
+
+    @staticmethod
+    def run_group_member_permissions(execution_id):
+        """
+        Runs the propagation of the permissions enqueued by schedule_group_member_permissions, with the role
+        the user has in the group when it runs: the propagations are not applied in the order they are enqueued.
+        Returns False, leaving the execution ready, when a propagation for the same user and group is running.
+        """
+        from geonode.resource.models import ExecutionRequest
+        from geonode.resource.progress import publish_execution_progress
+
+        executions = ExecutionRequest.objects.filter(exec_id=execution_id, status=ExecutionRequest.STATUS_READY)
+        execution = executions.first()
+        if execution is None:
+            return True
+        params = execution.input_params
+        # the propagations for the same user and group rewrite the permissions of the same resources
+        lock_key = f"{GROUP_MEMBER_PERMISSIONS_LOCK_PREFIX}:{params['user']}:{params['group']}"
+        if not cache.add(lock_key, str(execution_id), settings.GROUP_MEMBER_PERMISSIONS_LOCK_TIMEOUT):
+            return False
+        try:
+            if not executions.update(status=ExecutionRequest.STATUS_RUNNING):
+                # already run by another worker
+                return True
+            publish_execution_progress(execution_id, {"status": ExecutionRequest.STATUS_RUNNING})
+            try:
+                user = get_user_model().objects.get(pk=params["user"])
+                group = GroupProfile.objects.get(pk=params["group"])
+                # None when the user is no longer a member of the group
+                role = GroupMember.objects.filter(user=user, group=group).values_list("role", flat=True).first()
+                AdvancedSecurityWorkflowManager.set_group_member_permissions(
+                    user, group, role, execution_id=execution_id
+                )
+                changes = {"status": ExecutionRequest.STATUS_FINISHED, "finished": timezone.now()}
+                executions.update(**changes)
+            except Exception as e:
+                logger.exception(e)
+                changes = {"status": ExecutionRequest.STATUS_FAILED, "finished": timezone.now(), "log": str(e)}
+                executions.update(**changes)
+            publish_execution_progress(execution_id, changes)
+        finally:
+            cache.delete(lock_key)
+        return True
+
+
+def record_execution_progress(execution_id, step):
+    from geonode.resource.models import ExecutionRequest
+    from geonode.resource.progress import publish_execution_progress
+
+    ExecutionRequest.objects.filter(exec_id=execution_id).update(step=step, last_updated=timezone.now())
+    publish_execution_progress(execution_id, {"step": step})
+
+
+@contextmanager
+def deferred_security_sync():
+    """
+    Collects the ids of the resources whose permissions are set within the block, instead of syncing their
+    security rules with the backend one resource at a time; see sync_deferred_security_rules
+    """
+    deferred = set()
+    token = _deferred_security_sync.set(deferred)
+    try:
+        yield deferred
+    finally:
+        _deferred_security_sync.reset(token)
+
+
+def defer_security_sync(resource):
+    """Returns True, recording the resource, when its security rules are synced later by the caller"""
+    deferred = _deferred_security_sync.get()
+    if deferred is None:
+        return False
+    deferred.add(resource.id)
+    return True
+
+
+def sync_deferred_security_rules(resource_ids):
+    """Syncs the security rules of the resources collected by deferred_security_sync with the backend"""
+    from geonode import geoserver
+    from geonode.utils import check_ogc_backend
+
+    if resource_ids and check_ogc_backend(geoserver.BACKEND_PACKAGE):
+        from geonode.geoserver.security import sync_datasets_geofence_rules
 
-                # Let's the ResourceManager finally decide which are the correct security settings to apply
-                _r.set_permissions(perm_spec)
+        sync_datasets_geofence_rules(sorted(resource_ids))
 
 
 def can_feature(user, resource):
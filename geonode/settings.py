@@ -292,6 +292,37 @@ MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(PROJECT_ROOT, MEDIAFILES_LOCAT
 MEDIA_URL = os.getenv("MEDIA_URL", f"{FORCE_SCRIPT_NAME}/{MEDIAFILES_LOCATION}/")
 LOCAL_MEDIA_URL = os.getenv("LOCAL_MEDIA_URL", f"{FORCE_SCRIPT_NAME}/{MEDIAFILES_LOCATION}/")
 
+# Absolute path to the directory that holds the precomputed sitemap files
+SITEMAP_ROOT = os.getenv("SITEMAP_ROOT", os.path.join(MEDIA_ROOT, "sitemaps"))
+# Maximum number of urls of a sitemap file (the protocol allows up to 50000)
+SITEMAP_SECTION_SIZE = int(os.getenv("SITEMAP_SECTION_SIZE", 50000))
+# Seconds to wait before updating a sitemap section, changes made in the meanwhile are batched
+SITEMAP_UPDATE_DEBOUNCE = int(os.getenv("SITEMAP_UPDATE_DEBOUNCE", 60))
+
+# Seconds to wait before refreshing the resource counters of an owner, changes made in the meanwhile are batched
+RESOURCE_COUNTS_UPDATE_DEBOUNCE = int(os.getenv("RESOURCE_COUNTS_UPDATE_DEBOUNCE", 10))
+# Seconds between two reconciliations of all the resource counters with the resources
+RESOURCE_COUNTS_RECONCILE_INTERVAL = int(os.getenv("RESOURCE_COUNTS_RECONCILE_INTERVAL", 86400))
+# Seconds the resource counts are cached for, changes to the resources discard them earlier
+RESOURCE_COUNTS_CACHE_TIMEOUT = int(os.getenv("RESOURCE_COUNTS_CACHE_TIMEOUT", 300))
+
+# Search the resources with the full text index of PostgreSQL, ranked by relevance
+RESOURCE_SEARCH_INDEX_ENABLED = ast.literal_eval(os.getenv("RESOURCE_SEARCH_INDEX_ENABLED", "True"))
+# Match also the titles similar to the search text, requires the pg_trgm extension
+RESOURCE_SEARCH_TRIGRAM_ENABLED = ast.literal_eval(os.getenv("RESOURCE_SEARCH_TRIGRAM_ENABLED", "False"))
+
+# Share the rendered catalogue API responses between the anonymous users
+RESPONSE_CACHE_ENABLED = ast.literal_eval(os.getenv("RESPONSE_CACHE_ENABLED", "True"))
+# Seconds the anonymous responses are cached for, changes to the resources discard them earlier
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300))
+# Seconds a request waits for the same response being rendered by another one before rendering it
+RESPONSE_CACHE_LOCK_WAIT = int(os.getenv("RESPONSE_CACHE_LOCK_WAIT", 5))
+# Answer the conditional GET requests of the resources API, requires a default cache shared by the processes
+API_CONDITIONAL_GET_ENABLED = ast.literal_eval(os.getenv("API_CONDITIONAL_GET_ENABLED", "True"))
+
+# Seconds to wait before updating the bbox of the maps including a dataset whose bbox changed
+MAPS_BBOX_UPDATE_DEBOUNCE = int(os.getenv("MAPS_BBOX_UPDATE_DEBOUNCE", 10))
+
 # Absolute path to the directory that holds static files like app media.
 # Example: "/home/media/media.lawrence.com/apps/"
 STATIC_ROOT = os.getenv("STATIC_ROOT", os.path.join(PROJECT_ROOT, "static_root"))
@@ -665,6 +696,15 @@ except ValueError:
 
 MAX_DOCUMENT_SIZE = int(os.getenv("MAX_DOCUMENT_SIZE ", "2"))  # MB
 
+# Images with more pixels are not decoded by Pillow for the thumbnail, they are read at a reduced size with GDAL
+DOCUMENT_THUMBNAIL_MAX_DECODE_PIXELS = int(os.getenv("DOCUMENT_THUMBNAIL_MAX_DECODE_PIXELS", 25000000))
+# LibreOffice executable used to render the thumbnail of office documents, they have no thumbnail when missing
+DOCUMENT_THUMBNAIL_SOFFICE = os.getenv("DOCUMENT_THUMBNAIL_SOFFICE", "soffice")
+DOCUMENT_THUMBNAIL_OFFICE_TYPES = ast.literal_eval(
+    os.getenv("DOCUMENT_THUMBNAIL_OFFICE_TYPES", "['doc', 'docx', 'odt', 'rtf', 'ppt', 'pptx', 'odp', 'xls', 'xlsx', 'ods']")
+)
+DOCUMENT_THUMBNAIL_CONVERSION_TIMEOUT = int(os.getenv("DOCUMENT_THUMBNAIL_CONVERSION_TIMEOUT", 120))
+
 # DOCUMENT_TYPE_MAP and DOCUMENT_MIMETYPE_MAP update enumerations in
 # documents/enumerations.py and should only
 # need to be uncommented if adding other types
@@ -1086,6 +1126,59 @@ OGC_SERVER = {
 
 USE_GEOSERVER = "geonode.geoserver" in INSTALLED_APPS and OGC_SERVER["default"]["BACKEND"] == "geonode.geoserver"
 
+# Seconds the GeoServer REST catalog responses are shared between the processes before being revalidated
+GEOSERVER_CATALOG_CACHE_FRESHNESS = int(os.getenv("GEOSERVER_CATALOG_CACHE_FRESHNESS", 5))
+# Seconds the GeoServer REST catalog responses are kept for revalidation
+GEOSERVER_CATALOG_CACHE_TIMEOUT = int(os.getenv("GEOSERVER_CATALOG_CACHE_TIMEOUT", 3600))
+
+# Seconds the GeoWebCache truncations requested for a layer are collected before being sent together
+GWC_TRUNCATE_DEBOUNCE = int(os.getenv("GWC_TRUNCATE_DEBOUNCE", 10))
+# Seed again the GeoWebCache tiles of the popular layers after they have been truncated
+GWC_SEED_ENABLED = ast.literal_eval(os.getenv("GWC_SEED_ENABLED", "False"))
+# Minimum number of views of a layer for its tiles to be seeded
+GWC_SEED_MIN_POPULARITY = int(os.getenv("GWC_SEED_MIN_POPULARITY", 10))
+# Gridsets, image format and zoom levels of the seeded tiles
+GWC_SEED_GRIDSETS = os.getenv("GWC_SEED_GRIDSETS", "EPSG:900913").split(",")
+GWC_SEED_FORMAT = os.getenv("GWC_SEED_FORMAT", "image/png")
+GWC_SEED_ZOOM_START = int(os.getenv("GWC_SEED_ZOOM_START", 0))
+GWC_SEED_ZOOM_STOP = int(os.getenv("GWC_SEED_ZOOM_STOP", 10))
+# Threads of each GeoWebCache seeding task
+GWC_SEED_THREADS = int(os.getenv("GWC_SEED_THREADS", 2))
+# Maximum number of seeding tasks running in GeoWebCache, the next ones wait for GWC_SEED_RETRY_DELAY seconds
+# up to GWC_SEED_MAX_WAIT seconds
+GWC_SEED_MAX_RUNNING = int(os.getenv("GWC_SEED_MAX_RUNNING", 4))
+GWC_SEED_RETRY_DELAY = int(os.getenv("GWC_SEED_RETRY_DELAY", 60))
+GWC_SEED_MAX_WAIT = int(os.getenv("GWC_SEED_MAX_WAIT", 3600))
+
+# Serve the Mapbox Vector Tiles of the vector datasets from the datastore at /datasets/<alternate>/tiles/<z>/<x>/<y>.pbf
+VECTOR_TILES_ENABLED = ast.literal_eval(os.getenv("VECTOR_TILES_ENABLED", "False"))
+VECTOR_TILES_MAX_ZOOM = int(os.getenv("VECTOR_TILES_MAX_ZOOM", 22))
+# Size of the tiles in MVT units, and of the buffer around them
+VECTOR_TILES_EXTENT = int(os.getenv("VECTOR_TILES_EXTENT", 4096))
+VECTOR_TILES_BUFFER = int(os.getenv("VECTOR_TILES_BUFFER", 64))
+# Tolerance of the simplification of the geometries, in tile pixels
+VECTOR_TILES_SIMPLIFY_PIXELS = float(os.getenv("VECTOR_TILES_SIMPLIFY_PIXELS", 1.0))
+VECTOR_TILES_MAX_FEATURES = int(os.getenv("VECTOR_TILES_MAX_FEATURES", 50000))
+# Directory the generated tiles are stored in, and number of tiles kept in memory by each process
+VECTOR_TILES_CACHE_DIR = os.getenv("VECTOR_TILES_CACHE_DIR", os.path.join(PROJECT_ROOT, "vector_tiles"))
+VECTOR_TILES_MEMORY_CACHE_SIZE = int(os.getenv("VECTOR_TILES_MEMORY_CACHE_SIZE", 512))
+VECTOR_TILES_MAX_AGE = int(os.getenv("VECTOR_TILES_MAX_AGE", 60))
+
+# Serve the legends of the datasets, rendered once for each style version, at /datasets/<alternate>/legend
+# only when the default cache is shared by the processes, e.g. not with DummyCache or LocMemCache
+LEGEND_CACHE_ENABLED = ast.literal_eval(os.getenv("LEGEND_CACHE_ENABLED", "True"))
+# Seconds the rendered legends are kept in the cache, and cached by the clients
+LEGEND_CACHE_TIMEOUT = int(os.getenv("LEGEND_CACHE_TIMEOUT", 2592000))
+LEGEND_CACHE_MAX_AGE = int(os.getenv("LEGEND_CACHE_MAX_AGE", 86400))
+# Maximum width and height of the legends in pixels
+LEGEND_MAX_SIZE = int(os.getenv("LEGEND_MAX_SIZE", 1024))
+
+# Profile the data of the datasets in the datastore, computing the statistics of their attributes, when synchronized
+DATASET_PROFILE_ENABLED = ast.literal_eval(os.getenv("DATASET_PROFILE_ENABLED", "True"))
+# Maximum number of most common values and of histogram buckets of each attribute
+DATASET_PROFILE_MAX_VALUES = int(os.getenv("DATASET_PROFILE_MAX_VALUES", 100))
+DATASET_PROFILE_HISTOGRAM_BINS = int(os.getenv("DATASET_PROFILE_HISTOGRAM_BINS", 20))
+
 # Uploader Settings
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 100000
 """
@@ -1835,6 +1928,12 @@ CELERY_BEAT_SCHEDULER = os.environ.get("CELERY_BEAT_SCHEDULER", "celery.beat:Per
 CELERY_BEAT_SCHEDULE = {}
 
 DELAYED_SECURITY_SIGNALS = ast.literal_eval(os.environ.get("DELAYED_SECURITY_SIGNALS", "False"))
+# Number of resources whose permissions are updated, and synced with GeoFence in a single batch, at a time
+# when the membership of a user in a group changes
+GROUP_MEMBER_PERMISSIONS_CHUNK_SIZE = int(os.environ.get("GROUP_MEMBER_PERMISSIONS_CHUNK_SIZE", 100))
+# Maximum number of seconds a propagation of the permissions of a group member holds the lock serializing
+# the propagations for the same user and group
+GROUP_MEMBER_PERMISSIONS_LOCK_TIMEOUT = int(os.environ.get("GROUP_MEMBER_PERMISSIONS_LOCK_TIMEOUT", 3600))
 CELERY_ENABLE_UTC = ast.literal_eval(os.environ.get("CELERY_ENABLE_UTC", "True"))
 CELERY_TIMEZONE = TIME_ZONE
 
@@ -2106,6 +2205,11 @@ if USE_GEOSERVER:
     MAP_BASELAYERS.extend(baselayers)
 
 CATALOG_METADATA_TEMPLATE = os.getenv("CATALOG_METADATA_TEMPLATE", "catalogue/full_metadata.xml")
+# Regenerate the metadata XML of saved resources in background batches instead of inside the request.
+# Saves of the same resource within CATALOG_METADATA_XML_DEBOUNCE seconds collapse into a single render.
+CATALOG_METADATA_XML_DEFERRED = ast.literal_eval(os.getenv("CATALOG_METADATA_XML_DEFERRED", str(ASYNC_SIGNALS)))
+CATALOG_METADATA_XML_DEBOUNCE = int(os.getenv("CATALOG_METADATA_XML_DEBOUNCE", 30))
+CATALOG_METADATA_XML_BATCH_SIZE = int(os.getenv("CATALOG_METADATA_XML_BATCH_SIZE", 100))
 
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 UI_DEFAULT_MANDATORY_FIELDS = [
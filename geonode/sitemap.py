@@ -17,29 +17,205 @@
 #
 #########################################################################
 
+"""
+Sitemaps of the public resources.
+
+The sitemaps are precomputed as static files under ``settings.SITEMAP_ROOT``: an index and one
+file for each section, where a section holds the resources of a type whose ids fall in the same
+range of ``settings.SITEMAP_SECTION_SIZE`` ids. When a resource changes only its section and
+the index are generated again.
+"""
+import os
+import logging
+import tempfile
+from urllib.parse import urljoin
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models import signals
+from django.http import Http404
+from django.views.static import serve
 from django.contrib.sitemaps import Sitemap
 from geonode.maps.models import Map
 from geonode.layers.models import Dataset
 from guardian.shortcuts import get_objects_for_user
 from django.contrib.auth.models import AnonymousUser
 
+logger = logging.getLogger(__name__)
+
+SITEMAP_INDEX = "sitemap.xml"
+SITEMAP_PENDING_PREFIX = "sitemap:pending"
 
-class DatasetSitemap(Sitemap):
+URLSET_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_FOOTER = "</urlset>\n"
+INDEX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+INDEX_FOOTER = "</sitemapindex>\n"
+
+
+class ResourceSitemap(Sitemap):
     changefreq = "never"
     priority = 0.5
+    model = None
 
     def items(self):
         permitted = get_objects_for_user(AnonymousUser(), "base.view_resourcebase")
-        return Dataset.objects.filter(id__in=permitted)
+        return self.model.objects.filter(id__in=permitted)
 
     def lastmod(self, obj):
-        return obj.date
+        return obj.last_updated
 
 
-class MapSitemap(Sitemap):
-    changefreq = "never"
-    priority = 0.5
+class DatasetSitemap(ResourceSitemap):
+    model = Dataset
 
-    def items(self):
-        permitted = get_objects_for_user(AnonymousUser(), "base.view_resourcebase")
-        return Map.objects.filter(id__in=permitted)
+
+class MapSitemap(ResourceSitemap):
+    model = Map
+
+
+sitemaps = {"dataset": DatasetSitemap, "map": MapSitemap}
+
+
+def get_section(resource_id):
+    return resource_id // settings.SITEMAP_SECTION_SIZE
+
+
+def get_section_filename(name, section):
+    return f"sitemap-{name}-{section}.xml"
+
+
+def _absolute_url(url):
+    return urljoin(settings.SITEURL, url)
+
+
+def _w3c_date(value):
+    return value.isoformat(timespec="seconds") if value else None
+
+
+def _write(filename, lines):
+    """Writes the file atomically, so that it is never served half written"""
+    os.makedirs(settings.SITEMAP_ROOT, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=settings.SITEMAP_ROOT, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            out.writelines(lines)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(settings.SITEMAP_ROOT, filename))
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def build_sitemap_section(name, section):
+    """Generates the sitemap file of a section, returns the number of urls written"""
+    sitemap = sitemaps[name]()
+    size = settings.SITEMAP_SECTION_SIZE
+    items = sitemap.items().filter(id__gte=section * size, id__lt=(section + 1) * size).order_by("id")
+    count = 0
+
+    def urls():
+        nonlocal count
+        yield URLSET_HEADER
+        for obj in items.iterator(chunk_size=2000):
+            lastmod = _w3c_date(sitemap.lastmod(obj))
+            yield (
+                f"<url><loc>{escape(_absolute_url(sitemap.location(obj)))}</loc>"
+                f"{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}"
+                f"<changefreq>{sitemap.changefreq}</changefreq><priority>{sitemap.priority}</priority></url>\n"
+            )
+            count += 1
+        yield URLSET_FOOTER
+
+    _write(get_section_filename(name, section), urls())
+    if not count:
+        # the section is not listed in the index anymore
+        os.remove(os.path.join(settings.SITEMAP_ROOT, get_section_filename(name, section)))
+    return count
+
+
+def build_sitemap_index():
+    """Generates the index of the sections, returns the list of the (name, section) listed"""
+    size = settings.SITEMAP_SECTION_SIZE
+    entries = []
+    for name, sitemap in sitemaps.items():
+        sections = (
+            sitemap()
+            .items()
+            .annotate(section=F("id") / size)
+            .values("section")
+            .annotate(lastmod=Max("last_updated"))
+            .order_by("section")
+        )
+        entries.extend((name, _section["section"], _section["lastmod"]) for _section in sections)
+
+    def index():
+        yield INDEX_HEADER
+        for name, section, lastmod in entries:
+            yield (
+                f"<sitemap><loc>{escape(_absolute_url(get_section_filename(name, section)))}</loc>"
+                f"{f'<lastmod>{_w3c_date(lastmod)}</lastmod>' if lastmod else ''}</sitemap>\n"
+            )
+        yield INDEX_FOOTER
+
+    _write(SITEMAP_INDEX, index())
+    return [(name, section) for name, section, _ in entries]
+
+
+def build_sitemaps():
+    """Generates the index and all its sections"""
+    for name, section in build_sitemap_index():
+        build_sitemap_section(name, section)
+
+
+def update_sitemap(resource):
+    """Schedules the update of the section of the resource, once per debounce period"""
+    from geonode.tasks.tasks import update_sitemap_section
+
+    name = getattr(resource, "resource_type", None)
+    if name not in sitemaps or not resource.id:
+        return
+    section = get_section(resource.id)
+    if cache.add(f"{SITEMAP_PENDING_PREFIX}:{name}:{section}", True, settings.SITEMAP_UPDATE_DEBOUNCE):
+        transaction.on_commit(
+            lambda: update_sitemap_section.apply_async(args=(name, section), countdown=settings.SITEMAP_UPDATE_DEBOUNCE)
+        )
+
+
+def release_sitemap_update(name, section):
+    cache.delete(f"{SITEMAP_PENDING_PREFIX}:{name}:{section}")
+
+
+def sitemap_changed(instance, sender, **kwargs):
+    update_sitemap(instance)
+
+
+def connect_sitemap_signals():
+    for sitemap in sitemaps.values():
+        signals.post_save.connect(
+            sitemap_changed, sender=sitemap.model, dispatch_uid=f"sitemap_{sitemap.model.__name__}"
+        )
+        signals.post_delete.connect(
+            sitemap_changed, sender=sitemap.model, dispatch_uid=f"sitemap_delete_{sitemap.model.__name__}"
+        )
+
+
+def sitemap(request, name=None, section=None):
+    """Serves the precomputed sitemap files, generating the missing ones"""
+    if name is None:
+        filename = SITEMAP_INDEX
+    elif name in sitemaps:
+        filename = get_section_filename(name, int(section))
+    else:
+        raise Http404()
+
+    if not os.path.exists(os.path.join(settings.SITEMAP_ROOT, filename)):
+        if name is None:
+            build_sitemap_index()
+        else:
+            build_sitemap_section(name, int(section))
+    return serve(request, filename, document_root=settings.SITEMAP_ROOT)
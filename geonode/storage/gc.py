@@ -0,0 +1,219 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Garbage collection of the files no longer referenced by the database.
+
+The paths referenced by the assets, the thumbnails and the styles are loaded once in a set with a
+few streaming queries; each storage area is then walked, with os.scandir on the local filesystem
+or one directory listing at a time on the remote storages, and the files missing from the set are
+deleted in batches by a pool of workers. Files younger than the minimum age are kept, they may
+belong to an upload still in progress.
+"""
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from geonode.storage import settings as sm_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _get_local_root(manager):
+    """Returns the absolute directory of a filesystem storage, None for the remote ones"""
+    try:
+        root = manager.path("")
+    except Exception:
+        return None
+    return root if root and os.path.isabs(root) and os.path.isdir(root) else None
+
+
+def _get_relative_name(path, root):
+    if not path:
+        return None
+    if os.path.isabs(path):
+        if not root or not os.path.normpath(path).startswith(os.path.join(root, "")):
+            return None
+        return os.path.relpath(os.path.normpath(path), root)
+    return os.path.normpath(path)
+
+
+def walk_storage(manager, path):
+    """Yields the name, relative to the storage, and the modification time of the files under path"""
+    root = _get_local_root(manager)
+    if root:
+        stack = [os.path.join(root, path)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield os.path.relpath(entry.path, root), entry.stat(follow_symlinks=False).st_mtime
+    else:
+        # the remote storages only list a directory at a time and do not expose the modification time
+        try:
+            dirs, files = manager.listdir(path)
+        except Exception as e:
+            logger.debug(f"Could not list {path}: {e}")
+            return
+        for filename in files:
+            yield os.path.join(path, filename), None
+        for dirname in dirs:
+            yield from walk_storage(manager, os.path.join(path, dirname))
+
+
+def get_referenced_files(manager):
+    """Returns the names, relative to the storage, of the files and directories of the assets and of the styles"""
+    from geonode.assets.models import LocalAsset
+    from geonode.layers.models import Style
+
+    root = _get_local_root(manager)
+    referenced = set()
+    for location in LocalAsset.objects.values_list("location", flat=True).iterator(chunk_size=2000):
+        for path in location or []:
+            name = _get_relative_name(path, root)
+            if name:
+                referenced.add(name)
+    media_url = urlsplit(settings.MEDIA_URL).path
+    for sld_url in Style.objects.exclude(sld_url__isnull=True).values_list("sld_url", flat=True).iterator():
+        url_path = urlsplit(sld_url).path
+        if url_path.startswith(media_url):
+            referenced.add(os.path.normpath(url_path[len(media_url) :]))
+    return referenced
+
+
+def get_referenced_thumbnails(manager):
+    """Returns the names of the thumbnails of the resources"""
+    from geonode.base.models import ResourceBase
+
+    referenced = set()
+    thumbnails = ResourceBase.objects.values_list("thumbnail_path", "thumbnail_url")
+    for thumbnail_path, thumbnail_url in thumbnails.iterator(chunk_size=2000):
+        if thumbnail_path:
+            referenced.add(os.path.normpath(thumbnail_path))
+        if thumbnail_url:
+            # the resources created before thumbnail_path was introduced only store the url
+            filename = os.path.basename(urlsplit(thumbnail_url).path)
+            referenced.add(os.path.join(settings.THUMBNAIL_LOCATION, filename))
+    return referenced
+
+
+def _get_default_storage_manager():
+    from geonode.storage.manager import storage_manager
+
+    return storage_manager
+
+
+def _get_assets_storage_manager():
+    from geonode.assets.local import _asset_storage_manager
+
+    return _asset_storage_manager
+
+
+# area name: (storage manager getter, path within the storage, referenced names getter)
+GC_AREAS = {
+    "thumbnails": (_get_default_storage_manager, lambda: settings.THUMBNAIL_LOCATION, get_referenced_thumbnails),
+    "documents": (_get_default_storage_manager, lambda: os.path.join("documents", "document"), get_referenced_files),
+    "layers": (_get_default_storage_manager, lambda: "layers", get_referenced_files),
+    "assets": (
+        _get_assets_storage_manager,
+        lambda: os.path.basename(settings.ASSETS_ROOT.rstrip("/")),
+        get_referenced_files,
+    ),
+}
+
+
+def _is_referenced(name, referenced):
+    # the assets can reference whole directories
+    while name and name != os.curdir:
+        if name in referenced:
+            return True
+        name = os.path.dirname(name)
+    return False
+
+
+def _delete_batch(manager, names):
+    deleted = []
+    for name in names:
+        try:
+            manager.delete(name)
+            deleted.append(name)
+        except Exception as e:
+            logger.error(f"Failed to delete orphaned file '{name}': {e}")
+    return deleted
+
+
+def find_orphans(area, min_age=None):
+    """Yields the names of the files of the area not referenced by the database and older than min_age seconds"""
+    get_manager, get_path, get_referenced = GC_AREAS[area]
+    manager = get_manager()
+    min_age = sm_settings.STORAGE_GC_MIN_AGE if min_age is None else min_age
+    referenced = get_referenced(manager)
+    threshold = time.time() - min_age
+    for name, modified in walk_storage(manager, get_path()):
+        if _is_referenced(name, referenced):
+            continue
+        if modified is None and min_age > 0:
+            # the age of the files is unknown on remote storages, they are only removed without threshold
+            continue
+        if modified is not None and modified > threshold:
+            continue
+        yield name
+
+
+def collect_garbage(areas=None, dry_run=False, min_age=None, workers=None, batch_size=None):
+    """
+    Deletes the orphaned files of the storage areas, all of them when areas is None.
+    Returns the names of the deleted files, or of the files to delete on a dry run, for each area.
+    """
+    workers = workers or sm_settings.STORAGE_GC_WORKERS
+    batch_size = batch_size or sm_settings.STORAGE_GC_BATCH_SIZE
+    results = {}
+    for area in areas or GC_AREAS.keys():
+        manager = GC_AREAS[area][0]()
+        orphans = find_orphans(area, min_age=min_age)
+        if dry_run:
+            results[area] = list(orphans)
+            continue
+        deleted = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending, batch = [], []
+            for name in orphans:
+                batch.append(name)
+                if len(batch) >= batch_size:
+                    pending.append(executor.submit(_delete_batch, manager, batch))
+                    batch = []
+                if len(pending) >= workers * 2:
+                    # keeps a bounded number of batches in memory
+                    deleted.extend(pending.pop(0).result())
+            if batch:
+                pending.append(executor.submit(_delete_batch, manager, batch))
+            for future in pending:
+                deleted.extend(future.result())
+        logger.info(f"Deleted {len(deleted)} orphaned files from {area}")
+        results[area] = deleted
+    return results
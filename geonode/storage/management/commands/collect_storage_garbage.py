@@ -0,0 +1,59 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+
+from django.core.management.base import BaseCommand
+
+from geonode.storage.gc import GC_AREAS, collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Delete the files of the storage not referenced by any asset, thumbnail or style"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-a",
+            "--area",
+            dest="areas",
+            action="append",
+            choices=sorted(GC_AREAS),
+            help="Storage area to collect, can be repeated; all of them when missing",
+        )
+        parser.add_argument(
+            "-n", "--dry-run", dest="dry_run", action="store_true", help="Only list the files which would be deleted"
+        )
+        parser.add_argument(
+            "--min-age", dest="min_age", type=int, help="Keep the files modified less than this number of seconds ago"
+        )
+        parser.add_argument("-w", "--workers", dest="workers", type=int, help="Number of parallel deletion workers")
+        parser.add_argument("-b", "--batch-size", dest="batch_size", type=int, help="Files deleted by each batch")
+
+    def handle(self, **options):
+        results = collect_garbage(
+            areas=options.get("areas"),
+            dry_run=options["dry_run"],
+            min_age=options.get("min_age"),
+            workers=options.get("workers"),
+            batch_size=options.get("batch_size"),
+        )
+        for area, names in results.items():
+            if options["verbosity"] > 1:
+                for name in names:
+                    self.stdout.write(name)
+            action = "to delete" if options["dry_run"] else "deleted"
+            self.stdout.write(f"{area}: {len(names)} orphaned files {action}")
@@ -21,3 +21,8 @@ import os
 STORAGE_MANAGER_CONCRETE_CLASS = os.environ.get(
     "STORAGE_MANAGER_CONCRETE_CLASS", "geonode.storage.manager.DefaultStorageManager"
 )
+
+# files younger than this number of seconds are never collected, they may belong to an upload in progress
+STORAGE_GC_MIN_AGE = int(os.environ.get("STORAGE_GC_MIN_AGE", 86400))
+STORAGE_GC_WORKERS = int(os.environ.get("STORAGE_GC_WORKERS", 4))
+STORAGE_GC_BATCH_SIZE = int(os.environ.get("STORAGE_GC_BATCH_SIZE", 500))
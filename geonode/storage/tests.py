@@ -19,6 +19,7 @@
 import io
 import os
 import shutil
+import time
 from django.test import override_settings
 import gisdata
 from unittest.mock import patch
@@ -28,7 +29,8 @@ from django.test.testcases import SimpleTestCase, TestCase
 from geonode.utils import mkdtemp
 from geonode.storage.aws import AwsStorageManager
 from geonode.storage.exceptions import DataRetrieverExcepion
-from geonode.storage.manager import StorageManager
+from geonode.storage.manager import DefaultStorageManager, StorageManager
+from geonode.storage.gc import collect_garbage, walk_storage
 from geonode.storage.gcs import GoogleStorageManager
 from geonode.storage.dropbox import DropboxStorageManager
 from geonode.base.populate_test_data import create_single_dataset
@@ -402,6 +404,48 @@ class TestStorageManager(GeoNodeBaseTestSupport):
         self.assertListEqual([expected], output["files"])
 
 
+class TestStorageGarbageCollector(SimpleTestCase):
+    def setUp(self):
+        self.root = mkdtemp()
+        self.manager = DefaultStorageManager(location=self.root)
+        self.referenced = {os.path.join("files", "kept.txt"), os.path.join("files", "asset")}
+        for name in ("kept.txt", "orphan.txt", "recent.txt", os.path.join("asset", "part.shp")):
+            path = os.path.join(self.root, "files", name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("content")
+            if name != "recent.txt":
+                old = time.time() - 3600
+                os.utime(path, (old, old))
+        areas = {"files": (lambda: self.manager, lambda: "files", lambda manager: self.referenced)}
+        patcher = patch.dict("geonode.storage.gc.GC_AREAS", areas, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_walk_storage(self):
+        names = {name for name, _ in walk_storage(self.manager, "files")}
+        expected = {os.path.join("files", name) for name in ("kept.txt", "orphan.txt", "recent.txt")}
+        self.assertSetEqual(names, expected | {os.path.join("files", "asset", "part.shp")})
+
+    def test_dry_run_does_not_delete(self):
+        results = collect_garbage(dry_run=True, min_age=60)
+        self.assertListEqual(results["files"], [os.path.join("files", "orphan.txt")])
+        self.assertTrue(os.path.exists(os.path.join(self.root, "files", "orphan.txt")))
+
+    def test_only_old_orphans_are_deleted(self):
+        results = collect_garbage(min_age=60, workers=2, batch_size=1)
+        self.assertListEqual(results["files"], [os.path.join("files", "orphan.txt")])
+        self.assertFalse(os.path.exists(os.path.join(self.root, "files", "orphan.txt")))
+        self.assertTrue(os.path.exists(os.path.join(self.root, "files", "recent.txt")))
+        # the files in a referenced directory are kept
+        self.assertTrue(os.path.exists(os.path.join(self.root, "files", "asset", "part.shp")))
+        results = collect_garbage(min_age=0)
+        self.assertListEqual(results["files"], [os.path.join("files", "recent.txt")])
+
+
 class TestDataRetriever(TestCase):
     @classmethod
     def setUpClass(cls) -> None:
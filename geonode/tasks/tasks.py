@@ -205,3 +205,106 @@ def set_permissions(self, permissions_names, resources_names, users_usernames, g
             set_datasets_permissions(
                 permissions_name, resources_names, users_usernames, groups_names, delete_flag, verbose=True
             )
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.tasks.sitemap.update_sitemap_section",
+    queue="update",
+    expires=3600,
+    acks_late=False,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3},
+    retry_backoff=3,
+    retry_backoff_max=30,
+    retry_jitter=False,
+)
+def update_sitemap_section(self, name, section):
+    """Generates again the sitemap section and the sitemap index"""
+    from geonode.sitemap import build_sitemap_index, build_sitemap_section, release_sitemap_update
+
+    # changes happening from now on will schedule a new update
+    release_sitemap_update(name, section)
+    build_sitemap_section(name, section)
+    build_sitemap_index()
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.tasks.counts.update_owner_resource_counts",
+    queue="update",
+    expires=3600,
+    acks_late=False,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3},
+    retry_backoff=3,
+    retry_backoff_max=30,
+    retry_jitter=False,
+)
+def update_owner_resource_counts(self, owner_ids):
+    """Computes again the resource counters of the owners"""
+    from geonode.base.counts import refresh_owner_counts, release_owner_counts_update
+
+    # changes happening from now on will schedule a new refresh
+    release_owner_counts_update(owner_ids)
+    refresh_owner_counts(owner_ids)
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.tasks.maps.update_maps_bbox",
+    queue="update",
+    expires=3600,
+    acks_late=False,
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3},
+    retry_backoff=3,
+    retry_backoff_max=30,
+    retry_jitter=False,
+)
+def update_maps_bbox(self, map_ids):
+    """Computes again the bbox of the maps from the bboxes of their datasets"""
+    from geonode.maps.models import Map, release_maps_bbox_update
+
+    # changes happening from now on will schedule a new update
+    release_maps_bbox_update(map_ids)
+    for _map in Map.objects.filter(id__in=map_ids).iterator():
+        _map.compute_bbox()
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.tasks.counts.reconcile_owner_resource_counts",
+    queue="cleanup",
+    expires=3600,
+    acks_late=False,
+)
+def reconcile_owner_resource_counts(self):
+    """Computes again the resource counters of all the owners, fixing the changes missed by the signals"""
+    from geonode.base.counts import refresh_owner_counts
+
+    # a single reconciliation at a time, they would rewrite the same rows
+    with AcquireLock("reconcile_owner_resource_counts") as lock:
+        if lock.acquire() is True:
+            refresh_owner_counts()
+
+
+@app.task(
+    bind=True,
+    base=FaultTolerantTask,
+    name="geonode.tasks.security.propagate_group_member_permissions",
+    queue="security",
+    expires=3600,
+    acks_late=False,
+)
+def propagate_group_member_permissions(self, execution_id):
+    """Applies the permissions of a user to the resources of a group after a change of their membership"""
+    from geonode.security.utils import AdvancedSecurityWorkflowManager
+
+    if not AdvancedSecurityWorkflowManager.run_group_member_permissions(execution_id):
+        # a propagation for the same user and group is running
+        raise self.retry(countdown=10, max_retries=None)
@@ -0,0 +1,74 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.shortcuts import reverse
+from django.test import override_settings
+
+from geonode.base.populate_test_data import create_single_dataset
+from geonode.layers.models import Dataset
+from geonode.sitemap import get_section, get_section_filename, update_sitemap
+from geonode.tests.base import GeoNodeBaseTestSupport
+
+SITEMAP_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    SITEMAP_ROOT=SITEMAP_ROOT,
+    SITEMAP_SECTION_SIZE=10,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class SitemapTest(GeoNodeBaseTestSupport):
+    def setUp(self):
+        self.dataset = create_single_dataset(name="test_sitemap_dataset")
+        self.dataset.set_default_permissions(owner=self.dataset.owner)
+        cache.clear()
+
+    def tearDown(self):
+        Dataset.objects.filter(name="test_sitemap_dataset").delete()
+        shutil.rmtree(SITEMAP_ROOT, ignore_errors=True)
+        cache.clear()
+
+    def test_sitemaps_are_generated_and_served(self):
+        response = self.client.get(reverse("sitemap"))
+        self.assertEqual(response.status_code, 200)
+        last_modified = response["Last-Modified"]
+        section_file = get_section_filename("dataset", get_section(self.dataset.id))
+        self.assertIn(section_file, b"".join(response.streaming_content).decode())
+
+        response = self.client.get(f"/{section_file}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(os.path.exists(os.path.join(SITEMAP_ROOT, section_file)))
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn(self.dataset.last_updated.isoformat(timespec="seconds"), content)
+
+        response = self.client.get(reverse("sitemap"), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    @patch("geonode.tasks.tasks.update_sitemap_section.apply_async")
+    def test_changes_update_only_their_section(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            update_sitemap(self.dataset)
+            update_sitemap(self.dataset)
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs["args"], ("dataset", get_section(self.dataset.id)))
@@ -27,6 +27,9 @@ class UploadAppConfig(AppConfig):
     def ready(self):
         """Finalize setup"""
         run_setup_hooks()
+        # keeps track of the import tasks of each execution
+        import geonode.upload.signals  # noqa: F401
+
         super(UploadAppConfig, self).ready()
         settings.CELERY_BEAT_SCHEDULE["clean-up-old-task-result"] = {
             "task": "geonode.upload.tasks.cleanup_celery_task_entries",
@@ -391,7 +391,7 @@ class BaseRasterFileHandler(BaseHandler):
         if dataset.exists() and _overwrite:
             dataset = dataset.first()
 
-            dataset = resource_manager.update(dataset.uuid, instance=dataset)
+            dataset = resource_manager.update(dataset.uuid, instance=dataset, overwrite=True)
 
             self.handle_xml_file(dataset, _exec)
             self.handle_sld_file(dataset, _exec)
@@ -54,6 +54,8 @@ from geonode.upload.orchestrator import orchestrator
 from django.db.models import Q
 import pyproj
 from geonode.geoserver.security import delete_dataset_cache, set_geowebcache_invalidate_cache
+from geonode.geoserver.tilecache import get_dataset_bbox, make_truncate_request, merge_truncate_requests
+from geonode.layers.vectortiles import invalidate_vector_tiles
 from geonode.geoserver.helpers import get_time_info
 from geonode.upload.utils import ImporterRequestAction as ira
 
@@ -679,11 +681,17 @@ class BaseVectorFileHandler(BaseHandler):
             dataset = dataset.first()
 
             delete_dataset_cache(dataset.alternate)
+            previous_bbox = get_dataset_bbox(dataset)
             # recalculate featuretype info
             DataPublisher(str(self)).recalculate_geoserver_featuretype(dataset)
-            set_geowebcache_invalidate_cache(dataset_alternate=dataset.alternate)
+            invalidate_vector_tiles(dataset)
 
-            dataset = resource_manager.update(dataset.uuid, instance=dataset, files=asset.location)
+            dataset = resource_manager.update(dataset.uuid, instance=dataset, files=asset.location, overwrite=True)
+            # the tiles in the previous and in the new extent of the data, all of them when one is not known
+            truncate_request = merge_truncate_requests(
+                make_truncate_request(previous_bbox), make_truncate_request(get_dataset_bbox(dataset))
+            )
+            set_geowebcache_invalidate_cache(dataset_alternate=dataset.alternate, bbox=truncate_request.get("bbox"))
 
             self.handle_xml_file(dataset, _exec)
             self.handle_sld_file(dataset, _exec)
@@ -117,6 +117,7 @@ def evaluate_error(celery_task, exc, task_id, args, kwargs, einfo):
     Main error function used by the task for the "on_failure" function
     """
     from geonode.upload.celery_tasks import orchestrator
+    from geonode.upload.signals import track_execution_task
 
     exec_id = orchestrator.get_execution_object(exec_id=get_uuid(args))
     output_params = exec_id.output_params.copy()
@@ -145,6 +146,8 @@ def evaluate_error(celery_task, exc, task_id, args, kwargs, einfo):
         state="FAILURE",
         meta={"exec_id": str(exec_id.exec_id), "reason": _log},
     )
+    # the progress evaluation below must already see the task as failed
+    track_execution_task(task_id, celery_task.name, args, {"execution_id": str(exec_id.exec_id)}, "FAILURE")
     orchestrator.update_execution_request_status(execution_id=str(exec_id.exec_id), output_params=output_params)
 
     orchestrator.evaluate_execution_progress(
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("upload", "0051__align_resourcehandler_with_asset"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExecutionTask",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("execution_id", models.UUIDField()),
+                ("task_id", models.CharField(max_length=255, unique=True)),
+                ("step", models.CharField(max_length=255)),
+                ("layer_name", models.CharField(default=None, max_length=255, null=True)),
+                ("state", models.CharField(default="PENDING", max_length=50)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["execution_id", "state"], name="upload_exectask_exec_state_idx")],
+            },
+        ),
+    ]
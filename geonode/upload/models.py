@@ -18,6 +18,7 @@
 #########################################################################
 import logging
 
+from celery import states
 from django.db import models
 from django.db.models.signals import pre_delete
 from django.dispatch import receiver
@@ -149,3 +150,24 @@ class ResourceHandlerInfo(models.Model):
     handler_module_path = models.CharField(max_length=250, blank=False, null=False)
     execution_request = models.ForeignKey(ExecutionRequest, null=True, default=None, on_delete=models.SET_NULL)
     kwargs = models.JSONField(verbose_name="Storing strictly related information of the handler", default=dict)
+
+
+class ExecutionTask(models.Model):
+    """
+    Keeps track of the celery tasks run for an execution request and of their state.
+    The rows are written by the celery signals (see geonode.upload.signals), so that the
+    progress of an execution can be evaluated without scanning the celery results
+    """
+
+    execution_id = models.UUIDField(null=False, blank=False)
+    task_id = models.CharField(max_length=255, unique=True)
+    step = models.CharField(max_length=255)
+    layer_name = models.CharField(max_length=255, null=True, default=None)
+    state = models.CharField(max_length=50, default=states.PENDING)
+    last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["execution_id", "state"], name="upload_exectask_exec_state_idx")]
+
+    def __str__(self):
+        return f"{self.step} ({self.task_id}) for execution {self.execution_id}: {self.state}"
@@ -23,11 +23,11 @@ from uuid import UUID
 
 from celery import states
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from django.utils.module_loading import import_string
-from django_celery_results.models import TaskResult
 from geonode.resource.models import ExecutionRequest
+from geonode.resource.progress import publish_execution_progress
 from rest_framework import serializers
 
 from geonode.upload.api.exceptions import ImportException
@@ -229,7 +229,7 @@ class ImportOrchestrator:
         )
 
     def evaluate_execution_progress(self, execution_id, _log=None, handler_module_path=None):
-        from geonode.upload.models import ResourceHandlerInfo
+        from geonode.upload.models import ExecutionTask, ResourceHandlerInfo
 
         """
         The execution id is a mandatory argument for the task
@@ -242,21 +242,16 @@ class ImportOrchestrator:
         actual_dataset = ResourceHandlerInfo.objects.filter(execution_request=_exec).count()
         is_last_dataset = actual_dataset >= expected_dataset
         execution_id = str(execution_id)  # force it as string to be sure
-        lower_exec_id = execution_id.replace("-", "_").lower()
-        exec_result = TaskResult.objects.filter(
-            Q(task_args__icontains=lower_exec_id)
-            | Q(task_kwargs__icontains=lower_exec_id)
-            | Q(result__icontains=lower_exec_id)
-            | Q(task_args__icontains=execution_id)
-            | Q(task_kwargs__icontains=execution_id)
-            | Q(result__icontains=execution_id)
+        # the tasks of the execution are tracked by the celery signals in geonode.upload.signals
+        tasks_state = ExecutionTask.objects.filter(execution_id=execution_id).aggregate(
+            running=Count("id", filter=~Q(state__in=[states.SUCCESS, states.FAILURE])),
+            failed=Count("id", filter=Q(state=states.FAILURE)),
         )
-        _has_data = ResourceHandlerInfo.objects.filter(execution_request__exec_id=execution_id).exists()
+        _has_data = actual_dataset > 0
 
-        # .all() is needed since we want to have the last status on the DB without take in consideration the cache
-        if exec_result.all().exclude(Q(status=states.SUCCESS) | Q(status=states.FAILURE)).exists():
+        if tasks_state["running"]:
             self._evaluate_last_dataset(is_last_dataset, _log, execution_id, handler_module_path)
-        elif exec_result.all().filter(status=states.FAILURE).exists():
+        elif tasks_state["failed"]:
             """
             Should set it fail if all the execution are done and at least 1 is failed
             """
@@ -329,8 +324,22 @@ class ImportOrchestrator:
 
         ExecutionRequest.objects.filter(exec_id=execution_id).update(**kwargs)
 
+        layer_name = None
         if celery_task_request:
-            TaskResult.objects.filter(task_id=celery_task_request.id).update(task_args=celery_task_request.args)
+            from geonode.upload.signals import get_layer_name, track_execution_task
+
+            task_kwargs = {**(celery_task_request.kwargs or {}), "execution_id": execution_id}
+            track_execution_task(
+                celery_task_request.id,
+                celery_task_request.task,
+                celery_task_request.args,
+                task_kwargs,
+                states.STARTED,
+            )
+            layer_name = get_layer_name(celery_task_request.task, celery_task_request.args or (), task_kwargs)
+
+        # pushing the changes to the clients following the execution
+        publish_execution_progress(execution_id, kwargs, layer_name=layer_name)
 
     def update_execution_request_obj(self, _exec_obj, payload):
         ExecutionRequest.objects.filter(pk=_exec_obj.pk).update(**payload)
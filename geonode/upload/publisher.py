@@ -22,7 +22,7 @@ from typing import List
 
 from geonode import settings
 from geonode.geoserver.helpers import create_geoserver_db_featurestore
-from geoserver.catalog import Catalog
+from geonode.geoserver.catalog_cache import SharedCacheCatalog
 from geonode.utils import OGC_Servers_Handler
 from django.utils.module_loading import import_string
 from geoserver.support import build_url
@@ -43,7 +43,7 @@ class DataPublisher:
 
         _user, _password = ogc_server_settings.credentials
 
-        self.cat = Catalog(service_url=ogc_server_settings.rest, username=_user, password=_password)
+        self.cat = SharedCacheCatalog(service_url=ogc_server_settings.rest, username=_user, password=_password)
         self.workspace = self._get_default_workspace(create=True)
 
         self.store = None
@@ -0,0 +1,107 @@
+#########################################################################
+#
+# Copyright (C) 2026 OSGeo
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#########################################################################
+"""
+Celery signals keeping the ExecutionTask table aligned with the state of the import tasks
+"""
+import logging
+
+from celery import states
+from celery.signals import after_task_publish, task_postrun, task_prerun, task_revoked
+
+from geonode.upload.handlers.utils import get_uuid
+from geonode.upload.models import ExecutionTask
+
+logger = logging.getLogger("importer")
+
+IMPORTER_TASKS_PREFIX = "geonode.upload."
+
+
+def _get_execution_id(args, kwargs):
+    candidates = [kwargs.get("execution_id"), kwargs.get("exec_id"), *args]
+    return get_uuid([str(candidate) for candidate in candidates if candidate])
+
+
+def get_layer_name(task_name, args, kwargs):
+    if kwargs.get("layer_name"):
+        return kwargs["layer_name"]
+    # the steps run for a single layer receive (execution_id, step, layer_name, alternate, ...)
+    if len(args) >= 4 and args[1] == task_name:
+        return args[2]
+    return None
+
+
+def track_execution_task(task_id, task_name, args, kwargs, state, overwrite=True):
+    """
+    Stores the state of an import task, the tasks not related to an execution are ignored.
+    With overwrite=False an already tracked task is left untouched
+    """
+    if not task_id or not task_name or not task_name.startswith(IMPORTER_TASKS_PREFIX):
+        return
+    args, kwargs = args or (), kwargs or {}
+    execution_id = _get_execution_id(args, kwargs)
+    if execution_id is None:
+        return
+    execution_task = ExecutionTask(
+        execution_id=execution_id,
+        task_id=task_id,
+        step=task_name,
+        layer_name=get_layer_name(task_name, args, kwargs),
+        state=state,
+    )
+    try:
+        if overwrite:
+            ExecutionTask.objects.bulk_create(
+                [execution_task],
+                update_conflicts=True,
+                unique_fields=["task_id"],
+                update_fields=["state", "last_updated"],
+            )
+        else:
+            ExecutionTask.objects.bulk_create([execution_task], ignore_conflicts=True)
+    except Exception as e:
+        # keeping track of the task must never break the import itself
+        logger.error(f"Could not track the task {task_id} of the execution {execution_id}: {e}")
+
+
+@after_task_publish.connect(dispatch_uid="upload_execution_task_published")
+def execution_task_published(sender=None, headers=None, body=None, **kwargs):
+    headers = headers or {}
+    if "task" in headers:
+        # message protocol v2: the body is (args, kwargs, embed)
+        task_id, (args, _kwargs, _) = headers.get("id"), body
+    else:
+        task_id, args, _kwargs = body.get("id"), body.get("args"), body.get("kwargs")
+    # the worker may have already started the task
+    track_execution_task(task_id, sender, args, _kwargs, states.PENDING, overwrite=False)
+
+
+@task_prerun.connect(dispatch_uid="upload_execution_task_started")
+def execution_task_started(sender=None, task_id=None, task=None, args=None, kwargs=None, **extra):
+    track_execution_task(task_id, task.name, args, kwargs, states.STARTED)
+
+
+@task_postrun.connect(dispatch_uid="upload_execution_task_done")
+def execution_task_done(sender=None, task_id=None, task=None, args=None, kwargs=None, state=None, **extra):
+    track_execution_task(task_id, task.name, args, kwargs, state or states.SUCCESS)
+
+
+@task_revoked.connect(dispatch_uid="upload_execution_task_revoked")
+def execution_task_revoked(sender=None, request=None, **extra):
+    if request is not None:
+        track_execution_task(request.id, request.task, request.args, request.kwargs, states.REVOKED)
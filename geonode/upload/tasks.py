@@ -29,7 +29,10 @@ logger = logging.getLogger("importer")
 @app.task(bind=False, acks_late=False, queue="clery_cleanup", ignore_result=True)
 def cleanup_celery_task_entries():
     from django_celery_results.models import TaskResult
+    from geonode.upload.models import ExecutionTask
 
     result_obj = TaskResult.objects.filter(date_done__lte=(datetime.today() - timedelta(days=7)))
     logger.error(f"Total celery task to be deleted: {result_obj.count()}")
     result_obj.delete()
+    # the tracking of the import tasks is not needed anymore as well
+    ExecutionTask.objects.filter(last_updated__lte=(datetime.today() - timedelta(days=7))).delete()
@@ -29,7 +29,8 @@ from geonode.upload.handlers.base import BaseHandler
 from geonode.upload.handlers.shapefile.serializer import ShapeFileSerializer
 from geonode.upload.orchestrator import ImportOrchestrator
 from django.utils import timezone
-from django_celery_results.models import TaskResult
+from geonode.upload.models import ExecutionTask
+from geonode.upload.signals import track_execution_task
 from geonode.assets.handlers import asset_handler_registry
 
 from geonode.resource.models import ExecutionRequest
@@ -293,8 +294,12 @@ class TestsImporterOrchestrator(GeoNodeBaseTestSupport):
                 )
             )
 
-            started_entry = TaskResult.objects.create(task_id="task_id_started", status="STARTED", task_args=exec_id)
-            success_entry = TaskResult.objects.create(task_id="task_id_success", status="SUCCESS", task_args=exec_id)
+            started_entry = ExecutionTask.objects.create(
+                execution_id=exec_id, task_id="task_id_started", step="test", state="STARTED"
+            )
+            success_entry = ExecutionTask.objects.create(
+                execution_id=exec_id, task_id="task_id_success", step="test", state="SUCCESS"
+            )
             with self.assertLogs(level="INFO") as _log:
                 result = self.orchestrator.evaluate_execution_progress(exec_id)
 
@@ -346,8 +351,12 @@ class TestsImporterOrchestrator(GeoNodeBaseTestSupport):
                 )
             )
 
-            FAILED_entry = TaskResult.objects.create(task_id="task_id_FAILED", status="FAILURE", task_args=exec_id)
-            success_entry = TaskResult.objects.create(task_id="task_id_success", status="SUCCESS", task_args=exec_id)
+            FAILED_entry = ExecutionTask.objects.create(
+                execution_id=exec_id, task_id="task_id_FAILED", step="test", state="FAILURE"
+            )
+            success_entry = ExecutionTask.objects.create(
+                execution_id=exec_id, task_id="task_id_success", step="test", state="SUCCESS"
+            )
             self.orchestrator.evaluate_execution_progress(exec_id)
 
         finally:
@@ -366,10 +375,39 @@ class TestsImporterOrchestrator(GeoNodeBaseTestSupport):
                 )
             )
 
-            success_entry = TaskResult.objects.create(task_id="task_id_success", status="SUCCESS", task_args=exec_id)
+            success_entry = ExecutionTask.objects.create(
+                execution_id=exec_id, task_id="task_id_success", step="test", state="SUCCESS"
+            )
 
             self.orchestrator.evaluate_execution_progress(exec_id)
 
         finally:
             if success_entry:
                 success_entry.delete()
+
+    def test_track_execution_task(self):
+        exec_id = str(
+            self.orchestrator.create_execution_request(
+                user=get_user_model().objects.first(),
+                func_name="test",
+                step="test",
+            )
+        )
+        step = "geonode.upload.publish_resource"
+        args = (exec_id, step, "layer", "alternate", "handler", "upload")
+        try:
+            track_execution_task("task_id", step, args, {}, "STARTED")
+            # the publish signal of an already started task is ignored
+            track_execution_task("task_id", step, args, {}, "PENDING", overwrite=False)
+            # tasks not related to the importer are not tracked
+            track_execution_task("other_task_id", "geonode.tasks.email.send_mail", args, {}, "STARTED")
+
+            task = ExecutionTask.objects.get(execution_id=exec_id)
+            self.assertEqual(task.task_id, "task_id")
+            self.assertEqual(task.layer_name, "layer")
+            self.assertEqual(task.state, "STARTED")
+
+            track_execution_task("task_id", step, args, {}, "SUCCESS")
+            self.assertEqual(ExecutionTask.objects.get(task_id="task_id").state, "SUCCESS")
+        finally:
+            ExecutionTask.objects.filter(execution_id=exec_id).delete()
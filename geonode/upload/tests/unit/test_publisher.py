@@ -86,7 +86,7 @@ class TestDataPublisher(TestCase):
             self.publisher.get_or_create_store()
             datastore.assert_called_once()
 
-    @patch("geonode.upload.publisher.Catalog.publish_featuretype")
+    @patch("geonode.upload.publisher.SharedCacheCatalog.publish_featuretype")
     def test_publish_resources_should_raise_exception_if_any_error_happen(self, publish_featuretype):
         publish_featuretype.side_effect = Exception("Exception")
 
@@ -94,7 +94,7 @@ class TestDataPublisher(TestCase):
             self.publisher.publish_resources(resources=[{"crs": "EPSG:32632", "name": "stazioni_metropolitana"}])
         publish_featuretype.assert_called_once()
 
-    @patch("geonode.upload.publisher.Catalog.publish_featuretype")
+    @patch("geonode.upload.publisher.SharedCacheCatalog.publish_featuretype")
     def test_publish_resources_should_work(self, publish_featuretype):
         publish_featuretype.return_value = True
         self.publisher.sanity_checks = MagicMock()
@@ -24,12 +24,11 @@ from django.urls import re_path
 from django.conf import settings
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.conf.urls.static import static
-from geonode.sitemap import DatasetSitemap, MapSitemap
+from geonode.sitemap import sitemap
 from django.views.generic import TemplateView
 from django.contrib import admin
 from django.conf.urls.i18n import i18n_patterns
 from django.views.i18n import JavaScriptCatalog
-from django.contrib.sitemaps.views import sitemap
 
 import geonode.proxy.urls
 from geonode.upload.api.views import ImporterViewSet, ResourceImporter
@@ -49,8 +48,6 @@ admin.autodiscover()
 
 js_info_dict = {"domain": "djangojs", "packages": "geonode"}
 
-sitemaps = {"dataset": DatasetSitemap, "map": MapSitemap}
-
 homepage = register_url_event()(TemplateView.as_view(template_name="index.html"))
 
 urlpatterns = [
@@ -60,7 +57,8 @@ urlpatterns = [
     re_path(r"^about/$", TemplateView.as_view(template_name="about.html"), name="about"),
     re_path(r"^privacy_cookies/$", TemplateView.as_view(template_name="privacy-cookies.html"), name="privacy-cookies"),
     # Meta
-    re_path(r"^sitemap\.xml$", sitemap, {"sitemaps": sitemaps}, name="sitemap"),
+    re_path(r"^sitemap\.xml$", sitemap, name="sitemap"),
+    re_path(r"^sitemap-(?P<name>[a-z]+)-(?P<section>\d+)\.xml$", sitemap, name="sitemap_section"),
     re_path(r"^robots\.txt$", TemplateView.as_view(template_name="robots.txt"), name="robots"),
     re_path(r"(.*version\.txt)$", version.version, name="version"),
 ]
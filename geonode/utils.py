@@ -53,6 +53,7 @@ from django.utils.http import url_has_allowed_host_and_scheme
 from django.apps import apps as django_apps
 from django.middleware.csrf import get_token
 from django.http import HttpResponse
+from django.urls import reverse
 from django.forms.models import model_to_dict
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
@@ -1186,11 +1187,23 @@ def get_legend_url(
     height=20,
     params=None,
 ):
+    """
+    Returns the URL of the GetLegendGraphic of the dataset with the style. The legends of the local datasets
+    are served by the GeoNode legends cache when it is enabled, see geonode.geoserver.legends, with
+    the version of the style in the URL so that the clients can keep them.
+    """
     from geonode.geoserver.helpers import ogc_server_settings
+    from geonode.geoserver.legends import get_dataset_style, get_style_version, is_legend_cache_enabled
 
-    _service_url = service_url or f"{ogc_server_settings.PUBLIC_LOCATION}ows"
     _dataset_name = dataset_name or instance.alternate
     _params = f"&{params}" if params else ""
+    if service_url is None and dataset_name is None and is_legend_cache_enabled():
+        _service_url = urljoin(settings.SITEURL, reverse("dataset_legend", args=[_dataset_name]))
+        style = get_dataset_style(instance, style_name) if hasattr(instance, "styles") else None
+        if style:
+            _params = f"&v={get_style_version(style)}{_params}"
+    else:
+        _service_url = service_url or f"{ogc_server_settings.PUBLIC_LOCATION}ows"
     return (
         f"{_service_url}?"
         f"service=WMS&request=GetLegendGraphic&format=image/png&WIDTH={width}&HEIGHT={height}&"
@@ -1199,16 +1212,60 @@ def get_legend_url(
     )
 
 
+def get_dataset_links_bbox(instance, gs_catalog):
+    """
+    Returns the bbox, as a "minx,miny,maxx,maxy" string, and the srid of the dataset for its links.
+    They are read from GeoServer only when not already known, updating the dataset.
+    """
+    if instance.srid and instance.bbox_polygon:
+        return instance.bbox_string, instance.srid
+
+    srid = instance.srid if instance.srid else getattr(settings, "DEFAULT_MAP_CRS", "EPSG:4326")
+    try:
+        gs_resource = gs_catalog.get_resource(name=instance.name, store=instance.store, workspace=instance.workspace)
+        if not gs_resource:
+            gs_resource = gs_catalog.get_resource(name=instance.name, workspace=instance.workspace)
+        if not gs_resource:
+            gs_resource = gs_catalog.get_resource(name=instance.name)
+
+        if not gs_resource:
+            return instance.bbox_string, srid
+        srid = gs_resource.projection
+        bbox = gs_resource.native_bbox
+        ll_bbox = gs_resource.latlon_bbox
+        try:
+            instance.set_bbox_polygon([bbox[0], bbox[2], bbox[1], bbox[3]], srid)
+        except GeoNodeException as e:
+            if not ll_bbox:
+                raise
+            else:
+                logger.exception(e)
+                instance.srid = "EPSG:4326"
+        instance.set_ll_bbox_polygon([ll_bbox[0], ll_bbox[2], ll_bbox[1], ll_bbox[3]])
+        if instance.srid:
+            instance.srid_url = f"http://www.spatialreference.org/ref/{instance.srid.replace(':', '/').lower()}/"
+        elif instance.bbox_polygon is not None:
+            # Guessing 'EPSG:4326' by default
+            instance.srid = "EPSG:4326"
+        else:
+            raise GeoNodeException(_("Invalid Projection. Dataset is missing CRS!"))
+        # Rewriting BBOX as a plain string
+        return ",".join(str(x) for x in [bbox[0], bbox[2], bbox[1], bbox[3]]), srid
+    except Exception as e:
+        logger.exception(e)
+        return instance.bbox_string, srid
+
+
 def set_resource_default_links(instance, layer, prune=False, **kwargs):
+    """
+    Creates or updates the default links of the dataset, e.g. the OGC services and the legends.
+    The desired links are computed in memory and aligned with the stored ones with Link.objects.sync;
+    with prune, the other links of the default types are removed.
+    """
     from geonode.base.models import Link
     from django.utils.translation import gettext_lazy
 
-    # Prune old links
-    if prune:
-        logger.debug(" -- Resource Links[Prune old links]...")
-        _def_link_types = ("data", "image", "original", "html", "OGC:WMS", "OGC:WFS", "OGC:WCS")
-        Link.objects.filter(resource=instance.resourcebase_ptr, link_type__in=_def_link_types).delete()
-        logger.debug(" -- Resource Links[Prune old links]...done!")
+    _def_link_types = ("data", "image", "original", "html", "OGC:WMS", "OGC:WFS", "OGC:WCS")
 
     if check_ogc_backend(geoserver.BACKEND_PACKAGE):
         from geonode.geoserver.ows import wcs_links, wfs_links, wms_links
@@ -1220,104 +1277,37 @@ def set_resource_default_links(instance, layer, prune=False, **kwargs):
         width = 550
 
         # Parse Dataset BBOX and SRID
-        bbox = None
-        srid = instance.srid if instance.srid else getattr(settings, "DEFAULT_MAP_CRS", "EPSG:4326")
-        if not prune and instance.srid and instance.bbox_polygon:
-            bbox = instance.bbox_string
-        else:
-            try:
-                gs_resource = gs_catalog.get_resource(
-                    name=instance.name, store=instance.store, workspace=instance.workspace
-                )
-                if not gs_resource:
-                    gs_resource = gs_catalog.get_resource(name=instance.name, workspace=instance.workspace)
-                if not gs_resource:
-                    gs_resource = gs_catalog.get_resource(name=instance.name)
-
-                if gs_resource:
-                    srid = gs_resource.projection
-                    bbox = gs_resource.native_bbox
-                    ll_bbox = gs_resource.latlon_bbox
-                    try:
-                        instance.set_bbox_polygon([bbox[0], bbox[2], bbox[1], bbox[3]], srid)
-                    except GeoNodeException as e:
-                        if not ll_bbox:
-                            raise
-                        else:
-                            logger.exception(e)
-                            instance.srid = "EPSG:4326"
-                    instance.set_ll_bbox_polygon([ll_bbox[0], ll_bbox[2], ll_bbox[1], ll_bbox[3]])
-                    if instance.srid:
-                        instance.srid_url = (
-                            f"http://www.spatialreference.org/ref/{instance.srid.replace(':', '/').lower()}/"
-                        )
-                    elif instance.bbox_polygon is not None:
-                        # Guessing 'EPSG:4326' by default
-                        instance.srid = "EPSG:4326"
-                    else:
-                        raise GeoNodeException(_("Invalid Projection. Dataset is missing CRS!"))
-                    dx = float(bbox[1]) - float(bbox[0])
-                    dy = float(bbox[3]) - float(bbox[2])
-                    dataAspect = 1 if dy == 0 else dx / dy
-                    width = int(height * dataAspect)
-                    # Rewriting BBOX as a plain string
-                    bbox = ",".join(str(x) for x in [bbox[0], bbox[2], bbox[1], bbox[3]])
-                else:
-                    bbox = instance.bbox_string
-            except Exception as e:
-                logger.exception(e)
-                bbox = instance.bbox_string
+        bbox, srid = get_dataset_links_bbox(instance, gs_catalog)
+        try:
+            minx, miny, maxx, maxy = (float(value) for value in bbox.split(","))
+            dx = maxx - minx
+            dy = maxy - miny
+            dataAspect = 1 if dy == 0 else dx / dy
+            width = int(height * dataAspect)
+        except (AttributeError, TypeError, ValueError):
+            pass
+
+        links = []
+
+        def add_link(match, defaults, update=True):
+            links.append({"match": match, "defaults": defaults, "update": update})
 
         # Set download links for WMS, WCS or WFS and KML
         logger.debug(" -- Resource Links[Set download links for WMS, WCS or WFS and KML]...")
         instance_ows_url = f"{instance.ows_url}?" if instance.ows_url else f"{ogc_server_settings.public_url}ows?"
-        links = wms_links(instance_ows_url, instance.alternate, bbox, srid, height, width)
-
-        for ext, name, mime, wms_url in links:
-            try:
-                Link.objects.update_or_create(
-                    resource=instance.resourcebase_ptr,
-                    name=gettext_lazy(name),
-                    defaults=dict(
-                        extension=ext,
-                        url=wms_url,
-                        mime=mime,
-                        link_type="image",
-                    ),
-                )
-            except Link.MultipleObjectsReturned:
-                _d = dict(extension=ext, url=wms_url, mime=mime, link_type="image")
-                Link.objects.filter(
-                    resource=instance.resourcebase_ptr, name=gettext_lazy(name), link_type="image"
-                ).update(**_d)
+        for ext, name, mime, wms_url in wms_links(instance_ows_url, instance.alternate, bbox, srid, height, width):
+            add_link(
+                {"name": str(gettext_lazy(name)), "link_type": "image"},
+                {"extension": ext, "url": wms_url, "mime": mime},
+            )
 
         if instance.subtype == "vector":
-            links = wfs_links(
+            data_links = wfs_links(
                 instance_ows_url,
                 instance.alternate,
                 bbox=None,  # bbox filter should be set at runtime otherwise conflicting with CQL
                 srid=srid,
             )
-            for ext, name, mime, wfs_url in links:
-                if mime == "SHAPE-ZIP":
-                    name = "Zipped Shapefile"
-                if (
-                    Link.objects.filter(
-                        resource=instance.resourcebase_ptr, url=wfs_url, name=name, link_type="data"
-                    ).count()
-                    < 2
-                ):
-                    Link.objects.update_or_create(
-                        resource=instance.resourcebase_ptr,
-                        url=wfs_url,
-                        name=name,
-                        link_type="data",
-                        defaults=dict(
-                            extension=ext,
-                            mime=mime,
-                        ),
-                    )
-
         elif instance.subtype == "raster":
             """
             Going to create the WCS GetCoverage Default download links.
@@ -1327,197 +1317,96 @@ def set_resource_default_links(instance, layer, prune=False, **kwargs):
             Notice that the "wcs_links" method also generates 1 default "outputFormat":
              - "geotiff"; GeoTIFF which will be compressed and tiled by passing to the WCS the default query params compression='DEFLATE' and tile_size=512
             """
-            links = wcs_links(instance_ows_url, instance.alternate)
-            for ext, name, mime, wcs_url in links:
-                if (
-                    Link.objects.filter(
-                        resource=instance.resourcebase_ptr, url=wcs_url, name=name, link_type="data"
-                    ).count()
-                    < 2
-                ):
-                    Link.objects.update_or_create(
-                        resource=instance.resourcebase_ptr,
-                        url=wcs_url,
-                        name=name,
-                        link_type="data",
-                        defaults=dict(
-                            extension=ext,
-                            mime=mime,
-                        ),
-                    )
+            data_links = wcs_links(instance_ows_url, instance.alternate)
+        else:
+            data_links = []
+        for ext, name, mime, data_url in data_links:
+            if mime == "SHAPE-ZIP":
+                name = "Zipped Shapefile"
+            add_link({"url": data_url, "name": name, "link_type": "data"}, {"extension": ext, "mime": mime})
 
         site_url = settings.SITEURL.rstrip("/") if settings.SITEURL.startswith("http") else settings.SITEURL
         html_link_url = f"{site_url}{instance.get_absolute_url()}"
-
-        if (
-            Link.objects.filter(
-                resource=instance.resourcebase_ptr, url=html_link_url, name=instance.alternate, link_type="html"
-            ).count()
-            < 2
-        ):
-            Link.objects.update_or_create(
-                resource=instance.resourcebase_ptr,
-                url=html_link_url,
-                name=instance.alternate or instance.name,
-                link_type="html",
-                defaults=dict(
-                    extension="html",
-                    mime="text/html",
-                ),
-            )
-        logger.debug(" -- Resource Links[Set download links for WMS, WCS or WFS and KML]...done!")
+        add_link(
+            {"url": html_link_url, "name": instance.alternate or instance.name, "link_type": "html"},
+            {"extension": "html", "mime": "text/html"},
+        )
 
         # Legend link
         logger.debug(" -- Resource Links[Legend link]...")
-        try:
-            if instance.subtype not in ["tileStore", "remote"]:
-                for style in set(
-                    list(instance.styles.all())
-                    + [
-                        instance.default_style,
-                    ]
-                ):
+        remote_legend = instance.subtype in ["tileStore", "remote"]
+        if not remote_legend:
+            try:
+                for style in set(list(instance.styles.all()) + [instance.default_style]):
                     if style:
                         style_name = os.path.basename(urlparse(style.sld_url).path).split(".")[0]
                         legend_url = get_legend_url(instance, style_name)
-                        if Link.objects.filter(resource=instance.resourcebase_ptr, url=legend_url).count() < 2:
-                            Link.objects.update_or_create(
-                                resource=instance.resourcebase_ptr,
-                                name="Legend",
-                                url=legend_url,
-                                defaults=dict(
-                                    extension="png",
-                                    url=legend_url,
-                                    mime="image/png",
-                                    link_type="image",
-                                ),
-                            )
-            else:
-                from geonode.services.serviceprocessors import get_service_handler
-
-                handler = get_service_handler(
-                    instance.remote_service.service_url, service_type=instance.remote_service.type
-                )
-                if handler and hasattr(handler, "_create_dataset_legend_link"):
-                    handler._create_dataset_legend_link(instance)
-
-            logger.debug(" -- Resource Links[Legend link]...done!")
-        except Exception as e:
-            logger.debug(f" -- Resource Links[Legend link]...error: {e}")
+                        add_link(
+                            {"name": "Legend", "url": legend_url},
+                            {"extension": "png", "mime": "image/png", "link_type": "image"},
+                        )
+            except Exception as e:
+                logger.debug(f" -- Resource Links[Legend link]...error: {e}")
 
         # Thumbnail link
-        if instance.get_thumbnail_url():
-            logger.debug(" -- Resource Links[Thumbnail link]...")
-            if (
-                Link.objects.filter(
-                    resource=instance.resourcebase_ptr, url=instance.get_thumbnail_url(), name="Thumbnail"
-                ).count()
-                < 2
-            ):
-                Link.objects.update_or_create(
-                    resource=instance.resourcebase_ptr,
-                    url=instance.get_thumbnail_url(),
-                    name="Thumbnail",
-                    defaults=dict(
-                        extension="png",
-                        mime="image/png",
-                        link_type="image",
-                    ),
-                )
-            logger.debug(" -- Resource Links[Thumbnail link]...done!")
+        thumbnail_url = instance.get_thumbnail_url()
+        if thumbnail_url:
+            add_link(
+                {"url": thumbnail_url, "name": "Thumbnail"},
+                {"extension": "png", "mime": "image/png", "link_type": "image"},
+            )
 
         logger.debug(" -- Resource Links[OWS Links]...")
         try:
-            if (
-                not hasattr(instance.get_real_instance(), "ptype")
-                or instance.get_real_instance().ptype == GXP_PTYPES["WMS"]
-            ):
-                ogc_wms_url = instance.ows_url or urljoin(ogc_server_settings.public_url, "ows")
-                ogc_wms_name = f"OGC WMS: {instance.workspace} Service"
-                if (
-                    Link.objects.filter(resource=instance.resourcebase_ptr, name=ogc_wms_name, url=ogc_wms_url).count()
-                    < 2
-                ):
-                    Link.objects.get_or_create(
-                        resource=instance.resourcebase_ptr,
-                        url=ogc_wms_url,
-                        name=ogc_wms_name,
-                        defaults=dict(
-                            extension="html",
-                            url=ogc_wms_url,
-                            mime="text/html",
-                            link_type="OGC:WMS",
-                        ),
-                    )
-
+            real_instance = instance.get_real_instance()
+            ows_url = instance.ows_url or urljoin(ogc_server_settings.public_url, "ows")
+            if not hasattr(real_instance, "ptype") or real_instance.ptype == GXP_PTYPES["WMS"]:
+                services = [("WMS", "OGC:WMS")]
                 if instance.subtype == "vector":
-                    ogc_wfs_url = instance.ows_url or urljoin(ogc_server_settings.public_url, "ows")
-                    ogc_wfs_name = f"OGC WFS: {instance.workspace} Service"
-                    if (
-                        Link.objects.filter(
-                            resource=instance.resourcebase_ptr, name=ogc_wfs_name, url=ogc_wfs_url
-                        ).count()
-                        < 2
-                    ):
-                        Link.objects.get_or_create(
-                            resource=instance.resourcebase_ptr,
-                            url=ogc_wfs_url,
-                            name=ogc_wfs_name,
-                            defaults=dict(
-                                extension="html",
-                                url=ogc_wfs_url,
-                                mime="text/html",
-                                link_type="OGC:WFS",
-                            ),
-                        )
-
+                    services.append(("WFS", "OGC:WFS"))
                 if instance.subtype == "raster":
-                    ogc_wcs_url = instance.ows_url or urljoin(ogc_server_settings.public_url, "ows")
-                    ogc_wcs_name = f"OGC WCS: {instance.workspace} Service"
-                    if (
-                        Link.objects.filter(
-                            resource=instance.resourcebase_ptr, name=ogc_wcs_name, url=ogc_wcs_url
-                        ).count()
-                        < 2
-                    ):
-                        Link.objects.get_or_create(
-                            resource=instance.resourcebase_ptr,
-                            url=ogc_wcs_url,
-                            name=ogc_wcs_name,
-                            defaults=dict(
-                                extension="html",
-                                url=ogc_wcs_url,
-                                mime="text/html",
-                                link_type="OGC:WCS",
-                            ),
-                        )
-
-            elif hasattr(instance.get_real_instance(), "ptype") and instance.get_real_instance().ptype:
-                ptype_link = dict((v, k) for k, v in GXP_PTYPES.items()).get(instance.get_real_instance().ptype)
-                ptype_link_name = get_available_service_types().get(ptype_link)
-                ptype_link_url = instance.ows_url
-                if (
-                    Link.objects.filter(
-                        resource=instance.resourcebase_ptr, name=ptype_link_name, url=ptype_link_url
-                    ).count()
-                    < 2
-                ):
-                    Link.objects.get_or_create(
-                        resource=instance.resourcebase_ptr,
-                        url=ptype_link_url,
-                        name=ptype_link_name,
-                        defaults=dict(
-                            extension="html",
-                            url=ptype_link_url,
-                            mime="text/html",
-                            link_type="image",
-                        ),
+                    services.append(("WCS", "OGC:WCS"))
+                for service, link_type in services:
+                    add_link(
+                        {"url": ows_url, "name": f"OGC {service}: {instance.workspace} Service"},
+                        {"extension": "html", "mime": "text/html", "link_type": link_type},
+                        update=False,
                     )
-            logger.debug(" -- Resource Links[OWS Links]...done!")
+            elif hasattr(real_instance, "ptype") and real_instance.ptype:
+                ptype_link = dict((v, k) for k, v in GXP_PTYPES.items()).get(real_instance.ptype)
+                add_link(
+                    {"url": instance.ows_url, "name": get_available_service_types().get(ptype_link)},
+                    {"extension": "html", "mime": "text/html", "link_type": "image"},
+                    update=False,
+                )
         except Exception as e:
             logger.error(" -- Resource Links[OWS Links]...error!")
             logger.exception(e)
 
+        created, updated, deleted = Link.objects.sync(
+            instance.resourcebase_ptr, links, prune_types=_def_link_types if prune else ()
+        )
+        logger.debug(f" -- Resource Links: {created} created, {updated} updated, {deleted} deleted")
+
+        legend_urls = [link["match"]["url"] for link in links if link["match"].get("name") == "Legend"]
+        if legend_urls:
+            # the legends of the former styles, or served from a former location, e.g. before the legends cache
+            Link.objects.filter(resource=instance.resourcebase_ptr, name="Legend").exclude(url__in=legend_urls).delete()
+
+        if remote_legend:
+            try:
+                from geonode.services.serviceprocessors import get_service_handler
+
+                handler = get_service_handler(
+                    instance.remote_service.service_url, service_type=instance.remote_service.type
+                )
+                if handler and hasattr(handler, "_create_dataset_legend_link"):
+                    handler._create_dataset_legend_link(instance)
+            except Exception as e:
+                logger.debug(f" -- Resource Links[Legend link]...error: {e}")
+    elif prune:
+        Link.objects.filter(resource=instance.resourcebase_ptr, link_type__in=_def_link_types).delete()
+
 
 json_serializer_k_map = {
     "user": settings.AUTH_USER_MODEL,